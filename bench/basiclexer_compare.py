@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import sys
+import time
+from pathlib import Path
+from typing import Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from basiclegacyanalyzer import BasicLineDimAnalyzerLegacy, BasicLineVarAnalyzerLegacy, count_on_goto_targets_legacy
+from kc_v24_transfer_basiclexer import KC_V24_Transfer_BASIClexer, _benchmark_listing
+from kc_v24_transfer_basiclinedimanalyzer import BasicLineDimAnalyzer
+from kc_v24_transfer_basiclinevaranalyzer import BasicLineVarAnalyzer
+from kc_v24_transfer_textplan import KC_V24_Transfer_TextPlan, TextPlanConfig
+
+# Vergleich der Zeilenanalyse (ON GOTO, DIM, Variablen) vor und nach dem gemeinsamen Lexer:
+# Laufzeit im selben Messaufbau wie "kc_v24_transfer_basiclexer.py -bench" (Listing mit 2000 Zeilen),
+# dazu die Zeilen der Dateien mit abweichendem Ergebnis und die daraus berechneten Wartezeiten beim Eintippen.
+
+
+def main(files) -> int:
+    lines = _benchmark_listing(files)
+    if not lines:
+        print("Keine BASIC-Zeilen gefunden", file=sys.stderr)
+        return 1
+
+    lexer       = KC_V24_Transfer_BASIClexer.shared()
+    dimanalyzer = BasicLineDimAnalyzer(option_base=0)
+    varanalyzer = BasicLineVarAnalyzer()
+    dimlegacy   = BasicLineDimAnalyzerLegacy(option_base=0)
+    varlegacy   = BasicLineVarAnalyzerLegacy()
+
+    def analyze_new(ln: str) -> Tuple[int, int, int, int]:
+        # wie KC_V24_Transfer_TextPlan.compile je Zeile: (ON-GOTO-Ziele, Feldzugriffe, DIM-Einheiten, Variablen)
+        tokens = lexer.lex(ln)
+        return (KC_V24_Transfer_TextPlan._count_on_goto_targets(tokens),) + dimanalyzer.analyze_line(ln) + (varanalyzer.analyze_line(ln)[0],)
+
+    def analyze_legacy(ln: str) -> Tuple[int, int, int, int]:
+        # wie KC_V24_Transfer_TextPlan.compile vor dem gemeinsamen Lexer
+        return (count_on_goto_targets_legacy(ln),) + dimlegacy.analyze_line(ln) + (varlegacy.analyze_line(ln)[0],)
+
+    def run(analyze, cached: bool) -> float:
+        best = None
+        for _ in range(5):
+            if not cached:
+                lexer.cache_clear()
+            t0 = time.perf_counter()
+            for ln in lines:
+                analyze(ln)
+            t = time.perf_counter() - t0
+            best = t if best is None else min(best, t)
+        return best / len(lines) * 1e6
+
+    print(f"{len(lines)} Zeilen:")
+    print(f"  vorher (Masken/Regex):   {run(analyze_legacy, False):7.1f} us/Zeile")
+    print(f"  nachher ohne Cache:      {run(analyze_new, False):7.1f} us/Zeile")
+    print(f"  nachher mit Cache:       {run(analyze_new, True):7.1f} us/Zeile")
+
+    # abweichende Ergebnisse und ihre Wirkung auf die Wartezeiten beim Eintippen
+    cfg = TextPlanConfig()
+    def delay_ms(r: Tuple[int, int, int, int]) -> float:
+        on_goto, dim_refs, dim_units, var_refs = r
+        return (on_goto * cfg.command_addition + dim_refs * cfg.dim_ref_delay
+                + dim_units * cfg.dim_unit_delay + var_refs * cfg.var_ref_delay)
+
+    for filename in files:
+        with open(filename, "rb") as f:
+            source = [ln for ln in f.read().decode("latin1").splitlines() if ln.strip()]
+        before = after = 0.0
+        changed = []
+        for ln in source:
+            old, new = analyze_legacy(ln), analyze_new(ln)
+            before += delay_ms(old)
+            after  += delay_ms(new)
+            if old != new:
+                changed.append((ln, old, new))
+        print(f"{filename}: {len(changed)} von {len(source)} Zeilen abweichend, "
+              f"Wartezeit aus der Analyse vorher {before / 1000:.1f} s, nachher {after / 1000:.1f} s")
+        for ln, old, new in changed[:10]:
+            print(f"  {ln[:60]}\n      (ON GOTO, Felder, DIM, Variablen) vorher {old} nachher {new}")
+    return 0
+
+
+# Einfacher CLI-Einstiegspunkt
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print(
+            "python bench/basiclexer_compare.py <datei.txt> [...]"
+            ,""
+            ,"Zeilenanalyse vorher (bench/basiclegacyanalyzer.py) und nachher (gemeinsamer Lexer, ohne und mit Cache):"
+            ,"Laufzeit für ein Listing mit 2000 Zeilen aus den Zeilen der Dateien, abweichende Zeilen und"
+            ,"die Summe der daraus berechneten Wartezeiten (TextPlanConfig) vorher/nachher."
+            , sep="\n"
+            , file=sys.stderr
+        )
+        sys.exit(1)
+    sys.exit(main(sys.argv[1:]))
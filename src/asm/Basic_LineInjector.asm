@@ -0,0 +1,79 @@
+; Zeilen-Einspeiser für BASIC (KC_V24_Transfer_LineInjector)
+; Gibt ein vorab per ESC-T geladenes Listing Zeile für Zeile an die BASIC-Eingabe weiter -
+; ohne Tastaturübertragung über die V24 und damit ohne deren Wartezeiten je Zeichen und Zeile.
+;
+; Speicher (ein ESC-T, vom PC zusammengestellt):
+;   <Zeilenpuffer> <Einspeiser ab 7A00h>        dahinter 256 Bytes Kopie der UP-Tabelle (TABLE)
+;   Zeilenpuffer: Zeilen mit 0Dh abgeschlossen, am Ende 00h - endet direkt vor dem Einspeiser.
+;   Der Bereich oberhalb von TABLE bleibt für Stack und Zeichenketten des BASIC frei.
+;
+; Ablauf:
+;   Der Einspeiser wird nach dem BASIC-Start am Prompt mit CALL*7A00 aufgerufen. Er kopiert die
+;   CAOS-Unterprogrammtabelle (SUTAB) und trägt sich dort als INLIN (UP 17h) ein. Ruft BASIC die
+;   Zeileneingabe auf, wird die nächste Zeile des Puffers über CRT ausgegeben (wie das Echo beim
+;   Tippen) und das ursprüngliche INLIN mit vorgemerkter ENTER-Taste (IX+13 = 0Dh, IX+8 Bit 0)
+;   aufgerufen: BASIC übernimmt die Zeile wie eine eingetippte - mit jedem BASIC-Dialekt.
+;   Nach der letzten Zeile wird die ursprüngliche Tabelle wieder eingetragen und 'O' über DART-B
+;   (Kanal 2 des M003) an die Gegenstelle gemeldet; danach gilt wieder die Tastatur.
+;
+; Die Adresse des Zeilenpuffers (START+2) wird vom PC eingetragen.
+
+        ORG     7A00h
+
+SUTAB   EQU     0B7B0h          ; CAOS: Zeiger auf die Unterprogrammtabelle (PV1)
+KEYFLG  EQU     01F8h           ; CAOS: IX+8, Bit 0 = Tastencode gültig
+KEYCOD  EQU     01FDh           ; CAOS: IX+13, Tastencode
+PV1     EQU     0F003h
+UPINL   EQU     002Eh           ; Offset von INLIN (UP 17h) in der Tabelle
+UPCRT   EQU     00h             ; CRT: Zeichen in A ausgeben
+
+START:  JR      INIT
+BUFPTR: DW      0               ; nächste Zeile im Puffer (vom PC eingetragen)
+OLDTAB: DW      0               ; ursprüngliche UP-Tabelle
+OLDINL: DW      0               ; ursprüngliches INLIN
+
+INIT:   LD      HL,(SUTAB)      ; UP-Tabelle kopieren
+        LD      (OLDTAB),HL
+        LD      DE,TABLE
+        LD      BC,256
+        LDIR
+        LD      HL,(TABLE+UPINL)
+        LD      (OLDINL),HL
+        LD      HL,INLIN        ; INLIN umlenken
+        LD      (TABLE+UPINL),HL
+        LD      HL,TABLE
+        LD      (SUTAB),HL
+        RET                     ; zurück zu BASIC - die nächste Zeileneingabe kommt aus dem Puffer
+
+; INLIN-Ersatz (Aufruf über PV1, IX = 01F0h)
+INLIN:  LD      HL,(BUFPTR)
+        LD      A,(HL)
+        OR      A
+        JR      Z,DONE          ; Puffer abgearbeitet
+LINE:   LD      A,(HL)
+        INC     HL
+        CP      0Dh
+        JR      Z,ENTER
+        PUSH    HL
+        CALL    PV1
+        DB      UPCRT
+        POP     HL
+        JR      LINE
+ENTER:  LD      (BUFPTR),HL
+        LD      A,0Dh           ; ENTER als gedrückte Taste vormerken
+        LD      (KEYCOD),A
+        LD      HL,KEYFLG
+        SET     0,(HL)
+ORIG:   LD      HL,(OLDINL)     ; ursprüngliches INLIN übernimmt die Zeile vom Bildschirm
+        JP      (HL)
+
+DONE:   LD      HL,(OLDTAB)     ; Tabelle zurück
+        LD      (SUTAB),HL
+TXWAIT: IN      A,(0Bh)         ; Meldung an die Gegenstelle (Sendepuffer leer abwarten)
+        BIT     2,A
+        JR      Z,TXWAIT
+        LD      A,'O'
+        OUT     (09h),A
+        JR      ORIG            ; Eingabe wieder von der Tastatur
+
+TABLE:                          ; Kopie der UP-Tabelle (256 Bytes, nicht Teil des Speicherabbilds)
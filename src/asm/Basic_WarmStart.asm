@@ -0,0 +1,67 @@
+; BASIC-Warmstart per ESC-U (KC_V24_Transfer_BasicWarmStart)
+; Startet ein per ESC-T geladenes BASIC-Speicherabbild (Systemblock ab 0300h, Programm ab 0401h)
+; ohne Tastaturmodus: statt REBASIC und RUN über die V24 einzutippen, ruft der PC diesen Stub
+; per ESC-U auf.
+;
+; Speicher (ein ESC-T zusammen mit dem Speicherabbild, vom PC zusammengestellt):
+;   <Stub ab 0280h> <RUN-Zeile, 0Dh> <00h bis 02FFh> <BASIC-Systemblock ab 0300h> <Programm ab 0401h>
+;   TABLE (256 Bytes Kopie der UP-Tabelle) liegt im freien IRM unterhalb der BF00-Stubs.
+;
+; Ablauf:
+;   Der Stub trägt sich wie der Zeilen-Einspeiser (Basic_LineInjector.asm) als INLIN (UP 17h) in
+;   eine Kopie der CAOS-Unterprogrammtabelle ein, schaltet das BASIC-ROM ein (wie REBASIC) und springt
+;   über den Warmstart-Vektor des Systemblocks (0300h: JP 0C089h) in BASIC. Die erste Zeileneingabe
+;   am BASIC-Prompt erhält die RUN-Zeile; danach gilt wieder die ursprüngliche Tabelle.
+;
+; Die RUN-Zeile (z.B. "RUN 10", mit 0Dh abgeschlossen) hängt der PC direkt hinter den Code (LINE).
+
+        ORG     0280h
+
+SUTAB   EQU     0B7B0h          ; CAOS: Zeiger auf die Unterprogrammtabelle (PV1)
+PV1     EQU     0F003h
+UPINL   EQU     002Eh           ; Offset von INLIN (UP 17h) in der Tabelle
+UPCRT   EQU     00h             ; CRT: Zeichen in A ausgeben
+BASWRM  EQU     0300h           ; Warmstart-Vektor im BASIC-Systemblock
+TABLE   EQU     0BE00h          ; Kopie der UP-Tabelle (IRM)
+
+START:  LD      HL,(SUTAB)      ; UP-Tabelle kopieren
+        LD      (OLDTAB),HL
+        LD      DE,TABLE
+        LD      BC,256
+        LDIR
+        LD      HL,(TABLE+UPINL)
+        LD      (OLDINL),HL
+        LD      HL,INLIN        ; INLIN umlenken
+        LD      (TABLE+UPINL),HL
+        LD      HL,TABLE
+        LD      (SUTAB),HL
+
+        LD      IX,01F0h        ; BASIC-ROM ein (PIO A, Bit 7 - Kopie in IX+1)
+        LD      A,(IX+1)
+        OR      80h
+        LD      (IX+1),A
+        OUT     (88h),A
+        JP      BASWRM
+
+; INLIN-Ersatz (Aufruf über PV1, IX = 01F0h): RUN-Zeile ausgeben und mit ENTER übernehmen
+INLIN:  LD      HL,LINE
+NEXT:   LD      A,(HL)
+        INC     HL
+        CP      0Dh
+        JR      Z,ENTER
+        PUSH    HL
+        CALL    PV1
+        DB      UPCRT
+        POP     HL
+        JR      NEXT
+ENTER:  LD      HL,(OLDTAB)     ; Tabelle zurück - weitere Eingaben von der Tastatur
+        LD      (SUTAB),HL
+        LD      (IX+13),0Dh     ; ENTER als gedrückte Taste vormerken
+        SET     0,(IX+8)
+        LD      HL,(OLDINL)     ; ursprüngliches INLIN übernimmt die Zeile vom Bildschirm
+        JP      (HL)
+
+OLDTAB: DW      0               ; ursprüngliche UP-Tabelle
+OLDINL: DW      0               ; ursprüngliches INLIN
+
+LINE:                           ; RUN-Zeile (vom PC angehängt)
@@ -0,0 +1,172 @@
+; Stub, der auf Kanal 2 des M003 in Slot 8 eine Duplex-Routine mit 57600 Baud anbietet
+; und die empfangenen Daten anschließend RLE-entpackt (Variante des Polling_ESC-T-Stubs)
+; Nach seinem Start wartet der Stub wie CAOS-Duplex auf ESC-T
+; -> 1B 54 <adrL> <adrH> <lenL> <lenH> <Daten... len Bytes>
+; Die Daten sind ein gepackter Strom:
+; -> <zielL> <zielH> <Token...> 00
+;    Token 01h..7Fh: n Bytes folgen unverändert
+;    Token 80h..FFh: das folgende Byte wird (n-7Eh)-mal geschrieben (2..129)
+;    Token 00h     : Ende
+; Entpackt wird vorwärts von der Ladeadresse zur Zieladresse.
+; Die Gegenstelle legt die Ladeadresse so, dass der Schreibzeiger den Lesezeiger
+; nie überholt (Entpacken "in place" am Ende des Zielbereichs).
+; Er kehrt danach zurück und schaltet die "normale" CAOS-Duplex-Routine (1200 Baud) wieder ein
+;
+; der Stub kann initial mit der CAOS-Duplex-Routine per ESC-T an seine Adresse 
+; geladen werden und per ESC-U gestartet werden.
+;
+; Vor dem ESC-T an den Stub muss die Datenrate der Gegenstelle auf 57600 Baud gestellt werden.
+; Nach der Datenübertragung muss die Gegenstelle zurück auf 1200 Baud schalten und
+; die Dauer des Entpackens abwarten, bevor sie weitere Zeichen sendet
+
+        ORG     0200h
+
+START:  ; vollständige Registersicherung (inkl. Shadow + IX/IY)
+        PUSH    AF
+        PUSH    BC
+        PUSH    DE
+        PUSH    HL
+        PUSH    IX
+        PUSH    IY
+
+        EX      AF,AF'
+        PUSH    AF
+        EXX
+        PUSH    BC
+        PUSH    DE
+        PUSH    HL
+        EXX
+        EX      AF,AF'
+
+        DI                      ; kein EI am Ende (Stub läuft im CAOS-ISR-Kontext)
+
+        CALL    SETRUN          ; RUN-Konfig
+        CALL    RECV_ESCT       ; ESC 'T' empfangen und an Ladeadresse schreiben (HL = Ladeadresse)
+        PUSH    HL
+        CALL    SETCAOS         ; zurück auf CAOS-Konfig
+        POP     HL
+        CALL    UNPACK          ; gepackte Daten ab Ladeadresse an die Zieladresse entpacken
+
+        ; vollständige Registerwiederherstellung (umgekehrte Reihenfolge)
+        EXX
+        POP     HL
+        POP     DE
+        POP     BC
+        EXX
+
+        EX      AF,AF'
+        POP     AF
+        EX      AF,AF'
+
+        POP     IY
+        POP     IX
+        POP     HL
+        POP     DE
+        POP     BC
+        POP     AF
+        RET
+
+; Protokoll: 1B 54 <adrL><adrH><lenL><lenH><daten...>
+RECV_ESCT:
+WAIT_ESC:
+        CALL    GETBYTE
+        CP      1Bh
+        JR      NZ,WAIT_ESC
+        CALL    GETBYTE
+        CP      54h             ; 'T'
+        JR      NZ,WAIT_ESC
+
+        CALL    GETBYTE         ; adrL
+        LD      L,A
+        CALL    GETBYTE         ; adrH
+        LD      H,A
+        PUSH    HL              ; Ladeadresse merken
+
+        CALL    GETBYTE         ; lenL
+        LD      C,A
+        CALL    GETBYTE         ; lenH
+        LD      B,A
+
+LOOP:   LD      A,B
+        OR      C
+        JR      Z,RECV_END
+
+        CALL    GETBYTE
+        LD      (HL),A
+        INC     HL
+        DEC     BC
+        JR      LOOP
+
+RECV_END:
+        POP     HL              ; HL = Ladeadresse
+        RET
+
+; Entpacken: HL = gepackter Strom (beginnt mit der Zieladresse)
+UNPACK: LD      E,(HL)          ; zielL
+        INC     HL
+        LD      D,(HL)          ; zielH
+        INC     HL
+UNP_NEXT:
+        LD      A,(HL)          ; Token
+        INC     HL
+        OR      A
+        RET     Z               ; 00h = Ende
+        JP      M,UNP_FILL
+        LD      C,A             ; 01h..7Fh: n Bytes kopieren
+        LD      B,0
+        LDIR
+        JR      UNP_NEXT
+UNP_FILL:
+        SUB     7Eh             ; 80h..FFh: Wiederholungen 2..129
+        LD      B,A
+        LD      A,(HL)          ; Füllbyte
+        INC     HL
+UNP_FLP:
+        LD      (DE),A
+        INC     DE
+        DJNZ    UNP_FLP
+        JR      UNP_NEXT
+
+; DART-B Status (0Bh) pollen, bei RX-ready Daten aus 09h lesen
+GETBYTE:
+        IN      A,(0Bh)
+        BIT     0,A
+        JR      Z,GETBYTE
+        IN      A,(09h)
+        RET
+
+; --- Konfigurationen (Tabellen + OTIR) ---
+
+SETRUN: LD      HL,RUN_CTC
+        CALL    APPLY_CTC
+        LD      HL,RUN_SIO
+        CALL    APPLY_SIO
+        RET
+
+SETCAOS:
+        LD      HL,CAOS_CTC
+        CALL    APPLY_CTC
+        LD      HL,CAOS_SIO
+        CALL    APPLY_SIO
+        RET
+
+APPLY_CTC:
+        LD      C,0Dh
+        LD      B,2
+        OTIR
+        RET
+
+APPLY_SIO:
+        LD      C,0Bh
+        LD      B,0Bh
+        OTIR
+        RET
+
+; Tabellen
+;RUN_CTC:  DB 47h,17h ; 2400
+;RUN_CTC:  DB 47h,0Bh ; 4800
+RUN_CTC:  DB 47h,1h
+RUN_SIO:  DB 18h,02h,0E2h,14h,44h,03h,0E1h,05h,0EAh,11h,18h
+
+CAOS_CTC: DB 47h,2Eh
+CAOS_SIO: DB 18h,02h,0E2h,14h,44h,03h,0E1h,05h,0EAh,11h,18h
@@ -0,0 +1,173 @@
+; Residenter Schnelllader (Session-Stub) auf Kanal 2 des M003 in Slot 8 mit 57600 Baud
+; Im Gegensatz zu Polling_ESC-T bleibt der Stub nach einem ESC-T in der schnellen
+; Konfiguration und wartet auf weitere Kommandos:
+; -> 1B 54 <adrL> <adrH> <lenL> <lenH> <Daten... len Bytes>   Daten an adr schreiben (ESC-T)
+; -> 1B 46 <adrL> <adrH> <lenL> <lenH> <Wert>                 Bereich mit Wert füllen (ESC-F)
+; -> 1B 55 <adrL> <adrH>                                        zurück auf CAOS-Konfig und adr aufrufen (ESC-U)
+; -> 1B 51                                                      zurück auf CAOS-Konfig (ESC-Q)
+; Andere Zeichen werden ignoriert.
+; Nach ESC-U und ESC-Q schaltet der Stub die "normale" CAOS-Duplex-Routine (1200 Baud) wieder ein
+; und kehrt zurück (bei ESC-U erst, wenn das aufgerufene Programm zurückkehrt)
+;
+; der Stub kann initial mit der CAOS-Duplex-Routine per ESC-T an seine Adresse 
+; geladen werden und per ESC-U gestartet werden.
+;
+; Vor dem ersten Kommando an den Stub muss die Datenrate der Gegenstelle auf 57600 Baud gestellt werden.
+; Nach ESC-U oder ESC-Q muss die Gegenstelle zurück auf 1200 Baud schalten.
+; Nach ESC-F muss die Gegenstelle die Dauer des Füllens abwarten, bevor sie weitere Zeichen sendet
+
+        ORG     0BF00h
+
+START:  ; vollständige Registersicherung (inkl. Shadow + IX/IY)
+        PUSH    AF
+        PUSH    BC
+        PUSH    DE
+        PUSH    HL
+        PUSH    IX
+        PUSH    IY
+
+        EX      AF,AF'
+        PUSH    AF
+        EXX
+        PUSH    BC
+        PUSH    DE
+        PUSH    HL
+        EXX
+        EX      AF,AF'
+
+        DI                      ; kein EI am Ende (Stub läuft im CAOS-ISR-Kontext)
+
+        CALL    SETRUN          ; RUN-Konfig
+
+; Kommandoschleife: ESC <Kommando> ...
+CMD_LOOP:
+        CALL    GETBYTE
+        CP      1Bh
+        JR      NZ,CMD_LOOP
+        CALL    GETBYTE
+        CP      54h             ; 'T'
+        JR      Z,CMD_T
+        CP      46h             ; 'F'
+        JR      Z,CMD_F
+        CP      55h             ; 'U'
+        JR      Z,CMD_U
+        CP      51h             ; 'Q'
+        JR      NZ,CMD_LOOP
+
+        CALL    SETCAOS         ; ESC-Q: zurück auf CAOS-Konfig
+
+EXIT:   ; vollständige Registerwiederherstellung (umgekehrte Reihenfolge)
+        EXX
+        POP     HL
+        POP     DE
+        POP     BC
+        EXX
+
+        EX      AF,AF'
+        POP     AF
+        EX      AF,AF'
+
+        POP     IY
+        POP     IX
+        POP     HL
+        POP     DE
+        POP     BC
+        POP     AF
+        RET
+
+; ESC-T: Daten empfangen und an adr schreiben
+CMD_T:  CALL    GETADRLEN
+T_LOOP: LD      A,B
+        OR      C
+        JR      Z,CMD_LOOP
+
+        CALL    GETBYTE
+        LD      (HL),A
+        INC     HL
+        DEC     BC
+        JR      T_LOOP
+
+; ESC-F: len Bytes ab adr mit Wert füllen
+CMD_F:  CALL    GETADRLEN
+        CALL    GETBYTE         ; Wert
+        LD      E,A
+        LD      A,B
+        OR      C
+        JR      Z,CMD_LOOP
+        LD      (HL),E
+        DEC     BC
+        LD      A,B
+        OR      C
+        JR      Z,CMD_LOOP
+        LD      D,H
+        LD      E,L
+        INC     DE
+        LDIR
+        JR      CMD_LOOP
+
+; ESC-U: zurück auf CAOS-Konfig und adr aufrufen (wie CAOS-Duplex)
+CMD_U:  CALL    GETBYTE         ; adrL
+        LD      L,A
+        CALL    GETBYTE         ; adrH
+        LD      H,A
+        PUSH    HL
+        CALL    SETCAOS
+        POP     HL
+        CALL    JP_HL
+        JR      EXIT
+
+JP_HL:  JP      (HL)
+
+; HL = adr, BC = len
+GETADRLEN:
+        CALL    GETBYTE         ; adrL
+        LD      L,A
+        CALL    GETBYTE         ; adrH
+        LD      H,A
+        CALL    GETBYTE         ; lenL
+        LD      C,A
+        CALL    GETBYTE         ; lenH
+        LD      B,A
+        RET
+
+; DART-B Status (0Bh) pollen, bei RX-ready Daten aus 09h lesen
+GETBYTE:
+        IN      A,(0Bh)
+        BIT     0,A
+        JR      Z,GETBYTE
+        IN      A,(09h)
+        RET
+
+; --- Konfigurationen (Tabellen + OTIR) ---
+
+SETRUN: LD      HL,RUN_CTC
+        CALL    APPLY_CTC
+        LD      HL,RUN_SIO
+        CALL    APPLY_SIO
+        RET
+
+SETCAOS:
+        LD      HL,CAOS_CTC
+        CALL    APPLY_CTC
+        LD      HL,CAOS_SIO
+        CALL    APPLY_SIO
+        RET
+
+APPLY_CTC:
+        LD      C,0Dh
+        LD      B,2
+        OTIR
+        RET
+
+APPLY_SIO:
+        LD      C,0Bh
+        LD      B,0Bh
+        OTIR
+        RET
+
+; Tabellen
+RUN_CTC:  DB 47h,1h
+RUN_SIO:  DB 18h,02h,0E2h,14h,44h,03h,0E1h,05h,0EAh,11h,18h
+
+CAOS_CTC: DB 47h,2Eh
+CAOS_SIO: DB 18h,02h,0E2h,14h,44h,03h,0E1h,05h,0EAh,11h,18h
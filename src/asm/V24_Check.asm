@@ -0,0 +1,58 @@
+; Prüfprogramm für die Kalibrierung der Turbo-Datenrate (KC_V24_Transfer_BaudLadder)
+; Prüft ein per Stub geladenes Testmuster, zeigt das Ergebnis auf dem Bildschirm an
+; und meldet es über die V24 (Kanal 2 des M003) an die Gegenstelle:
+; -> 'O' Muster fehlerfrei, 'E' Muster fehlerhaft
+;
+; Testmuster: Byte[i] = (i low) XOR (i high) XOR Kennung
+; Die Gegenstelle setzt vor jeder Stufe die Kennung (Operand bei START+12),
+; damit ein Muster aus einer vorherigen Stufe nicht als gültig erkannt wird.
+; Musteradresse (START+1) und Musterlänge (START+4) können ebenfalls gepatcht werden.
+;
+; Das Programm wird nach der Musterübertragung (wieder mit 1200 Baud) per ESC-U gestartet.
+
+        ORG     0300h
+
+START:  LD      HL,0400h        ; Musteradresse
+        LD      BC,1000h        ; Musterlänge
+        LD      DE,0000h        ; Position im Muster
+CHKLOOP:
+        LD      A,E
+        XOR     D
+        XOR     00h             ; Kennung der Stufe
+        CP      (HL)
+        JR      NZ,FAIL
+        INC     HL
+        INC     DE
+        DEC     BC
+        LD      A,B
+        OR      C
+        JR      NZ,CHKLOOP
+
+        LD      A,'O'
+        CALL    ANSWER
+        PUSH    IX
+        LD      IX,01F0h        ; CAOS-Arbeitszellen für PV1
+        CALL    0F003h          ; PV1
+        DB      23h             ; OSTR
+        DB      'V24-Test OK',0Dh,0Ah,0
+        POP     IX
+        RET
+
+FAIL:   LD      A,'E'
+        CALL    ANSWER
+        PUSH    IX
+        LD      IX,01F0h
+        CALL    0F003h
+        DB      23h
+        DB      'V24-Test FEHLER',0Dh,0Ah,0
+        POP     IX
+        RET
+
+; Zeichen in A über DART-B senden (Sendepuffer leer abwarten)
+ANSWER: LD      C,A
+TXWAIT: IN      A,(0Bh)
+        BIT     2,A
+        JR      Z,TXWAIT
+        LD      A,C
+        OUT     (09h),A
+        RET
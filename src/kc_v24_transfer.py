@@ -8,60 +8,45 @@
 # python -m PyInstaller --noconfirm --clean --onefile --windowed --name KC-V24-Transfer_win7 --paths src --add-data "src\assets;assets" --add-data "src\bin;bin"  --icon "src\assets\kc85logo.ico" src\kc_v24_transfer.py
 from __future__ import annotations 
 
+import sys
+
+# Kommandozeilenbetrieb ohne Tk: python -m kc_v24_transfer send <datei> --port ... (siehe kc_v24_transfer_cli)
+if __name__ == "__main__" and sys.argv[1:2] and sys.argv[1] in ("send", "info", "watch", "-h", "--help"):
+    from kc_v24_transfer_cli import main
+    sys.exit(main(sys.argv[1:]))
+
 import tkinter as tk
 from tkinter import filedialog, messagebox
 from tkinter import font as tkfont
-from pathlib import Path
-import sys
-import configparser
 import serial
 import time
 import os
 import ctypes
-import threading
-import copy
 import unicodedata
 import math
+import queue
 from collections import deque
 from datetime import datetime
-from typing import List, Optional
+from typing import Optional
 from serial.tools import list_ports
 
 import kc_v24_transfer_gui as gui
 
 from kc_v24_transfer_kcfileformattools import ParseResult
 
-from kc_v24_transfer_kcfileformattools import KC_V24_Transfer_FileFormatTools
 from kc_v24_transfer_basicdetokenizer import KC_V24_Transfer_BASICdetokenizer
 #from kc_v24_transfer_kcfileformattools import ParseResult
 from kc_v24_transfer_kcjob import KC_Job
+from kc_v24_transfer_bytekernels import KC_V24_Transfer_ByteKernels
+from kc_v24_transfer_baudladder import KC_V24_Transfer_BaudLadder
+from kc_v24_transfer_session import KC_V24_Transfer_Session, ProcessingResult, JobEvent
 
-from enum import Enum, auto
-
-class ProcessingResult(Enum):
-    DONE = auto()
-    CANCELED = auto()
-    FAILED = auto()
-    
-class KC_V24_TransferApp:
-    
-    APP_NAME = "KC-V24-Transfer"
-    VERSION  = "1.5"
-    
-    BASE_DIR      = Path(__file__).resolve().parent
+class KC_V24_TransferApp(KC_V24_Transfer_Session):
     
     if os.name == "nt":
-        _cfg_root = os.environ.get("LOCALAPPDATA") or os.environ.get("APPDATA")
-        CONFIG_DIR = Path(_cfg_root) / APP_NAME if _cfg_root else (BASE_DIR / APP_NAME)
-        ctypes.windll.shell32.SetCurrentProcessExplicitAppUserModelID(APP_NAME)
-        
-    else:
-        _xdg = os.environ.get("XDG_CONFIG_HOME")
-        CONFIG_DIR = (Path(_xdg) if _xdg else (Path.home() / ".config")) / APP_NAME
+        ctypes.windll.shell32.SetCurrentProcessExplicitAppUserModelID(KC_V24_Transfer_Session.APP_NAME)
 
-    CONFIG_PATH   = CONFIG_DIR / (APP_NAME + ".ini")
-    ASSET_PATH    = BASE_DIR / "assets"
-    BIN_PATH      = BASE_DIR / "bin"
+    ASSET_PATH    = KC_V24_Transfer_Session.BASE_DIR / "assets"
     
     # Zeichen ersetzen für Inhalte aus dem Clipboard
     UNICODE_CLIPBOARD_MAP = str.maketrans({
@@ -125,6 +110,7 @@ class KC_V24_TransferApp:
     }    
         
     def __init__(self, root):
+        super().__init__()   # Schnittstelle, Zustand, Jobs, Konfigurationswerte (KC_V24_Transfer_Session)
 
         # -------------------------------------------------------------------------
         # GUI-Texte
@@ -147,97 +133,29 @@ class KC_V24_TransferApp:
         except Exception as e:
             print(f"Logo konnte nicht geladen werden: {e}")
         
-        self.com_port           = None            # hält das COM-Portobjekt
-        self.com_port_name      = ""              # Name des aktuellen COM-Ports (vom COM-Portobjekt)
         self.com_port_menu_name = tk.StringVar(value="") # Name der aktuellen COM-Port-Menüauswahl in self.port_option
-
         self._keybmode_enabled  = False           # (Tastaturnmodus) True: Zeicheneingaben werden (in trans_state "KEY") an den KC weitergeleitet
-        self.trans_state        = None            # hält den aktuellen Status des Transfersystems
-                                                  # None:    uninitialisiert
-                                                  # "BROKE": nach Abgebrochener Binärübertragung - der KC wartet dann auf seiner Seite auf Abschluss, bis er wieder in den Tastaturmodus wechseln kann 
-                                                  # "BIN":   im ESC-U/ESC-T-Polling-Modus
-                                                  # "KEY":   Interupt-Modus (Tastatureingaben)
-
-        self.pr                  = None           # hält das ParseResult der zuletzt geladenen Datei
-        self.file_name           = None           # nur Dateiname ohne Pfad
-         
-        self.pr_bascoder         = None           # hält das ParseResult der geladenen Bascoderdatei
-        self.file_name_bascoder  = None           # Dateiname der geladenen Bascoder-Datei
-        
-        # die stubs schalten die Schnittstellengeschwindigkeit zum Laden des Hauptprogramms auf 2400 Baud
-        # je nach Ladeadresse des Hauptprogramms wird ein stub vorgeladen, der ausserhalb des Speicherbereichs liegt
-        
-        self.use_turboload       = True           # wenn True, wird vor Binärübertragungen ein Stub mit 2400 Baud-Pollingroutine geladen
-        self.pr_0200stub         = None           # hält ein parseResult mit den Binärdaten des Schnittstellen-Umschalters auf 2400 Baud, der unten geladen wird
-        self.file_name_0200stub  = None           # Dateiname des Umschalter-bins
-        self.pr_BF00stub         = None           # hält ein parseResult mit den Binärdaten des Schnittstellen-Umschalters auf 2400 Baud, der oben geladen wird
-        self.file_name_BF00stub  = None           # Dateiname des Umschalter-bins
-        
-        self.last_basicodelinenumber = None       # die letzte Zeilennummer des BASICODE-Programmes
 
         self._rlz_hist_seconds = deque(maxlen=20) # Hilfsvariable zur Glättung der Restlaufzeitanzeige
 
         # werden in update_gui() ausgewertet
         self.gui_sendbutton_state = False          # Aktueller Soll-Status des Senden-Schalters False: deaktiviert, True: aktiviert
         self.gui_sendbutton_text  = self.SBTN_SEND # Aktueller Senden-Modus der App 0: Übertragen, 1: Abbruch
+        self._gui_shown: dict = {}                 # zuletzt angezeigte Werte je Widget (Statusfeld, Fortschrittsbalken, Tastaturschalter) - neu gezeichnet wird nur bei Änderung
 
-        
-        # -------------------------------------------------------------------------
-        # Zeugs für Nebenläufigkeit
-        # -------------------------------------------------------------------------
-        self.jobs: List[KC_Job] = []             # Liste der aktuellen Jobs verschiedenen Status
-        self._worker: Optional[threading.Thread] = None
-        self._current_job: Optional[KC_Job]      = None
-        self._stop_all        = threading.Event()
-        self._lock = threading.Lock()            # der Lock für das Theading
-    
-        self._processing_done = threading.Event()
-        self._processing_result: ProcessingResult | None = None
+        # Fortschritt der Übertragung: die JobEngine legt ihre Ereignisse in die Queue, _drain_events() holt sie im GUI-Thread ab
+        self._gui_events: queue.SimpleQueue = queue.SimpleQueue()
+        self._gui_drain_id  = None                 # after()-Id des nächsten _drain_events()
+        self._gui_ended     = False                # END-Ereignis der Engine empfangen
 
-        self._jobssent              = 0          # Anzahl der durch bereits abgearbeitete Jobs gesendeter Bytes
-        self._jobstotal             = 0          # Anzahl der durch alle Jobs zu sendender Bytes
-        self._currentjobnr          = 0          # Nummer aktuell abgearbeiteter Jobs
-        self._totaljobcount         = 0          # Anzahl aller vorhandenen Jobs
-
-        
         
         # -------------------------------------------------------------------------
-        # Timeout-Überwachung (COM-Port / Jobs)
+        # Timeout-Überwachung (COM-Port / Jobs) - die Deadlines prüft die JobEngine
         # -------------------------------------------------------------------------
-        # self.timeout_comport / self.timeout_job werden extern gesetzt (Sekunden, None = deaktiviert)
-        self.timeout_comport: int | None = 10    # sendende Jobs (job.total > 0): max. Stillstand ohne Fortschritt
-        self.timeout_job: int | None     = 10    # sonstige Jobs (job.total == 0) ohne askstart: max. Laufzeit
-
-        # interne Überwachung (GUI-Thread, time.monotonic())
-        self._watch_job: KC_Job | None             = None
-        self._watch_job_started_mono: float | None = None
-        self._watch_last_sent: int                 = 0
-        self._watch_last_sent_mono: float | None   = None
-
         self._timeout_handled: bool                = False
-        self._timeout_status_text: str | None      = None
+        self._timeout_status_text: str | None      = None   # wird im Thread der Engine gesetzt (_on_engine_event)
+        self.engine.subscribe(self._on_engine_event)
 
-        # -------------------------------------------------------------------------
-        # Übertragungs-Konfiguration für Übertragungen im Keyboard-Übertragungsmodus
-        # -------------------------------------------------------------------------
-        self.textconfig_showkonfigdialog  = True    # der Textkonfigdialog soll bei der nächsten übertragung wieder angezeigt werden
-        self.textconfig_linewidth         = 40      # nach wievielen Zeichen wird die Zeile umgebrochen und gescrollt (40 - BASIC-Promptlänge)
-        self.textconfig_promptwidth       = 1       # wieviele Zeichen nimmt der BASIC-Prompt in Anspruch
-        self.textconfig_init_delay        = 300     # ms Wartezeit nach dem init der Schnittstelle
-        self.textconfig_init_clsdelay     = 600     # ms Wartezeit bis der Eingabeprompt nach einem CLS bereit ist
-        self.textconfig_init_basic1delay  = 700     # ms Wartezeit nach einem Start von BASIC in CAOS
-        self.textconfig_init_basic2delay  = 3800    # ms Wartezeit nach einem Start von BASIC (EIngabe von "MEMORY END")
-        self.textconfig_init_rebasicdelay = 300     # ms Wartezeit nach einem Start von BASIC in CAOS
-        self.textconfig_char_delay        = 0       # ms warten nach jeder Zeicheneingabe
-        self.textconfig_linescroll_delay  = 300     # nach Zeilenumbruch (ms Zeit, die der Rechner zum Scrollen einer Zeile braucht)
-        self.textconfig_process_delay     = 200     # nach Zeilenübergabe (ms Zeit, die der Rechner zur Verarbeitung der Eingabe braucht)
-        self.textconfig_command_addition  = 80      # zusätzliche Zeit für jeden zusätzlichen Befehl in der Zeile (es wird stumpf nach Doppelpunkten gesucht)
-        self.textconfig_linethrottle      = 0.4     # 0.4 = 400ms/1000 Zeilen - wird mit jeder zusätzlichen Zeile Programmcode dem Zeilendelay hinzugefügt - die BASIC Befehlsübernahme wird mit zunehmender Zeilenzahl langsamer
-        self.textconfig_lines             = 32      # maximal darstellbare Zeilen auf dem Bildschirm
-        self.textconfig_basicode_delay    = 50      # wenn Basicode schon im Speicher ist, wird der BASIC-Editor langsamer
-        self.textconfig_dim_ref_delay     = 40      # (20 gemessen)  DIM-Sonderbehandlung - dim_ref:  Zeit für Zugriff auf eine Feldvariable
-        self.textconfig_dim_unit_delay    = 0.2     # (0.3 gemessen) DIM-Sonderbehandlung - dim_unit: Zeit für Deklaration EINER einzelnen Feldvariable
-        self.textconfig_var_ref_delay     = 50      # Variablenaufruf-Sonderbehandlung - Zeit für Referenzierung einer Variable
          
         # -------------------------------------------------------------------------
         # UI bauen
@@ -268,6 +186,8 @@ class KC_V24_TransferApp:
         self._context_menu.add_command(label="Einfügen (Code) <STRG+V>",         command=self.on_pastebasic)
         self._context_menu.add_command(label="Einfügen (Code langsam) <STRG+B>", command=lambda: self.on_pastebasic(slow=True))
         self._context_menu.add_command(label="Einfügen (Text) <UMSCH+STRG+V>",  command=self.on_pastetext)
+        self._context_menu.add_separator()
+        self._context_menu.add_command(label="Turbo-Datenrate kalibrieren ...",  command=self.on_calibrate_clicked)
         # Rechtsklick global abfangen (auch wenn Fokus in einem anderen Widget liegt)
         self.root.bind_all("<Button-3>", self._show_context_menu, "+")           # Windows/Linux
         self.root.bind_all("<Button-2>", self._show_context_menu, "+")           # macOS (je nach System)
@@ -369,254 +289,144 @@ class KC_V24_TransferApp:
     # Threading-Zeugs
     ##################################################################################################
     
-    # threadsicheres Setzen der Variable (aus den Jobs)
-    def set_trans_state(self, value: str) -> None:
-        with self._lock:
-            self.trans_state = value  
-             
-    # threadsicheres Lesen der Variable (aus den Jobs)
-    def get_trans_state(self) -> str:
-        with self._lock:
-            return self.trans_state
-            
-    # threadsicheres Setzen der Variable (aus den Jobs)
-    def set_last_basicodelinenumber(self, value: str | None) -> None:
-        with self._lock:
-            self.last_basicodelinenumber = value
-            print(f"set_last_basicodelinenumber: {value}")
-            
-    # threadsicheres Holen der Variable (in die Jobs)
-    def get_last_basicodelinenumber(self) -> str | None:
-        with self._lock:
-            return self.last_basicodelinenumber
-    
+    # Rückfragen aus KC_V24_Transfer_Session / KC_Job als Dialoge
+    def ask_yes_no(self, title: str, text: str, default: bool = True) -> bool:
+        return messagebox.askyesno(title, text, parent=self.root, default=messagebox.YES if default else messagebox.NO)
+
+    def confirm_reset(self) -> bool:
+        dlg = gui.DualOptionsDialog(self.root, title="Achtung", text="Vor der Übertragung\n\n RESET\n\nam KC drücken!", okbuttontext="Erledigt!")
+        return bool(dlg.result)
+
+    def show_error(self, text: str) -> None:
+        messagebox.showerror("Fehler", text, parent=self.root)
+
     # startet die Abarbeitung der KC_Jobs
     def start_processing(self) -> None:
         if self._worker and self._worker.is_alive():
             return  # läuft bereits
 
-        self._stop_all.clear()
-        self._processing_done.clear()
-        self._processing_result = None
-
         # Timeout-Überwachung zurücksetzen
         self._timeout_handled = False
         self._timeout_status_text = None
-        self._watch_job = None
-        self._watch_job_started_mono = None
-        self._watch_last_sent = 0
-        self._watch_last_sent_mono = None
-
-        self._jobssent      = 0
-        self._jobstotal     = 0
-        self._currentjobnr  = 1
-        self._totaljobcount = 0
-        for job in self.jobs:
-            self._jobstotal     += job.total
-            self._totaljobcount += 1
 
         self._keybmode_enabled = False
         self.jobs_starttime = datetime.now()
         self._rlz_hist_seconds.clear()
 
-        # WICHTIGER FUNKTIONSAUFRUF: separater Worker-Thread startet die Abarbeitung
-        self._worker = threading.Thread(target=self._run_jobs_sequentially, daemon=True)
-        self._worker.start()
-        
-        self._poll_status()
-    
-    # wird nebenläufig ausgeführt    
-    def _run_jobs_sequentially(self) -> None:
-        """
-        Läuft im Worker-Thread:
-        - nimmt Job 1
-        - führt startjob() aus (blockierend)
-        - nach DONE/FAIL -> nächster Job
-        """
-        any_failed = False
-        try:
-            for job in self.jobs:
-                if self._stop_all.is_set():
-                    break
-
-                self._current_job = job
-                job.startjob()  # WICHTIG: Job läuft hier im Worker-Thread
-
-                """Thread-sicherer Schnappschuss für Statusabfragen im Haupt-/GUI-Thread."""
-                state, sent, _ = job.snapshot()  # liefert state/sent threadsicher
-                with self._lock:
-                    self._jobssent += self._current_job.total
-                    self._currentjobnr += 1
-                    
-                if state == KC_Job._JS_FAILED:
-                    any_failed = True
-                    print(f"any_failed {job.type}")
-                if state == KC_Job._JS_NOAFTERASK:   # Startfrage wurde mit nein beantwortet
-                    break
-
-        finally:
-            self._current_job = None  # wird bei Ihnen ohnehin am Ende gesetzt
+        # Ereignisse einer vorigen Übertragung verwerfen
+        while not self._gui_events.empty():
+            self._gui_events.get_nowait()
+        self._gui_ended = False
 
-            if self._stop_all.is_set():
-                self._processing_result = ProcessingResult.CANCELED
-            elif any_failed:
-                self._processing_result = ProcessingResult.FAILED
-            else:
-                self._processing_result = ProcessingResult.DONE
+        self.start_jobs()   # JobEngine (KC_V24_Transfer_Session)
 
-            self._processing_done.set()
-            self.jobs.clear()
+        if self._gui_drain_id is None:
+            self._drain_events()
     
-    # holt Informationen aus den nebenläufigen Jobs    
-    def _poll_status(self) -> None:
-        job = self._current_job
-
-        # Keyboardschalter aktualisieren
-        self._update_keybmode_button()
-
-        self.jobs_currenttime = datetime.now()
-        now_mono = time.monotonic()
-
-        if job is None:
-            # Überwachung zurücksetzen, wenn kein Job aktiv ist
-            self._watch_job = None
-            self._watch_job_started_mono = None
-            self._watch_last_sent = 0
-            self._watch_last_sent_mono = None
-
-            # Ende nur dann, wenn Worker wirklich fertig ist
-            if self._worker and not self._worker.is_alive():
-                res = self._processing_result
-
-                if res == ProcessingResult.CANCELED:
-                    self.set_transfer_status("Übertragung abgebrochen")
-                elif res == ProcessingResult.FAILED:
-                    self.set_transfer_status("Übertragung fehlgeschlagen")
-                else:
-                    self.set_transfer_status("Übertragung abgeschlossen")
+    # Ereignisse der JobEngine (läuft im Thread der Engine - hier keine Tk-Aufrufe)
+    def _on_engine_event(self, event: JobEvent) -> None:
+        if event.kind == self.engine._EV_TIMEOUT:
+            self._timeout_status_text = event.text
+        self._gui_events.put(event)
+
+    _GUI_IDLE_MS = 250   # Abfrageintervall der Ereignis-Queue, solange keine Ereignisse eintreffen
+
+    def _gui_frame_ms(self) -> int:
+        """Mindestabstand zweier Aktualisierungen der Fortschrittsanzeige (gui_max_fps)."""
+        return max(10, int(1000 / max(1, self.gui_max_fps)))
+
+    # einziger Tk-Callback während einer Übertragung: holt die Ereignisse der Engine ab und zeichnet
+    # höchstens gui_max_fps mal pro Sekunde neu - ohne Ereignisse (z.B. in den Wartezeiten einer
+    # Tastaturübertragung) nur alle _GUI_IDLE_MS ms ein Blick in die Queue
+    def _drain_events(self) -> None:
+        self._gui_drain_id = None
+
+        latest = None
+        while True:
+            try:
+                event = self._gui_events.get_nowait()
+            except queue.Empty:
+                break
+            if event.kind == self.engine._EV_END:
+                self._gui_ended = True
+            else:
+                latest = event
 
-                self.set_controls_send(text=self.SBTN_SEND, send_enabled=True)
+        # Deadline überschritten (Engine hat abgebrochen und den Port geschlossen)
+        if self._timeout_status_text and not self._timeout_handled:
+            self.on_transfer_timeout()
 
-                self._keybmode_enabled = True   # remote keyboard einschalten
-                self._update_keybmode_button()
+        if self._gui_ended and not (self._worker and self._worker.is_alive()):
+            self._on_processing_finished()
+            return
 
-                self.jobs_currenttime = None
-                self.jobs_starttime = None
+        if latest is not None:
+            self._render_progress(latest)
 
-                # Timeout-Status zurücksetzen (für die nächste Übertragung)
-                self._timeout_handled = False
-                self._timeout_status_text = None
+        delay = self._gui_frame_ms() if (latest is not None or self._gui_ended) else self._GUI_IDLE_MS
+        self._gui_drain_id = self.root.after(delay, self._drain_events)
 
-                return  # wichtig: kein weiteres after()
-            else:
-                self.root.after(100, self._poll_status)
-                return
+    def _render_progress(self, event: JobEvent) -> None:
+        """Fortschrittsanzeige aus dem letzten Ereignis der Engine."""
+        self.jobs_currenttime = datetime.now()
+        cancelable = event.job.snapshot()[2] if event.job is not None else False
 
-        state, sent, cancelable = job.snapshot()
-
-        # ---------------------------------------------------------------------
-        # Timeout-Prüfung:
-        # - sendende Jobs (job.total > 0): Fortschritt über "sent"
-        # - Jobs ohne Nutzdaten (job.total == 0) und askstart=False: Laufzeit
-        # ---------------------------------------------------------------------
-        if job is not self._watch_job:
-            self._watch_job = job
-            self._watch_job_started_mono = now_mono
-            self._watch_last_sent = sent
-            self._watch_last_sent_mono = now_mono
-        elif sent != self._watch_last_sent:
-            self._watch_last_sent = sent
-            self._watch_last_sent_mono = now_mono
-
-        if (not self._timeout_handled) and state == KC_Job._JS_RUNNING:
-            if (
-                self.timeout_comport is not None
-                and self.timeout_comport > 0
-                and job.total > 0
-                and self._watch_last_sent_mono is not None
-                and (now_mono - self._watch_last_sent_mono) > self.timeout_comport
-            ):
-                self.on_comport_timeout(job, now_mono - self._watch_last_sent_mono)
-                cancelable = False
-
-            elif (
-                self.timeout_job is not None
-                and self.timeout_job > 0
-                and job.total <= 0
-                and (not getattr(job, "askstart", False))
-                and self._watch_job_started_mono is not None
-                and (now_mono - self._watch_job_started_mono) > self.timeout_job
-            ):
-                self.on_job_timeout(job, now_mono - self._watch_job_started_mono)
-                cancelable = False
-
-        allsent = self._jobssent + sent   # bislang über alle Jobs gesendete Datenmenge
-
-        # Nach Timeout: Status einfrieren, aber weiter pollen (damit Abschluss sauber erkannt wird)
+        # Nach Timeout: Status einfrieren, bis die Engine fertig ist
         if self._timeout_handled and self._timeout_status_text:
             self.set_transfer_status(
                 status=self._timeout_status_text,
-                sent=allsent,
-                total=self._jobstotal,
-                currentjobnr=self._currentjobnr,
-                totaljobcount=self._totaljobcount,
+                sent=event.sent,
+                total=event.total,
+                currentjobnr=event.jobnr,
+                totaljobcount=event.jobcount,
                 restlaufzeit=None,
                 cancelable=False,
             )
             self.set_controls_send(text=self.SBTN_SEND, send_enabled=False)
-            self.root.after(200, self._poll_status)
             return
 
-        rlzStr = self.get_restlaufzeit(
-            starttime=self.jobs_starttime,
-            currenttime=self.jobs_currenttime,
-            sent=allsent,
-            total=self._jobstotal,
-        )
         self.set_transfer_status(
             "Übertragung läuft",
-            allsent,
-            self._jobstotal,
-            self._currentjobnr,
-            self._totaljobcount,
-            rlzStr,
+            event.sent,
+            event.total,
+            event.jobnr,
+            event.jobcount,
+            self.get_restlaufzeit(event),
             cancelable,
+            timeprogress=(event.done_ms, event.plan_ms),
         )
         self.set_controls_send(text=self.SBTN_CANCEL, send_enabled=cancelable)
-        self.root.after(100, self._poll_status)
 
+    def _on_processing_finished(self) -> None:
+        """Abarbeitung beendet (GUI-Thread): Ergebnis anzeigen und Bedienelemente freigeben."""
+        res = self._processing_result
 
-    def stop_all(self) -> None:
-        # optional: globale Stop-Funktion
-        self._stop_all.set()
-        if self._current_job:
-            self._current_job.cancel()
+        if self._timeout_handled and self._timeout_status_text:
+            self.set_transfer_status(self._timeout_status_text)
+        elif res == ProcessingResult.CANCELED:
+            self.set_transfer_status("Übertragung abgebrochen")
+        elif res == ProcessingResult.FAILED:
+            self.set_transfer_status("Übertragung fehlgeschlagen")
+        else:
+            self.set_transfer_status("Übertragung abgeschlossen")
 
+        self.set_controls_send(text=self.SBTN_SEND, send_enabled=True)
 
-    def _interrupt_and_close_com_port(self) -> None:
-        """Versucht blockierende Schreib-/Leseoperationen zu unterbrechen und den Port zu schließen."""
-        ser = self.com_port
-        self.com_port = None  # Referenz früh lösen
+        self._keybmode_enabled = True   # remote keyboard einschalten
+        self._update_keybmode_button()
 
-        if ser is None:
-            return
+        self.jobs_currenttime = None
+        self.jobs_starttime = None
 
-        try:
-            if hasattr(ser, "cancel_write"):
-                try:
-                    ser.cancel_write()
-                except Exception:
-                    pass
-            if hasattr(ser, "cancel_read"):
-                try:
-                    ser.cancel_read()
-                except Exception:
-                    pass
-        finally:
-            try:
-                ser.close()
-            except Exception:
-                pass
+        # Timeout-Status zurücksetzen (für die nächste Übertragung)
+        self._timeout_handled = False
+        self._timeout_status_text = None
+
+    def on_transfer_timeout(self) -> None:
+        """Deadline eines Jobs überschritten (GUI-Thread): Port ist bereits geschlossen, Meldung anzeigen."""
+        if self._timeout_handled:
+            return
+        self._timeout_handled = True
 
         # GUI aktualisieren
         try:
@@ -631,36 +441,6 @@ class KC_V24_TransferApp:
             self._update_keybmode_button()
         except Exception:
             pass
-
-    def on_comport_timeout(self, job: KC_Job, idle_seconds: float) -> None:
-        """Callback bei blockierendem COM-Port (aus _poll_status(), GUI-Thread)."""
-        if self._timeout_handled:
-            return
-        self._timeout_handled = True
-        self._timeout_status_text = f"COM-Port blockiert (keine Daten seit {idle_seconds:.1f}s)"
-        self.stop_all()
-        self.set_trans_state("BROKE")
-        self._interrupt_and_close_com_port()
-        try:
-            messagebox.showerror(
-                "Fehler",
-                "Die Übertragung wurde beendet,\n"
-                "weil der COM-Port blockiert war.\n"
-                "Bitte Verbindung/Porteinstellung prüfen.",
-                parent=self.root,
-            )
-        except Exception:
-            pass
-
-    def on_job_timeout(self, job: KC_Job, run_seconds: float) -> None:
-        """Callback bei Job-Timeout (Jobs ohne Nutzdaten; askstart=False)."""
-        if self._timeout_handled:
-            return
-        self._timeout_handled = True
-        self._timeout_status_text = f"Job-Timeout (läuft seit {run_seconds:.1f}s)"
-        self.stop_all()
-        self.set_trans_state("BROKE")
-        self._interrupt_and_close_com_port()
         try:
             messagebox.showerror(
                 "Fehler",
@@ -793,8 +573,7 @@ class KC_V24_TransferApp:
         pr.format       = pr._FORMAT_RAW
         pr.transferdata = raw_kc
         
-        pr_nodata = copy.deepcopy(pr)
-        pr_nodata.transferdata = bytearray()
+        pr_nodata = pr.without_data()
         
         if self.trans_state != "KEY":
             self.jobs.append(KC_Job(parent=self, type=KC_Job._JT_STARTKEYBMODE, pr=pr_nodata))
@@ -837,8 +616,7 @@ class KC_V24_TransferApp:
         pr.format       = pr._FORMAT_RAW
         pr.transferdata = raw_kc
         
-        pr_nodata = copy.deepcopy(pr)
-        pr_nodata.transferdata = bytearray()
+        pr_nodata = pr.without_data()
         
         if self.trans_state != "KEY":
             self.jobs.append(KC_Job(parent=self, type=KC_Job._JT_STARTKEYBMODE, pr=pr_nodata))
@@ -857,10 +635,8 @@ class KC_V24_TransferApp:
         return "break"
         
 
-    def _kc_payload_from_text(self, text: str) -> bytearray:
+    def _kc_payload_from_text(self, text: str) -> bytes:
         """Wandelt Unicode-Text in KC-Tastaturcodes um (wie bei Einzeltasten)."""
-        latin2kc = KC_V24_Transfer_BASICdetokenizer._LATIN_2_KC
-
         try:
             raw = text.encode("latin-1", "strict")
         except UnicodeEncodeError:
@@ -870,20 +646,9 @@ class KC_V24_TransferApp:
             print("on_pastetext() UNICODE")
 
         # Latin-1 Bytes -> KC Bytes
-        raw_kc = bytearray()
-        for b in raw:
-            b = latin2kc.get(b, b)
-
-            # Zeilenende vereinheitlichen: \n -> überspringen (job_sendtext ignoriert 0x0A ohnehin)
-            if b == 0x0A:
-                continue
-
-            # Zulässige KC-Textbytes: CR oder 0x20..0x7F
-            if b == 0x0D or (0x20 <= b < 0x80):
-                raw_kc.append(b)
-            else:
-                # Ersatz für nicht darstellbare Bytes (z.B. 0xBD)
-                raw_kc.append(0x20)  # oder ord('?')
+        # Zeilenende vereinheitlichen: \n entfällt (job_sendtext ignoriert 0x0A ohnehin),
+        # zulässig sind CR und 0x20..0x7F, nicht darstellbare Bytes (z.B. 0xBD) werden zu Leerzeichen
+        raw_kc = KC_V24_Transfer_ByteKernels.latin_to_kc_keys(raw)
         
         return raw_kc
 
@@ -908,6 +673,8 @@ class KC_V24_TransferApp:
         can_paste = self._clipboard_has_text()
         self._context_menu.entryconfigure(0, state=("normal" if can_paste else "disabled"))
         self._context_menu.entryconfigure(1, state=("normal" if can_paste else "disabled"))
+        can_calibrate = self.checkdata is not None and self.pr_0200stub is not None
+        self._context_menu.entryconfigure(4, state=("normal" if can_calibrate else "disabled"))
 
         try:
             self._context_menu.tk_popup(event.x_root, event.y_root)
@@ -990,25 +757,26 @@ class KC_V24_TransferApp:
         def disabled(self): self.keybmode_button.configure(style="KeybDisabled.TButton", image=self._img_keyb_disabled, text="einschalten", state="normal")
         def inactive(self): self.keybmode_button.configure(style="KeybOff.TButton",      image=self._img_keyb_off,      text="aus",         state="disabled")
         
-        # während einer Datenübertragung Button disablen
-        if self._worker and self._worker.is_alive():
-            inactive(self)
-            return
-
-        # ohne com_port Button disablen
-        if self.com_port is None:
-            inactive(self)
-            return
+        # während einer Datenübertragung und ohne com_port Button disablen
+        if (self._worker and self._worker.is_alive()) or self.com_port is None:
+            mode = inactive
 
         # wenn keine Übertragung läuft
-        if self.trans_state is None:
-            off(self)
+        elif self.trans_state is None:
+            mode = off
         elif self.trans_state == "KEY":
-            on(self) if self._keybmode_enabled else off(self)
+            mode = on if self._keybmode_enabled else off
         elif self.trans_state == "BIN":
-            off(self) if self._keybmode_enabled else on(self)
+            mode = off if self._keybmode_enabled else on
         elif self.trans_state == "BROKE":
-            disabled(self)
+            mode = disabled
+        else:
+            return
+
+        # nur bei Änderung neu konfigurieren
+        if self._gui_shown.get("keyb") != mode.__name__:
+            self._gui_shown["keyb"] = mode.__name__
+            mode(self)
     
     # ------------------------ Datei laden ------------------------
     
@@ -1050,104 +818,58 @@ class KC_V24_TransferApp:
             self._update_keybmode_button()
             
     
-    def load_stubs(self) -> None:
+    def on_calibrate_clicked(self) -> None:
         """
-        Lädt die Baud-Umschaltstubs und bereitet ParseResults vor,
-        die oben oder unten im Speicherraum als Preloader geladen werden können
+        Kalibrierung der Turbo-Datenrate: alle Stufen von KC_V24_Transfer_BaudLadder nacheinander
+        mit Testmuster und Prüfprogramm durchlaufen (bis zum ersten Fehler).
+        Die höchste fehlerfreie Stufe wird für den aktuellen COM-Port gespeichert (on_calibration_step).
         """
-        try:
-        
-            # Stub für den unteren Speicherbereich
-            
-            stub_path = self.BASE_DIR / "bin" / "Polling_ESC-T_0200.bin"  # Dateiname ggf. anpassen
-            data = bytearray(stub_path.read_bytes())
-            if not data:
-                raise ValueError("200-Stub ist leer.")
-
-            pr = ParseResult()
-            pr.format = ParseResult._FORMAT_RAW
-            pr.type = ParseResult._TYPE_MC
-            pr.errorstate = False
-            pr.validstate = 0
-
-            pr.transferdata = data
-            pr.start = 0x200
-            pr.end = pr.start + len(pr.transferdata)
-
-            pr.callp = pr.start
-            pr.callh = pr.start
-            pr.callu = pr.start
-
-            self.pr_0200stub = pr
-
-            # Stub für den oberen Speicherbereich
-
-            stub_path = self.BASE_DIR / "bin" / "Polling_ESC-T_BF00.bin"  # Dateiname ggf. anpassen
-            data = bytearray(stub_path.read_bytes())
-            if not data:
-                raise ValueError("BF00-Stub ist leer.")
-
-            pr = ParseResult()
-            pr.format = ParseResult._FORMAT_RAW
-            pr.type = ParseResult._TYPE_MC
-            pr.errorstate = False
-            pr.validstate = 0
-
-            pr.transferdata = data
-            pr.start = 0xBF00
-            pr.end = pr.start + len(pr.transferdata)
-
-            pr.callp = pr.start
-            pr.callh = pr.start
-            pr.callu = pr.start
+        if self._worker and self._worker.is_alive():
+            return
+        if self.checkdata is None or self.pr_0200stub is None:
+            return
 
-            self.pr_BF00stub = pr
+        dlg = gui.DualOptionsDialog(self.root, title="Kalibrierung", text="Vor der Kalibrierung\n\n RESET\n\nam KC drücken!", okbuttontext="Erledigt!")
+        if dlg.result: self.trans_state = None
+        else: return
+
+        ladder     = KC_V24_Transfer_BaudLadder()
+        pr_checker = ladder.build_checker(self.checkdata)
+        pr_stub    = self.pr_0200stub
+        pr_stub_nodata = pr_stub.without_data()
+        pr_checker_nodata = pr_checker.without_data()
+
+        self._calibration_best = None
+        self.jobs = []
+        self.jobs.append(KC_Job(parent=self, type=KC_Job._JT_SENDBIN, pr=pr_stub))
+        self.jobs.append(KC_Job(parent=self, type=KC_Job._JT_SENDBIN, pr=pr_checker))
+        for nr, step in enumerate(ladder.steps(), start=1):
+            # Zeitkonstante im Stub und Kennung im Prüfprogramm setzen (mit 1200 Baud)
+            self.jobs.append(KC_Job(parent=self, type=KC_Job._JT_SENDBIN, pr=ladder.stub_ctc_patch(pr_stub, step.ctc)))
+            self.jobs.append(KC_Job(parent=self, type=KC_Job._JT_SENDBIN, pr=ladder.checker_seed_patch(pr_checker, nr)))
+            # Testmuster mit der Stufe übertragen, danach zurück auf 1200 Baud und prüfen
+            self.jobs.append(KC_Job(parent=self, type=KC_Job._JT_RUNBIN,  pr=pr_stub_nodata, set_ser_br=step.baudrate, set_ser_sb=step.stopbits, pause=100))
+            pattern_job = KC_Job(parent=self, type=KC_Job._JT_SENDBIN, pr=ladder.build_pattern(nr), set_ser_br=1200, pause=100)
+            self.jobs.append(pattern_job)
+            self.jobs.append(KC_Job(parent=self, type=KC_Job._JT_RUNCHECK, pr=pr_checker_nodata, calibration=(step, pattern_job)))
+        self.start_processing()
 
-        except Exception as e:
-            self.pr_BF00stub = None
-            self.pr_0200stub = None
-            messagebox.showerror("Fehler", f"Ein Stub konnte nicht geladen werden:\n{e}", parent=self.root)
-          
-    def load_bascoder(self):
+    def on_calibration_step(self, job: KC_Job, ok: bool) -> None:
         """
-        Die (mitgegebene) Bascoderdatei laden und bereithalten
+        Ergebnis einer Kalibrierungsstufe (aus dem Worker-Thread von _JT_RUNCHECK).
+        Die Stufen steigen an - jede fehlerfreie Stufe wird sofort als Einstellung des COM-Ports gespeichert.
         """
-        print("load_bascoder")
-        try:
-            path = str(self.BIN_PATH) + "/BAC854-5.KCB"
-            with open(path, "rb") as f:
-                filedata = bytearray(f.read())
-            if not filedata:
-                raise ValueError("Datei ist leer.")
-            # neuen Dateinamen merken
-            file_name = os.path.basename(path)
-            ft = KC_V24_Transfer_FileFormatTools()
-            pr = ft.parseBinData(filedata)  # pr ist eine Class ParseResult
-
-            print(pr)
-            if pr.errorstate:
-                #self.set_transfer_status(status="Format der Bascoder-Datei ungültig")
-                return
-
-            elif pr.validstate > 0:  # konnte geparst werden, aber es gab ein Problem mit dem Dateiformat - Sendeversuch aber möglich
-                #TODO Hinweismeldung ausgeben
-                pass
-
-            if pr.callp: pr.callu = pr.callp
-            else: pr.callu = pr.callh
-            
-            self.pr_bascoder = pr
-            
-            self.file_name_bascoder = file_name
-            
-            print(f"load_bascoder -> Bascoder-Datei \"{self.file_name_bascoder}\" geladen")
-            
-        except Exception as e:
-            self.set_controls_send(text=self.SBTN_SEND, send_enabled=False)
-            self.set_transfer_status(status="Dateiladefehler")
-            messagebox.showerror("Fehler", f"Fehler beim Laden der Datei:\n{e}")
-            print(f"load_bascoder{e}")
-
+        step, pattern_job = job.calibration
+        seconds = None
+        if pattern_job.started is not None and pattern_job.finished is not None:
+            seconds = pattern_job.finished - pattern_job.started
+        rate = f", {pattern_job.total / seconds:.0f} Bytes/s (ohne Pause/Umschaltung ~{pattern_job.total / step.bytes_per_second:.2f} s)" if seconds else ""
+        print(f"Kalibrierung: {step}: {'OK' if ok else 'FEHLER'}{rate}")
+
+        if ok:
+            self.turbo_steps[self.com_port_name.strip().lower()] = step
+            self.save_config()
+          
     def load_file(self):
         print("load_file")
         
@@ -1171,15 +893,8 @@ class KC_V24_TransferApp:
 
         # Dateiinhalt untersuchen und Inhalt klassifizieren -> Start, End, Einsprungadresse herausfinden
         try:
-            with open(path, "rb") as f:
-                filedata = bytearray(f.read())
-            if not filedata:
-                raise ValueError("Datei ist leer.")
-            
-            ft = KC_V24_Transfer_FileFormatTools()
-            pr = ft.parseBinData(filedata)  # pr ist eine Class ParseResult
+            pr = self.read_file(path)   # pr ist eine Class ParseResult
 
-            print(pr)
             if pr.errorstate:
                 #TODO Fehlermeldung und Rückkehr
                 self.pr = None
@@ -1191,8 +906,6 @@ class KC_V24_TransferApp:
                 #TODO Hinweismeldung ausgeben
                 pass
 
-            if pr.callp: pr.callu = pr.callp
-            else: pr.callu = pr.callh
             self.pr = pr
             
             self.file_name = file_name
@@ -1212,268 +925,56 @@ class KC_V24_TransferApp:
     # ------------------------ Senden ------------------------
 
     def on_send_clicked(self):
-        # hält den aktuellen Status des Transfersystems
-        # None:    uninitialisiert
-        # "BROKE": nach Abgebrochener Binärübertragung - der KC wartet dann auf seiner Seite auf Abschluss, bis er wieder in den Tastaturmodus wechseln kann 
-        # "BIN":   im ESC-U/ESC-T-Polling-Modus
-        # "KEY":   Interupt-Modus (Tastatureingaben)
-        
         # Wenn gerade abgearbeitet wird: Abbruch anfordern
         if self._worker and self._worker.is_alive():
             self.stop_all()
             #self.set_controls_send(text=self.SBTN_CANCEL, send_enabled=False)
             self.set_transfer_status(status="Abbruch angefordert.")
             return
-            
-        else: #Schalter steht auf Übertragen
-
-            # prüfen, ob überhaupt etwas geladen wurde
-            if self.pr is None:
-                messagebox.showwarning(
-                    "Hinweis",
-                    "Keine Daten zur Übertragung."
-                )
-                return
-            
-            # "leeres" ParseResult für Jobs ohne Datenübertagung erzeugen (spart Speicher)
-            pr_nodata = copy.deepcopy(self.pr)
-            pr_nodata.transferdata = bytearray()
-            
-            pr_bascoder_nodata = copy.deepcopy(self.pr_bascoder)
-            pr_bascoder_nodata.transferdata = bytearray()
-            #self.last_basicodelinenumber = None
-            
-            pr_0200stub_nodata = copy.deepcopy(self.pr_0200stub)
-            pr_0200stub_nodata.transferdata = bytearray()
-            
-            pr_BF00stub_nodata = copy.deepcopy(self.pr_BF00stub)
-            pr_BF00stub_nodata.transferdata = bytearray()
-            
-            
-            # testweise Jobs bauen und abarbeiten
-            self.jobs = []
-
-            #_TYPE_MC         = "Speicherabbild"  # binärer Maschinencode (Speicherabzug)
-            #_TYPE_BASICMC    = "BASIC (Speicherabbild)"   # binärer BASIC-Code (auch binär!) geladen (Speicherabzug)
-            #_TYPE_BASICTEXT  = "BASIC (Text)"    # Basic-Programlisting in ASCII-Form - muss als Tastatureingaben übertragen werden
-            #_TYPE_BASICODE   = "BASICODE (Text)" # Basic-Programcode in ASCII-Form - muss als Tastatureingaben übertragen werden - benötigt geladenen BASCODER
-            #_TYPE_TEXT       = "TEXT"            # Einfacher Text ohne bekanntes Format zur Übertragung
-
-            #_JT_NONE           = None
-            #_JT_STARTKEYBMODE  = 1   # sendet ein CR und startet so den Interrupt-Modus, wenn parent.transState nicht BROKE oder bereits KEY ist
-            #_JT_SENDBIN        = 2   # sendet ESC-T (Polling-Modus EIN) und sendet jpr.transferdata wenn parent.transState nicht BROKE oder bereits BIN ist
-            #_JT_RUNBIN         = 3   # sendet ESC-U (Polling-Modus EIN) und startet den Code an Adresse des jpr.callu wenn parent.transState nicht BROKE oder bereits BIN ist
-            #_JT_SENDTEXT      = 4   # überträgt pr.tarnsferdata als keyboardeingaben an den BASIC-Prompt
-            #_JT_STARTBASIC     = 5   # startet aus CAOS das BASIC-System (durch Keyboardeingaben)
-            #_JT_STARTREBASIC   = 6   # startet aus CAOS REBASIC (durch Keyboardeingaben)
-            #_JT_RUNBASIC       = 7   # startet ein BASIC-Programm per "RUN" am BASIC-Prompt
-
-            if self.pr.type == self.pr._TYPE_TEXT:
-                # Tastaturmodus einschalten
-                # transferdata als Tastatureingaben übertragen
-
-                # RESET am KC erfragen
-                dlg = gui.DualOptionsDialog(self.root, title="Achtung", text="Vor der Übertragung\n\n RESET\n\nam KC drücken!", okbuttontext="Erledigt!")
-                if dlg.result: self.trans_state = None
-                else: return
-
-                self.jobs.append(KC_Job(parent=self, type=KC_Job._JT_STARTKEYBMODE, pr=pr_nodata))
-                self.jobs.append(KC_Job(parent=self, type=KC_Job._JT_SENDTEXT,      pr=self.pr))
-                self.start_processing()
-                
-            elif self.pr.type == self.pr._TYPE_BASICTEXT:
-                # Tastaturmodus einschalten
-                # BASIC starten
-                # transferdata als Tastatureingaben übertragen
-                # wenn Autostart: BASIC-Programm starten
-
-                dlg = gui.DualOptionsDialog(self.root, title="Achtung", text="Vor der Übertragung\n\n RESET\n\nam KC drücken!", okbuttontext="Erledigt!")
-                if dlg.result: self.trans_state = None
-                else: return
-                
-                self.jobs.append(KC_Job(parent=self, type=KC_Job._JT_STARTKEYBMODE, pr=pr_nodata))
-                self.jobs.append(KC_Job(parent=self, type=KC_Job._JT_STARTBASIC,    pr=pr_nodata))
-                self.jobs.append(KC_Job(parent=self, type=KC_Job._JT_SENDBASICTEXT, pr=self.pr, pause=None, askstart=True))
-                self.jobs.append(KC_Job(parent=self, type=KC_Job._JT_RUNBASIC,      pr=pr_nodata))
-                self.start_processing()
-                
 
-            elif self.pr.type == self.pr._TYPE_BASICODE:
-                # BASCODER schon geladen?
-                
-                # BASCODER laden
-                # Tastaturmodus einschalten
-                # REBASIC
-                # BASIC-Programm starten (BASCODER)
-                # transferdata als Tastatureingaben übertragen
-                # wenn Autostart: BASIC-Programm starten
-                
-                if self.last_basicodelinenumber:   # wir haben die letzte Zeilennummer des zuletzt geladenen BASICODE-Programmes, evtl. läuft der BASCODER noch
-                    print("Frage-Bascoder")
-                    bascoderload = messagebox.askyesno("BASICODE-Programm", "Ist der Bascoder bereits geladen?\"Ja\": Das Programm wird direkt geladen.\n\n\"Nein\": Der Bascoder wird mitübertragen", parent=self.root)
-                    if not bascoderload:
-
-                        print("Frage-Bascoder mitladen: Ja")
-
-                        # RESET am KC erfragen
-                        dlg = gui.DualOptionsDialog(self.root, title="Achtung", text="Vor der Übertragung\n\n RESET\n\nam KC drücken!", okbuttontext="Erledigt!")
-                        if dlg.result: self.trans_state = None
-                        else: return
-
-                        if self.use_turboload:   # stub mit 2400 Baud-Routine vorladen und starten
-                            # passenden Stub (Preloader) auswählen
-                            if self.pr_bascoder.start <= self.pr_0200stub.end:
-                                print(f"-- oberen Stub vorladen {self.pr_BF00stub.start:04X}")
-                                pr_stub        = self.pr_BF00stub
-                                pr_stub_nodata = pr_BF00stub_nodata
-                            else:
-                                print(f"-- unteren Stub vorladen {self.pr_0200stub.start:04X}")
-                                pr_stub        = self.pr_0200stub
-                                pr_stub_nodata = pr_0200stub_nodata
-
-                            self.jobs.append(KC_Job(parent=self, type=KC_Job._JT_SENDBIN,       pr=pr_stub))
-                            self.jobs.append(KC_Job(parent=self, type=KC_Job._JT_RUNBIN,        pr=pr_stub_nodata, set_ser_br=57600, pause=100))
-
-                        # Bascoder vorladen
-                        self.jobs.append(KC_Job(parent=self, type=KC_Job._JT_SENDBIN,       pr=self.pr_bascoder))
-                        self.jobs.append(KC_Job(parent=self, type=KC_Job._JT_STARTKEYBMODE, pr=pr_nodata))
-                        self.jobs.append(KC_Job(parent=self, type=KC_Job._JT_STARTREBASIC,  pr=pr_nodata, pause=500))
-                        self.jobs.append(KC_Job(parent=self, type=KC_Job._JT_RUNBASIC,      pr=pr_nodata, pause=3000))
-                        # Binärstart des Bascoder funktioniert nicht
-                        #self.jobs.append(KC_Job(parent=self, type=KC_Job._JT_SENDBIN,       pr=self.pr_bascoder))
-                        #self.jobs.append(KC_Job(parent=self, type=KC_Job._JT_RUNBIN,        pr=pr_bascoder_nodata, pause=5000))
-
-                    else:
-                        print("Frage-Bascoder mitladen: Nein")
-                        # Bascoder - geladenes Programm zurücksetzen
-                        self.jobs.append(KC_Job(parent=self, type=KC_Job._JT_STARTKEYBMODE,  pr=pr_nodata))
-                        self.jobs.append(KC_Job(parent=self, type=KC_Job._JT_RESETBASCODER, pr=pr_nodata))
-
-                else:   # Bascoder auf jeden Fall laden
-                    # Bascoder vorladen
-                    dlg = gui.DualOptionsDialog(self.root, title="Achtung", text="Vor der Übertragung\n\n RESET\n\nam KC drücken!", okbuttontext="Erledigt!")
-                    if dlg.result: self.trans_state = None
-                    else: return
-                    
-                    if self.use_turboload:   # stub mit 2400 Baud-Routine vorladen und starten
-                        # passenden Stub (Preloader) auswählen
-                        if self.pr_bascoder.start <= self.pr_0200stub.end:
-                            print(f"-- oberen Stub vorladen {self.pr_BF00stub.start:04X}")
-                            pr_stub        = self.pr_BF00stub
-                            pr_stub_nodata = pr_BF00stub_nodata
-                        else:
-                            print(f"-- unteren Stub vorladen {self.pr_0200stub.start:04X}")
-                            pr_stub        = self.pr_0200stub
-                            pr_stub_nodata = pr_0200stub_nodata
-
-                        self.jobs.append(KC_Job(parent=self, type=KC_Job._JT_SENDBIN,       pr=pr_stub))
-                        self.jobs.append(KC_Job(parent=self, type=KC_Job._JT_RUNBIN,        pr=pr_stub_nodata, set_ser_br=57600, pause=100))
-                    
-                    self.jobs.append(KC_Job(parent=self, type=KC_Job._JT_SENDBIN,       pr=self.pr_bascoder, set_ser_br=1200))
-                    self.jobs.append(KC_Job(parent=self, type=KC_Job._JT_STARTKEYBMODE, pr=pr_nodata))
-                    self.jobs.append(KC_Job(parent=self, type=KC_Job._JT_STARTREBASIC,  pr=pr_nodata, pause=500))
-                    self.jobs.append(KC_Job(parent=self, type=KC_Job._JT_RUNBASIC,      pr=pr_nodata, pause=3000))
-
-                # Basicode-Programm laden    
-                self.jobs.append(KC_Job(parent=self, type=KC_Job._JT_SENDBASICTEXT,  pr=self.pr, pause=None, askstart=True, savelastline=True))
-                self.jobs.append(KC_Job(parent=self, type=KC_Job._JT_RUNBASIC,       pr=pr_nodata))
+        # prüfen, ob überhaupt etwas geladen wurde
+        if self.pr is None:
+            messagebox.showwarning(
+                "Hinweis",
+                "Keine Daten zur Übertragung."
+            )
+            return
+        
+        # Abgebrochene Binärübertragung? Der KC wartet noch auf den Rest der Daten
+        resume_info = self.get_resume_info()
+        if self.get_trans_state() == "BROKE" and resume_info is not None:
+            resume = messagebox.askyesno(
+                "Übertragung fortsetzen",
+                f"Die letzte Binärübertragung wurde nach {resume_info.offset} von {resume_info.total} Bytes unterbrochen.\n\n"
+                "\"Ja\": Nur die fehlenden Daten übertragen (ohne RESET).\n\n"
+                "\"Nein\": Neu übertragen",
+                parent=self.root,
+            )
+            if resume:
+                self.jobs = [resume_info.job.clone(type=KC_Job._JT_RESUMEBIN)]
+                self.jobs += [job.clone() for job in resume_info.followjobs]
                 self.start_processing()
-                
+                return
+            self.set_resume_info(None)
 
-            elif self.pr.type == self.pr._TYPE_BASICMC:
-                # BIN laden
-                # Tastaturmodus einschalten
-                # REBASIC starten
-                # wenn Autostart: BASIC-Programm starten
-                # RESET am KC erfragen
-                dlg = gui.DualOptionsDialog(self.root, title="Achtung", text="Vor der Übertragung\n\n RESET\n\nam KC drücken!", okbuttontext="Erledigt!")
-                if dlg.result: self.trans_state = None
-                else: return
-                
-                if self.use_turboload:   # stub mit 2400 Baud-Routine vorladen und starten
-                    # passenden Stub (Preloader) auswählen
-                    if self.pr.start <= self.pr_0200stub.end:
-                        print(f"-- oberen Stub vorladen {self.pr_BF00stub.start:04X}")
-                        pr_stub        = self.pr_BF00stub
-                        pr_stub_nodata = pr_BF00stub_nodata
-                    else:
-                        print(f"-- unteren Stub vorladen {self.pr_0200stub.start:04X}")
-                        pr_stub        = self.pr_0200stub
-                        pr_stub_nodata = pr_0200stub_nodata
-
-                    self.jobs.append(KC_Job(parent=self, type=KC_Job._JT_SENDBIN,       pr=pr_stub))
-                    self.jobs.append(KC_Job(parent=self, type=KC_Job._JT_RUNBIN,        pr=pr_stub_nodata, set_ser_br=57600, pause=100))
-
-                self.jobs.append(KC_Job(parent=self, type=KC_Job._JT_SENDBIN,       pr=self.pr, set_ser_br=1200, pause=100, askstart=True))
-                self.jobs.append(KC_Job(parent=self, type=KC_Job._JT_STARTKEYBMODE, pr=pr_nodata))
-                self.jobs.append(KC_Job(parent=self, type=KC_Job._JT_STARTREBASIC,  pr=pr_nodata, pause=500))
-                self.jobs.append(KC_Job(parent=self, type=KC_Job._JT_RUNBASIC,      pr=pr_nodata))
-                
-                self.start_processing()
-                pass
-                
-            elif self.pr.type == self.pr._TYPE_MC:
-                # BIN laden
-                # BIN starten
-                # Tastaturmodus einschalten
-                
-                # RESET am KC erfragen
-                dlg = gui.DualOptionsDialog(self.root, title="Achtung", text="Vor der Übertragung\n\n RESET\n\nam KC drücken!", okbuttontext="Erledigt!")
-                if dlg.result: self.trans_state = None
-                else: return
-
-                if self.use_turboload:   # stub mit 2400 Baud-Routine vorladen und starten
-                    # passenden Stub (Preloader) auswählen
-                    if self.pr.start <= self.pr_0200stub.end:
-                        print(f"-- oberen Stub vorladen {self.pr_BF00stub.start:04X}")
-                        pr_stub        = self.pr_BF00stub
-                        pr_stub_nodata = pr_BF00stub_nodata
-                    else:
-                        print(f"-- unteren Stub vorladen {self.pr_0200stub.start:04X}")
-                        pr_stub        = self.pr_0200stub
-                        pr_stub_nodata = pr_0200stub_nodata
-
-                    self.jobs.append(KC_Job(parent=self, type=KC_Job._JT_SENDBIN,       pr=pr_stub))
-                    self.jobs.append(KC_Job(parent=self, type=KC_Job._JT_RUNBIN,        pr=pr_stub_nodata, set_ser_br=57600, pause=100))
-                
-                if self.pr.callu:   # nur wenn Startadresse gegeben ist, nach Start fragen
-                    self.jobs.append(KC_Job(parent=self, type=KC_Job._JT_SENDBIN,       pr=self.pr, set_ser_br=1200, pause=100, askstart=True))
-                    self.jobs.append(KC_Job(parent=self, type=KC_Job._JT_STARTKEYBMODE, pr=pr_nodata))
-                    self.jobs.append(KC_Job(parent=self, type=KC_Job._JT_RUNBINMENU,    pr=pr_nodata))
-                else:
-                    self.jobs.append(KC_Job(parent=self, type=KC_Job._JT_SENDBIN,       pr=self.pr, set_ser_br=1200))
-                
-                self.start_processing()
+        # Job-Folge je Datentyp (KC_V24_Transfer_Session.build_send_jobs)
+        if self.build_send_jobs():
+            self.start_processing()
 
     #######################################################################################################
     # Hilfsfunktionen 
     #######################################################################################################
     
-    def get_restlaufzeit(self, starttime: datetime, currenttime: datetime, sent: int, total: int) -> str | None:
-        if total <= 0:
-            raise ValueError("T muss > 0 sein.")
-        if sent < 0:
-            raise ValueError("S darf nicht negativ sein.")
-        if sent > total:
-            sent = total
-        if currenttime < starttime:
-            raise ValueError("B darf nicht vor A liegen.")
-
-        elapsed = (currenttime - starttime).total_seconds()
-        if sent == 0 or elapsed <= 10:
-            return None
-
-        rate = sent / elapsed
-        if rate <= 0:
+    def get_restlaufzeit(self, event: JobEvent) -> str | None:
+        """Restlaufzeit nach dem Zeitmodell (event.eta_s, siehe KC_V24_Transfer_CostModel) - geglättet."""
+        if event.plan_ms <= 0:
             return None
 
-        remaining_bytes = total - sent
-        if remaining_bytes <= 0:
+        remaining_seconds = int(math.ceil(event.eta_s))
+        if remaining_seconds <= 0:
             self._rlz_hist_seconds.clear()
             return "0m00s"
 
-        remaining_seconds = int(math.ceil(remaining_bytes / rate))
-
         # gleitender Mittelwert über die letzten 10 Restsekunden
         self._rlz_hist_seconds.append(remaining_seconds)
         avg_seconds = int(math.ceil(sum(self._rlz_hist_seconds) / len(self._rlz_hist_seconds)))
@@ -1485,36 +986,12 @@ class KC_V24_TransferApp:
         return f"{m}m{s:02d}s"
 
     
-    def open_port(self, br=1200) -> Optional[serial.Serial]:
-        port_name = self.com_port_name
-        try:
-            ser = serial.Serial(
-                port_name,
-                baudrate=br,
-                bytesize=serial.EIGHTBITS,
-                parity=serial.PARITY_NONE,
-                stopbits=serial.STOPBITS_TWO,
-                timeout=1,
-                xonxoff=False,
-            )
-            return ser
-        except serial.SerialException as e:
-            messagebox.showerror(
-                "Fehler",
-                f"Schnittstelle {port_name} konnte nicht geöffnet werden:\n{e}",
-                parent=self.root,
-            )
+    def open_port(self, br=1200, stopbits=None) -> Optional[serial.Serial]:
+        ser = super().open_port(br, stopbits=stopbits)
+        if ser is None:
             self.refresh_port_menu()
-            return None
-            
-    def _close_current_port(self) -> None:
-        try:
-            if self.com_port and getattr(self.com_port, "is_open", False):
-                self.com_port.close()
-        except Exception:
-            pass
-        self.com_port = None
-   
+        return ser
+
     def get_system_ports(self):
         """
         Liefert eine Liste von Tupeln (portname, busy),
@@ -1747,112 +1224,6 @@ class KC_V24_TransferApp:
         """Aktualisiert vor dem Öffnen des Port-Menüs die Einträge."""
         self.init_port_menu(onmenuopen=True)
 
-    #######################################################################################################
-    # gespeicherte Konfiguration 
-    #######################################################################################################
-    def load_config(self) -> bool:
-        cfg = configparser.ConfigParser()
-        if not self.CONFIG_PATH.exists():
-            if self.save_config():
-                print("load_config() Konfigurationsdatei angelegt")
-                return True
-            else:
-                return False
-
-        try:
-            cfg.read(self.CONFIG_PATH, encoding="utf-8")
-
-            # [serial]
-            if cfg.has_section("serial"):
-            #if cfg.has_option("serial", "com_port_name"):
-                self.com_port_name = cfg.get("serial", "com_port_name", fallback="").strip()
-                self.use_turboload = cfg.getboolean("serial", "use_turboload", fallback=self.use_turboload)
-                
-            """    
-            # [timeouts]
-            if cfg.has_section("timeouts"):
-                self.timeout_comport              = cfg.getint("timeouts", "comport", fallback=self.timeout_comport)
-                self.timeout_job                  = cfg.getint("timeouts", "job",     fallback=self.timeout_job)
-                
-            # [textconfig]
-            if cfg.has_section("textconfig"):
-                self.timeout_comport              = cfg.getint("textconfig", "comport", fallback=self.timeout_comport)
-                self.timeout_job                  = cfg.getint("textconfig", "job",     fallback=self.timeout_job)
-                
-                self.textconfig_showkonfigdialog  = cfg.getboolean("textconfig", "showkonfigdialog", fallback=self.textconfig_showkonfigdialog)
-                self.textconfig_linewidth         = cfg.getint("textconfig", "linewidth",         fallback=self.textconfig_linewidth)
-                self.textconfig_promptwidth       = cfg.getint("textconfig", "promptwidth",       fallback=self.textconfig_promptwidth)
-                self.textconfig_init_delay        = cfg.getint("textconfig", "init_delay",        fallback=self.textconfig_init_delay)
-                self.textconfig_init_clsdelay     = cfg.getint("textconfig", "init_clsdelay",     fallback=self.textconfig_init_clsdelay)
-                self.textconfig_init_basic1delay  = cfg.getint("textconfig", "init_basic1delay",  fallback=self.textconfig_init_basic1delay)
-                self.textconfig_init_basic2delay  = cfg.getint("textconfig", "init_basic2delay",  fallback=self.textconfig_init_basic2delay)
-                self.textconfig_init_rebasicdelay = cfg.getint("textconfig", "init_rebasicdelay", fallback=self.textconfig_init_rebasicdelay)
-                self.textconfig_char_delay        = cfg.getint("textconfig", "char_delay",        fallback=self.textconfig_char_delay)
-                self.textconfig_linescroll_delay  = cfg.getint("textconfig", "linescroll_delay",  fallback=self.textconfig_linescroll_delay)
-                self.textconfig_process_delay     = cfg.getint("textconfig", "process_delay",     fallback=self.textconfig_process_delay)
-                self.textconfig_command_addition  = cfg.getint("textconfig", "command_addition",  fallback=self.textconfig_command_addition)
-                self.textconfig_linethrottle      = cfg.getint("textconfig", "linethrottle",      fallback=self.textconfig_linethrottle)
-                self.textconfig_lines             = cfg.getint("textconfig", "lines",             fallback=self.textconfig_lines)
-                self.textconfig_basicode_delay    = cfg.getint("textconfig", "basicode_delay",    fallback=self.textconfig_basicode_delay)
-                self.textconfig_dim_ref_delay     = cfg.getint("textconfig", "dim_ref_delay",     fallback=self.textconfig_dim_ref_delay)
-                self.textconfig_dim_unit_delay    = cfg.getint("textconfig", "dim_unit_delay",    fallback=self.textconfig_dim_unit_delay)
-                self.textconfig_var_ref_delay     = cfg.getint("textconfig", "var_ref_delay",     fallback=self.textconfig_var_ref_delay)
-            """
-            return True
-        except Exception as e:
-            print(f"load_config() Konfiguration konnte nicht geladen werden: {e}")
-            return False
-
-    def save_config(self) -> bool:
-        try:
-            self.CONFIG_PATH.parent.mkdir(parents=True, exist_ok=True)
-        except Exception as e:
-            print(f"save_config() Konfigurationsverzeichnis konnte nicht angelegt werden: {e}")
-            return False
-            
-        cfg = configparser.ConfigParser()
-
-        cfg["serial"] = {
-            "com_port_name":     self.com_port_name.strip(),
-            "use_turboload":     self.use_turboload
-        }
-        
-        """
-        cfg["timeouts"] = {
-            "comport":           str(int(self.timeout_comport)),
-            "job":               str(int(self.timeout_job)),
-        }       
-        
-        cfg["textconfig"] = {
-            "showkonfigdialog":  str(bool(self.textconfig_showkonfigdialog)),
-            "linewidth":         str(int(self.textconfig_linewidth)),
-            "promptwidth":       str(int(self.textconfig_promptwidth)),
-            "init_delay":        str(int(self.textconfig_init_delay)),
-            "init_clsdelay":     str(int(self.textconfig_init_clsdelay)),
-            "init_basic1delay":  str(int(self.textconfig_init_basic1delay)),
-            "init_basic2delay":  str(int(self.textconfig_init_basic2delay)),
-            "init_rebasicdelay": str(int(self.textconfig_init_rebasicdelay)),
-            "char_delay":        str(int(self.textconfig_char_delay)),
-            "linescroll_delay":  str(int(self.textconfig_linescroll_delay)),
-            "process_delay":     str(int(self.textconfig_process_delay)),
-            "command_addition":  str(int(self.textconfig_command_addition)),
-            "linethrottle":      str(int(self.textconfig_linethrottle)),
-            "lines":             str(int(self.textconfig_lines)),
-            "basicode_delay":    str(int(self.textconfig_basicode_delay)),
-            "dim_ref_delay":     str(int(self.textconfig_dim_ref_delay)),
-            "dim_unit_delay":    str(int(self.textconfig_dim_unit_delay)),
-            "var_ref_delay":     str(int(self.textconfig_var_ref_delay)),
-        }
-        """
-        try:
-            with self.CONFIG_PATH.open("w", encoding="utf-8") as f:
-                cfg.write(f)
-        except Exception as e:
-            print(f"save_config() Konfiguration konnte nicht gespeichert werden: {e}")
-            return False
-
-        return True
-    
     # Ausgabe in das Statusfeld 
     def set_transfer_status(self,
                             status=None,
@@ -1861,7 +1232,8 @@ class KC_V24_TransferApp:
                             currentjobnr=None,
                             totaljobcount=None,
                             restlaufzeit=None,
-                            cancelable=None
+                            cancelable=None,
+                            timeprogress=None
                             ):
         """
         Schreibt einen Status in das Textfeld.
@@ -1870,6 +1242,7 @@ class KC_V24_TransferApp:
         sent   : bereits übertragene Bytes (int oder None)
         total  : gesamte Datenlänge (int oder None)
         status : Text, z.B. "bereit zur Datenübertragung"
+        timeprogress : (erledigt, gesamt) in ms nach dem Zeitmodell - Fortschrittsbalken nach Zeit statt nach Bytes
         """
         
         #print(sent, total, currentjobnr,totaljobcount, cancelable, "----", sep="\n")
@@ -1917,10 +1290,12 @@ class KC_V24_TransferApp:
             parts.append(f"  Name: {name}\n")        
 
         # Länge zusammensetzen
+        rlz = f" {restlaufzeit}" if restlaufzeit is not None else ""
         if sent is not None and total is not None and total > 0:
             prozent = sent * 100 / total
-            rlz = f" {restlaufzeit}" if restlaufzeit is not None else ""
             parts.append(f"Senden: {int(sent)}/{int(total)} Byte [{prozent:.1f}%{rlz}]\n")
+        elif timeprogress is not None and restlaufzeit is not None:
+            parts.append(f"Senden: [Rest{rlz}]\n")
         elif prtotal is not None:
             parts.append(f" Größe: {int(prtotal)} Byte\n")
         
@@ -1943,19 +1318,22 @@ class KC_V24_TransferApp:
 
         text = "".join(parts) if parts else ""
 
-        # Textfeld als Statusfeld benutzen (Inhalt komplett ersetzen)
-        self.statusfeld.config(state="normal")
-        self.statusfeld.delete("1.0", "end")
-        self.statusfeld.insert("1.0", text)
-        self.statusfeld.config(state="disabled")
+        # Textfeld als Statusfeld benutzen (Inhalt komplett ersetzen - nur bei Änderung)
+        if text != self._gui_shown.get("status"):
+            self._gui_shown["status"] = text
+            self.statusfeld.config(state="normal")
+            self.statusfeld.delete("1.0", "end")
+            self.statusfeld.insert("1.0", text)
+            self.statusfeld.config(state="disabled")
         
-        # progressbar setzen
-        if total is not None and sent is not None:
-            self.progress["maximum"] = total
-            self.progress["value"]   = sent
+        # progressbar setzen (nur bei Änderung)
+        if timeprogress is not None and timeprogress[1] > 0:
+            bar = (int(timeprogress[1]), int(timeprogress[0]))
         else:
-            self.progress["maximum"] = 1
-            self.progress["value"]   = 0
+            bar = (total, sent) if total is not None and sent is not None else (1, 0)
+        if bar != self._gui_shown.get("progress"):
+            self._gui_shown["progress"] = bar
+            self.progress["maximum"], self.progress["value"] = bar
     
 
     def on_exit(self, event=None):
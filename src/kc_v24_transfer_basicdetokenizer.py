@@ -287,7 +287,8 @@ class KC_V24_Transfer_BASICdetokenizer:
                         in_rem = True
 
                     out.append(token)
-                    if (not compact) and (token in self.KEYWORDS_WITH_SPACE_AFTER):
+                    # nach REM/! kein zusätzliches Leerzeichen: der Kommentar steht so im Listing, wie ihn der KC speichert
+                    if (not compact) and (not in_rem) and (token in self.KEYWORDS_WITH_SPACE_AFTER):
                         if not out[-1].endswith(" "):
                             out.append(" ")
 
@@ -341,7 +342,8 @@ class KC_V24_Transfer_BASICdetokenizer:
                             out.append(chr(b2) if b2 >= 32 else " ")
                 i += 1
 
-        return "".join(out)
+        # Leerzeichen am Zeilenende nur in Kommentaren erhalten (dort gehören sie zum Programmtext)
+        return "".join(out) if in_rem and not compact else "".join(out).rstrip()
 
     def detokenize_hc_basic(self, program: bytes, compact: bool = False) -> str:
         """
@@ -357,7 +359,7 @@ class KC_V24_Transfer_BASICdetokenizer:
             lines: List[str] = []
             line_space = " " if not compact else ""
             for line_no, raw in self._iter_tokenized_lines(program):
-                text = self.detokenize_line(raw, compact=compact, line_no=line_no).rstrip()
+                text = self.detokenize_line(raw, compact=compact, line_no=line_no)
                 tmp = f"{line_no}{line_space}{text}"
                 if len(tmp) > 76:
                     self.process_messages.append(
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import re
+import sys
+from typing import Dict, List, Optional, Tuple
+
+# Änderungsübertragung von BASIC-Listings:
+# Das zuletzt eingetippte Listing (KC_V24_Transfer_MemoryShadow.basic_listing) wird zeilennummernweise mit dem
+# neuen verglichen. Übertragen werden nur neue und geänderte Zeilen - der BASIC-Interpreter ersetzt eine Zeile
+# mit gleicher Nummer - und für entfernte Zeilen DELETE-Befehle (wie in job_resetbascoder) bzw. die bloße
+# Zeilennummer. Unveränderte Zeilen dürfen in keinem DELETE-Bereich liegen, geänderte schon (sie werden danach neu
+# eingegeben). Listings mit Zeilen ohne Zeilennummer (Direktbefehle) werden nicht verglichen.
+
+
+class KC_V24_Transfer_BasicDiff:
+    """Unterschied zweier BASIC-Listings (HC-Zeichensatz) als Tastatureingaben."""
+
+    _RX_LINENUMBER = re.compile(rb"^\s*(\d{1,5})")
+    _RX_NEWLINE    = re.compile(rb"\r\n|\n|\r")
+
+    def __init__(self, old: Dict[int, bytes], new: Dict[int, bytes]) -> None:
+        self.changed: List[int] = sorted(nr for nr, line in new.items() if old.get(nr) != line)   # neu oder geändert
+        self.removed: List[int] = sorted(nr for nr in old if nr not in new)
+        self.kept    = len(old) - len(self.removed)    # Zeilen, die vor der Eingabe schon im Programm stehen
+        self.lastline: Optional[int] = max(new) if new else None
+        self._new    = new
+        self.deletes = self._delete_ranges(old, new)
+
+    @classmethod
+    def parse_lines(cls, data) -> Optional[Dict[int, bytes]]:
+        """Zeilennummer -> Zeile (ohne Zeilenende); None, wenn eine nicht leere Zeile keine Zeilennummer hat."""
+        lines: Dict[int, bytes] = {}
+        for line in cls._RX_NEWLINE.split(bytes(data)):
+            line = line.strip()
+            if not line:
+                continue
+            m = cls._RX_LINENUMBER.match(line)
+            if not m:
+                return None
+            lines[int(m.group(1))] = line   # doppelte Zeilennummer: die letzte gilt (wie beim Eintippen)
+        return lines
+
+    @classmethod
+    def compare(cls, old_data, new_data) -> Optional["KC_V24_Transfer_BasicDiff"]:
+        """Vergleich zweier Listings (transferdata); None, wenn eines davon nicht zeilenweise vergleichbar ist."""
+        old, new = cls.parse_lines(old_data), cls.parse_lines(new_data)
+        if old is None or new is None:
+            return None
+        return cls(old, new)
+
+    @staticmethod
+    def _delete_ranges(old: Dict[int, bytes], new: Dict[int, bytes]) -> List[Tuple[int, int]]:
+        """Entfernte Zeilen als Bereiche (von, bis) - ohne unveränderte Zeilen des alten Listings dazwischen."""
+        ranges: List[Tuple[int, int]] = []
+        open_range = False
+        for nr in sorted(old):
+            if nr not in new:
+                if open_range:
+                    ranges[-1] = (ranges[-1][0], nr)
+                else:
+                    ranges.append((nr, nr))
+                    open_range = True
+            elif new[nr] == old[nr]:
+                open_range = False
+        return ranges
+
+    def is_empty(self) -> bool:
+        return not self.changed and not self.deletes
+
+    def transferdata(self) -> bytes:
+        """Tastatureingaben: zuerst die Löschbefehle, dann die neuen/geänderten Zeilen (jeweils mit CR)."""
+        out = bytearray()
+        for first, last in self.deletes:
+            out += (f"DELETE {first},{last}" if last != first else str(first)).encode("ascii") + b"\r"
+        for nr in self.changed:
+            out += self._new[nr] + b"\r"
+        return bytes(out)
+
+    def __str__(self) -> str:
+        deletes = ", ".join(f"{a}-{b}" if a != b else str(a) for a, b in self.deletes) or "-"
+        return f"{len(self.changed)} neue/geänderte Zeilen, gelöscht: {deletes}, unverändert: {len(self._new) - len(self.changed)}"
+
+
+# Einfacher CLI-Einstiegspunkt
+if __name__ == "__main__":
+    if len(sys.argv) < 3:
+        print(
+            "python kc_v24_transfer_basicdiff.py <alt.txt> <neu.txt>"
+            ,""
+            ,"Gibt die Tastatureingaben aus, die das alte BASIC-Listing im KC in das neue überführen."
+            , sep="\n"
+            , file=sys.stderr
+        )
+        sys.exit(1)
+
+    with open(sys.argv[1], "rb") as f_old, open(sys.argv[2], "rb") as f_new:
+        diff = KC_V24_Transfer_BasicDiff.compare(f_old.read(), f_new.read())
+    if diff is None:
+        print("Listing enthält Zeilen ohne Zeilennummer - kein Vergleich möglich", file=sys.stderr)
+        sys.exit(1)
+    print(diff)
+    print(diff.transferdata().decode("latin1").replace("\r", "\n"), end="")
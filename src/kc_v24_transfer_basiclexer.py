@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+import functools
+import re
+import sys
+from typing import FrozenSet, Iterable, NamedTuple, Optional, Tuple
+
+from kc_v24_transfer_basicdetokenizer import KC_V24_Transfer_BASICdetokenizer
+
+# Gemeinsamer Lexer für HC-BASIC-Zeilen (Klartext-Listings):
+# zerlegt eine Zeile in einem Durchlauf in typisierte Token (Zeilennummer, Schlüsselwort,
+# Variable, Feldvariable, Zahl, String, DATA-Inhalt, Kommentar, Operator/Trennzeichen).
+# Die Zeilenanalysen (DIM, Variablen, ON GOTO, RUN-Zeile, Klassifizierung) arbeiten auf
+# dem Tokenstrom, statt jeweils selbst Strings zu maskieren und Kommentare abzuschneiden.
+# Das Ergebnis wird pro Zeilentext in einem begrenzten LRU-Cache gehalten - die Analysen
+# einer Zeile (und die Klassifizierung vor der Übertragung) lexen jede Zeile nur einmal.
+
+
+class BasicToken(NamedTuple):
+    kind: str    # KC_V24_Transfer_BASIClexer._TK_*
+    text: str    # Schlüsselwörter/Namen/Zahlen in Großbuchstaben, Strings und Kommentare wie im Original
+    pos:  int    # Position in der Zeile
+
+
+class KC_V24_Transfer_BASIClexer:
+    """Lexer für HC-/KC-BASIC-Zeilen mit LRU-Cache (Schlüssel: Zeilentext)."""
+
+    _TK_LINENO  = "LINENO"    # führende Zeilennummer
+    _TK_KEYWORD = "KEYWORD"   # Schlüsselwort ('?' wird als PRINT geliefert)
+    _TK_IDENT   = "IDENT"     # Variable (Name inkl. '$')
+    _TK_ARRAY   = "ARRAY"     # Feldvariable - Name direkt (ggf. nach Leerzeichen) vor '('
+    _TK_NUMBER  = "NUMBER"
+    _TK_STRING  = "STRING"    # Stringliteral inkl. Anführungszeichen
+    _TK_DATA    = "DATA"      # Inhalt einer DATA-Anweisung bis ':' (ohne Analyse)
+    _TK_COMMENT = "COMMENT"   # Rest der Zeile nach REM bzw. '!'
+    _TK_OP      = "OP"        # Operatoren und Trennzeichen (einzelne Zeichen)
+
+    # Schlüsselwörter des BASIC-ROM (ohne Operatorzeichen) und gebräuchliche Schreibweisen
+    DEFAULT_KEYWORDS: FrozenSet[str] = frozenset(
+        {kw.rstrip("(") for kw in KC_V24_Transfer_BASICdetokenizer.HC_BASIC_TOKENS.values() if kw[0].isalpha()}
+        | {
+            "LIST#", "PRINT#", "INPUT#", "LOAD#",
+            "CSRLINE", "BASIC", "REBASIC",
+            "RIGTH$", "INKRY$",      # Schreibfehler, die in Listings vorkommen
+        }
+    )
+
+    _CACHE_SIZE = 4096
+
+    _RX_LINENO = re.compile(r"\s*(\d{1,5})(?!\d)")
+    _RX_DATA   = re.compile(r'(?:"[^"]*"?|[^:"])*')
+    _RX_PAREN  = re.compile(r"\s*\(")
+
+    def __init__(self, keywords: Optional[Iterable[str]] = None, cache_size: int = _CACHE_SIZE) -> None:
+        kws = keywords if keywords is not None else self.DEFAULT_KEYWORDS
+        self.keywords: FrozenSet[str] = frozenset(k.upper() for k in kws if k and k[0].isalpha())
+
+        # längste Schlüsselwörter zuerst - die Alternation liefert dann den längsten Treffer (INKEY$ vor INK)
+        kw = "|".join(re.escape(k) for k in sorted(self.keywords, key=len, reverse=True))
+        self._rx_token = re.compile(
+            r'(?P<STRING>"[^"]*"?)'
+            r"|(?P<COMMENT>!.*)"
+            r"|(?P<NUMBER>(?:\d+\.?\d*|\.\d+)(?:E[+-]?\d+)?)"
+            r"|(?P<KEYWORD>" + kw + r")"
+            # Namen enden vor einem Schlüsselwort (kompakte Schreibweise, z.B. ONOZGOTO -> ON OZ GOTO)
+            r"|(?P<IDENT>[A-Z](?:(?!" + kw + r")[A-Z0-9])*\$?)"
+            r"|(?P<SPACE>\s+)"
+            r"|(?P<OP>.)",
+            re.DOTALL,
+        )
+
+        # begrenzter Cache pro Instanz
+        self.lex = functools.lru_cache(maxsize=cache_size)(self._lex)
+
+    _shared: Optional["KC_V24_Transfer_BASIClexer"] = None
+
+    @classmethod
+    def shared(cls) -> "KC_V24_Transfer_BASIClexer":
+        """Gemeinsame Instanz mit den Standard-Schlüsselwörtern (ein Cache für alle Analysen)."""
+        if cls._shared is None:
+            cls._shared = cls()
+        return cls._shared
+
+    def cache_info(self):
+        return self.lex.cache_info()
+
+    def cache_clear(self) -> None:
+        self.lex.cache_clear()
+
+    def _lex(self, line: str) -> Tuple[BasicToken, ...]:
+        """Zerlegt eine Zeile in Token (Leerzeichen werden übersprungen)."""
+        upper  = line.upper()
+        n      = len(upper)
+        tokens = []
+        pos    = 0
+
+        m = self._RX_LINENO.match(upper)
+        if m:
+            tokens.append(BasicToken(self._TK_LINENO, m.group(1), m.start(1)))
+            pos = m.end()
+
+        rx = self._rx_token
+        while pos < n:
+            m = rx.match(upper, pos)
+            kind = m.lastgroup
+            end  = m.end()
+
+            if kind == "SPACE":
+                pass
+            elif kind == "KEYWORD":
+                text = m.group()
+                tokens.append(BasicToken(kind, text, pos))
+                if text == "REM":
+                    if end < n:
+                        tokens.append(BasicToken(self._TK_COMMENT, line[end:], end))
+                    break
+                if text == "DATA":
+                    d = self._RX_DATA.match(upper, end)
+                    if d.end() > end:
+                        tokens.append(BasicToken(self._TK_DATA, line[end:d.end()], end))
+                    end = d.end()
+            elif kind == "IDENT":
+                if self._RX_PAREN.match(upper, end):
+                    kind = self._TK_ARRAY
+                tokens.append(BasicToken(kind, m.group(), pos))
+            elif kind in ("STRING", "COMMENT"):
+                tokens.append(BasicToken(kind, line[pos:end], pos))
+            elif kind == "OP" and upper[pos] == "?":   # PRINT-Kurzform
+                tokens.append(BasicToken(self._TK_KEYWORD, "PRINT", pos))
+            else:
+                tokens.append(BasicToken(kind, m.group(), pos))
+            pos = end
+
+        return tuple(tokens)
+
+
+def _benchmark_listing(filenames, count: int = 2000) -> list:
+    """Listing mit count Zeilen aus den Zeilen der übergebenen Dateien (neu nummeriert)."""
+    rx_line = re.compile(r"^\s*\d{1,5}\s*(.*)$")
+    body = []
+    for filename in filenames:
+        with open(filename, "rb") as f:
+            for ln in f.read().decode("latin1").splitlines():
+                m = rx_line.match(ln)
+                if m and m.group(1):
+                    body.append(m.group(1))
+    if not body:
+        return []
+    return [f"{(nr + 1) * 10} {body[nr % len(body)]}" for nr in range(count)]
+
+
+# Einfacher CLI-Einstiegspunkt
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print(
+            "python kc_v24_transfer_basiclexer.py <datei.txt> [...] [-bench]"
+            ," -bench: Zeilenanalyse (ON GOTO, DIM, Variablen) für ein Listing mit 2000 Zeilen"
+            ,"         aus den Zeilen der Dateien messen (ohne und mit Cache)"
+            ,""
+            ,"Gibt die Token der Zeilen aus."
+            , sep="\n"
+            , file=sys.stderr
+        )
+        sys.exit(1)
+
+    import time
+    from kc_v24_transfer_basiclinedimanalyzer import BasicLineDimAnalyzer
+    from kc_v24_transfer_basiclinevaranalyzer import BasicLineVarAnalyzer
+    from kc_v24_transfer_textplan import KC_V24_Transfer_TextPlan
+
+    files = [a for a in sys.argv[1:] if not a.startswith("-")]
+    lexer = KC_V24_Transfer_BASIClexer.shared()
+
+    if "-bench" not in sys.argv[1:]:
+        for filename in files:
+            with open(filename, "rb") as f:
+                for ln in f.read().decode("latin1").splitlines():
+                    print(ln)
+                    print("   ", " ".join(f"{t.kind}:{t.text}" for t in lexer.lex(ln)))
+        sys.exit(0)
+
+    lines = _benchmark_listing(files)
+    if not lines:
+        print("Keine BASIC-Zeilen gefunden", file=sys.stderr)
+        sys.exit(1)
+
+    dimanalyzer = BasicLineDimAnalyzer(option_base=0)
+    varanalyzer = BasicLineVarAnalyzer()
+
+    def analyze_all() -> int:
+        # wie KC_V24_Transfer_TextPlan.compile je Zeile
+        s = 0
+        for ln in lines:
+            s += KC_V24_Transfer_TextPlan._count_on_goto_targets(lexer.lex(ln))
+            dim_refs, dim_units = dimanalyzer.analyze_line(ln)
+            var_refs, _ = varanalyzer.analyze_line(ln)
+            s += dim_refs + dim_units + var_refs
+        return s
+
+    for label, cached in (("ohne Cache", False), ("mit Cache ", True)):
+        best = None
+        for _ in range(5):
+            if not cached:
+                lexer.cache_clear()
+            t0 = time.perf_counter()
+            result = analyze_all()
+            t = time.perf_counter() - t0
+            best = t if best is None else min(best, t)
+        print(f"{label}: {len(lines)} Zeilen, {best / len(lines) * 1e6:7.1f} us/Zeile (Summe {result})")
+    print(lexer.cache_info())
@@ -5,6 +5,8 @@ import re
 from dataclasses import dataclass, field
 from typing import Iterable, List, Optional, Set, Tuple
 
+from kc_v24_transfer_basiclexer import BasicToken, KC_V24_Transfer_BASIClexer
+
 
 @dataclass
 class BasicLineDimAnalyzer:
@@ -14,12 +16,15 @@ class BasicLineDimAnalyzer:
     - array_refs: Anzahl Feldvariablen-Referenzen wie OV(OZ) oder C$(30)
                  (DIM-Deklarationen werden dabei nicht mitgezählt)
     - dim_units : gewichtete Schätzung der DIM-Initialisierungsarbeit
+
+    Die Zeile wird von KC_V24_Transfer_BASIClexer zerlegt (ohne Angabe: gemeinsamer Lexer mit Cache).
     """
     # DIM-Schätzung
     unknown_dim_default: int = 10     # Ersatzwert, wenn Dimension nicht sicher auswertbar ist (als Max-Index)
     option_base: int = 0             # 0 => Elemente (n+1), 1 => Elemente (n)
     string_factor: int = 2           # Gewicht für String-Felder (…$)
     numeric_factor: int = 1          # Gewicht für numerische Felder
+    lexer: Optional[KC_V24_Transfer_BASIClexer] = field(default=None, repr=False, compare=False)
 
     # Funktionen/Keywords mit Klammern, die NICHT als Feldvariable gezählt werden sollen
     non_arrays: Set[str] = field(default_factory=lambda: {
@@ -38,7 +43,7 @@ class BasicLineDimAnalyzer:
 
     def analyze_line(self, line: str) -> Tuple[int, int]:
         """Rückgabe: (array_refs, dim_units)"""
-        return self.count_array_refs(line), self.dim_allocation_units(line)
+        return self._analyze(self._lex(line))
 
     def count_array_refs(self, line: str) -> int:
         """
@@ -47,55 +52,7 @@ class BasicLineDimAnalyzer:
         - bekannte Funktionen/Keywords mit Klammern
         - DIM-Deklarationen
         """
-        s = self._remove_dim_statements(line)
-        n = len(s)
-        i = 0
-        in_string = False
-        count = 0
-
-        while i < n:
-            ch = s[i]
-
-            if in_string:
-                if ch == '"':
-                    if i + 1 < n and s[i + 1] == '"':  # "" innerhalb String
-                        i += 2
-                        continue
-                    in_string = False
-                i += 1
-                continue
-
-            if ch == '"':
-                in_string = True
-                i += 1
-                continue
-
-            # Kommentarstart
-            if ch == "'" or (ch == "!" and (i == 0 or not self._is_alnum(s[i - 1]))):
-                break
-
-            if self._is_letter(ch):
-                start = i
-                i += 1
-                while i < n and self._is_alnum(s[i]):
-                    i += 1
-                if i < n and s[i] == "$":
-                    i += 1
-
-                ident = s[start:i].upper()
-                if ident == "REM":
-                    break
-
-                j = self._skip_ws(s, i)
-                if j < n and s[j] == "(":
-                    # FN...(...) ist Funktionsaufruf, keine Feldvariable
-                    if not ident.startswith("FN") and ident not in self.non_arrays:
-                        count += 1
-                continue
-
-            i += 1
-
-        return count
+        return self._analyze(self._lex(line))[0]
 
     def dim_allocation_units(self, line: str) -> int:
         """
@@ -104,72 +61,98 @@ class BasicLineDimAnalyzer:
         - Elementzahl: Produkt der Dimensionen (unter Berücksichtigung option_base)
         - String-Felder werden höher gewichtet
         """
-        code = self._strip_basic_line_number(line)
-        raw = self._strip_strings_and_comments(code)
-        up = raw.upper()
+        return self._analyze(self._lex(line))[1]
+
+    # ---------------- Internals ----------------
+
+    def _lex(self, line: str) -> Tuple[BasicToken, ...]:
+        lexer = self.lexer if self.lexer is not None else KC_V24_Transfer_BASIClexer.shared()
+        return lexer.lex(line)
 
+    def _analyze(self, tokens: Tuple[BasicToken, ...]) -> Tuple[int, int]:
+        """Ein Durchlauf über die Token: (array_refs, dim_units)."""
+        refs = 0
         units = 0
+        in_dim = False    # innerhalb einer DIM-Anweisung (bis ':' auf Top-Level)
+        depth = 0
+        after_fn = False
         i = 0
-        while True:
-            pos = up.find("DIM", i)
-            if pos < 0:
-                break
+        n = len(tokens)
 
-            prev = up[pos - 1] if pos > 0 else " "
-            if prev.isalnum() or prev == "$":
-                i = pos + 3
-                continue
+        while i < n:
+            kind, text, _ = tokens[i]
+            i += 1
 
-            j = pos + 3
-            if j >= len(up) or not ("A" <= up[j] <= "Z"):
-                i = pos + 3
+            if kind == KC_V24_Transfer_BASIClexer._TK_KEYWORD:
+                after_fn = text == "FN"
+                if text == "DIM":
+                    in_dim = True
+                    depth = 0
                 continue
 
-            # DIM-Teil bis ':' auf Top-Level-Klammer-Ebene
-            stmt = raw[j:]
-            cut: List[str] = []
-            depth = 0
-            k = 0
-            while k < len(stmt):
-                ch = stmt[k]
-                if ch == "(":
+            if kind == KC_V24_Transfer_BASIClexer._TK_OP:
+                if text == "(":
                     depth += 1
-                elif ch == ")":
+                elif text == ")":
                     depth = max(0, depth - 1)
-                if ch == ":" and depth == 0:
-                    break
-                cut.append(ch)
-                k += 1
-            dim_part = "".join(cut).strip()
-
-            for decl in self._split_top_level_commas(dim_part):
-                m = re.match(r"^([A-Za-z][A-Za-z0-9]*\$?)\s*\((.*)\)\s*$", decl.strip())
-                if not m:
-                    continue
-                name = m.group(1)
-                dims_str = m.group(2).strip()
+                elif text == ":" and depth == 0:
+                    in_dim = False
 
-                dims: List[int] = []
-                for de in self._split_top_level_commas(dims_str):
-                    v = self._safe_int_expr(de)
-                    if v is None:
-                        v = self.unknown_dim_default
-                    if v < 0:
-                        v = 0
-                    dims.append(v)
+            elif kind == KC_V24_Transfer_BASIClexer._TK_ARRAY:
+                if in_dim and depth == 0:
+                    # Deklaration NAME(d1, d2, ...)
+                    dims, i = self._read_dims(tokens, i)
+                    elems = 1
+                    for de in dims:
+                        v = self._safe_int_expr(de)
+                        if v is None:
+                            v = self.unknown_dim_default
+                        if v < 0:
+                            v = 0
+                        elems *= self._elements_for_dim(v)
 
-                elems = 1
-                for max_index in dims:
-                    elems *= self._elements_for_dim(max_index)
+                    factor = self.string_factor if text.endswith("$") else self.numeric_factor
+                    units += elems * factor
 
-                factor = self.string_factor if name.endswith("$") else self.numeric_factor
-                units += elems * factor
+                # FN...(...) ist Funktionsaufruf, keine Feldvariable
+                elif not after_fn and text not in self.non_arrays:
+                    refs += 1
 
-            i = pos + 3
+            after_fn = False
 
-        return units
+        return refs, units
 
-    # ---------------- Internals ----------------
+    @staticmethod
+    def _read_dims(tokens: Tuple[BasicToken, ...], i: int) -> Tuple[List[str], int]:
+        """
+        Liest die Dimensionsausdrücke einer Deklaration ab der öffnenden Klammer (tokens[i]).
+        Rückgabe: (Ausdrücke als Text, Index nach der schließenden Klammer)
+        """
+        dims: List[str] = []
+        cur: List[str] = []
+        depth = 0
+        n = len(tokens)
+        while i < n:
+            kind, text, _ = tokens[i]
+            i += 1
+            if kind == KC_V24_Transfer_BASIClexer._TK_OP:
+                if text == "(":
+                    depth += 1
+                    if depth == 1:
+                        continue
+                elif text == ")":
+                    depth -= 1
+                    if depth == 0:
+                        break
+                elif text == "," and depth == 1:
+                    dims.append("".join(cur))
+                    cur = []
+                    continue
+            cur.append(text)
+        tail = "".join(cur).strip()
+        if tail or dims:
+            dims.append(tail)
+        return dims, i
 
     def _elements_for_dim(self, max_index: int) -> int:
         # option_base=0 => 0..max_index => max_index+1
@@ -177,45 +160,6 @@ class BasicLineDimAnalyzer:
         base = 0 if self.option_base <= 0 else 1
         return max(0, max_index - base + 1)
 
-    @staticmethod
-    def _is_letter(c: str) -> bool:
-        return ("A" <= c <= "Z") or ("a" <= c <= "z")
-
-    @staticmethod
-    def _is_alnum(c: str) -> bool:
-        return c.isdigit() or BasicLineDimAnalyzer._is_letter(c)
-
-    @staticmethod
-    def _skip_ws(s: str, idx: int) -> int:
-        n = len(s)
-        while idx < n and s[idx].isspace():
-            idx += 1
-        return idx
-
-    @staticmethod
-    def _strip_basic_line_number(line: str) -> str:
-        return re.sub(r"^\s*\d+\s*", "", line, count=1)
-
-    @staticmethod
-    def _split_top_level_commas(s: str) -> List[str]:
-        parts: List[str] = []
-        cur: List[str] = []
-        depth = 0
-        for ch in s:
-            if ch == "(":
-                depth += 1
-            elif ch == ")":
-                depth = max(0, depth - 1)
-            if ch == "," and depth == 0:
-                parts.append("".join(cur).strip())
-                cur = []
-            else:
-                cur.append(ch)
-        tail = "".join(cur).strip()
-        if tail:
-            parts.append(tail)
-        return parts
-
     @staticmethod
     def _safe_int_expr(expr: str) -> Optional[int]:
         """
@@ -259,96 +203,3 @@ class BasicLineDimAnalyzer:
             return int(ev(node))
         except Exception:
             return None
-
-    @staticmethod
-    def _strip_strings_and_comments(line: str) -> str:
-        """
-        Ersetzt Stringliterale durch Leerzeichen und schneidet Kommentare ab (', REM, !).
-        """
-        out: List[str] = []
-        i = 0
-        n = len(line)
-        in_string = False
-
-        while i < n:
-            ch = line[i]
-
-            if in_string:
-                if ch == '"':
-                    if i + 1 < n and line[i + 1] == '"':
-                        out.append("  ")
-                        i += 2
-                        continue
-                    in_string = False
-                    out.append(" ")
-                else:
-                    out.append(" ")
-                i += 1
-                continue
-
-            if ch == '"':
-                in_string = True
-                out.append(" ")
-                i += 1
-                continue
-
-            if ch == "'":
-                break
-            if ch == "!" and (i == 0 or not line[i - 1].isalnum()):
-                break
-
-            # REM als Kommentar (best effort)
-            if line[i:i+3].upper() == "REM":
-                prev = line[i - 1] if i > 0 else " "
-                nxt = line[i + 3] if i + 3 < n else " "
-                if not prev.isalnum() and not nxt.isalnum():
-                    break
-
-            out.append(ch)
-            i += 1
-
-        return "".join(out)
-
-    def _remove_dim_statements(self, line: str) -> str:
-        """
-        Entfernt DIM-Statements (best effort), damit DIM-Deklarationen nicht als Feldzugriffe zählen.
-        """
-        code = self._strip_basic_line_number(line)
-        raw = self._strip_strings_and_comments(code)
-        up = raw.upper()
-        out = list(raw)
-
-        i = 0
-        while True:
-            pos = up.find("DIM", i)
-            if pos < 0:
-                break
-
-            prev = up[pos - 1] if pos > 0 else " "
-            if prev.isalnum() or prev == "$":
-                i = pos + 3
-                continue
-
-            j = pos + 3
-            if j >= len(up) or not ("A" <= up[j] <= "Z"):
-                i = pos + 3
-                continue
-
-            # bis ':' auf Top-Level
-            k = j
-            depth = 0
-            while k < len(raw):
-                ch = raw[k]
-                if ch == "(":
-                    depth += 1
-                elif ch == ")":
-                    depth = max(0, depth - 1)
-                if ch == ":" and depth == 0:
-                    break
-                k += 1
-
-            for t in range(pos, k):
-                out[t] = " "
-            i = k
-
-        return "".join(out)
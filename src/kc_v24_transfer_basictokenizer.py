@@ -0,0 +1,408 @@
+from typing import Dict, List, Optional, Tuple
+import sys
+
+from kc_v24_transfer_basicdetokenizer import KC_V24_Transfer_BASICdetokenizer
+
+# Gegenstück zum Detokenizer:
+# erzeugt aus einem BASIC-Listing (KC-Zeichenkodierung) den tokenisierten
+# HC-BASIC-Programmbereich, wie ihn das BASIC des KC beim Eintippen der Zeilen
+# im Speicher ablegt (verkettete Zeilen ab 0x0401, Abschluss mit 0x00 0x00 0x00)
+# Damit können BASIC-Listings als Speicherabbild per ESC-T geladen werden,
+# statt Zeile für Zeile als Tastatureingaben übertragen zu werden
+class KC_V24_Transfer_BASICtokenizer:
+    """Tokenizer für HC-/KC-BASIC-Programme (KC85/3, KC85/4)."""
+
+    # Schlüsselwörter in Token-Reihenfolge - das BASIC des KC durchsucht seine
+    # Schlüsselworttabelle ebenfalls in dieser Reihenfolge, der erste Treffer gewinnt
+    # (z.B. ATN vor AT, INKEY$ vor INK, KEYLIST vor KEY)
+    _KEYWORDS: List[Tuple[str, int]] = sorted(
+        ((kw, tok) for tok, kw in KC_V24_Transfer_BASICdetokenizer.HC_BASIC_TOKENS.items()),
+        key=lambda e: e[1],
+    )
+
+    _TOKEN_PRINT = 0x9E
+    _TOKEN_DATA  = 0x83
+    _TOKEN_REM   = 0x8E
+    _TOKEN_REM2  = 0x9C    # "!"
+    _TOKEN_LET   = 0x87
+
+    _MAX_LINE_NUMBER = 65529
+    _MAX_INPUT       = 73      # Eingabezeile des KC: 72 Zeichen, jedes weitere überschreibt das letzte
+    _BASIC_START_ADDR = 0x0401
+
+    def __init__(self) -> None:
+        # Sammelliste für Hinweise/Warnungen
+        self.process_messages: List[str] = []
+
+        # Schlüsselworttabelle nach Anfangszeichen vorsortieren (Reihenfolge bleibt erhalten)
+        self._kw_by_char: Dict[str, List[Tuple[bytes, int]]] = {}
+        for kw, tok in self._KEYWORDS:
+            self._kw_by_char.setdefault(kw[0], []).append((kw.encode("latin1"), tok))
+
+    def _match_keyword(self, line: bytes, i: int, first: int) -> Optional[Tuple[int, int]]:
+        """Liefert (Token, Länge) des ersten passenden Schlüsselwortes an Position i oder None."""
+        for kw, tok in self._kw_by_char.get(chr(first), ()):
+            if line[i:i + len(kw)].upper() == kw:
+                return tok, len(kw)
+        return None
+
+    def tokenize_line(self, text: bytes, line_no: int = 0) -> bytes:
+        """
+        Tokenisiert den Textanteil einer einzelnen BASIC-Zeile (ohne Zeilennummer).
+
+        Verhalten wie beim Eintippen am KC:
+        - Schlüsselwörter werden außerhalb von Strings überall erkannt (auch in Variablennamen)
+        - '?' wird zu PRINT
+        - Kleinbuchstaben werden außerhalb von Strings, REM und DATA zu Großbuchstaben
+        - nach REM/! bleibt der Rest der Zeile unverändert
+        - nach DATA bleibt der Text bis zum nächsten ':' (außerhalb von Strings) unverändert
+        - Leerzeichen bleiben erhalten, auch direkt nach REM/! und am Zeilenende
+        """
+        out = bytearray()
+        in_string = False
+        in_data = False
+        i = 0
+        n = len(text)
+
+        while i < n:
+            b = text[i]
+
+            if b >= 0x80 and not in_string:
+                raise ValueError(f"Unzulässiges Zeichen 0x{b:02X} in Zeile {line_no} an Position {i}")
+
+            if b == 0x22:  # Anführungszeichen "
+                in_string = not in_string
+                out.append(b)
+                i += 1
+                continue
+
+            if in_string:
+                out.append(b)
+                i += 1
+                continue
+
+            if in_data:
+                if b == 0x3A:  # ':' beendet DATA
+                    in_data = False
+                out.append(b)
+                i += 1
+                continue
+
+            if 0x61 <= b <= 0x7A:  # Kleinbuchstaben außerhalb von Strings/REM/DATA wandelt der KC in Großbuchstaben
+                b -= 0x20
+
+            if b == 0x3F:  # '?' -> PRINT
+                out.append(self._TOKEN_PRINT)
+                i += 1
+                continue
+
+            match = self._match_keyword(text, i, b)
+            if match is None:
+                out.append(b)
+                i += 1
+                continue
+
+            tok, length = match
+            out.append(tok)
+            i += length
+
+            if tok in (self._TOKEN_REM, self._TOKEN_REM2):
+                # Kommentar: Rest der Zeile wörtlich übernehmen
+                out += text[i:]
+                break
+
+            if tok == self._TOKEN_DATA:
+                in_data = True
+
+        if 0x00 in out:
+            raise ValueError(f"Unzulässiges Zeichen 0x00 in Zeile {line_no}")
+
+        return bytes(out)
+
+    def parse_listing(self, listing: str, kc_input: bool = True) -> Optional[Dict[int, bytes]]:
+        """
+        Zerlegt ein Listing in {Zeilennummer: Zeilentext (bytes)}.
+        Wie beim Eintippen ersetzt eine spätere Zeile eine frühere gleicher Nummer,
+        eine Zeile nur mit Nummer löscht die Zeile. Längere Zeilen als _MAX_INPUT werden wie bei der
+        Eingabe am KC gekürzt: die ersten 72 Zeichen und das zuletzt getippte (kc_input=False: ungekürzt).
+        Gibt None zurück, wenn eine Zeile keine gültige Zeilennummer hat.
+        """
+        lines: Dict[int, bytes] = {}
+        text = listing.replace("\r\n", "\n").replace("\r", "\n")
+
+        for nr, raw in enumerate(text.split("\n"), start=1):
+            s = raw.lstrip(" ")   # Leerzeichen am Zeilenende speichert der KC mit
+            if not s.rstrip(" "):
+                continue
+
+            j = 0
+            while j < len(s) and s[j].isdigit() and s[j].isascii():
+                j += 1
+            if j == 0 or j > 5:
+                self.process_messages.append(f"Zeile {nr} hat keine gültige Zeilennummer: {s[:20]!r}")
+                return None
+
+            line_no = int(s[:j])
+            if line_no > self._MAX_LINE_NUMBER:
+                self.process_messages.append(f"Zeilennummer {line_no} in Zeile {nr} zu groß")
+                return None
+
+            body = s[j:].lstrip(" ")
+            if not body.rstrip(" "):
+                lines.pop(line_no, None)
+                continue
+
+            if kc_input and len(s) > self._MAX_INPUT:
+                self.process_messages.append(
+                    f"Hinweis: Zeile {line_no} - wie bei der Eingabe am KC auf {self._MAX_INPUT} Zeichen gekürzt"
+                )
+                s = s[:self._MAX_INPUT - 1] + s[-1]
+                body = s[j:].lstrip(" ")
+            lines[line_no] = body.encode("latin1")
+
+        return lines
+
+    def tokenize_hc_basic(self, listing: str, start_addr: int = _BASIC_START_ADDR,
+                          min_line_no: int = 0) -> Optional[bytes]:
+        """
+        Wandelt ein BASIC-Listing (KC-Zeichenkodierung, Zeilenende CR/LF) in den
+        tokenisierten HC-BASIC-Programmbereich um.
+
+        Aufbau je Zeile: <Zeiger nächste Zeile (LE)> <Zeilennummer (LE)> <Tokens...> 0x00
+        Abschluss: 0x00 0x00 (Zeiger auf "keine weitere Zeile")
+
+        start_addr:  Adresse, an der das Programm im KC liegt (für die Zeilenzeiger)
+        min_line_no: Zeilen mit kleinerer Nummer werden übergangen (z.B. BASICODE ab Zeile 1000)
+        Gibt None zurück, wenn das Listing nicht tokenisiert werden konnte.
+        """
+        try:
+            lines = self.parse_listing(listing)
+            if not lines:
+                return None
+
+            skipped = [n for n in lines if n < min_line_no]
+            if skipped:
+                self.process_messages.append(
+                    f"Hinweis: {len(skipped)} Zeile(n) unter {min_line_no} übergangen"
+                )
+                for n in skipped:
+                    del lines[n]
+                if not lines:
+                    return None
+
+            prog = bytearray()
+            addr = start_addr
+            for line_no in sorted(lines):
+                body = self.tokenize_line(lines[line_no], line_no=line_no)
+                next_addr = addr + 4 + len(body) + 1
+                prog += bytes((next_addr & 0xFF, (next_addr >> 8) & 0xFF,
+                               line_no & 0xFF, (line_no >> 8) & 0xFF))
+                prog += body
+                prog.append(0x00)
+                addr = next_addr
+
+            prog += b"\x00\x00"
+
+            if addr + 2 > 0xC000:
+                raise ValueError(f"Programm passt nicht in den RAM (Ende 0x{addr + 2:04X})")
+
+            return bytes(prog)
+
+        except ValueError as e:
+            self.process_messages.append(str(e))
+            print(f"tokenize_hc_basic: {e}")
+            return None
+
+    @staticmethod
+    def program_lines(program: bytes) -> Dict[int, bytes]:
+        """Zerlegt einen tokenisierten Programmbereich (ab 0x0401) in {Zeilennummer: Tokens der Zeile}."""
+        lines: Dict[int, bytes] = {}
+        i = 0
+        while i + 4 <= len(program) and (program[i] or program[i + 1]):
+            end = program.find(b"\x00", i + 4)
+            if end < 0:
+                break
+            lines[program[i + 2] | (program[i + 3] << 8)] = bytes(program[i + 4:end])
+            i = end + 1
+        return lines
+
+    # Vergleichsformen für die Rücktransformation (-check). Der Detokenizer setzt Leerzeichen um Schlüsselwörter,
+    # schreibt ? als PRINT und Schlüsselwörter groß, kompakt zusätzlich REM als !, ohne LET und ohne Kommentartext.
+    # Genau das wird angeglichen - Strings, Kommentare und alle übrigen Zeichen müssen übereinstimmen:
+    #   - Leerzeichen außerhalb von Strings und Kommentaren (auch in DATA) zählen nicht
+    #   - außerhalb von Strings und Kommentaren: Groß-/Kleinschreibung, ? = PRINT, LET entfällt
+    #   - REM = !; comments=False: Kommentartext entfällt (kompaktes Listing)
+
+    @classmethod
+    def compare_text(cls, text: str, comments: bool = True) -> str:
+        """Vergleichsform einer Listing-Zeile (Text hinter der Zeilennummer)."""
+        out: List[str] = []
+        upper = text.upper()
+        in_string = False
+        i = 0
+        while i < len(text):
+            c = text[i]
+            if c == '"':
+                in_string = not in_string
+            elif in_string:
+                pass
+            elif c == "!" or upper.startswith("REM", i):
+                out.append("!")
+                if comments:
+                    out.append(text[i + (1 if c == "!" else 3):])
+                break
+            elif c == " ":
+                i += 1
+                continue
+            elif c == "?" or upper.startswith("LET", i):
+                out.append("PRINT" if c == "?" else "")
+                i += 1 if c == "?" else 3
+                continue
+            else:
+                c = upper[i]
+            out.append(c)
+            i += 1
+        return "".join(out)
+
+    @classmethod
+    def compare_form(cls, body: bytes, comments: bool = True) -> bytes:
+        """Vergleichsform einer tokenisierten Zeile."""
+        out = bytearray()
+        in_string = False
+        for i, b in enumerate(body):
+            if b == 0x22:
+                in_string = not in_string
+            elif not in_string and b in (cls._TOKEN_REM, cls._TOKEN_REM2):
+                out.append(cls._TOKEN_REM2)
+                if comments:
+                    out += body[i + 1:]
+                break
+            elif not in_string and b in (0x20, cls._TOKEN_LET):
+                continue
+            out.append(b)
+        return bytes(out)
+
+    def get_last_line_number(self, listing: str) -> Optional[int]:
+        """Gibt die höchste Zeilennummer des Listings zurück (oder None)."""
+        lines = self.parse_listing(listing)
+        if not lines:
+            return None
+        return max(lines)
+
+
+# Einfacher CLI-Einstiegspunkt
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print(
+            "python kc_v24_transfer_basictokenizer.py <datei.txt> [-fileout] [-hcencode] [-check] [-kcc <datei.kcc>]"
+            ," -fileout: Es wird eine Datei <datei.txt.sss> (SSS-Diskettenformat) mit dem tokenisierten Programm angelegt"
+            ,"-hcencode: Das Listing liegt bereits in HC-BASIC-Zeichenkodierung vor"
+            ,"   -check: Rücktransformation prüfen: Listing -> tokenisieren -> detokenisieren muss wieder das Listing ergeben"
+            ,"           (verglichen wird zeilenweise nach KC_V24_Transfer_BASICtokenizer.compare_form: Leerzeichen außerhalb"
+            ,"           von Strings und Kommentaren zählen nicht, im kompakten Listing auch die Kommentartexte nicht;"
+            ,"           zu lange Zeilen des Listings werden wie bei der Eingabe am KC gekürzt)"
+            ,"     -kcc: das tokenisierte Programm Byte für Byte mit dem Programm in einer KCC/KCB/SSS-Datei vergleichen"
+            ,""
+            ,"Konvertiert ein BASIC-Listing in tokenisierte HC-Basic-Binärdaten des KC85/4"
+            ,"Als Eingabe dienen Textdateien mit Zeilennummern oder KCC/KCB-/SSS-Dateien mit tokenisiertem Programm (nur mit -check)."
+            , sep="\n"
+            , file=sys.stderr
+        )
+        sys.exit(1)
+
+    filename = sys.argv[1]
+    fileout_flag  = ("-fileout"  in sys.argv[2:])
+    hcencode_flag = ("-hcencode" in sys.argv[2:])
+    check_flag    = ("-check"    in sys.argv[2:])
+    kcc_name      = sys.argv[sys.argv.index("-kcc") + 1] if "-kcc" in sys.argv[2:-1] else None
+
+    try:
+        with open(filename, "rb") as f:
+            data = f.read()
+    except OSError as e:
+        print(f"Fehler beim Lesen von '{filename}': {e}", file=sys.stderr)
+        sys.exit(1)
+
+    detok = KC_V24_Transfer_BASICdetokenizer()
+    tok   = KC_V24_Transfer_BASICtokenizer()
+
+    # tokenisierte Programme aus KCC/KCB- oder SSS-Dateien nur für die Rücktransformation
+    from kc_v24_transfer_bytekernels import KC_V24_Transfer_ByteKernels
+    from kc_v24_transfer_kcfileformattools import KC_V24_Transfer_FileFormatTools, ParseResult
+    pr = KC_V24_Transfer_FileFormatTools().parseBinData(bytearray(data))
+    if pr.type == ParseResult._TYPE_BASICMC and pr.format != ParseResult._FORMAT_TEXT:
+        program_bytes = bytes(pr.transferdata[tok._BASIC_START_ADDR - pr.start:])
+        listings = [detok.detokenize_hc_basic(program=program_bytes, compact=c) for c in (False, True)]
+        if None in listings:
+            print("Fehler: Daten konnten nicht detokenisiert werden")
+            sys.exit(1)
+    else:
+        if hcencode_flag:
+            listing = data.decode("latin1")
+        else:
+            # latin1 -> KC (ä/ö/ü/ß usw.)
+            listing = KC_V24_Transfer_ByteKernels.latin_to_kc(data).decode("latin1")
+        program_bytes = tok.tokenize_hc_basic(listing)
+        if program_bytes is None:
+            print("Fehler: Listing konnte nicht tokenisiert werden")
+            for msg in tok.process_messages:
+                print(" -", msg)
+            sys.exit(1)
+        listings = [detok.detokenize_hc_basic(program=program_bytes, compact=c) for c in (False, True)]
+        print(f"{len(program_bytes)} Bytes tokenisiert")
+
+    if check_flag:
+        # Vergleich mit dem Original: Zeilen des Listings (Text) bzw. des Programms aus der Datei (Tokens)
+        if pr.format == ParseResult._FORMAT_TEXT:
+            original = {nr: body.decode("latin1") for nr, body in KC_V24_Transfer_BASICtokenizer().parse_listing(listing).items()}
+            form = tok.compare_text
+        else:
+            original = tok.program_lines(program_bytes)
+            form = tok.compare_form
+        failed = False
+        for compact, lst in zip((False, True), listings):
+            result = tok.parse_listing(lst, kc_input=False) or {}
+            if pr.format != ParseResult._FORMAT_TEXT:
+                result = {nr: tok.tokenize_line(body, line_no=nr) for nr, body in result.items()}
+            else:
+                result = {nr: body.decode("latin1") for nr, body in result.items()}
+            diffs = [nr for nr in sorted(set(original) | set(result))
+                     if nr not in original or nr not in result or form(original[nr], not compact) != form(result[nr], not compact)]
+            failed = failed or bool(diffs)
+            print(f"Rücktransformation ({'compact' if compact else 'normal'}): "
+                  + ("OK" if not diffs else f"FEHLER in {len(diffs)} von {len(original)} Zeilen"))
+            for nr in diffs[:5]:
+                print(f"  - {nr} {original.get(nr)!r}\n  + {nr} {result.get(nr)!r}")
+        if failed:
+            sys.exit(2)
+
+    if kcc_name is not None:
+        # Vergleich mit dem Programm, wie es der KC selbst gespeichert hat
+        pr_kcc = KC_V24_Transfer_FileFormatTools().parseBinData(bytearray(open(kcc_name, "rb").read()))
+        if pr_kcc.type != ParseResult._TYPE_BASICMC or pr_kcc.start is None:
+            print(f"Fehler: {kcc_name} enthält kein tokenisiertes BASIC-Programm")
+            sys.exit(1)
+        kc_lines = tok.program_lines(bytes(pr_kcc.transferdata[tok._BASIC_START_ADDR - pr_kcc.start:]))
+        own      = tok.program_lines(program_bytes)
+        diffs    = [nr for nr in sorted(set(kc_lines) | set(own)) if kc_lines.get(nr) != own.get(nr)]
+        print(f"Vergleich mit {kcc_name}: "
+              + ("identisch" if not diffs else f"{len(diffs)} von {len(kc_lines)} Zeilen abweichend"))
+        for nr in diffs:
+            print(f"  KC  {nr}: {kc_lines.get(nr, b'')!r}\n  neu {nr}: {own.get(nr, b'')!r}")
+        if diffs:
+            sys.exit(2)
+
+    if fileout_flag and pr.format == ParseResult._FORMAT_TEXT:
+        outname = filename + ".sss"
+        try:
+            with open(outname, "wb") as f_out:
+                f_out.write(bytes((len(program_bytes) & 0xFF, len(program_bytes) >> 8)) + program_bytes)
+            print(f"Datei {outname} erzeugt")
+        except OSError as e:
+            print(f"Fehler beim Schreiben von '{outname}': {e}", file=sys.stderr)
+
+    # ggf. Hinweise ausgeben
+    if tok.process_messages or detok.process_messages:
+        print("\nProzessmeldungen:")
+        for msg in tok.process_messages + detok.process_messages:
+            print(" -", msg)
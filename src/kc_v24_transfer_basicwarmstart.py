@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import sys
+from typing import Optional
+
+from kc_v24_transfer_kcfileformattools import ParseResult
+
+# BASIC-Warmstart per ESC-U (bin/Basic_WarmStart.bin, Quelltext asm/Basic_WarmStart.asm):
+# Ein BASIC-Speicherabbild (Systemblock ab 0300h mit den Zeigern aus _KCB_SYS_MEM0300, Programm ab 0401h)
+# wurde bisher über den Tastaturmodus gestartet - REBASIC und RUN eingetippt, jeweils mit festen Wartezeiten.
+# Der Warmstart-Stub wird direkt vor den Systemblock gelegt und mit dem Speicherabbild in einem ESC-T
+# übertragen; ein ESC-U auf den Stub schaltet das BASIC-ROM ein, springt über den Warmstart-Vektor (0300h)
+# in BASIC und gibt am Prompt die RUN-Zeile (ggf. mit runlinebasic) ein.
+
+
+class KC_V24_Transfer_BasicWarmStart:
+    """Speicherabbild aus Warmstart-Stub, RUN-Zeile und BASIC-Speicherabbild."""
+
+    _START     = 0x0280    # ORG des Stubs
+    _SYS_START = 0x0300    # Beginn des BASIC-Systemblocks (Warmstart-Vektor)
+
+    @classmethod
+    def run_line(cls, pr: ParseResult) -> bytes:
+        """Eingabe am BASIC-Prompt: RUN bzw. RUN <runlinebasic>, mit CR abgeschlossen."""
+        line = f"RUN {pr.runlinebasic}" if pr.runlinebasic else "RUN"
+        return line.encode("ascii", errors="replace") + b"\r"
+
+    @classmethod
+    def build_image(cls, pr_stub: Optional[ParseResult], pr: ParseResult) -> Optional[ParseResult]:
+        """
+        Speicherabbild <Stub><RUN-Zeile><00h ...><pr> ab 0280h mit Einsprung (callu) auf den Stub;
+        None, wenn kein Stub geladen ist oder pr kein BASIC-Speicherabbild ab 0300h ist.
+        """
+        if pr_stub is None or pr_stub.start != cls._START:
+            return None
+        if pr.errorstate or pr.type != ParseResult._TYPE_BASICMC or pr.start != cls._SYS_START:
+            return None
+
+        head = bytes(pr_stub.transferdata) + cls.run_line(pr)
+        if cls._START + len(head) > cls._SYS_START:
+            return None
+
+        image = pr.without_data()
+        image.start        = cls._START
+        image.transferdata = head.ljust(cls._SYS_START - cls._START, b"\x00") + bytes(pr.transferdata)
+        image.callh        = cls._START
+        image.callp        = cls._START
+        image.callu        = cls._START
+        return image
+
+
+# Einfacher CLI-Einstiegspunkt
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print(
+            "python kc_v24_transfer_basicwarmstart.py <datei.kcb|datei.sss>"
+            ,""
+            ,"Zeigt das Speicherabbild mit Warmstart-Stub für ein BASIC-Programm."
+            , sep="\n"
+            , file=sys.stderr
+        )
+        sys.exit(1)
+
+    from pathlib import Path
+    from kc_v24_transfer_kcfileformattools import KC_V24_Transfer_FileFormatTools
+
+    stub = ParseResult()
+    stub.start, stub.format, stub.errorstate = KC_V24_Transfer_BasicWarmStart._START, ParseResult._FORMAT_RAW, False
+    stub.transferdata = (Path(__file__).parent / "bin" / "Basic_WarmStart.bin").read_bytes()
+    pr = KC_V24_Transfer_FileFormatTools().parseBinData(Path(sys.argv[1]).read_bytes())
+    image = KC_V24_Transfer_BasicWarmStart.build_image(stub, pr)
+    if image is None:
+        print("kein BASIC-Speicherabbild ab 0300h", file=sys.stderr)
+        sys.exit(1)
+    print(f"Speicherabbild {image.start:04X}-{image.end:04X} ({len(image.transferdata)} Bytes), "
+          f"ESC-U {image.callu:04X}, Eingabe: {KC_V24_Transfer_BasicWarmStart.run_line(pr).decode('ascii').strip()}")
@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Optional
+
+from kc_v24_transfer_kcfileformattools import ParseResult
+
+
+@dataclass(frozen=True)
+class BaudStep:
+    """Eine Stufe der Kalibrierung: Datenrate der Gegenstelle, CTC-Zeitkonstante des Stubs, Stoppbits."""
+    baudrate: int       # Datenrate am PC
+    ctc:      int       # Zeitkonstante für CTC-Kanal 2 (RUN_CTC im Stub)
+    stopbits: int       # 2 = 8N2 (wie CAOS), 1 = 8N1
+
+    @property
+    def bytes_per_second(self) -> float:
+        return self.baudrate / (9 + self.stopbits)
+
+    def __str__(self) -> str:
+        return f"{self.baudrate} Baud 8N{self.stopbits} (CTC {self.ctc:02X}h)"
+
+    def to_config(self) -> str:
+        return f"{self.baudrate},{self.ctc},{self.stopbits}"
+
+    @staticmethod
+    def from_config(value: str) -> Optional["BaudStep"]:
+        try:
+            baudrate, ctc, stopbits = (int(v) for v in value.split(","))
+        except ValueError:
+            return None
+        if not 0 < ctc <= 0xFF or stopbits not in (1, 2):
+            return None
+        return BaudStep(baudrate, ctc, stopbits)
+
+
+class KC_V24_Transfer_BaudLadder:
+    """
+    Kalibrierung der Turbo-Datenrate:
+    Ein Testmuster wird über den Polling-Stub mit steigender Datenrate (und mit 2 bzw. 1 Stoppbit)
+    übertragen und auf dem KC von bin/V24_Check.bin geprüft. Das Prüfprogramm zeigt das Ergebnis an
+    und meldet 'O' bzw. 'E' über die V24 zurück.
+
+    Der CTC-Kanal des M003 teilt (bei x16-Takt des DART) etwa 55,4 kHz - die PC-Datenraten 57600/n
+    passen zur Zeitkonstante n (alle mit derselben Abweichung von knapp 4 %).
+    57600 Baud (Zeitkonstante 1) ist damit die höchste erreichbare Stufe.
+    """
+
+    # nach Durchsatz aufsteigend sortiert
+    _LADDER = (
+        BaudStep( 9600, 6, 2), BaudStep( 9600, 6, 1),
+        BaudStep(19200, 3, 2), BaudStep(19200, 3, 1),
+        BaudStep(28800, 2, 2), BaudStep(28800, 2, 1),
+        BaudStep(57600, 1, 2), BaudStep(57600, 1, 1),
+    )
+    DEFAULT_STEP = BaudStep(57600, 1, 2)   # bisherige Einstellung (ohne Kalibrierung)
+
+    # CTC- und DART-Tabelle der Stubs: RUN_CTC (47h, Zeitkonstante) gefolgt von RUN_SIO
+    _RUN_TABLE = bytes.fromhex("18 02 E2 14 44 03 E1 05 EA 11 18")
+
+    _CHECK_ADDR     = 0x0300
+    _CHECK_ADR_OFS  = 1       # LD HL,Musteradresse
+    _CHECK_LEN_OFS  = 4       # LD BC,Musterlänge
+    _CHECK_SEED_OFS = 12      # XOR Kennung
+    _PATTERN_ADDR   = 0x0400
+    _PATTERN_LEN    = 0x1000
+
+    def steps(self) -> tuple[BaudStep, ...]:
+        return self._LADDER
+
+    def ctc_offset(self, stubdata) -> int:
+        """Offset der Zeitkonstante (RUN_CTC+1) im Stub, -1 wenn nicht gefunden."""
+        pos = bytes(stubdata).find(b"\x47")
+        while pos >= 0:
+            if bytes(stubdata[pos + 2:pos + 2 + len(self._RUN_TABLE)]) == self._RUN_TABLE:
+                return pos + 1
+            pos = bytes(stubdata).find(b"\x47", pos + 1)
+        return -1
+
+    def patch_stub(self, pr_stub: ParseResult, ctc: int) -> ParseResult:
+        """Kopie des Stubs mit geänderter Zeitkonstante (RUN_CTC); unverändert, wenn sie schon passt."""
+        ofs = self.ctc_offset(pr_stub.transferdata)
+        if ofs < 0:
+            raise ValueError(f"Stub {pr_stub.start:04X}: RUN_CTC nicht gefunden")
+        if pr_stub.transferdata[ofs] == ctc:
+            return pr_stub
+
+        data = bytearray(pr_stub.transferdata)
+        data[ofs] = ctc
+        return self._copy_pr(pr_stub, pr_stub.start, data)
+
+    def stub_ctc_patch(self, pr_stub: ParseResult, ctc: int) -> ParseResult:
+        """1-Byte-ESC-T, das im bereits geladenen Stub die Zeitkonstante setzt."""
+        ofs = self.ctc_offset(pr_stub.transferdata)
+        if ofs < 0:
+            raise ValueError(f"Stub {pr_stub.start:04X}: RUN_CTC nicht gefunden")
+        return self._copy_pr(pr_stub, pr_stub.start + ofs, bytes((ctc,)))
+
+    def build_checker(self, checkdata) -> ParseResult:
+        """Prüfprogramm mit Musteradresse/-länge als ParseResult (callu = Startadresse)."""
+        data = bytearray(checkdata)
+        data[self._CHECK_ADR_OFS]     = self._PATTERN_ADDR & 0xFF
+        data[self._CHECK_ADR_OFS + 1] = (self._PATTERN_ADDR >> 8) & 0xFF
+        data[self._CHECK_LEN_OFS]     = self._PATTERN_LEN & 0xFF
+        data[self._CHECK_LEN_OFS + 1] = (self._PATTERN_LEN >> 8) & 0xFF
+
+        pr = ParseResult()
+        pr.format       = ParseResult._FORMAT_RAW
+        pr.type         = ParseResult._TYPE_MC
+        pr.start        = self._CHECK_ADDR
+        pr.end          = pr.start + len(data)
+        pr.transferdata = data
+        pr.callh = pr.callp = pr.callu = pr.start
+        pr.errorstate   = False
+        return pr
+
+    def checker_seed_patch(self, pr_checker: ParseResult, seed: int) -> ParseResult:
+        """1-Byte-ESC-T, das im geladenen Prüfprogramm die Kennung der Stufe setzt."""
+        return self._copy_pr(pr_checker, pr_checker.start + self._CHECK_SEED_OFS, bytes((seed & 0xFF,)))
+
+    def build_pattern(self, seed: int) -> ParseResult:
+        """Testmuster: Byte[i] = (i low) XOR (i high) XOR seed - enthält alle Bytewerte (auch 00h, 1Bh, FFh)."""
+        seed &= 0xFF
+        data = bytearray(((i & 0xFF) ^ (i >> 8) ^ seed) for i in range(self._PATTERN_LEN))
+
+        pr = ParseResult()
+        pr.format       = ParseResult._FORMAT_RAW
+        pr.type         = ParseResult._TYPE_MC
+        pr.start        = self._PATTERN_ADDR
+        pr.end          = pr.start + len(data)
+        pr.transferdata = data
+        pr.errorstate   = False
+        return pr
+
+    def _copy_pr(self, pr_src: ParseResult, start: int, data) -> ParseResult:
+        pr = ParseResult()
+        pr.format       = pr_src.format
+        pr.type         = pr_src.type
+        pr.start        = start
+        pr.end          = start + len(data)
+        pr.transferdata = data
+        pr.callh, pr.callp, pr.callu = pr_src.callh, pr_src.callp, pr_src.callu
+        pr.errorstate   = False
+        return pr
+
+
+if __name__ == "__main__":
+    import sys
+    from pathlib import Path
+
+    # Selbstprüfung: Zeitkonstante in allen Stubs auffindbar, Muster/Prüfprogramm passend
+    ladder = KC_V24_Transfer_BaudLadder()
+    bindir = Path(__file__).resolve().parent / "bin"
+    rc = 0
+    for path in sorted(bindir.glob("Polling_*.bin")):
+        ofs = ladder.ctc_offset(path.read_bytes())
+        print(f"{path.name:32} RUN_CTC+1 bei +{ofs:02X}h" if ofs >= 0 else f"{path.name:32} RUN_CTC nicht gefunden")
+        rc |= ofs < 0
+    checker = ladder.build_checker((bindir / "V24_Check.bin").read_bytes())
+    print(f"V24_Check.bin: {checker.start:04X}-{checker.end:04X}, Muster {ladder._PATTERN_ADDR:04X}+{ladder._PATTERN_LEN:04X}")
+    for step in ladder.steps():
+        print(f"  {step}  ~{step.bytes_per_second:.0f} Bytes/s")
+    sys.exit(rc)
@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import re
+import sys
+from typing import Iterator, List, Optional, Tuple
+
+from kc_v24_transfer_basicdetokenizer import KC_V24_Transfer_BASICdetokenizer
+
+# Byte-Kernel für die Formaterkennung:
+# Zeichensatzumsetzung, Textprüfung, Füllbyte-Läufe und Prolog-Suche arbeiten mit
+# 256-Byte-Tabellen (bytes.translate), bytes.find/rstrip und vorkompilierten
+# Byte-Regexen statt mit Python-Schleifen über jedes Byte - auch mehrere MB große
+# Dateien (z.B. aus WAV-Dateien gewonnene Abzüge) sind damit in wenigen ms geprüft.
+
+
+def _table(pred) -> bytes:
+    """Alle Bytewerte, für die pred zutrifft (als Löschtabelle für bytes.translate)."""
+    return bytes(b for b in range(256) if pred(b))
+
+
+class KC_V24_Transfer_ByteKernels:
+    """Tabellengestützte Byte-Operationen (alle Methoden arbeiten auf bytes/bytearray/memoryview)."""
+
+    # Latin-1 -> KC-Zeichensatz (ä, ö, ü, ß, ...)
+    LATIN_2_KC = bytes(KC_V24_Transfer_BASICdetokenizer._LATIN_2_KC.get(b, b) for b in range(256))
+
+    # Latin-1 -> KC-Tastatureingabe: CR und 0x20-0x7F bleiben, alles andere wird Leerzeichen (LF wird gelöscht)
+    LATIN_2_KC_KEYS = bytes(k if k == 0x0D or 0x20 <= k < 0x80 else 0x20 for k in LATIN_2_KC)
+
+    # zulässige Textzeichen 0x20-0x7E sowie CR (ENTER) und LF (Zeilenumbruch); 0x7F (DEL), 0x80-0xFF
+    # und alle übrigen Steuerzeichen (auch die laut KC85/4-Dokumentation "nicht benutzten") sind unzulässig.
+    # Als Löschtabelle verwendet: nach bytes.translate bleiben nur unzulässige Bytes übrig.
+    _TEXT_VALID = _table(lambda b: (0x20 <= b < 0x7F) or b in (0x0A, 0x0D))
+
+    _PROLOG      = b"\x7F\x7F"
+    _RX_MENUNAME = re.compile(rb"[0-9A-Za-z:]*")   # Zeichen von CAOS-Menünamen: 0-9, A-Z, a-z, ':'
+    _MAX_EPILOG  = 0x1F
+    _SCAN_BLOCK  = 0x10000
+
+    @classmethod
+    def latin_to_kc(cls, data) -> bytes:
+        """Latin-1-Bytes in KC-Codes umsetzen."""
+        return bytes(data).translate(cls.LATIN_2_KC)
+
+    @classmethod
+    def latin_to_kc_keys(cls, data) -> bytes:
+        """Latin-1-Text in KC-Tastaturcodes (Zeilenende nur CR, nicht darstellbare Bytes als Leerzeichen)."""
+        return bytes(data).translate(cls.LATIN_2_KC_KEYS, b"\n")
+
+    @classmethod
+    def is_text_byte(cls, b: int) -> bool:
+        """Einzelnes Byte als KC-Textzeichen zulässig (siehe _TEXT_VALID)?"""
+        return 0 <= b < 256 and cls._TEXT_VALID.find(b) >= 0
+
+    @classmethod
+    def first_invalid_text(cls, data) -> int:
+        """Position des ersten unzulässigen Textzeichens, -1 wenn alle zulässig sind."""
+        view = memoryview(data)
+        # blockweise prüfen - Binärdaten scheitern so schon im ersten Block
+        for ofs in range(0, len(view), cls._SCAN_BLOCK):
+            block = bytes(view[ofs:ofs + cls._SCAN_BLOCK])
+            invalid = block.translate(None, cls._TEXT_VALID)
+            if invalid:
+                # 'invalid' behält die Reihenfolge - sein erstes Byte tritt im Block zuerst als unzulässiges Zeichen auf
+                return ofs + block.find(invalid[:1])
+        return -1
+
+    @staticmethod
+    def trailing_run(data, max_len: Optional[int] = None) -> Tuple[int, int]:
+        """
+        Lauf gleicher Bytes am Ende von data: (Bytewert, Länge), höchstens max_len Bytes.
+        Bei leeren Daten (-1, 0).
+        """
+        n = len(data)
+        if n == 0:
+            return -1, 0
+        view = memoryview(data)
+        if max_len is not None:
+            view = view[max(0, n - max_len):]
+        tail = bytes(view)
+        value = tail[-1]
+        return value, len(tail) - len(tail.rstrip(bytes((value,))))
+
+    @staticmethod
+    def fill_runs(data, min_len: int, max_len: Optional[int] = None) -> Iterator[Tuple[int, int, int]]:
+        """
+        Läufe von mindestens min_len gleichen Bytes: (Start, Ende(exkl.), Bytewert) in aufsteigender Folge.
+        Mit max_len werden längere Läufe in Stücke von höchstens max_len Bytes zerlegt
+        (ein Rest unter min_len entfällt).
+        """
+        if min_len < 2:
+            raise ValueError("fill_runs: min_len muss >= 2 sein")
+        rx = re.compile(rb"(.)\1{%d,}" % (min_len - 1), re.DOTALL)
+        for m in rx.finditer(data):
+            start, end = m.span()
+            value = m.group(1)[0]
+            if max_len is None:
+                yield start, end, value
+                continue
+            while end - start >= min_len:
+                stop = min(end, start + max_len)
+                yield start, stop, value
+                start = stop
+
+    @classmethod
+    def find_prologs(cls, data, start: int = 0) -> List[Tuple[str, int]]:
+        """
+        CAOS-Prologe (7Fh 7Fh <Name> <Epilog <= 1Fh>) in data[start:] suchen
+        (bei bytes ohne Kopie des Bereichs).
+        Rückgabe: Liste (Name, Offset der Einsprungstelle hinter dem Epilog, bezogen auf start).
+        """
+        if not isinstance(data, bytes):
+            data = bytes(data)
+        n = len(data)
+        entries: List[Tuple[str, int]] = []
+
+        # minimaler Prolog = 0x7F 0x7F <Epilog> <Code...>
+        pos = data.find(cls._PROLOG, start)
+        while 0 <= pos and pos + 4 < n:
+            # Name endet spätestens vor dem letzten Byte der Daten
+            m = cls._RX_MENUNAME.match(data, pos + 2, n - 1)
+            name_end = m.end()
+            if name_end > pos + 2 and data[name_end] <= cls._MAX_EPILOG:
+                entries.append((m.group().decode("ascii"), name_end + 1 - start))
+            pos = data.find(cls._PROLOG, name_end + 1)
+        return entries
+
+
+# Einfacher CLI-Einstiegspunkt
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print(
+            "python kc_v24_transfer_bytekernels.py <datei> [...]"
+            ,""
+            ,"Misst die Formaterkennung (parseBinData) und die einzelnen Kernel für die Dateien."
+            , sep="\n"
+            , file=sys.stderr
+        )
+        sys.exit(1)
+
+    import contextlib
+    import io
+    import time
+    from kc_v24_transfer_kcfileformattools import KC_V24_Transfer_FileFormatTools
+
+    tools = KC_V24_Transfer_FileFormatTools()
+    for filename in sys.argv[1:]:
+        try:
+            with open(filename, "rb") as f:
+                data = bytearray(f.read())
+        except OSError as e:
+            print(f"Fehler beim Lesen von '{filename}': {e}", file=sys.stderr)
+            continue
+
+        timings = []
+        for label, func in (
+            ("latin_to_kc",        lambda: KC_V24_Transfer_ByteKernels.latin_to_kc(data)),
+            ("first_invalid_text", lambda: KC_V24_Transfer_ByteKernels.first_invalid_text(data)),
+            ("fill_runs(32)",      lambda: sum(1 for _ in KC_V24_Transfer_ByteKernels.fill_runs(data, 32))),
+            ("find_prologs",       lambda: KC_V24_Transfer_ByteKernels.find_prologs(data)),
+        ):
+            t0 = time.perf_counter()
+            func()
+            timings.append(f"{label} {1000 * (time.perf_counter() - t0):.1f}ms")
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            t0 = time.perf_counter()
+            pr = tools.parseBinData(data)
+            t = time.perf_counter() - t0
+        print(f"{filename}: {len(data)} Bytes, parseBinData {1000 * t:.1f}ms ({pr.format}, {pr.type}, validstate {pr.validstate})")
+        print("   ", ", ".join(timings))
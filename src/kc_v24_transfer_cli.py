@@ -0,0 +1,337 @@
+from __future__ import annotations
+
+import argparse
+import contextlib
+import os
+import sys
+import threading
+import time
+from typing import Optional
+
+from kc_v24_transfer_costmodel import KC_V24_Transfer_CostModel
+from kc_v24_transfer_jobplan import KC_V24_Transfer_JobPlan
+from kc_v24_transfer_session import KC_V24_Transfer_Session, JobEvent, ProcessingResult
+from kc_v24_transfer_watch import KC_V24_Transfer_Watch
+
+# Kommandozeilenwerkzeug ohne GUI (kein tkinter-Import):
+#
+#   python -m kc_v24_transfer send <datei> --port COM3 [--turbo | --no-turbo] [--no-ask] [-q]
+#   python -m kc_v24_transfer info <datei>
+#   python -m kc_v24_transfer watch <datei> --port COM3 [--no-run] [--interval SEK]
+#
+# Datei-Erkennung, Stubs/Bascoder und die Job-Folgen sind dieselben wie in der GUI
+# (KC_V24_Transfer_Session); Fortschritt und Rückfragen laufen über die Konsole (stderr/stdin).
+# Den Fortschritt liefert die JobEngine als Ereignisse; die Debug-Ausgaben der Module (stdout) unterdrückt -q.
+
+EXIT_OK       = 0     # Übertragung abgeschlossen
+EXIT_FAILED   = 1     # Übertragung fehlgeschlagen (Job gescheitert, Timeout)
+EXIT_USAGE    = 2     # Aufruffehler (argparse)
+EXIT_FILE     = 3     # Datei nicht lesbar bzw. Format unbekannt
+EXIT_PORT     = 4     # COM-Port nicht angegeben oder nicht zu öffnen
+EXIT_CANCELED = 130   # Abbruch (Strg+C, RESET-Rückfrage verneint)
+
+
+class KC_V24_Transfer_CLI(KC_V24_Transfer_Session):
+    """KC_V24_Transfer_Session mit Rückfragen und Fortschritt auf der Konsole."""
+
+    _POLL_S = 0.2   # Mindestabstand der Fortschrittsausgaben auf einem Terminal
+
+    # Job-Typen für die Ausgabe (_JT_SENDBIN -> "SENDBIN")
+    _JOB_NAMES = KC_V24_Transfer_CostModel._JOB_NAMES
+
+    def __init__(self, no_ask: bool = False, out=None) -> None:
+        super().__init__()
+        self.no_ask = no_ask
+        self.out    = out if out is not None else sys.stderr
+        self._asking = threading.Event()   # während einer Rückfrage keine Fortschrittsausgabe
+
+    # ------------------------ Rückfragen ------------------------
+
+    def message(self, text: str) -> None:
+        print(text, file=self.out, flush=True)
+
+    def _prompt(self, text: str) -> str:
+        self._asking.set()
+        try:
+            print(f"\n{text} ", end="", file=self.out, flush=True)
+            line = sys.stdin.readline()
+            if not line:   # stdin geschlossen (Batchbetrieb ohne --no-ask)
+                raise EOFError("keine Eingabe möglich (--no-ask verwenden)")
+            return line.strip().lower()
+        finally:
+            self._asking.clear()
+
+    def ask_yes_no(self, title: str, text: str, default: bool = True) -> bool:
+        question = " ".join(text.split())
+        if self.no_ask:
+            self.message(f"{title}: {question} -> {'Ja' if default else 'Nein'} (--no-ask)")
+            return default
+        answer = self._prompt(f"{title}: {question} {'[J/n]' if default else '[j/N]'}")
+        if not answer:
+            return default
+        return answer in ("j", "ja", "y", "yes")
+
+    def confirm_reset(self) -> bool:
+        if self.no_ask:
+            self.message("Hinweis: der KC muss vor der Übertragung per RESET zurückgesetzt sein (--no-ask)")
+            return True
+        return self._prompt("Vor der Übertragung RESET am KC drücken und ENTER (q = Abbruch):") not in ("q", "n", "nein")
+
+    def show_error(self, text: str) -> None:
+        self.message("Fehler: " + " ".join(text.split()))
+
+    # ------------------------ Ablauf ------------------------
+
+    def describe_jobs(self) -> list[str]:
+        """Geplante Jobs mit vorhergesagter Dauer (KC_V24_Transfer_CostModel)."""
+        return self.cost_model.describe(self.jobs)
+
+    def run_jobs(self) -> ProcessingResult:
+        """Arbeitet self.jobs in der JobEngine ab und gibt deren Fortschrittsereignisse aus."""
+        self._tty = getattr(self.out, "isatty", lambda: False)()
+        self._shown = 0.0
+        t0 = time.monotonic()
+
+        unsubscribe = self.engine.subscribe(self._on_engine_event)
+        try:
+            self.start_jobs()
+            try:
+                while not self.engine.join(self._POLL_S):
+                    pass
+            except KeyboardInterrupt:
+                self.message("\nAbbruch angefordert ...")
+                self.stop_all()
+                if not self.engine.join(5.0):
+                    self.abort_port()   # z.B. blockierendes write()
+                    self.engine.join(2.0)
+        finally:
+            unsubscribe()
+
+        if self._tty:
+            print(file=self.out)
+        result = self._processing_result
+        if result is None:   # Engine hängt noch
+            result = ProcessingResult.CANCELED
+        allsent, total, _, _ = self.progress_totals()
+        self.message(f"{self._RESULT_TEXT[result]}: {allsent} von {total} Byte in {time.monotonic() - t0:.1f}s")
+        return result
+
+    _RESULT_TEXT = {
+        ProcessingResult.DONE:     "Übertragung abgeschlossen",
+        ProcessingResult.CANCELED: "Übertragung abgebrochen",
+        ProcessingResult.FAILED:   "Übertragung fehlgeschlagen",
+    }
+
+    def _on_engine_event(self, event: JobEvent) -> None:
+        """Fortschrittsausgabe (im Thread der Engine): auf einem Terminal höchstens alle _POLL_S Sekunden, sonst je Job."""
+        engine = self.engine
+        if event.kind == engine._EV_TIMEOUT:
+            self.message(f"\n{event.text}")
+            return
+        if event.kind == engine._EV_JOBEND and event.job is not None and event.job.send_stats is not None:
+            self.message(("\n" if self._tty else "") + f"  {event.job.send_stats}")
+            return
+        if event.kind not in (engine._EV_JOB, engine._EV_PROGRESS) or self._asking.is_set():
+            return
+        if event.kind == engine._EV_PROGRESS and not (self._tty and event.t - self._shown >= self._POLL_S):
+            return
+        self._shown = event.t
+
+        status = f"[{min(event.jobnr, event.jobcount)}/{event.jobcount}] {self._JOB_NAMES.get(event.job.type, event.job.type)}"
+        if event.total > 0:
+            status += f" {event.sent}/{event.total} Byte ({event.sent * 100 / event.total:.1f}%)"
+        if event.plan_ms > 0:
+            status += f" noch ~{event.eta_s:.0f}s"
+        if self._tty:
+            print(f"\r{status:<60}", end="", file=self.out, flush=True)
+        else:
+            self.message(status)
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m kc_v24_transfer",
+        description="Programme ohne GUI auf einen KC85/4 (M003) übertragen.",
+        epilog=(f"Rückgabewerte: {EXIT_OK} abgeschlossen, {EXIT_FAILED} fehlgeschlagen, {EXIT_USAGE} Aufruffehler, "
+                f"{EXIT_FILE} Datei/Format, {EXIT_PORT} COM-Port, {EXIT_CANCELED} abgebrochen"),
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    send = sub.add_parser("send", help="Datei übertragen (und ggf. starten)")
+    send.add_argument("file", help="Programmdatei (KCC, KCB, SSS, BAS/TXT, BIN ...)")
+    send.add_argument("--port", help="COM-Port (Standard: zuletzt in der GUI gewählter Port)")
+    turbo = send.add_mutually_exclusive_group()
+    turbo.add_argument("--turbo", dest="turbo", action="store_true", default=None,
+                       help="Speicherabbilder mit Schnelllader (Stub, kalibrierte Datenrate) übertragen")
+    turbo.add_argument("--no-turbo", dest="turbo", action="store_false",
+                       help="nur mit 1200 Baud übertragen")
+    send.add_argument("--no-ask", action="store_true",
+                      help="keine Rückfragen: RESET wird vorausgesetzt, Programme werden gestartet")
+    send.add_argument("--timeout", type=int, default=None, metavar="SEK",
+                      help="Timeout für Stillstand des COM-Ports bzw. Jobs ohne Daten (0 = aus, Standard: je Job aus dem Zeitmodell)")
+    send.add_argument("-q", "--quiet", action="store_true", help="Debug-Ausgaben unterdrücken")
+
+    info = sub.add_parser("info", help="Dateiformat und geplante Jobs anzeigen (ohne Übertragung)")
+    info.add_argument("file")
+    info.add_argument("--turbo", dest="turbo", action="store_true", default=None)
+    info.add_argument("--no-turbo", dest="turbo", action="store_false")
+    info.add_argument("-q", "--quiet", action="store_true", default=True, help=argparse.SUPPRESS)
+
+    watch = sub.add_parser("watch", help="Speicherabbild überwachen und nach jeder Änderung nur die geänderten Bereiche senden")
+    watch.add_argument("file", help="Programmdatei (KCC, KCB, BIN ...), z.B. Ausgabe des Assemblers")
+    watch.add_argument("--port", help="COM-Port (Standard: zuletzt in der GUI gewählter Port)")
+    turbo = watch.add_mutually_exclusive_group()
+    turbo.add_argument("--turbo", dest="turbo", action="store_true", default=None,
+                       help="erste bzw. vollständige Übertragungen mit Schnelllader")
+    turbo.add_argument("--no-turbo", dest="turbo", action="store_false",
+                       help="nur mit 1200 Baud übertragen")
+    watch.add_argument("--no-ask", action="store_true",
+                       help="keine Rückfragen: RESET wird vorausgesetzt, Programme werden gestartet")
+    watch.add_argument("--no-run", dest="run", action="store_false", default=True,
+                       help="Programm nach einer Änderung nicht starten")
+    watch.add_argument("--interval", type=float, default=0.5, metavar="SEK",
+                       help="Abfrageintervall der Datei (Standard: 0.5)")
+    watch.add_argument("-q", "--quiet", action="store_true", help="Debug-Ausgaben unterdrücken")
+    return parser
+
+
+def _run(args: argparse.Namespace, cli: KC_V24_Transfer_CLI) -> int:
+    # gespeicherte GUI-Einstellungen (Port, Schnelllader, kalibrierte Datenrate) nur lesen
+    if cli.CONFIG_PATH.exists():
+        cli.load_config()
+    else:
+        cli.load_memory()
+    if getattr(args, "port", None):
+        cli.com_port_name = args.port
+    if args.turbo is not None:
+        cli.use_turboload = args.turbo
+    if getattr(args, "timeout", None) is not None:
+        cli.timeout_comport = cli.timeout_job = args.timeout
+
+    try:
+        pr = cli.read_file(args.file)
+    except (OSError, ValueError) as e:
+        cli.show_error(f"Datei '{args.file}' nicht lesbar: {e}")
+        return EXIT_FILE
+    if pr.errorstate:
+        cli.show_error(f"Dateiformat unbekannt ({pr.validstate})")
+        return EXIT_FILE
+    cli.pr = pr
+    cli.file_name = os.path.basename(args.file)
+
+    cli.load_bascoder()
+    cli.load_stubs()
+    if cli.use_turboload and (cli.pr_0200stub is None or cli.pr_BF00stub is None):
+        cli.use_turboload = False
+
+    cli.message(f"{cli.file_name}: {pr.format}, {pr.type}, {len(pr.transferdata)} Byte"
+                + (f" [{pr.start:04X}-{pr.end:04X}]" if pr.start is not None and pr.end is not None else "")
+                + (f" Start {pr.callu:04X}" if pr.callu else ""))
+
+    if args.command == "info":
+        if cli.build_send_jobs():
+            cli.message("Jobs" + (f" (Turbo {cli.get_turbo_step()})" if cli.use_turboload else "") + ":")
+            for line in cli.plan_report[1:] or cli.describe_jobs():
+                cli.message(line)
+        return EXIT_OK
+
+    if not cli.com_port_name:
+        cli.show_error("kein COM-Port angegeben (--port)")
+        return EXIT_PORT
+    if args.command == "watch" and not KC_V24_Transfer_Watch.supported(pr):
+        cli.show_error(f"watch unterstützt nur Speicherabbilder mit Adressen ({pr.type})")
+        return EXIT_FILE
+    cli.com_port = cli.open_port()
+    if cli.com_port is None:
+        return EXIT_PORT
+
+    try:
+        if not cli.build_send_jobs():
+            cli.message("Übertragung abgebrochen")
+            return EXIT_CANCELED
+        result = cli.run_jobs()
+        if args.command == "watch" and result == ProcessingResult.DONE:
+            return _watch(args, cli)
+    finally:
+        cli._close_current_port()
+
+    return _exit_code(result)
+
+
+def _exit_code(result: ProcessingResult) -> int:
+    if result == ProcessingResult.DONE:
+        return EXIT_OK
+    if result == ProcessingResult.CANCELED:
+        return EXIT_CANCELED
+    return EXIT_FAILED
+
+
+def _watch(args: argparse.Namespace, cli: KC_V24_Transfer_CLI) -> int:
+    """
+    Entwicklungsschleife nach der ersten vollständigen Übertragung: bei jeder inhaltlichen Änderung der Datei RESET
+    erfragen, nur die geänderten Bereiche senden (KC_V24_Transfer_Watch) und das Programm wieder starten. Ende mit Strg+C.
+    """
+    watch = KC_V24_Transfer_Watch(cli, args.file, run=args.run)
+    watch.sent(cli.pr)
+    while True:
+        cli.message("Warte auf Änderungen ... (Strg+C beendet)")
+        try:
+            watch.wait_change(args.interval)
+        except KeyboardInterrupt:
+            return EXIT_OK
+
+        try:
+            pr = cli.read_file(args.file)
+        except (OSError, ValueError) as e:
+            cli.show_error(f"Datei '{args.file}' nicht lesbar: {e}")
+            continue
+        if not watch.supported(pr):
+            cli.show_error(f"Dateiformat unbekannt bzw. ohne Adressen ({pr.validstate})")
+            continue
+        cli.pr = pr
+
+        # erst vergleichen: nur angefasste Datei (gleicher Inhalt) - kein RESET, nichts zu senden
+        if not watch.changed_ranges(pr):
+            cli.message(f"{cli.file_name}: keine Änderung")
+            continue
+
+        if not cli._reset_kc():
+            cli.message("Übertragung abgebrochen")
+            return EXIT_CANCELED
+        watch.on_reset()
+
+        # nach dem RESET neu aufbauen (der RESET kann Teile des Abbildes überschreiben); der Start folgt in jedem Fall
+        jobs = watch.build_jobs(pr) or (watch.start_jobs(pr) if watch.run else [])
+        if not jobs:
+            continue
+        plan = KC_V24_Transfer_JobPlan(cli, jobs)
+        cli.jobs = plan.optimize(cli.get_trans_state())
+        cli.message(f"{cli.file_name}: {len(watch.changed_ranges(pr))} geänderte Bereiche")
+
+        result = cli.run_jobs()
+        if result == ProcessingResult.DONE:
+            watch.sent(pr)
+        elif result == ProcessingResult.CANCELED:
+            return EXIT_CANCELED
+        else:
+            watch.baseline.invalidate_all()   # unbekannt, was angekommen ist: beim nächsten Mal vollständig
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    args = _build_parser().parse_args(argv)
+    cli = KC_V24_Transfer_CLI(no_ask=getattr(args, "no_ask", False) or args.command == "info")
+
+    quiet = contextlib.redirect_stdout(open(os.devnull, "w")) if args.quiet else contextlib.nullcontext()
+    try:
+        with quiet:
+            return _run(args, cli)
+    except EOFError as e:
+        cli.show_error(str(e))
+        return EXIT_CANCELED
+    except KeyboardInterrupt:
+        cli.message("\nabgebrochen")
+        return EXIT_CANCELED
+
+
+if __name__ == "__main__":
+    sys.exit(main())
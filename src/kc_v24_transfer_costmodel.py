@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import sys
+from dataclasses import replace
+from typing import TYPE_CHECKING, List, NamedTuple, Optional, Tuple
+
+from kc_v24_transfer_kcfileformattools import KC_V24_Transfer_FileFormatTools
+from kc_v24_transfer_kcjob import KC_Job
+from kc_v24_transfer_lineinjector import KC_V24_Transfer_LineInjector
+from kc_v24_transfer_textplan import KC_V24_Transfer_TextPlan, TextPlanConfig
+
+if TYPE_CHECKING:
+    from kc_v24_transfer_session import KC_V24_Transfer_Session
+
+# Zeitmodell der Verbindung PC -> KC:
+# sagt die Dauer jedes KC_Jobs aus Datenrate und Rahmenformat (Start-, 8 Daten-, Stoppbits),
+# den festen Pausen der Jobs (ESC-Pause, textconfig_*-Wartezeiten, pause) und für Tastatur-
+# übertragungen aus dem Übertragungsplan (Zeilenanalyse, KC_V24_Transfer_TextPlan) voraus.
+# Die Datenrate wird über die Jobs fortgeschrieben (set_ser_br/set_ser_sb nach einem Job).
+# Genutzt für die Restlaufzeit (JobEngine), die Wahl Schnelllader/direkt und die Timeouts je Job.
+
+
+class JobCost(NamedTuple):
+    ms:         float     # vorhergesagte Dauer des Jobs (ohne Rückfragen an den Benutzer)
+    max_gap_ms: float     # längste erwartete Zeit ohne Fortschritt von job.sent (sendende Jobs)
+    baudrate:   int       # Datenrate während des Jobs
+    stopbits:   int
+
+
+class KC_V24_Transfer_CostModel:
+    """Vorhersage der Dauer von KC_Jobs und daraus abgeleitete Timeouts."""
+
+    _ESC_PAUSE_MS   = 100     # Pause nach ESC in job_sendbin/job_runbin/job_runcheck
+    _CHECK_WAIT_MS  = 3000    # job_runcheck: maximale Wartezeit auf die Antwort des Prüfprogramms
+    _REOPEN_MS      = 20      # Schließen/Öffnen des COM-Ports bei einer Umschaltung der Datenrate
+
+    _TIMEOUT_FACTOR = 3.0     # Timeout = Faktor * Vorhersage + Zuschlag ...
+    _TIMEOUT_ADD_S  = 2.0
+    _TIMEOUT_MIN_S  = 3.0     # ... mindestens jedoch
+
+    def __init__(self, session: KC_V24_Transfer_Session) -> None:
+        self.session = session
+        self.tools   = KC_V24_Transfer_FileFormatTools()
+
+    # ------------------------ Grundgrößen ------------------------
+
+    @staticmethod
+    def wire_ms(nbytes: int, baudrate: int = 1200, stopbits: int = 2) -> float:
+        """Übertragungszeit von nbytes (1 Start-, 8 Daten-, stopbits Stoppbits)."""
+        return nbytes * (9 + stopbits) * 1000.0 / baudrate if baudrate else 0.0
+
+    def sendbin_ms(self, nbytes: int, baudrate: int = 1200, stopbits: int = 2, escpause: bool = True) -> float:
+        """ESC-T mit nbytes Nutzdaten (Header 6 Bytes)."""
+        return (self._ESC_PAUSE_MS if escpause else 0) + self.wire_ms(nbytes + 6, baudrate, stopbits)
+
+    def esct_min_gap(self, baudrate: int = 1200, stopbits: int = 2) -> int:
+        """Größte Lücke (Bytes) zwischen zwei ESC-T-Bereichen, die mitgesendet billiger ist als ein weiterer ESC-T (Header + ESC-Pause)."""
+        return int(self._ESC_PAUSE_MS / self.wire_ms(1, baudrate, stopbits)) + 6
+
+    def textplan(self, job: KC_Job) -> KC_V24_Transfer_TextPlan:
+        """Übertragungsplan einer Tastaturübertragung wie in job_sendtext."""
+        basic = job.type == KC_Job._JT_SENDBASICTEXT
+        return KC_V24_Transfer_TextPlan.compile(
+            job.pr.transferdata,
+            TextPlanConfig.from_app(self.session),
+            fastmode=basic,
+            endreturn=True if basic else None,
+            basiclinesoffset=job.basiclinesoffset if basic else 0,
+            basicode=(job.pr.type == job.pr._TYPE_BASICODE),
+        )
+
+    def injector_ms(self, job: KC_Job) -> float:
+        """
+        Zeilen-Einspeiser (_JT_RUNINJECTOR): BASIC verarbeitet die Zeilen wie eingetippte, es entfallen
+        aber Übertragung und Wartezeit je Zeichen; ohne CLS scrollt der Bildschirm (kein fastmode).
+        """
+        plan = KC_V24_Transfer_TextPlan.compile(
+            job.image.transferdata,
+            replace(TextPlanConfig.from_app(self.session), char_delay=0),
+            endreturn=True,
+            basiclinesoffset=job.basiclinesoffset,
+            basicode=(job.image.type == job.image._TYPE_BASICODE),
+        )
+        return plan.delay_ms
+
+    # ------------------------ Jobs ------------------------
+
+    def job_ms(self, job: KC_Job, baudrate: int = 1200, stopbits: int = 2) -> Tuple[float, float]:
+        """(Dauer, längste Zeit ohne Fortschritt) eines Jobs in ms bei der angegebenen Datenrate."""
+        s    = self.session
+        wire = lambda n: self.wire_ms(n, baudrate, stopbits)
+        t    = job.type
+        pr   = job.pr
+        gap  = 0.0
+
+        if t == KC_Job._JT_STARTKEYBMODE:
+            ms = wire(1) + s.textconfig_init_delay
+        elif t == KC_Job._JT_STARTBASIC:
+            ms = wire(3) + s.textconfig_char_delay + s.textconfig_init_basic1delay + s.textconfig_init_basic2delay
+        elif t == KC_Job._JT_STARTREBASIC:
+            ms = wire(8) + s.textconfig_init_rebasicdelay
+        elif t == KC_Job._JT_RUNBASIC:
+            ms = wire(4 + (len(pr.runlinebasic) + 1 if pr.runlinebasic else 0))
+        elif t == KC_Job._JT_RESETBASCODER:
+            lln = s.get_last_basicodelinenumber()
+            ms = wire(1 + len(f"DELETE 1000,{lln}") + 1 + 6) + 3 * 300 if lln is not None else 0.0
+        elif t in (KC_Job._JT_SENDTEXT, KC_Job._JT_SENDBASICTEXT):
+            plan = self.textplan(job)
+            ms   = plan.duration_ms(baudrate)
+            gap  = max((seg.delay_ms + wire(len(seg.data)) for seg in plan.segments), default=0.0)
+        elif t in (KC_Job._JT_SENDBIN, KC_Job._JT_TURBOSENDBIN):
+            ms  = self.sendbin_ms(len(pr.transferdata), baudrate, stopbits, escpause=(t == KC_Job._JT_SENDBIN))
+            # Sendepuffer wird nachgefüllt, wenn er halb leer ist (KC_Job._send_bindata)
+            gap = self._ESC_PAUSE_MS + max(wire(KC_Job._TX_MIN_BLOCK), KC_Job._TX_WINDOW_MS)
+        elif t == KC_Job._JT_RESUMEBIN:
+            info = s.get_resume_info()
+            rest = info.total - info.offset if info is not None else len(pr.transferdata)
+            if info is not None:
+                baudrate, stopbits = info.baudrate, info.stopbits
+            ms  = self._REOPEN_MS + self.wire_ms(rest, baudrate, stopbits)
+            gap = self._REOPEN_MS + max(self.wire_ms(KC_Job._TX_MIN_BLOCK, baudrate, stopbits), KC_Job._TX_WINDOW_MS)
+        elif t == KC_Job._JT_TURBOFILL:
+            ms = self.tools.fill_ms((pr.end or 0) - (pr.start or 0), baudrate, stopbits)
+        elif t == KC_Job._JT_TURBOEND:
+            ms = wire(2)
+        elif t in (KC_Job._JT_RUNBIN, KC_Job._JT_RUNBASICWARM):
+            ms = self._ESC_PAUSE_MS + wire(4)
+        elif t == KC_Job._JT_RUNCHECK:
+            ms = self._ESC_PAUSE_MS + wire(4)   # Antwort kommt sofort - ohne Antwort bis _CHECK_WAIT_MS und Rückfrage
+        elif t == KC_Job._JT_RUNBINMENU:
+            ms = wire(len(pr.namep or "") + 1)
+        elif t == KC_Job._JT_RUNINJECTOR:
+            ms = wire(len(KC_V24_Transfer_LineInjector.command()) + 1) + (self.injector_ms(job) if job.image is not None else 0.0)
+        else:
+            ms = 0.0
+
+        if job.set_ser_br:
+            ms += self._REOPEN_MS
+        ms += job.pause or 0
+        return ms, gap
+
+    def estimate(self, jobs: List[KC_Job], baudrate: int = 1200, stopbits: int = 2) -> List[JobCost]:
+        """Kosten aller Jobs in Reihenfolge; die Datenrate folgt den Umschaltungen (set_ser_br/set_ser_sb)."""
+        costs = []
+        for job in jobs:
+            ms, gap = self.job_ms(job, baudrate, stopbits)
+            costs.append(JobCost(ms, gap, baudrate, stopbits))
+            if job.set_ser_br:
+                baudrate = int(job.set_ser_br)
+                stopbits = int(job.set_ser_sb) if job.set_ser_sb else 2
+        return costs
+
+    def total_ms(self, jobs: List[KC_Job]) -> float:
+        return sum(c.ms for c in self.estimate(jobs))
+
+    # ------------------------ Timeouts ------------------------
+
+    def timeouts(self, job: KC_Job, cost: JobCost) -> Tuple[Optional[float], Optional[float]]:
+        """
+        (Stillstand, Laufzeit) in Sekunden für einen Job - None: keine Überwachung.
+        Sendende Jobs (job.total > 0) werden über den Stillstand überwacht, alle übrigen über die Laufzeit;
+        Jobs mit Rückfrage (askstart, Kalibrierung) haben keine Laufzeitgrenze.
+        """
+        if job.total > 0:
+            idle = self._TIMEOUT_FACTOR * cost.max_gap_ms / 1000.0 + self._TIMEOUT_ADD_S
+            return max(self._TIMEOUT_MIN_S, idle), None
+        if job.askstart or job.type == KC_Job._JT_RUNCHECK:
+            return None, None
+        run = self._TIMEOUT_FACTOR * cost.ms / 1000.0 + self._TIMEOUT_ADD_S
+        return None, max(self._TIMEOUT_MIN_S, run)
+
+    # ------------------------ Ausgabe ------------------------
+
+    _JOB_NAMES = {v: k[4:] for k, v in vars(KC_Job).items() if k.startswith("_JT_") and v is not None}
+
+    def describe(self, jobs: List[KC_Job]) -> List[str]:
+        """Jobliste mit vorhergesagter Dauer (eine Zeile je Job, Summe am Ende)."""
+        lines = []
+        costs = self.estimate(jobs)
+        for nr, (job, cost) in enumerate(zip(jobs, costs), start=1):
+            name = self._JOB_NAMES.get(job.type, str(job.type))
+            pr   = job.pr
+            area = f" {pr.start:04X}-{pr.end:04X}" if job.total and pr.start is not None and pr.end is not None else ""
+            size = f" {job.total} Bytes" if job.total else ""
+            baud = f" -> {job.set_ser_br} Baud" if job.set_ser_br else ""
+            lines.append(f"  {nr:2}. {name:<14}{area}{size}{baud}  [{cost.baudrate} Baud, ~{cost.ms / 1000:.1f}s]")
+        lines.append(f"  Summe ~{sum(c.ms for c in costs) / 1000:.1f}s")
+        return lines
+
+
+# Einfacher CLI-Einstiegspunkt
+if __name__ == "__main__":
+    print("Zeitmodell: python -m kc_v24_transfer info <datei> zeigt die Jobs mit vorhergesagter Dauer", file=sys.stderr)
+    sys.exit(1)
@@ -0,0 +1,296 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from enum import Enum, auto
+from typing import TYPE_CHECKING, Callable, List, NamedTuple, Optional
+
+from kc_v24_transfer_costmodel import JobCost
+from kc_v24_transfer_kcjob import KC_Job
+
+if TYPE_CHECKING:
+    from kc_v24_transfer_session import KC_V24_Transfer_Session
+
+# Job-Engine auf Basis von asyncio:
+# Eine Ereignisschleife in einem eigenen Thread arbeitet die KC_Jobs nacheinander ab. Jeder Job läuft
+# als Coroutine (KC_Job.run_async - der blockierende pyserial-Teil in einem Executor-Thread), die Engine
+# tastet parallel dazu den Fortschritt ab, überwacht die Deadlines (Stillstand des COM-Ports, Laufzeit)
+# und verteilt Ereignisse (JobEvent) an alle Abonnenten - GUI, Kommandozeile oder Testskripte.
+# Ein Abbruch weckt die Schleife und den laufenden Job sofort auf (auch mitten in einer Wartezeit des Jobs).
+# Restlaufzeit und Timeouts je Job kommen aus dem Zeitmodell der Session (KC_V24_Transfer_CostModel).
+
+
+class ProcessingResult(Enum):
+    DONE = auto()
+    CANCELED = auto()
+    FAILED = auto()
+
+
+class JobEvent(NamedTuple):
+    kind:     str                          # KC_V24_Transfer_JobEngine._EV_*
+    jobnr:    int                          # Nummer des aktuellen Jobs (ab 1)
+    jobcount: int                          # Anzahl aller Jobs
+    job:      Optional[KC_Job]
+    state:    Optional[int]                # KC_Job._JS_* des Jobs
+    sent:     int                          # gesendete Bytes über alle Jobs
+    total:    int                          # zu sendende Bytes über alle Jobs
+    result:   Optional[ProcessingResult]   # nur bei _EV_END
+    text:     Optional[str]                # Meldung (z.B. Timeout)
+    t:        float                        # time.monotonic() des Ereignisses
+    done_ms:  float = 0.0                  # nach dem Zeitmodell bereits erledigte Zeit (ms)
+    plan_ms:  float = 0.0                  # vorhergesagte Dauer aller Jobs (ms)
+
+    @property
+    def eta_s(self) -> float:
+        """Vorhergesagte Restlaufzeit in Sekunden."""
+        return max(0.0, self.plan_ms - self.done_ms) / 1000.0
+
+
+class KC_V24_Transfer_JobEngine:
+    """Arbeitet KC_Jobs in einer asyncio-Ereignisschleife ab und meldet den Fortschritt an Abonnenten."""
+
+    _EV_START    = "START"      # Abarbeitung beginnt
+    _EV_JOB      = "JOB"        # ein Job beginnt
+    _EV_PROGRESS = "PROGRESS"   # gesendete Bytes haben sich geändert
+    _EV_JOBEND   = "JOBEND"     # ein Job ist beendet (state)
+    _EV_TIMEOUT  = "TIMEOUT"    # Deadline überschritten - die Übertragung wird abgebrochen
+    _EV_END      = "END"        # Abarbeitung beendet (result)
+
+    _TICK_S = 0.02              # Abtastintervall für Fortschritt und Deadlines
+
+    def __init__(self, session: KC_V24_Transfer_Session, tick_s: float = _TICK_S) -> None:
+        self.session = session
+        self.tick_s  = tick_s
+
+        self._subscribers: List[Callable[[JobEvent], None]] = []
+        self._lock    = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._loop:   Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._cancel  = threading.Event()
+
+        self.current_job: Optional[KC_Job] = None
+        self.result: Optional[ProcessingResult] = None
+        self.timeout_text: Optional[str] = None   # Meldung der zuletzt überschrittenen Deadline
+
+        self._sentdone = 0    # Bytes der bereits abgearbeiteten Jobs
+        self._total    = 0
+        self._jobnr    = 0
+        self._jobcount = 0
+
+        self._costs: List[JobCost] = []   # Vorhersage je Job (gleiche Reihenfolge wie jobs)
+        self._plan_ms   = 0.0             # Summe der Vorhersagen
+        self._ms_done   = 0.0             # Vorhersagen der bereits abgearbeiteten Jobs
+        self._job_start = 0.0             # time.monotonic() beim Start des aktuellen Jobs
+
+    # ------------------------ Abonnenten ------------------------
+
+    def subscribe(self, callback: Callable[[JobEvent], None]) -> Callable[[], None]:
+        """
+        callback(JobEvent) für alle Ereignisse anmelden - wird im Thread der Engine aufgerufen.
+        Rückgabe: Funktion zum Abmelden.
+        """
+        with self._lock:
+            self._subscribers.append(callback)
+
+        def unsubscribe() -> None:
+            with self._lock:
+                if callback in self._subscribers:
+                    self._subscribers.remove(callback)
+        return unsubscribe
+
+    def _emit(self, kind: str, state: Optional[int] = None, result: Optional[ProcessingResult] = None, text: Optional[str] = None) -> None:
+        sent, total, jobnr, jobcount = self.progress()
+        now = time.monotonic()
+        event = JobEvent(kind, jobnr, jobcount, self.current_job, state, sent, total, result, text, now,
+                         self.time_done_ms(now), self._plan_ms)
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for callback in subscribers:
+            try:
+                callback(event)
+            except Exception as e:
+                print(f"JobEngine: Fehler im Abonnenten {callback}: {e}")
+
+    # ------------------------ Steuerung (aus beliebigen Threads) ------------------------
+
+    def start(self, jobs: List[KC_Job]) -> threading.Thread:
+        """Startet die Abarbeitung von jobs in einem eigenen Thread mit eigener Ereignisschleife."""
+        if self.is_running():
+            raise RuntimeError("JobEngine: Abarbeitung läuft bereits")
+        self._cancel.clear()
+        self.result = None
+        self.timeout_text = None
+        costs = self.session.cost_model.estimate(jobs)
+        with self._lock:
+            self._sentdone = 0
+            self._total    = sum(job.total for job in jobs)
+            self._jobnr    = 1
+            self._jobcount = len(jobs)
+            self._costs    = costs
+            self._plan_ms  = sum(c.ms for c in costs)
+            self._ms_done  = 0.0
+
+        self._thread = threading.Thread(target=asyncio.run, args=(self.run(jobs),), daemon=True)
+        self._thread.start()
+        return self._thread
+
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def join(self, timeout: Optional[float] = None) -> bool:
+        """Wartet auf das Ende der Abarbeitung; True, wenn sie beendet ist."""
+        if self._thread is not None:
+            self._thread.join(timeout)
+        return not self.is_running()
+
+    def cancel(self) -> None:
+        """Bricht die Abarbeitung ab: der laufende Job wird sofort geweckt, weitere Jobs starten nicht."""
+        self._cancel.set()
+        job = self.current_job
+        if job is not None:
+            job.cancel()
+        loop, wakeup = self._loop, self._wakeup
+        if loop is not None and wakeup is not None:
+            try:
+                loop.call_soon_threadsafe(wakeup.set)
+            except RuntimeError:   # Schleife bereits beendet
+                pass
+
+    def progress(self) -> tuple[int, int, int, int]:
+        """(gesendete Bytes, Bytes gesamt, Nummer des aktuellen Jobs, Anzahl Jobs)"""
+        job = self.current_job
+        sent = job.snapshot()[1] if job is not None else 0
+        with self._lock:
+            return self._sentdone + sent, self._total, self._jobnr, self._jobcount
+
+    def time_done_ms(self, now: Optional[float] = None) -> float:
+        """
+        Nach dem Zeitmodell erledigte Zeit in ms: Vorhersagen der abgearbeiteten Jobs plus der Anteil des
+        aktuellen Jobs (sendende Jobs nach gesendeten Bytes, sonst nach Laufzeit - höchstens seine Vorhersage).
+        """
+        job = self.current_job
+        with self._lock:
+            done = self._ms_done
+            nr   = self._jobnr - 1
+            cost = self._costs[nr] if job is not None and 0 <= nr < len(self._costs) else None
+        if cost is None:
+            return done
+        if job.total > 0:
+            return done + cost.ms * min(1.0, job.snapshot()[1] / job.total)
+        now = time.monotonic() if now is None else now
+        return done + min(cost.ms, (now - self._job_start) * 1000.0)
+
+    def job_cost(self, jobnr: int) -> Optional[JobCost]:
+        """Vorhersage für den Job mit der Nummer jobnr (ab 1) der laufenden bzw. letzten Abarbeitung."""
+        with self._lock:
+            return self._costs[jobnr - 1] if 0 < jobnr <= len(self._costs) else None
+
+    # ------------------------ Abarbeitung (Ereignisschleife) ------------------------
+
+    async def run(self, jobs: List[KC_Job]) -> ProcessingResult:
+        """Coroutine: arbeitet jobs nacheinander ab (entspricht dem früheren Worker-Thread)."""
+        self._loop   = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        any_failed = False
+        try:
+            self._emit(self._EV_START)
+            for nr, job in enumerate(jobs):
+                if self._cancel.is_set():
+                    break
+
+                self._job_start  = time.monotonic()
+                self.current_job = job
+                state = await self._run_job(job, self.job_cost(nr + 1))
+
+                # abgebrochene Binärübertragung: noch ausstehende Jobs für eine Fortsetzung merken
+                resume_info = self.session.get_resume_info()
+                if resume_info is not None and resume_info.job is job:
+                    resume_info.followjobs = list(jobs[nr + 1:])
+
+                self._emit(self._EV_JOBEND, state=state)
+                with self._lock:
+                    self._sentdone += job.total
+                    self._ms_done  += self._costs[nr].ms if nr < len(self._costs) else 0.0
+                    self._jobnr += 1
+                    self.current_job = None
+
+                if state == KC_Job._JS_FAILED:
+                    any_failed = True
+                    print(f"any_failed {job.type}")
+                if state == KC_Job._JS_NOAFTERASK:   # Startfrage wurde mit nein beantwortet
+                    break
+
+        finally:
+            self.current_job = None
+            if self._cancel.is_set() and self.timeout_text is None:
+                self.result = ProcessingResult.CANCELED
+            elif any_failed or self.timeout_text is not None:
+                self.result = ProcessingResult.FAILED
+            else:
+                self.result = ProcessingResult.DONE
+            self._loop = self._wakeup = None
+            jobs.clear()
+            self._emit(self._EV_END, result=self.result)
+        return self.result
+
+    async def _run_job(self, job: KC_Job, cost: Optional[JobCost] = None) -> Optional[int]:
+        """Führt einen Job aus; meldet Fortschritt und prüft die Deadlines bis zu seinem Ende."""
+        task = asyncio.ensure_future(job.run_async())
+        self._emit(self._EV_JOB, state=KC_Job._JS_RUNNING)
+
+        now = time.monotonic()
+        started, last_sent, last_sent_mono = now, 0, now
+        while True:
+            wake = asyncio.ensure_future(self._wakeup.wait())
+            await asyncio.wait({task, wake}, timeout=self.tick_s, return_when=asyncio.FIRST_COMPLETED)
+            wake.cancel()
+            self._wakeup.clear()
+
+            state, sent, _ = job.snapshot()
+            now = time.monotonic()
+            if sent != last_sent:
+                last_sent, last_sent_mono = sent, now
+                self._emit(self._EV_PROGRESS, state=state)
+
+            if task.done():
+                break
+            if self._cancel.is_set():
+                job.cancel()
+                continue   # der Job beendet sich selbst (Wartezeiten werden sofort beendet)
+
+            text = self._deadline_exceeded(job, state, now - started, now - last_sent_mono, cost)
+            if text is not None:
+                self.timeout_text = text
+                print(f"JobEngine: {text}")
+                self._emit(self._EV_TIMEOUT, state=state, text=text)
+                self.session.abort_port()   # unterbricht auch blockierende Schreibvorgänge
+
+        return job.snapshot()[0]
+
+    def _deadline_exceeded(self, job: KC_Job, state: Optional[int], runtime: float, idle: float, cost: Optional[JobCost] = None) -> Optional[str]:
+        """
+        Deadlines des laufenden Jobs:
+        - job.deadline: maximale Laufzeit des Jobs (Sekunden)
+        - sendende Jobs (job.total > 0): Stillstand ohne Fortschritt > timeout_comport
+        - Jobs ohne Nutzdaten und ohne askstart: Laufzeit > timeout_job
+        timeout_comport/timeout_job der Session: None - aus dem Zeitmodell für diesen Job, 0 - deaktiviert.
+        """
+        if state != KC_Job._JS_RUNNING:   # z.B. Startfrage nach der Übertragung
+            return None
+        if job.deadline and runtime > job.deadline:
+            return f"Job-Deadline überschritten (läuft seit {runtime:.1f}s)"
+        timeout_comport = self.session.timeout_comport
+        timeout_job     = self.session.timeout_job
+        if cost is not None and (timeout_comport is None or timeout_job is None):
+            model_comport, model_job = self.session.cost_model.timeouts(job, cost)
+            if timeout_comport is None:
+                timeout_comport = model_comport
+            if timeout_job is None:
+                timeout_job = model_job
+        if timeout_comport and job.total > 0 and idle > timeout_comport:
+            return f"COM-Port blockiert (keine Daten seit {idle:.1f}s)"
+        if timeout_job and job.total <= 0 and not job.askstart and runtime > timeout_job:
+            return f"Job-Timeout (läuft seit {runtime:.1f}s)"
+        return None
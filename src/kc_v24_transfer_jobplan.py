@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple
+
+from kc_v24_transfer_kcjob import KC_Job
+
+if TYPE_CHECKING:
+    from kc_v24_transfer_session import KC_V24_Transfer_Session
+
+# Optimierung einer Job-Folge vor der Übertragung:
+# build_send_jobs stellt die Jobs je Datentyp zusammen, ohne den Zustand des KC zu kennen. Der Optimierer
+# verfolgt den Übertragungszustand (trans_state) über die Folge und entfernt bzw. ersetzt Schritte nach
+# festen Regeln (Tabellen unten); bewertet wird jeweils mit dem Zeitmodell (KC_V24_Transfer_CostModel).
+#   - Modusumschaltungen ohne Wirkung entfallen (Tastaturmodus ist schon eingeschaltet)
+#   - direkt aufeinanderfolgende ESC-T an lückenlose Adressen werden zu einem ESC-T zusammengefasst
+#   - Programmstart: CAOS-Menüeingabe (Tastaturmodus + Name) oder ESC-U auf callp - der schnellere Weg
+
+
+class KC_V24_Transfer_JobPlan:
+    """Optimierer für eine Folge von KC_Jobs (Regeln über den Übertragungszustand des KC, Bewertung mit dem Zeitmodell)."""
+
+    # Übertragungszustand nach einem Job (None: Job ändert ihn nicht)
+    _STATE_AFTER: Dict[int, Optional[str]] = {
+        KC_Job._JT_STARTKEYBMODE: "KEY",
+        KC_Job._JT_SENDBIN:       "BIN",
+        KC_Job._JT_TURBOSENDBIN:  "BIN",
+        KC_Job._JT_RESUMEBIN:     "BIN",
+        KC_Job._JT_TURBOEND:      "BIN",
+        KC_Job._JT_RUNBIN:        "BIN",
+        KC_Job._JT_RUNBASICWARM:  "BIN",
+        KC_Job._JT_RUNCHECK:      "BIN",
+    }
+
+    # Jobs, die ohne Wirkung sind, wenn der KC bereits im angegebenen Zustand ist
+    _NOOP_IN_STATE: Dict[int, str] = {
+        KC_Job._JT_STARTKEYBMODE: "KEY",
+    }
+
+    # ESC-T-Jobs, die zusammengefasst werden können
+    _MERGEABLE = (KC_Job._JT_SENDBIN, KC_Job._JT_TURBOSENDBIN)
+
+    def __init__(self, session: KC_V24_Transfer_Session, jobs: List[KC_Job]) -> None:
+        self.session = session
+        self.jobs    = list(jobs)
+        self.report: List[str] = []   # Jobs vor/nach der Optimierung mit vorhergesagter Dauer
+        self.changes: List[str] = []  # angewendete Regeln
+
+    # ------------------------ Optimierung ------------------------
+
+    def optimize(self, trans_state: Optional[str] = None, verbose: bool = True) -> List[KC_Job]:
+        """
+        Wendet alle Regeln an und gibt die neue Job-Folge zurück.
+        trans_state: Übertragungszustand des KC vor dem ersten Job (None nach einem RESET).
+        """
+        model  = self.session.cost_model
+        before = model.describe(self.jobs)
+
+        passes: Tuple[Callable[[Optional[str]], None], ...] = (self._merge_esct, self._drop_noop_modeswitches, self._cheapest_start)
+        for step in passes:
+            step(trans_state)
+
+        self.report = ["Jobs vorher:"] + before
+        if self.changes:
+            self.report += ["Optimierung:"] + [f"  - {text}" for text in self.changes]
+            self.report += ["Jobs nachher:"] + model.describe(self.jobs)
+        else:
+            self.report += ["(keine Optimierung möglich)"]
+        if verbose:
+            print("\n".join(self.report))
+        return self.jobs
+
+    def _states(self, trans_state: Optional[str]) -> List[Optional[str]]:
+        """Übertragungszustand vor jedem Job."""
+        states = []
+        for job in self.jobs:
+            states.append(trans_state)
+            trans_state = self._STATE_AFTER.get(job.type) or trans_state
+        return states
+
+    def _merge_esct(self, trans_state: Optional[str]) -> None:
+        """
+        Direkt aufeinanderfolgende ESC-T gleicher Art an lückenlose Adressen -> ein ESC-T (ein Header, eine ESC-Pause).
+        Jobs mit abweichendem Speicherinhalt (image, z.B. RLE-Abbild) bleiben einzeln - ihr image gilt nur für ihren pr.
+        """
+        merged: List[KC_Job] = []
+        for job in self.jobs:
+            prev = merged[-1] if merged else None
+            if (prev is not None and prev.type == job.type and job.type in self._MERGEABLE
+                    and not prev.set_ser_br and not prev.pause and not prev.askstart
+                    and prev.image is None and job.image is None
+                    and prev.pr.end is not None and prev.pr.end == job.pr.start):
+                pr = prev.pr.without_data()
+                pr.transferdata = bytes(prev.pr.transferdata) + bytes(job.pr.transferdata)
+                pr.end = job.pr.end
+                merged[-1] = KC_Job(parent=self.session, type=job.type, pr=pr, pause=job.pause, askstart=job.askstart,
+                                    savelastline=prev.savelastline or job.savelastline,
+                                    set_ser_br=job.set_ser_br, set_ser_sb=job.set_ser_sb, deadline=job.deadline)
+                self.changes.append(f"ESC-T {prev.pr.start:04X}-{prev.pr.end:04X} und {job.pr.start:04X}-{job.pr.end:04X} zusammengefasst")
+                continue
+            merged.append(job)
+        self.jobs = merged
+
+    def _drop_noop_modeswitches(self, trans_state: Optional[str]) -> None:
+        """Modusumschaltungen entfernen, deren Zielzustand schon besteht (z.B. Tastaturmodus nach Tastaturmodus)."""
+        jobs = []
+        for job, state in zip(self.jobs, self._states(trans_state)):
+            if state is not None and self._NOOP_IN_STATE.get(job.type) == state and not job.set_ser_br and not job.askstart:
+                self.changes.append(f"{self.session.cost_model._JOB_NAMES[job.type]} entfällt (KC ist bereits im Zustand {state})")
+                continue
+            jobs.append(job)
+        self.jobs = jobs
+
+    def _cheapest_start(self, trans_state: Optional[str]) -> None:
+        """
+        Programmstart über das CAOS-Menü (STARTKEYBMODE + RUNBINMENU) durch ESC-U auf callp ersetzen,
+        wenn der KC im Binärmodus ist und das nach dem Zeitmodell schneller ist.
+        """
+        model  = self.session.cost_model
+        states = self._states(trans_state)
+        for i, job in enumerate(self.jobs):
+            if job.type != KC_Job._JT_RUNBINMENU or not job.pr.callp:
+                continue
+            first = i - 1 if i > 0 and self.jobs[i - 1].type == KC_Job._JT_STARTKEYBMODE else i
+            if states[first] != "BIN" or any(j.set_ser_br or j.askstart for j in self.jobs[first:i + 1]):
+                continue
+
+            pr = job.pr.without_data()
+            pr.callu = pr.callp
+            runbin = KC_Job(parent=self.session, type=KC_Job._JT_RUNBIN, pr=pr, pause=job.pause, deadline=job.deadline)
+            menu_ms  = model.total_ms(self.jobs[first:i + 1])
+            escu_ms = model.total_ms([runbin])
+            if escu_ms < menu_ms:
+                self.jobs[first:i + 1] = [runbin]
+                self.changes.append(f"Start über ESC-U auf {pr.callp:04X} statt CAOS-Menü ({escu_ms:.0f} statt {menu_ms:.0f} ms)")
+            return   # höchstens ein Programmstart je Folge
@@ -1,7 +1,11 @@
 #from __future__ import annotations
-from typing import Optional
+from typing import Callable, NamedTuple, Optional
 #from dataclasses import dataclass
 from kc_v24_transfer_basicdetokenizer import KC_V24_Transfer_BASICdetokenizer
+from kc_v24_transfer_basictokenizer import KC_V24_Transfer_BASICtokenizer
+from kc_v24_transfer_basiclexer import KC_V24_Transfer_BASIClexer
+from kc_v24_transfer_bytekernels import KC_V24_Transfer_ByteKernels
+import math
 import re
 
 #@dataclass
@@ -22,20 +26,68 @@ class ParseResult:
     _TYPE_BASICODE   = "BASICODE (Zeilen)"        # Basic-Programcode in ASCII-Form - muss als Tastatureingaben übertragen werden - benötigt geladenen BASCODER
     _TYPE_TEXT       = "TEXT"                     # Einfacher Text ohne bekanntes Format zur Übertragung
     
-    start:        Optional[int] = None  # None oder (int) Start-Adresse
-    end:          Optional[int] = None  # None oder (int) End-Adresse (+1)
-    format:       Optional[str] = None  # Das erkannte Dateiformat - None oder (int) Fileformat (KCC, KCB, SSS)
-    type:         Optional[str] = None  # Der erkannte Programmtyp - None oder Programmtyp ("BASIC", "CM")
-    callh:        Optional[int] = None  # None oder (int) Einsprungadresse aus der Datei
-    callp:        Optional[int] = None  # None oder (int) Einsprungadresse aus CAOS-Prolog
-    callu:        Optional[int] = None  # None oder (int) - zu nutzende Einsprungadresse (Benutzerwahl)
-    nameh:        Optional[str] = None  # None oder ProgrammName aus dem Dateiheader
-    namep:        Optional[str] = None  # None oder ProgrammName aus CAOS-Prolog (= CAOS-Menüeintrag)
-    transferdata: bytearray = bytearray()  # Bytearray mit den zu sendenden Bytes
-    ramclass:     Optional[str] = None  # None oder "16k", "32k" oder "48k"
-    validstate:   int = 0               # 0, wenn Format valide ist -> alles größer null sind Hinweise auf Fehler
-    errorstate:   bool = True           # False, wenn geparst werden konnte, True im Fehlerfall
-    runlinebasic: Optional[str] = None  # Die Zeilennummer, mit der ein Basic-Progtamm gestartet werden soll
+    _EMPTY = memoryview(b"")   # gemeinsame leere Nutzdaten
+
+    # feste Attributmenge ohne __dict__ - die Nutzdaten liegen in _transferdata (siehe transferdata)
+    __slots__ = (
+        "start", "end", "format", "type", "callh", "callp", "callu", "nameh", "namep",
+        "_transferdata", "ramclass", "validstate", "errorstate", "runlinebasic", "lastlinebasic",
+    )
+
+    def __init__(self) -> None:
+        self.start:        Optional[int] = None  # None oder (int) Start-Adresse
+        self.end:          Optional[int] = None  # None oder (int) End-Adresse (+1)
+        self.format:       Optional[str] = None  # Das erkannte Dateiformat - None oder (int) Fileformat (KCC, KCB, SSS)
+        self.type:         Optional[str] = None  # Der erkannte Programmtyp - None oder Programmtyp ("BASIC", "CM")
+        self.callh:        Optional[int] = None  # None oder (int) Einsprungadresse aus der Datei
+        self.callp:        Optional[int] = None  # None oder (int) Einsprungadresse aus CAOS-Prolog
+        self.callu:        Optional[int] = None  # None oder (int) - zu nutzende Einsprungadresse (Benutzerwahl)
+        self.nameh:        Optional[str] = None  # None oder ProgrammName aus dem Dateiheader
+        self.namep:        Optional[str] = None  # None oder ProgrammName aus CAOS-Prolog (= CAOS-Menüeintrag)
+        self._transferdata: memoryview = self._EMPTY  # die zu sendenden Bytes (schreibgeschützt, siehe transferdata)
+        self.ramclass:     Optional[str] = None  # None oder "16k", "32k" oder "48k"
+        self.validstate:   int = 0               # 0, wenn Format valide ist -> alles größer null sind Hinweise auf Fehler
+        self.errorstate:   bool = True           # False, wenn geparst werden konnte, True im Fehlerfall
+        self.runlinebasic: Optional[str] = None  # Die Zeilennummer, mit der ein Basic-Progtamm gestartet werden soll
+        self.lastlinebasic: Optional[str] = None # Die letzte Zeilennummer eines im Speicherabbild enthaltenen BASICODE-Programmes
+
+    @property
+    def transferdata(self) -> memoryview:
+        """
+        Die zu sendenden Bytes als schreibgeschützte memoryview.
+        Mehrere ParseResults (und Ausschnitte, siehe slice) teilen sich denselben Puffer.
+        """
+        return self._transferdata
+
+    @transferdata.setter
+    def transferdata(self, data) -> None:
+        # bytes und Views auf bytes werden geteilt, veränderliche Puffer (bytearray) einmal kopiert -
+        # spätere Änderungen am Original wirken sich so nicht auf das ParseResult aus
+        view = memoryview(data)
+        if not isinstance(view.obj, bytes) or view.format != "B" or view.ndim != 1:
+            view = memoryview(view.tobytes())
+        self._transferdata = view.toreadonly()
+
+    def _copy_meta(self) -> "ParseResult":
+        pr = ParseResult()
+        for name in self.__slots__:
+            setattr(pr, name, getattr(self, name))
+        return pr
+
+    def without_data(self) -> "ParseResult":
+        """Kopie der Metadaten ohne Nutzdaten (für Jobs ohne Datenübertragung, z.B. RUNBIN, STARTKEYBMODE)."""
+        pr = self._copy_meta()
+        pr._transferdata = self._EMPTY
+        return pr
+
+    def slice(self, ofs: int, end: Optional[int] = None) -> "ParseResult":
+        """Ausschnitt transferdata[ofs:end] ohne Kopie der Bytes; start/end werden angepasst."""
+        pr = self._copy_meta()
+        pr._transferdata = self._transferdata[ofs:end]
+        if self.start is not None:
+            pr.start = self.start + ofs
+            pr.end   = pr.start + len(pr._transferdata)
+        return pr
 
     def _fmt_addr(self, value: Optional[int]) -> str:
         """Adresswerte konsistent im HEX-Format darstellen."""
@@ -63,6 +115,19 @@ class ParseResult:
             f"runlinebasic={self.runlinebasic})"
         )
         
+class FormatSniffer(NamedTuple):
+    """
+    Eintrag der Formaterkennung (siehe KC_V24_Transfer_FileFormatTools.register_format):
+    sniff(tools, filedata) liest nur Kopfbytes bzw. wenige Bytes an festen Positionen und liefert
+    die Zuverlässigkeit 0..100 (0 = Parser kann nicht erfolgreich sein), parse(tools, filedata)
+    ist der vollständige Parser. Bei gleicher Zuverlässigkeit entscheidet order.
+    """
+    name:  str
+    order: int
+    sniff: Callable[["KC_V24_Transfer_FileFormatTools", bytearray], int]
+    parse: Callable[["KC_V24_Transfer_FileFormatTools", bytearray], ParseResult]
+
+
 class KC_V24_Transfer_FileFormatTools:
 
     # KC85/4 BASIC-Systembereich 0x0300..0x03D6 (215 Bytes)
@@ -92,19 +157,14 @@ class KC_V24_Transfer_FileFormatTools:
 
     _KCB_SYS_START_ADDR   = 0x0300
     _KCB_BASIC_START_ADDR = 0x0401
-    # Laut KC85/4-Dokumentation explizit "nicht benutzt"
-    _KC_UNUSED_CODES = {0x04, 0x05, 0x06, 0x0E, 0x15, 0x17}
-
-    # Steuerzeichen, die wir trotzdem zulassen:
-    # 0x0D: CR (ENTER), 0x0A: LF (Zeilenumbruch)
-    _ALLOWED_CONTROL_CODES = {0x0A, 0x0D}
 
-    _BASICODE_START_RE = re.compile(r"^\s*1000(?!\d).*?(?<![A-Za-z])GOTO\s*20(?!\d)", re.IGNORECASE)
     _BASIC_LINE_RE = re.compile(r"^\s*(\d{1,5})(?!\d)")
-    _BASIC_KW_RE = re.compile(
-        r"(?<![A-Za-z])(?:PRINT|INPUT|IF|THEN|ELSE|FOR|NEXT|GOTO|GOSUB|RETURN|REM|DIM|DATA|READ|RESTORE|END|STOP|CLS|CLEAR|CALL|USR|POKE|PEEK|RANDOMIZE|ON|DEF|LET|RUN|LIST|NEW)(?![A-Za-z])",
-        re.IGNORECASE,
-    )
+    # Schlüsselwörter, mit denen Anweisungen eines BASIC-Listings typischerweise beginnen
+    _BASIC_STATEMENT_KEYWORDS = frozenset({
+        "PRINT", "INPUT", "IF", "FOR", "NEXT", "GOTO", "GOSUB", "RETURN", "REM", "DIM", "DATA", "READ",
+        "RESTORE", "END", "STOP", "CLS", "CLEAR", "CALL", "POKE", "RANDOMIZE", "ON", "DEF", "LET", "RUN",
+        "LIST", "NEW",
+    })
     
     # ---------------------------------------------------------
     # Textprüfung - auch für "aufgefüllte" Dateien
@@ -113,29 +173,9 @@ class KC_V24_Transfer_FileFormatTools:
     def _is_valid_textbyte(self, b: int) -> bool:
         """
         Prüft, ob ein Byte als Textzeichen für den KC85/4 zulässig ist
-        (inklusive erlaubter Steuerzeichen CR/LF). Entspricht der bisherigen
-        Prüflogik in checktext().
+        (0x20-0x7E sowie die Steuerzeichen CR/LF, siehe KC_V24_Transfer_ByteKernels).
         """
-        #b = bytes(b)
-        #b = bytes([b & 0xFF]) # b ist jetzt ein byte
-        
-        b = int(b) & 0xFF  # 0..255
-        # explizit "nicht benutzte" Codes verbieten
-        if b in self._KC_UNUSED_CODES:
-            return False
-
-        if b < 0x20:
-            # Unterhalb 0x20 nur explizit erlaubte Steuerzeichen zulassen
-            return b in self._ALLOWED_CONTROL_CODES
-
-        if 0x7F <= b < 0xA0:
-            # 0x7F (DEL) und 0x80–0x9F nicht als Textzeichen zulassen
-            return False
-
-        if b < 0x20 or b > 0x7F: # Zulässiger Zeichenbereich nur von 0x20 bis 0x7F
-            return False
-
-        return True
+        return KC_V24_Transfer_ByteKernels.is_text_byte(int(b) & 0xFF)
 
     # viele in eine SSS-Datei abgespeicherte BASIC-Programme haben als erste Zeile ähnliche Aufrufe wie 
     # 0 CLOSE I#1 : RUN10
@@ -153,12 +193,10 @@ class KC_V24_Transfer_FileFormatTools:
         if data is None or len(data) == 0:
             return None
 
-        if isinstance(data, bytes):
-            data = bytearray(data)
-        if not isinstance(data, bytearray):
-            raise TypeError("data muss vom Typ bytearray sein")
+        if not isinstance(data, (bytes, bytearray, memoryview)):
+            raise TypeError("data muss vom Typ bytes/bytearray sein")
 
-        text = bytes(data).decode("latin1", errors="ignore")
+        text = str(data, "latin1", errors="ignore")
         text = text.replace("\r\n", "\n").replace("\r", "\n")
 
         # 1) erste nichtleere Zeile ermitteln
@@ -173,84 +211,60 @@ class KC_V24_Transfer_FileFormatTools:
             return None
 
         # 2) muss mit Zeilennummer beginnen
-        m_line = self._BASIC_LINE_RE.match(first_line)
-        if not m_line:
+        tokens = KC_V24_Transfer_BASIClexer.shared().lex(first_line)
+        if not tokens or tokens[0].kind != KC_V24_Transfer_BASIClexer._TK_LINENO:
             return None
 
-        rest = first_line[m_line.end():]  # nach der Zeilennummer
-
-        # 3) String-Literale maskieren (damit RUN/CLOSE in Strings ignoriert wird)
-        def _mask_string_literals(s: str) -> str:
-            out = []
-            i = 0
-            in_str = False
-            while i < len(s):
-                ch = s[i]
-                if ch == '"':
-                    # "" innerhalb eines Strings
-                    if in_str and i + 1 < len(s) and s[i + 1] == '"':
-                        out.append(" ")
-                        out.append(" ")
-                        i += 2
-                        continue
-                    in_str = not in_str
-                    out.append(" ")
-                    i += 1
-                    continue
-                out.append(" " if in_str else ch)
-                i += 1
-            return "".join(out)
-
-        masked = _mask_string_literals(rest)
-
-        # 4) Kommentare abschneiden: '!' oder REM (auch kompakt, z.B. ':REM...')
-        excl = masked.find("!")
-        if excl != -1:
-            masked = masked[:excl]
-
-        m_rem = re.search(r"(?i)(^|[^A-Z0-9$])REM", masked)
-        if m_rem:
-            cut = m_rem.start(0) + (0 if m_rem.group(1) == "" else 1)
-            masked = masked[:cut]
-
-        upper = masked.upper()
-
-        # 5) RUN<zeile> finden (RUN10, RUN 10)
-        m_run = re.search(r"(?<![A-Z0-9$])RUN\s*(\d{1,5})(?!\d)", upper)
-        if not m_run:
-            return None
+        # 3) RUN<zeile> finden (RUN10, RUN 10) - Strings und Kommentare (REM, !) trennt der Lexer ab
+        #    typisch ist CLOSE I#1 davor, es genügt aber RUN als Befehl mit Zeilennummer
+        for tok, nxt in zip(tokens, tokens[1:]):
+            if (tok.kind == KC_V24_Transfer_BASIClexer._TK_KEYWORD and tok.text == "RUN"
+                    and nxt.kind == KC_V24_Transfer_BASIClexer._TK_NUMBER and nxt.text.isdigit() and len(nxt.text) <= 5):
+                return str(int(nxt.text))  # normalisieren (z.B. "0010" -> "10")
+        return None
 
-        run_target = m_run.group(1)
 
-        # 6) optionaler Musteranker: CLOSE I#1 (auch CLOSEI#1, CLOSE I # 1, CLOSE #1)
-        before_run = upper[:m_run.start()]
-        has_close_i1 = re.search(
-            r"(?<![A-Z0-9$])CLOSE\s*(?:I\s*)?#\s*1(?![A-Z0-9$])",
-            before_run
-        ) is not None
-
-        # primär: genau das typische SSS-Muster
-        if has_close_i1:
-            return str(int(run_target))  # normalisieren (z.B. "0010" -> "10")
-
-        # sekundär (häufige Variante): erste Zeile enthält schlicht RUN<zeile>
-        # (hier bewusst konservativ: RUN muss „als Befehl“ vorkommen, nicht als Teil eines Namens)
-        return str(int(run_target))
+    @staticmethod
+    def _is_basicode_start(tokens) -> bool:
+        """Zeile 1000 mit GOTO 20 (BASICODE-Programmstart)."""
+        if not tokens or tokens[0].kind != KC_V24_Transfer_BASIClexer._TK_LINENO or int(tokens[0].text) != 1000:
+            return False
+        return any(tok.kind == KC_V24_Transfer_BASIClexer._TK_KEYWORD and tok.text == "GOTO"
+                   and nxt.kind == KC_V24_Transfer_BASIClexer._TK_NUMBER and nxt.text == "20"
+                   for tok, nxt in zip(tokens, tokens[1:]))
 
+    def _has_basic_statement(self, tokens) -> bool:
+        """
+        True, wenn eine Anweisung der Zeile (nach der Zeilennummer bzw. nach ':') mit einem
+        typischen Schlüsselwort beginnt oder eine Zuweisung NAME=... ist.
+        Schlüsselwörter mitten im Text (z.B. TO, OR in Prosa) zählen nicht.
+        """
+        statement_start = True
+        for nr, tok in enumerate(tokens):
+            kind = tok.kind
+            if kind == KC_V24_Transfer_BASIClexer._TK_LINENO:
+                continue
+            if statement_start:
+                if kind == KC_V24_Transfer_BASIClexer._TK_KEYWORD and tok.text in self._BASIC_STATEMENT_KEYWORDS:
+                    return True
+                if (kind == KC_V24_Transfer_BASIClexer._TK_IDENT and nr + 1 < len(tokens)
+                        and tokens[nr + 1].text == "="):
+                    return True
+            statement_start = kind == KC_V24_Transfer_BASIClexer._TK_OP and tok.text == ":" \
+                or kind == KC_V24_Transfer_BASIClexer._TK_KEYWORD and tok.text in ("THEN", "ELSE")
+        return False
 
     # klassifiziert den im Text enthaltenen Code
     # gibt einen ParseResulte.type-String zurück (_TYPE_BASICTEXT, _TYPE_BASICODE oder _TYPE_TEXT)
     def classify_basic_text(self, data: bytearray) -> str:
         if data is None:
             return ParseResult._TYPE_TEXT
-        if isinstance(data, bytes):  # Robustheit, falls Alt-Code noch bytes übergibt
-            data = bytearray(data)
-        if not isinstance(data, bytearray):
-            raise TypeError("data muss vom Typ bytearray sein")
+        if not isinstance(data, (bytes, bytearray, memoryview)):
+            raise TypeError("data muss vom Typ bytes/bytearray sein")
         if len(data) == 0:
             return ParseResult._TYPE_TEXT
 
-        text = bytes(data).decode("ascii", errors="ignore")
+        text = str(data, "ascii", errors="ignore")
         text = text.replace("\r\n", "\n").replace("\r", "\n")
         
         lines = text.split("\n")
@@ -263,13 +277,15 @@ class KC_V24_Transfer_FileFormatTools:
                 return ParseResult._TYPE_TEXT
             break
             
+        lexer = KC_V24_Transfer_BASIClexer.shared()   # die Zeilen werden bei der Übertragung erneut analysiert (Cache)
+
         # 1) BASICODE: Zeile 1000 ... GOTO 20 (auch ohne Leerzeichen) früh suchen
         seen = 0
         for ln in lines:
             s = ln.strip()
             if not s:
                 continue
-            if self._BASICODE_START_RE.search(s):
+            if self._is_basicode_start(lexer.lex(s)):
                 return ParseResult._TYPE_BASICODE
             seen += 1
             if seen >= 200:
@@ -288,18 +304,15 @@ class KC_V24_Transfer_FileFormatTools:
                 continue
             nonempty += 1
 
-            m = self._BASIC_LINE_RE.match(s)
-            if not m:
+            tokens = lexer.lex(s)
+            if not tokens or tokens[0].kind != KC_V24_Transfer_BASIClexer._TK_LINENO:
                 continue
 
             numbered += 1
-            try:
-                line_nums.append(int(m.group(1)))
-            except ValueError:
-                pass
+            line_nums.append(int(tokens[0].text))
 
-            rest = s[m.end():]  # Rest nach der Zeilennummer (ggf. ohne Leerzeichen)
-            if self._BASIC_KW_RE.search(rest):
+            rest = s[tokens[1].pos:] if len(tokens) > 1 else ""  # Rest nach der Zeilennummer (ggf. ohne Leerzeichen)
+            if self._has_basic_statement(tokens):
                 keyworded += 1
             if any(ch in rest for ch in ("=", ":", '"', "(", ")", "<", ">", ";", ",")):
                 syntax_hits += 1
@@ -344,30 +357,91 @@ class KC_V24_Transfer_FileFormatTools:
             validstate    - 0, wenn Format valide ist
             errorstate    - False, wenn geparst werden konnte, True im Fehlerfall
         """
-        if not isinstance(filedata, bytearray):
-            raise TypeError("filedata muss vom Typ bytearray sein")
+        if not isinstance(filedata, (bytes, bytearray, memoryview)):
+            raise TypeError("filedata muss vom Typ bytes/bytearray sein")
+
+        # Dateiinhalt einmal als unveränderliche bytes festhalten - die Parser schneiden
+        # transferdata daraus nur noch aus (memoryview), statt die Daten zu kopieren
+        filedata = bytes(filedata)
+
+        # Kandidaten nach Zuverlässigkeit der Kopfprüfung ordnen - nur der beste Parser arbeitet vollständig,
+        # die weiteren nur, falls er doch scheitert (z.B. Detokenisierung fehlgeschlagen)
+        candidates = sorted(
+            ((fmt.sniff(self, filedata), fmt) for fmt in self._FORMATS),
+            key=lambda c: (-c[0], c[1].order),
+        )
+        candidates = [(conf, fmt) for conf, fmt in candidates if conf > 0]
+        print("parseBinData() Kandidaten: " + ", ".join(f"{fmt.name}({conf})" for conf, fmt in candidates))
 
-        result = self.parseformatTEXT(filedata)        # Erst auf simples Latin-1-Text-Format prüfen
-        if not result.errorstate:
-            return result
-        
-        result = self.parseformatSSSBand(filedata)     # Erst auf SSS-Bandformate prüfen
-        if not result.errorstate:
-            return result
-        
-        result = self.parseformatSSSDatei(filedata)    # Dann auf SSS-Dateiformate prüfen
-        if not result.errorstate:                      
-            return result
-        
-        result = self.parseformatKCC(filedata)         # Dann auf KCC/KCB_Format prüfen
-        if not result.errorstate:
-            return result
-        
-        result = self.parseRAWBytes(filedata)          # unbekanntes Binärformat unterstellen
-        
+        result = ParseResult()
+        for conf, fmt in candidates:
+            result = fmt.parse(self, filedata)
+            if not result.errorstate:
+                return result
         return result
-        
-        
+
+    @classmethod
+    def register_format(cls, sniffer: FormatSniffer) -> None:
+        """Weiteres Dateiformat für parseBinData anmelden (ersetzt einen Eintrag gleichen Namens)."""
+        cls._FORMATS = [fmt for fmt in cls._FORMATS if fmt.name != sniffer.name] + [sniffer]
+
+    # ---------------------------------------------------------
+    # Formaterkennung anhand der Kopfbytes (Sniffer)
+    # liefern 0, wenn der zugehörige Parser sicher scheitert
+    # ---------------------------------------------------------
+    _SNIFF_TEXT_PROBE = 4096
+
+    def _sniff_text(self, filedata: bytearray) -> int:
+        # nur den Anfang prüfen; ein unzulässiges Zeichen vor einer möglichen Auffüllung (max. 127 Bytes) schließt Text aus
+        probe = KC_V24_Transfer_ByteKernels.latin_to_kc(memoryview(filedata)[:self._SNIFF_TEXT_PROBE])
+        bad = KC_V24_Transfer_ByteKernels.first_invalid_text(probe)
+        if 0 <= bad < len(filedata) - 127:
+            return 0
+        return 90
+
+    def _sniff_sss_band(self, filedata: bytearray) -> int:
+        if len(filedata) < 14:
+            return 0
+        head = bytes(filedata[:3])
+        if (self._check_sss(head) or self._check_ttt(head) or self._check_uuu(head)
+                or self._check_www(head) or self._check_tap(head)):
+            return 95   # Kennung im Kassettenvorblock
+        return 0
+
+    def _sniff_sss_datei(self, filedata: bytearray) -> int:
+        size = len(filedata)
+        if size < 2 + 3:
+            return 0
+        prog_len = filedata[0] | (filedata[1] << 8)
+        code_end = 2 + prog_len
+        if prog_len < 3 or code_end > size or size - code_end > 127:
+            return 0
+        if filedata[code_end - 3:code_end] != b"\x00\x00\x00":
+            return 0
+        return 80       # Längenwort passt zur Dateigröße, Programm endet mit 00 00 00
+
+    def _sniff_kcc(self, filedata: bytearray) -> int:
+        size = len(filedata)
+        if size < 128:
+            return 0
+        data_len = filedata[0] + (filedata[1] << 8)
+        if 0 < data_len and data_len + 2 == size:
+            return 0    # SSS-Längenwort
+        head = bytes(filedata[:3])
+        if self._check_sss(head) or self._check_tap(head) or self._check_uuu(head) or self._check_www(head):
+            return 0
+        addrargs  = filedata[16]
+        startaddr = filedata[17] + (filedata[18] << 8)
+        endaddr   = filedata[19] + (filedata[20] << 8)
+        prog_size = (endaddr - startaddr) & 0xFFFF
+        if addrargs < 2 or addrargs > 0x0A or prog_size <= 0 or prog_size + 128 > size:
+            return 0
+        return 70       # plausible Kopfdaten (Adressargumente, Länge)
+
+    def _sniff_raw(self, filedata: bytearray) -> int:
+        return 1        # Rückfallebene: unbekanntes Binärformat
+
+    
     _KCB_SYS_START_ADDR   = 0x0300
     _KCB_BASIC_START_ADDR = 0x0401
 
@@ -390,16 +464,13 @@ class KC_V24_Transfer_FileFormatTools:
         prog_len = len(prog_bytes)
         end_addr = self._KCB_BASIC_START_ADDR + prog_len  # 0x0401 + len
 
-        transferdata = bytearray()
-        transferdata += self._KCB_SYS_MEM0300
-
-        # 3× endAddr (Little Endian)
-        for _ in range(3):
-            transferdata.append(end_addr & 0xFF)
-            transferdata.append((end_addr >> 8) & 0xFF)
-
-        transferdata += self._KCB_SYS_MEM03DD
-        transferdata += prog_bytes
+        # Systembereich, 3× endAddr (Little Endian), Rest des Systembereichs, Programm - in einem Stück zusammensetzen
+        transferdata = b"".join((
+            self._KCB_SYS_MEM0300,
+            end_addr.to_bytes(2, "little") * 3,
+            self._KCB_SYS_MEM03DD,
+            prog_bytes,
+        ))
 
         result.start        = self._KCB_SYS_START_ADDR
         result.end          = end_addr  # Ladebereich endet bei endAddr-1
@@ -413,6 +484,255 @@ class KC_V24_Transfer_FileFormatTools:
         result.runlinebasic = runlinebasic
         return result
 
+    # Bascoder (BAC854-5.KCB) - Initialisierung nach RUN (CALL*410):
+    #   LD (0340h),A / LD HL,207Bh / LD (03D7h),HL / LD (03D9h),HL / LD (03DBh),HL -> leeres BASICODE-Programm ab 0x2079
+    #   (die gleiche Folge ohne LD (0340h),A gehört zum Zurücksetzen des Programms und bleibt unverändert)
+    #   LD DE,207Dh / LD HL,BA02h / ... / LDIR                      -> verschiebt den Bascoder-Code ab 0x207B nach 0xBA00
+    # Das BASICODE-Programm überschreibt beim Eintippen genau diesen (dann schon verschobenen) Code
+    _BASCODER_VARTAB_INIT = bytes.fromhex("32 40 03 21 7B 20 22 D7 03 22 D9 03 22 DB 03")
+    _BASCODER_RELOC_INIT  = bytes.fromhex("11 7D 20 21 02 BA")
+    _BASCODER_RELOC_SIG   = bytes.fromhex("FE BA")   # Kennung im zu verschiebenden Code (Adresse+1)
+    _BASCODER_RELOC_DEST  = 0xB900                   # Zielbereich der Verschiebung - das Speicherabbild muss darunter enden
+    _BASICODE_FIRST_LINE  = 1000
+
+    def build_basicode_image(self, pr_bascoder: ParseResult, basicode_text) -> ParseResult:
+        """
+        Erzeugt aus dem Bascoder-Speicherabbild und einem BASICODE-Listing (ab Zeile 1000)
+        ein gemeinsames BASICMC-Speicherabbild, das mit einem ESC-T übertragen werden kann.
+
+        Das tokenisierte Programm liegt an der Stelle, an der es beim Eintippen nach der
+        Bascoder-Initialisierung abgelegt würde (0x2079). Der dort liegende Bascoder-Code,
+        den die Initialisierung nach 0xBA00 verschiebt, wird hinter das Programm gelegt und
+        die Initialisierung entsprechend angepasst (Quelle der Verschiebung, Programmende).
+
+        Gibt bei Erfolg ein ParseResult mit errorstate == False und gesetztem lastlinebasic zurück.
+        """
+        result = ParseResult()
+
+        if pr_bascoder is None or pr_bascoder.errorstate or pr_bascoder.start is None:
+            result.validstate = 600   # kein Bascoder geladen
+            return result
+
+        img  = bytearray(pr_bascoder.transferdata)
+        base = pr_bascoder.start
+
+        # Initialisierungscode suchen - jeweils genau einmal
+        pos_vartab = img.find(self._BASCODER_VARTAB_INIT)
+        pos_reloc  = img.find(self._BASCODER_RELOC_INIT)
+        if (pos_vartab < 0 or pos_reloc < 0
+                or img.find(self._BASCODER_VARTAB_INIT, pos_vartab + 1) >= 0
+                or img.find(self._BASCODER_RELOC_INIT, pos_reloc + 1) >= 0):
+            print("build_basicode_image() Initialisierung des Bascoders nicht gefunden")
+            result.validstate = 601   # unbekannte Bascoder-Version
+            return result
+
+        pos_vartab += 3                                                  # Operand von LD HL,207Bh
+        reloc_addr = img[pos_vartab + 1] | (img[pos_vartab + 2] << 8)   # 0x207B
+        prog_addr  = reloc_addr - 2                                      # 0x2079
+        prog_ofs   = prog_addr - base
+        reloc_ofs  = reloc_addr - base
+
+        # Plausibilität: leeres Programm (00 00) direkt vor dem zu verschiebenden Code mit Kennung
+        if (prog_ofs <= 0 or reloc_ofs + 3 > len(img)
+                or img[prog_ofs:reloc_ofs] != b"\x00\x00"
+                or img[reloc_ofs + 1:reloc_ofs + 3] != self._BASCODER_RELOC_SIG):
+            print("build_basicode_image() Speicheraufteilung des Bascoders unerwartet")
+            result.validstate = 602
+            return result
+
+        # BASICODE-Programm ab 0x2079 tokenisieren
+        if isinstance(basicode_text, (bytes, bytearray, memoryview)):
+            basicode_text = str(basicode_text, "latin1")
+
+        tok = KC_V24_Transfer_BASICtokenizer()
+        prog_bytes = tok.tokenize_hc_basic(basicode_text, start_addr=prog_addr,
+                                           min_line_no=self._BASICODE_FIRST_LINE)
+        for msg in tok.process_messages: print(" -", msg)
+        if prog_bytes is None:
+            result.validstate = 603   # Tokenisierung fehlgeschlagen
+            return result
+
+        reloc_code     = img[reloc_ofs:]
+        new_reloc_addr = prog_addr + len(prog_bytes)
+        end_addr       = new_reloc_addr + len(reloc_code)
+        if end_addr > self._BASCODER_RELOC_DEST:
+            print(f"build_basicode_image() Programm zu groß (Ende 0x{end_addr:04X})")
+            result.validstate = 604
+            return result
+
+        transferdata = img[:prog_ofs] + prog_bytes + reloc_code
+
+        # Initialisierung anpassen: Programmende (VARTAB usw.) ...
+        transferdata[pos_vartab + 1] = new_reloc_addr & 0xFF
+        transferdata[pos_vartab + 2] = (new_reloc_addr >> 8) & 0xFF
+        # ... und Quelle der Codeverschiebung (zeigt auf Adresse+2)
+        transferdata[pos_reloc + 1] = (new_reloc_addr + 2) & 0xFF
+        transferdata[pos_reloc + 2] = ((new_reloc_addr + 2) >> 8) & 0xFF
+
+        # BASIC-Arbeitszellen 0x03D7..0x03DC (3× endAddr) - bis zur Initialisierung gehört alles zum Programm
+        ofs = 0x03D7 - base
+        for i in range(3):
+            transferdata[ofs + 2 * i]     = end_addr & 0xFF
+            transferdata[ofs + 2 * i + 1] = (end_addr >> 8) & 0xFF
+
+        result.start         = base
+        result.end           = end_addr
+        result.format        = pr_bascoder.format
+        result.type          = ParseResult._TYPE_BASICMC
+        result.nameh         = pr_bascoder.nameh
+        result.transferdata  = transferdata
+        result.ramclass      = self._calc_ramclass(result.end)
+        result.lastlinebasic = str(tok.get_last_line_number(basicode_text))
+        result.validstate    = 0
+        result.errorstate    = False
+        return result
+
+    # RLE-gepackte Turbo-Übertragung (Stub bin/Polling_ESC-T_RLE_xxxx.bin)
+    #   ESC-T-Nutzdaten: <zielL> <zielH> <Token...> 00
+    #   Token 01h..7Fh: n Bytes unverändert, 80h..FFh: Folgebyte (n-7Eh)-mal (2..129), 00h: Ende
+    # Der Stub entpackt vorwärts von der Ladeadresse zur Zieladresse ("in place")
+    _RLE_MAX_LITERAL = 0x7F
+    _RLE_MIN_RUN     = 3
+    _RLE_MAX_RUN     = 0xFF - 0x7E
+
+    # Rechenzeiten der Stubs auf dem KC (Übertragungszeiten: KC_V24_Transfer_CostModel)
+    _Z80_KHZ         = 1773     # KC85/4
+    _RLE_T_PER_BYTE  = 26       # Takte je entpacktem Byte (Füllschleife; LDIR: 21)
+
+    def compress_rle(self, data) -> bytearray:
+        """
+        Packt data in Token (ohne Zieladresse, mit abschließendem 00h).
+        Läufe ab _RLE_MIN_RUN gleichen Bytes werden als Fülltoken, alles andere als Literale abgelegt.
+        """
+        data = memoryview(data)
+        n = len(data)
+        out = bytearray()
+        lit_start = 0
+
+        def flush_literals(end: int) -> None:
+            pos = lit_start
+            while pos < end:
+                cnt = min(end - pos, self._RLE_MAX_LITERAL)
+                out.append(cnt)
+                out.extend(data[pos:pos + cnt])
+                pos += cnt
+
+        for start, end, value in KC_V24_Transfer_ByteKernels.fill_runs(data, self._RLE_MIN_RUN, self._RLE_MAX_RUN):
+            flush_literals(start)
+            out.append(end - start + 0x7E)
+            out.append(value)
+            lit_start = end
+
+        flush_literals(n)
+        out.append(0x00)
+        return out
+
+    def _rle_inplace_offset(self, tokens) -> int:
+        """
+        Kleinster Abstand Ladeadresse - Zieladresse, bei dem der Stub beim Entpacken
+        keine noch ungelesenen Daten überschreibt (nach jedem Token: geschrieben <= gelesen).
+        """
+        consumed = 2    # Zieladresse
+        produced = 0
+        offset = 0
+        pos = 0
+        while tokens[pos] != 0x00:
+            tok = tokens[pos]
+            if tok & 0x80:
+                produced += tok - 0x7E
+                consumed += 2
+                pos += 2
+            else:
+                produced += tok
+                consumed += 1 + tok
+                pos += 1 + tok
+            offset = max(offset, produced - consumed)
+        return offset
+
+    def build_rle_transfer(self, pr: ParseResult) -> ParseResult:
+        """
+        Erzeugt aus einem Speicherabbild die ESC-T-Nutzdaten für den RLE-Stub.
+        start/end des Ergebnisses sind der Ladebereich des gepackten Stroms (kann hinter pr.end reichen),
+        Einsprungadressen und Namen werden übernommen.
+        """
+        result = ParseResult()
+
+        if pr is None or pr.errorstate or pr.start is None or not pr.transferdata:
+            result.validstate = 700   # nichts zu packen
+            return result
+
+        tokens = self.compress_rle(pr.transferdata)
+        load_start = pr.start + self._rle_inplace_offset(tokens)
+        load_end   = load_start + 2 + len(tokens)
+        if load_end > 0x10000:
+            result.validstate = 701   # Ladebereich oberhalb 64k
+            return result
+
+        transferdata = pr.start.to_bytes(2, "little") + tokens
+
+        result.start        = load_start
+        result.end          = load_end
+        result.format       = pr.format
+        result.type         = pr.type
+        result.nameh        = pr.nameh
+        result.namep        = pr.namep
+        result.callh        = pr.callh
+        result.callp        = pr.callp
+        result.callu        = pr.callu
+        result.runlinebasic = pr.runlinebasic
+        result.lastlinebasic = pr.lastlinebasic
+        result.transferdata = transferdata
+        result.ramclass     = self._calc_ramclass(max(pr.end or load_end, load_end))
+        result.validstate   = 0
+        result.errorstate   = False
+        return result
+
+    def unpack_ms(self, unpack_len: int) -> int:
+        """Geschätzte Entpackzeit des RLE-Stubs in ms (aufgerundet)."""
+        return -(-unpack_len * self._RLE_T_PER_BYTE // self._Z80_KHZ)
+
+    # Session-Stub (bin/Polling_Session_xxxx.bin): mehrere ESC-T/ESC-F in einer Sitzung mit der Turbo-Datenrate
+    _FILL_MIN_RUN    = 32       # ab dieser Lauflänge wird ein Bereich per ESC-F gefüllt statt übertragen
+    _FILL_HEADER_LEN = 7        # 1B 46 adr adr len len wert
+    _FILL_T_PER_BYTE = 21       # LDIR
+
+    def fill_ms(self, fill_len: int, baudrate: int, stopbits: int = 2) -> int:
+        """Wartezeit in ms nach einem ESC-F an den Session-Stub (Füllen + Kommando auf der Leitung mit baudrate/stopbits)."""
+        wire_ms = self._FILL_HEADER_LEN * (9 + stopbits) * 1000 / baudrate
+        return -(-fill_len * self._FILL_T_PER_BYTE // self._Z80_KHZ) + math.ceil(wire_ms)
+
+    def split_fill_segments(self, pr: ParseResult, min_fill: Optional[int] = None) -> list[tuple[str, ParseResult]]:
+        """
+        Zerlegt ein Speicherabbild in Abschnitte für den Session-Stub:
+        ("T", pr) - Daten per ESC-T übertragen, ("F", pr) - Bereich per ESC-F mit pr.transferdata[0] füllen.
+        Namen und Einsprungadressen werden in alle Abschnitte übernommen.
+        """
+        if min_fill is None:
+            min_fill = self._FILL_MIN_RUN
+
+        data = pr.transferdata
+        segments: list[tuple[str, ParseResult]] = []
+
+        def add(kind: str, ofs: int, end: int) -> None:
+            # Abschnitte teilen sich den Puffer von pr (Ausschnitt ohne Kopie)
+            seg = pr.slice(ofs, ofs + 1 if kind == "F" else end)
+            seg.end           = pr.start + end
+            seg.ramclass      = self._calc_ramclass(seg.end)
+            seg.validstate    = 0
+            seg.errorstate    = False
+            segments.append((kind, seg))
+
+        n = len(data)
+        seg_start = 0
+        for start, end, _ in KC_V24_Transfer_ByteKernels.fill_runs(data, min_fill):
+            if seg_start < start:
+                add("T", seg_start, start)
+            add("F", start, end)
+            seg_start = end
+        if seg_start < n:
+            add("T", seg_start, n)
+        return segments
+
     # gibt ein parseResult mit gesetzten errorstate und type zurück,
     # der errorstate ist True, wenn die übergebenen filedata ungültige Zeichen enthalten,
     # ansonsten wird der type und die enthaltenen textdaten in transferdata des ParseResult zurückgegeben (der Text (als bytes) ohne evtl. Füllzeichen am Ende)
@@ -433,11 +753,11 @@ class KC_V24_Transfer_FileFormatTools:
 
         result = ParseResult()
         
-        if not isinstance(filedata, bytearray):
-            raise TypeError("parseformatTEXT() filedata muss vom Typ bytearray sein")
+        if not isinstance(filedata, (bytes, bytearray)):
+            raise TypeError("parseformatTEXT() filedata muss vom Typ bytes/bytearray sein")
 
 
-        data = bytes(KC_V24_Transfer_BASICdetokenizer._LATIN_2_KC.get(b, b) for b in filedata)   # angenommenen LATIN-1-Code in KC-Codes umwandeln
+        data = KC_V24_Transfer_ByteKernels.latin_to_kc(filedata)   # angenommenen LATIN-1-Code in KC-Codes umwandeln
         #data = bytes(filedata)
         length = len(data)
 
@@ -452,32 +772,42 @@ class KC_V24_Transfer_FileFormatTools:
             # Nur dann als Füllzeichen betrachten, wenn dieses Byte selbst
             # KEIN zulässiges Textzeichen wäre (typisch: 0x00, 0x1A o. ä.).
             if not self._is_valid_textbyte(fill_byte):
-                run_len = 0
-                i = length - 1
-
                 # Bis zu 127 identische Bytes am Ende als Auffüllung akzeptieren
-                while i >= 0 and data[i] == fill_byte and run_len < 127:
-                    run_len += 1
-                    i -= 1
+                _, run_len = KC_V24_Transfer_ByteKernels.trailing_run(data, 127)
 
                 if run_len > 0:
                     cut_index = length - run_len
             if cut_index:
                 print(f"parseformatTEXT() Auffuellung gefunden: {cut_index}")
             
-        # Relevanten Textbereich ohne Füllzeichen
-        text_bytes = data[:cut_index]
+        # Relevanten Textbereich ohne Füllzeichen (Ausschnitt ohne Kopie)
+        text_bytes = memoryview(data)[:cut_index]
 
         # Jetzt den bereinigten Bereich auf zulässige Zeichen prüfen
-        for b in text_bytes:
-            if not self._is_valid_textbyte(b):
-                print(f"parseformatTEXT() not _is_valid_textchar 0x{b:02X}")
-                return result
+        bad = KC_V24_Transfer_ByteKernels.first_invalid_text(text_bytes)
+        if bad >= 0:
+            print(f"parseformatTEXT() not _is_valid_textchar 0x{text_bytes[bad]:02X}")
+            return result
 
         # Den enthaltenen Text noch klassifizieren
         result.format = result._FORMAT_TEXT
-        result.type = self.classify_basic_text(bytearray(text_bytes))  # gibt einen TYP-String aus ParseResult zurück
-        result.transferdata = bytearray(text_bytes)
+        result.type = self.classify_basic_text(text_bytes)  # gibt einen TYP-String aus ParseResult zurück
+
+        if result.type == result._TYPE_BASICTEXT:
+            # BASIC-Listing auf dem PC tokenisieren und als BASICMC-Speicherabbild senden
+            # (0x0300.., BASIC ab 0x0401) - schlägt das fehl, wird das Listing wie bisher eingetippt
+            tok = KC_V24_Transfer_BASICtokenizer()
+            prog_bytes = tok.tokenize_hc_basic(str(text_bytes, "latin1"))
+            for msg in tok.process_messages: print(" -", msg)
+            if prog_bytes is not None:
+                return self.build_basicmc_from_basic_program(
+                    prog_bytes,
+                    nameh=None,
+                    fmt=ParseResult._FORMAT_TEXT,
+                    runlinebasic=self.get_runline_from_basic(text_bytes),
+                )
+
+        result.transferdata = text_bytes
         result.errorstate = False
         return result
 
@@ -492,8 +822,8 @@ class KC_V24_Transfer_FileFormatTools:
 
         result = ParseResult()
 
-        if not isinstance(filedata, bytearray):
-            raise TypeError("parseformatTEXT() filedata muss vom Typ bytearray sein")
+        if not isinstance(filedata, (bytes, bytearray)):
+            raise TypeError("parseformatTEXT() filedata muss vom Typ bytes/bytearray sein")
 
         data = bytes(filedata)
         size = len(data)
@@ -550,8 +880,8 @@ class KC_V24_Transfer_FileFormatTools:
         calladdr  = data[21] + (data[22] << 8)
         prog_size = (endaddr - startaddr) & 0xFFFF
 
-        # Programmdaten abspalten
-        mem_data = data[128:]
+        # Programmdaten abspalten (Ausschnitt ohne Kopie)
+        mem_data = memoryview(data)[128:]
         if not mem_data:
             result.validstate = 206  # keine Programmdaten
             result.errorstate = True
@@ -587,13 +917,13 @@ class KC_V24_Transfer_FileFormatTools:
             result.format = result._FORMAT_KCC
 
         # CAOS-Menüeinträge (Prolog) suchen
-        entries = self._find_menu_entries(startaddr, mem_data)
+        entries = self._find_menu_entries(startaddr, data, 128)
         if entries:
             first_name, first_addr = entries[0]
             result.namep = first_name
             result.callp = first_addr
 
-        result.transferdata = bytearray(mem_data[:prog_size])
+        result.transferdata = mem_data[:prog_size]
         # Format ist konsistent
         result.validstate = 0
         result.errorstate = False
@@ -612,8 +942,8 @@ class KC_V24_Transfer_FileFormatTools:
 
         """
         result = ParseResult()
-        if not isinstance(filedata, bytearray):
-            raise TypeError("parseformatSSSDatei() filedata muss vom Typ bytearray sein")
+        if not isinstance(filedata, (bytes, bytearray)):
+            raise TypeError("parseformatSSSDatei() filedata muss vom Typ bytes/bytearray sein")
 
         data = bytes(filedata)
         size = len(data)
@@ -718,8 +1048,8 @@ class KC_V24_Transfer_FileFormatTools:
 
         result = ParseResult()
 
-        if not isinstance(filedata, bytearray):
-            raise TypeError("parseformatSSSBand() filedata muss vom Typ bytearray sein")
+        if not isinstance(filedata, (bytes, bytearray)):
+            raise TypeError("parseformatSSSBand() filedata muss vom Typ bytes/bytearray sein")
 
         data = bytes(filedata)
         size = len(data)
@@ -877,8 +1207,8 @@ class KC_V24_Transfer_FileFormatTools:
 
         result = ParseResult()
 
-        if not isinstance(filedata, bytearray):
-            raise TypeError("parseRAWBytes() filedata muss vom Typ bytearray sein")
+        if not isinstance(filedata, (bytes, bytearray)):
+            raise TypeError("parseRAWBytes() filedata muss vom Typ bytes/bytearray sein")
 
         data = bytes(filedata)
         size = len(data)
@@ -909,7 +1239,7 @@ class KC_V24_Transfer_FileFormatTools:
         result.callh        = startaddr          # Standard-Einsprungadresse 0x0200
         result.format       = result._FORMAT_RAW # optional: eigener RAW-Formatname
         result.type         = result._TYPE_MC    # Maschinenprogramm
-        result.transferdata = bytearray(data)
+        result.transferdata = data
         result.ramclass     = self._calc_ramclass(endaddr_exclusive)
         result.validstate   = 0
         result.errorstate   = False
@@ -965,48 +1295,13 @@ class KC_V24_Transfer_FileFormatTools:
 
         return True
 
-    def _isvalid_menu_char(self, value: int) -> bool:
-        """
-        Zeichen für CAOS-Menüeinträge zulassen: alphanumerisch oder ':'.
-        Entspricht isvalid() aus check_KCC.cpp.
-        """
-        # 0–9, A–Z, a–z oder ':'
-        if 0x30 <= value <= 0x39:
-            return True
-        if 0x41 <= value <= 0x5A:
-            return True
-        if 0x61 <= value <= 0x7A:
-            return True
-        if value == ord(':'):
-            return True
-        return False
-
-    def _find_menu_entries(self, startaddr: int, mem_data: bytes):
+    def _find_menu_entries(self, startaddr: int, mem_data: bytes, ofs: int = 0):
         """
-        Sucht im Programmbereich nach CAOS-Prologen (0x7F 0x7F <Name> <Epilog>)
+        Sucht im Programmbereich mem_data[ofs:] nach CAOS-Prologen (0x7F 0x7F <Name> <Epilog>)
         und liefert eine Liste von (Name, Einsprungadresse) zurück.
         """
-        entries = []
-        index = 0
-        n = len(mem_data)
-
-        # minimaler Prolog = 0x7F 0x7F <Epilog> <Code...>
-        while index + 4 < n:
-            if mem_data[index] == 0x7F and mem_data[index + 1] == 0x7F:
-                name_chars = []
-                index += 2
-                while index + 1 < n and self._isvalid_menu_char(mem_data[index]):
-                    name_chars.append(chr(mem_data[index]))
-                    index += 1
-
-                # valides Epilogbyte (<= 0x1F) und nichtleerer Name
-                if index < n and mem_data[index] <= 0x1F and name_chars:
-                    address = index + 1 + startaddr
-                    entries.append(("".join(name_chars), address))
-
-            index += 1
-            
-        
+        entries = [(name, pos + startaddr) for name, pos in KC_V24_Transfer_ByteKernels.find_prologs(mem_data, ofs)]
+
         print("_find_menu_entries()")
         print(", ".join(f"({s}, 0x{n:04X})" for s, n in entries))
         return entries
@@ -1029,3 +1324,12 @@ class KC_V24_Transfer_FileFormatTools:
         else:
             # oberhalb 48 kByte bleibt die höchste Klasse erhalten
             return "??k"
+
+    # Formate der Erkennung (Reihenfolge bei gleicher Zuverlässigkeit wie die frühere Prüfkette)
+    _FORMATS: list[FormatSniffer] = [
+        FormatSniffer("TEXT",     10, _sniff_text,      parseformatTEXT),
+        FormatSniffer("SSS-Band", 20, _sniff_sss_band,  parseformatSSSBand),
+        FormatSniffer("SSS-Disk", 30, _sniff_sss_datei, parseformatSSSDatei),
+        FormatSniffer("KCC",      40, _sniff_kcc,       parseformatKCC),
+        FormatSniffer("RAW",      50, _sniff_raw,       parseRAWBytes),
+    ]
@@ -1,26 +1,73 @@
 from __future__ import annotations
 
-from tkinter import messagebox
+import asyncio
 import serial
 import time
 import threading
 
+import zlib
 from dataclasses import dataclass, field
 from serial.tools import list_ports
 from typing import Callable, List, Optional, Union, TYPE_CHECKING
 
-from kc_v24_transfer_kcfileformattools import ParseResult
-from kc_v24_transfer_basiclinedimanalyzer import BasicLineDimAnalyzer
-from kc_v24_transfer_basiclinevaranalyzer import BasicLineVarAnalyzer
+from kc_v24_transfer_kcfileformattools import ParseResult, KC_V24_Transfer_FileFormatTools
+from kc_v24_transfer_lineinjector import KC_V24_Transfer_LineInjector
+from kc_v24_transfer_textplan import KC_V24_Transfer_TextPlan, TextPlanConfig
+from kc_v24_transfer_pacer import KC_V24_Transfer_Pacer, PacerStats
 
 if TYPE_CHECKING:
-    from kc_v24_transfer import KC_V24_TransferApp  # nur für Typprüfung, kein Laufzeit-Import
-import re
+    from kc_v24_transfer_session import KC_V24_Transfer_Session  # nur für Typprüfung, kein Laufzeit-Import
 import sys
 
 if sys.stdout is not None and hasattr(sys.stdout, "reconfigure"):
     sys.stdout.reconfigure(line_buffering=True)
 
+@dataclass
+class KC_ResumeInfo:
+    """
+    Stand einer abgebrochenen ESC-T-Übertragung.
+    Der KC wartet danach weiter auf genau total - offset Datenbytes und kann
+    mit _JT_RESUMEBIN ohne RESET zu Ende beladen werden.
+    """
+    start:    int                 # Zieladresse des ESC-T
+    total:    int                 # Länge der Nutzdaten
+    offset:   int                 # bereits vollständig gesendete Bytes
+    crc:      int                 # CRC32 der Nutzdaten (Identität)
+    baudrate: int                 # Datenrate der Übertragung (57600 hinter dem Turbo-Stub)
+    job:      "KC_Job"            # abgebrochener Job (Vorlage für den Fortsetzungs-Job)
+    stopbits: int = 2             # Stoppbits der Übertragung
+    followjobs: List["KC_Job"] = field(default_factory=list)   # danach noch ausstehende Jobs
+
+    @staticmethod
+    def payload_crc(data) -> int:
+        return zlib.crc32(bytes(data)) & 0xFFFFFFFF
+
+
+@dataclass
+class KC_SendStats:
+    """Auslastung der Leitung bei einer Binärübertragung (ESC-T)."""
+    baudrate:  int
+    stopbits:  int   = 2
+    nbytes:    int   = 0        # übertragene Bytes
+    elapsed_s: float = 0.0      # Dauer vom ersten Schreiben bis zum Ende der Übertragung
+    stall_s:   float = 0.0      # geschätzte Zeit, in der der Sendepuffer leer war (Leitung stand still)
+    pipelined: bool  = True     # False: out_waiting nicht verfügbar, blockweise mit flush() gesendet
+
+    @property
+    def wire_s(self) -> float:
+        """Reine Übertragungszeit der Bytes bei voller Auslastung."""
+        return self.nbytes * (9 + self.stopbits) / self.baudrate if self.baudrate else 0.0
+
+    @property
+    def utilisation(self) -> float:
+        return min(1.0, self.wire_s / self.elapsed_s) if self.elapsed_s > 0 else 0.0
+
+    def __str__(self) -> str:
+        mode = "Puffer" if self.pipelined else "blockweise"
+        return (f"{self.nbytes} Bytes in {self.elapsed_s:.2f}s ({mode}, {self.baudrate} Baud), "
+                f"Auslastung {self.utilisation * 100:.0f}%, Stillstand {self.stall_s * 1000:.0f}ms")
+
+
 class KC_Job:
 
     # Konstanten: Job-Status
@@ -45,9 +92,18 @@ class KC_Job:
     _JT_STARTREBASIC   = 8   # startet aus CAOS REBASIC (durch Keyboardeingaben)
     _JT_RUNBASIC       = 9   # startet ein BASIC-Programm per "RUN" am BASIC-Prompt
     _JT_RESETBASCODER  = 10  # TODO Setzt den Bascoder in der Bascoder-Oberfläche zurück
+    _JT_RESUMEBIN      = 11  # sendet den fehlenden Rest einer abgebrochenen ESC-T-Übertragung (parent.resume_info)
+    _JT_TURBOSENDBIN   = 12  # sendet ESC-T an den Session-Stub (ohne Pause nach ESC) - wie _JT_SENDBIN
+    _JT_TURBOFILL      = 13  # sendet ESC-F an den Session-Stub: pr.start..pr.end-1 mit pr.transferdata[0] füllen
+    _JT_TURBOEND       = 14  # sendet ESC-Q an den Session-Stub: zurück zur CAOS-Duplex-Routine (1200 Baud)
+    _JT_RUNCHECK       = 15  # startet per ESC-U das Prüfprogramm der Kalibrierung und wertet dessen Antwort aus (calibration)
+    _JT_RESIDENT       = 16  # sendet nichts: pr liegt bereits unverändert im KC (KC_V24_Transfer_MemoryShadow) - nur pause/askstart/savelastline
+    _JT_RUNINJECTOR    = 17  # ruft am BASIC-Prompt den vorab geladenen Zeilen-Einspeiser auf (CALL*7A00) und wartet auf dessen 'O' - image: das eingespeiste Listing
+    _JT_RUNBASICWARM   = 18  # sendet ESC-U auf den BASIC-Warmstart-Stub (pr.callu): BASIC ohne Tastaturmodus fortsetzen und RUN eingeben
+    # ESC-U an den Session-Stub: _JT_RUNBIN (der Stub schaltet vor dem Aufruf auf 1200 Baud zurück)
     
     # Properties
-    parent: KC_V24_TransferApp | None       # Hauptklasse
+    parent: KC_V24_Transfer_Session | None  # Hauptklasse (GUI-App oder Kommandozeile)
     
     type:   int | None                  # Typ des Jobs (_JT_xxx)
     pr:     ParseResult | None          # Parseresult, welches übertragen werden soll (Nutzdatenobjekt aus dem die auszuführenden Funktionsusfufe abgeleitet werden)
@@ -57,11 +113,22 @@ class KC_Job:
     sent:   int = 0                     # Anzahl aktuell gesendeter Bytes
     total:  int = 0                     # Anzahl der durch diesen Job zu sendenden (Nutz-)Daten
     cancelable: bool = False            # ist JOB aktuell cancelbar
-    savelastline:bool = False           # wenn gesetzt, wird die letzte gelesene Basic-Zeilennummer von einem _JT_SENDBASICTEXT-Typ per set_last_basicodelinenumber global gespeichert
+    savelastline:bool = False           # wenn gesetzt, wird die letzte gelesene Basic-Zeilennummer von einem _JT_SENDBASICTEXT-Typ (bzw. pr.lastlinebasic bei _JT_SENDBIN) per set_last_basicodelinenumber global gespeichert
     
     set_ser_br = None                   # Soll-Geschwindigkeit für Schnittstelle nach Umschaltung
+    set_ser_sb = None                   # Stoppbits nach Umschaltung (None = 2)
+    calibration = None                  # _JT_RUNCHECK: (BaudStep, Job der Musterübertragung)
+    deadline: float | None = None       # maximale Laufzeit in Sekunden (wird von der JobEngine überwacht)
+    image: ParseResult | None = None    # Speicherinhalt nach dem Job, wenn er von pr abweicht (RLE: entpacktes Abbild, BASIC-Änderungen: ganzes Listing)
+    pace_stats: PacerStats | None = None  # Genauigkeit der Wartezeiten (Tastaturübertragung)
+    send_stats: KC_SendStats | None = None  # Auslastung der Leitung (Binärübertragung)
+
+    _TX_WINDOW_MS = 100                 # Binärübertragung: so viele ms Daten im Sendepuffer vorhalten ...
+    _TX_MIN_BLOCK = 64                  # ... mindestens aber so viele Bytes
+    started:  float | None = None       # time.monotonic() bei Start/Ende des Jobs
+    finished: float | None = None
     
-    def __init__(self, parent: KC_V24_TransferApp, type: int, pr: ParseResult, pause: int = 0, askstart=False, savelastline=False, set_ser_br=None, basiclinesoffset=0) -> None:
+    def __init__(self, parent: KC_V24_Transfer_Session, type: int, pr: ParseResult, pause: int = 0, askstart=False, savelastline=False, set_ser_br=None, basiclinesoffset=0, set_ser_sb=None, calibration=None, deadline=None, image=None) -> None:
         self.parent           = parent
         self.type             = type
         self.askstart         = askstart
@@ -71,6 +138,10 @@ class KC_Job:
         self.savelastline     = savelastline
         self.set_ser_br       = set_ser_br
         self.basiclinesoffset = basiclinesoffset
+        self.set_ser_sb       = set_ser_sb
+        self.calibration      = calibration
+        self.deadline         = deadline
+        self.image            = image
 
         self.total   = len(pr.transferdata)
         #print(f"TRANSFERDATA: {len(pr.transferdata)}")
@@ -78,10 +149,19 @@ class KC_Job:
         self._lock   = threading.Lock()   # schützt Status-/Zählerzugriffe
         self._cancel = threading.Event()  # Abbruchsignal
         self._done   = threading.Event()  # Fertig-Signal (optional)
+        self._pacer  = KC_V24_Transfer_Pacer(self._cancel)   # Wartezeiten (abbrechbar)
         
         print(f"Job [Typ: {self.type}] [{self.total} Bytes] erzeugt")
 
         
+    def clone(self, type: int | None = None) -> "KC_Job":
+        """Neuer, noch nicht gestarteter Job mit denselben Parametern (optional anderer Typ)."""
+        return KC_Job(parent=self.parent, type=self.type if type is None else type, pr=self.pr,
+                      pause=self.pause, askstart=self.askstart, savelastline=self.savelastline,
+                      set_ser_br=self.set_ser_br, basiclinesoffset=self.basiclinesoffset,
+                      set_ser_sb=self.set_ser_sb, calibration=self.calibration, deadline=self.deadline,
+                      image=self.image)
+
     def cancel(self) -> None:
         # WICHTIGER FUNKTIONSAUFRUF: setzt Abbruchsignal
         self._cancel.set()
@@ -91,6 +171,32 @@ class KC_Job:
         with self._lock:
             return self.state, self.sent, self.cancelable
 
+    def _delay(self, ms: float) -> bool:
+        """Wartet ms Millisekunden (genau, siehe KC_V24_Transfer_Pacer); endet bei einem Abbruch sofort (Rückgabe False)."""
+        return self._pacer.sleep(ms)
+
+    def _canceled(self) -> bool:
+        """Job wurde während einer Wartezeit abgebrochen."""
+        print(f"Job {self.type} abgebrochen")
+        with self._lock:
+            self.state = self._JS_CANCELED
+        return True
+
+    async def run_async(self) -> Optional[int]:
+        """
+        Coroutine-Schnittstelle für die JobEngine: startjob() läuft in einem Executor-Thread
+        (pyserial blockiert), die Ereignisschleife bleibt frei. Wird die Coroutine abgebrochen,
+        wird der Job abgebrochen und sein Ende abgewartet. Rückgabe: Endstatus (_JS_xxx).
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(None, self.startjob)
+        try:
+            await asyncio.shield(future)
+        except asyncio.CancelledError:
+            self.cancel()
+            await future
+            raise
+        return self.snapshot()[0]
 
     def _get_ser(self) -> serial.Serial:
         """Liefert das aktuelle COM-Portobjekt aus dem Parent (wird erst zur Laufzeit gebunden)."""
@@ -106,14 +212,15 @@ class KC_Job:
         Währenddessen kann der GUI-/Haupt-Thread self.state/self.sent auslesen.
         """
         try:
-            # Wenn die Schnittstelle defekt ist, Job ignorieren/überspringen
-            if self.parent.get_trans_state() == "BROKE":
+            # Wenn die Schnittstelle defekt ist, Job ignorieren/überspringen (außer Fortsetzung der Übertragung)
+            if self.parent.get_trans_state() == "BROKE" and self.type != self._JT_RESUMEBIN:
                 with self._lock:
                     self.state = self._JS_IGNORED
                 return True
         
             with self._lock:
                 self.state = self._JS_RUNNING
+            self.started = time.monotonic()
             
             result = None
             print(f"Job {self.type} wird gestartet")
@@ -142,26 +249,50 @@ class KC_Job:
             elif self.type == self._JT_SENDBIN:
                 result = self.job_sendbin()
                 
-            elif self.type == self._JT_RUNBIN:
+            elif self.type == self._JT_RESUMEBIN:
+                result = self.job_resumebin()
+                
+            elif self.type == self._JT_TURBOSENDBIN:
+                result = self.job_sendbin(escpause=False)
+                
+            elif self.type == self._JT_TURBOFILL:
+                result = self.job_turbofill()
+                
+            elif self.type == self._JT_TURBOEND:
+                result = self.job_turboend()
+                
+            elif self.type == self._JT_RUNCHECK:
+                result = self.job_runcheck()
+                
+            elif self.type in (self._JT_RUNBIN, self._JT_RUNBASICWARM):
                 result = self.job_runbin()
                 
             elif self.type == self._JT_RUNBINMENU:
                 result = self.job_runbinmenu()
+
+            elif self.type == self._JT_RESIDENT:
+                result = self.job_resident()
+
+            elif self.type == self._JT_RUNINJECTOR:
+                result = self.job_runinjector()
             else:
                 # Typ nicht implementiert -> als Fehler markieren
                 raise NotImplementedError(f"Job-Typ {self.type} nicht implementiert")
 
+            t_end = time.monotonic()   # Ende der Ausgabe an den KC - ab hier läuft die Pause (self.pause)
+
             # Umschalten auf 9600 Baud
             if self.state == self._JS_DONE and self.set_ser_br:
                 new_br = int(self.set_ser_br)
-                print(f"COM -> neue Baudrate: {new_br}")
+                new_sb = int(self.set_ser_sb) if self.set_ser_sb else 2
+                print(f"COM -> neue Baudrate: {new_br} (8N{new_sb})")
                 try:
                     if self.parent.com_port is not None:
                         self.parent.com_port.flush()
                 except Exception:
                     pass
                 self.parent._close_current_port()
-                self.parent.com_port = self.parent.open_port(new_br)
+                self.parent.com_port = self.parent.open_port(new_br, stopbits=new_sb)
                 if self.parent.com_port is None:
                     with self._lock:
                         self.state = self._JS_FAILED
@@ -176,7 +307,7 @@ class KC_Job:
             # Frage nach einem Start
             if self.state == self._JS_DONE and self.askstart:
                 print("Frage-Starten")
-                starten = messagebox.askyesno("Frage", "Programm jetzt starten?", parent=self.parent.root)
+                starten = self.parent.ask_yes_no("Frage", "Programm jetzt starten?")
                 if starten:
                     print("Frage-Starten: Ja")
                     pass
@@ -187,8 +318,12 @@ class KC_Job:
             
             if result:
                 if (self.state == self._JS_DONE) and self.pause is not None and self.pause > 0:
-                    print(f"startjob() Pause: {self.pause}")
-                    time.sleep(self.pause / 1000.0)
+                    # die Pause gibt dem KC Zeit (z.B. Initialisierung des Bascoders nach RUN) - sie zählt ab dem
+                    # Ende der Ausgabe, Umschalten der Datenrate und die Startfrage an den Benutzer verkürzen sie
+                    rest = self.pause - (time.monotonic() - t_end) * 1000.0
+                    print(f"startjob() Pause: {self.pause} (noch {max(0.0, rest):.0f})")
+                    if rest > 0:
+                        self._delay(rest)
                 #with self._lock:
                 #    self.state = self._JS_DONE
             else:
@@ -201,9 +336,25 @@ class KC_Job:
                 self.state = self._JS_FAILED
 
         finally:
+            self.finished = time.monotonic()
+            self._track_memory()
             self._done.set()  # signalisiert threading "fertig"
 
             
+    def _track_memory(self) -> None:
+        """Wirkung des Jobs im Speicherabbild des KC (parent.memory) nachführen."""
+        memory = getattr(self.parent, "memory", None)
+        if memory is None or self.started is None or self.state == self._JS_IGNORED:
+            return
+        info = self.parent.get_resume_info()
+        try:
+            memory.apply_job(self, info.offset if info is not None and info.job is self else None)
+            memory.port = self.parent.com_port_name
+            memory.last_basicodelinenumber = self.parent.get_last_basicodelinenumber()
+        except Exception as e:
+            print(f"_track_memory: {e}")
+            memory.invalidate_all()
+
     # schaltet am KC den Keyboard-Modus ein
     # (Tastaturausgaben)
     def job_startkeybmode(self) -> bool:
@@ -219,7 +370,8 @@ class KC_Job:
             self.parent.set_trans_state("KEY")
             
             # Initial-Verzögerung nach Konfiguration
-            time.sleep(self.parent.textconfig_init_delay / 1000.0)
+            if not self._delay(self.parent.textconfig_init_delay):
+                return self._canceled()
             
             
             print("Keyboard-Modus eingeschaltet")
@@ -242,13 +394,16 @@ class KC_Job:
             
             ser.write("B".encode("ascii", errors="replace"))# B in CHAOS
             ser.flush()
-            time.sleep(self.parent.textconfig_char_delay / 1000.0)
+            if not self._delay(self.parent.textconfig_char_delay):
+                return self._canceled()
             ser.write(b"\x0D") # ENTER
             ser.flush()
-            time.sleep(self.parent.textconfig_init_basic1delay / 1000.0)
+            if not self._delay(self.parent.textconfig_init_basic1delay):
+                return self._canceled()
             ser.write(b"\x0D") # ENTER
             ser.flush()
-            time.sleep(self.parent.textconfig_init_basic2delay / 1000.0)
+            if not self._delay(self.parent.textconfig_init_basic2delay):
+                return self._canceled()
             #ser.write("RUN".encode("ascii", errors="replace"))# B in CHAOS
             #ser.flush()
             with self._lock:
@@ -299,17 +454,20 @@ class KC_Job:
                 
                 ser.write(b"\x03")  # besser ein BRK senden
                 ser.flush()
-                time.sleep(300 / 1000.0)
+                if not self._delay(300):
+                    return self._canceled()
                 
                 ser.write(f"DELETE 1000,{lln}".encode("ascii"))
                 ser.write(b"\x0D") # ENTER
                 ser.flush()
-                time.sleep(300 / 1000.0)
+                if not self._delay(300):
+                    return self._canceled()
                 
                 ser.write("CLEAR".encode("ascii"))
                 ser.write(b"\x0D") # ENTER
                 ser.flush()
-                time.sleep(300 / 1000.0)
+                if not self._delay(300):
+                    return self._canceled()
                 
             with self._lock:
                 self.state = self._JS_DONE
@@ -332,7 +490,8 @@ class KC_Job:
             ser.write("REBASIC".encode("ascii", errors="replace"))# B in CHAOS
             ser.write(b"\x0D") # ENTER
             ser.flush()
-            time.sleep(self.parent.textconfig_init_rebasicdelay / 1000.0)
+            if not self._delay(self.parent.textconfig_init_rebasicdelay):
+                return self._canceled()
             with self._lock:
                 self.state = self._JS_DONE
             
@@ -349,183 +508,61 @@ class KC_Job:
         print(f"job_sendtext() fastmode: {fastmode}")
         print(f"job_sendtext() endreturn: {endreturn}")
         
-        dimanalyzer = BasicLineDimAnalyzer(option_base=0)
-        varanalyzer = BasicLineVarAnalyzer()
-        
-        def is_charbyte_printable(byte) -> bool:
-            if (byte < 0x20 or byte >= 0x80): # Zulässiger Zeichenbereich nur von 0x20 bis 0x7F
-                return False
-            return True
-        
         try:
             ser = self._get_ser()    
-            cursor_line      = 0    # aktuelle Zeile des Cursors auf dem KC
-            cursor_row       = self.parent.textconfig_promptwidth             # Cursor steht am Prompt 
-            cursor_is_in_string = False # True, wenn der Cursor in einem Strinliteral steht
-            linecommandcount = 0    # Anzahl der ZUSÄTZLICHEN Befehle in einer Zeile (:)
-            totallinecount   = 0    # Anzahl der verarbeiteten Zeilen
-            currentlinetext  = ""   # Text der aktuellen Zeile
-            lastlinenumber   = None # die letzte BASIC-Zeilennummer des übertragenen Programmes 
-            
-            # Regex für ON GOTO - ON GOSUB Befehlszählung in Zeile
-            rx = re.compile(
-                r'(?i)(?:^|(?<=\s)|(?<=:)|(?<=THEN)|(?<=ELSE)|(?<=\d))'
-                r'ON\s*[^:]*?GO(?:TO|SUB)\s*([0-9]+(?:\s*,\s*[0-9]+)*)'
-            )
-
-            if fastmode:  # im Fastmode wird der Bildschirm initial und nach dem Vollschreiben gelöscht (Verhinderung von Zeilenscrolling)
-                #time.sleep(delay_ms / 1000.0)   
-                ser.write(b"\x0C")
-                time.sleep(self.parent.textconfig_char_delay / 1000)
-                
-                #ser.write(b"C")
-                #time.sleep(self.parent.textconfig_char_delay / 1000)
-                #ser.write(b"L")
-                #time.sleep(self.parent.textconfig_char_delay / 1000)
-                #ser.write(b"S")
-                #time.sleep(self.parent.textconfig_char_delay / 1000)
-                ser.write(b"\x0D")
-                ser.flush()
-                time.sleep(self.parent.textconfig_init_clsdelay / 1000)
-                cursor_line = 2
 
-            i = 0
-            total = len(self.pr.transferdata)
+            # Übertragungsplan vorab berechnen: Segmente (Bytes, Wartezeit danach)
+            plan = KC_V24_Transfer_TextPlan.compile(
+                self.pr.transferdata,
+                TextPlanConfig.from_app(self.parent),
+                fastmode=fastmode,
+                endreturn=endreturn,
+                basiclinesoffset=basiclinesoffset,
+                basicode=(self.pr.type == self.pr._TYPE_BASICODE),
+                verbose=True,
+            )
+            print(f"job_sendtext() Plan: {len(plan.segments)} Segmente, {plan.lines} Zeilen, "
+                  f"Dauer (geplant): {plan.duration_ms() / 1000:.1f}s")
 
             self.cancelable = True   # als cancelbar kennzeichnen
 
-            while i < total and not self._cancel.is_set():
-                charbyte = self.pr.transferdata[i]
-                #charbyte = self.pr.transferdata[i:i+1]   # bytes/bytearray der Länge 1
-                i += 1
-                
-                if charbyte == 0x0A:  # nur CR 0x0D soll im text gesendet werden
-                    continue  # Rest überspringen, nächster Durchlauf
-                
-                ser.write(bytes([charbyte]))
-                ser.flush()
+            lastlinenumber = None # die letzte BASIC-Zeilennummer des übertragenen Programmes 
+            done = 0              # Anzahl abgearbeiteter Segmente
+            
+            # Wartezeiten gegen den Plan takten: Übertragungszeit und Timer-Ungenauigkeit werden verrechnet
+            pacer = self._pacer
+            baudrate = int(getattr(ser, "baudrate", 1200))
+            pacer.start()
+            for seg in plan.segments:
+                if self._cancel.is_set():
+                    break
+
+                if seg.data:
+                    ser.write(seg.data)
+                    ser.flush()
                 
                 with self._lock:
-                    self.sent = i
-                    
-                delay_ms = self.parent.textconfig_char_delay
-                #print(ch)
-                
-                # Text der aktuellen Zeile ergänzen
-                if charbyte != 0x0D: # quasi Enter
-                    currentlinetext += chr(charbyte)
-                
-                # Zeilenende immer chr(0x0D) + chr(0x0A)
-                if charbyte == 0x0D: # quasi Enter
-                    
-                    if self.pr.type == self.pr._TYPE_BASICODE:
-                        m = re.match(r'^\s*(\d{1,5})', currentlinetext)
-                        if m:
-                            lastlinenumber = m.group(1)   # str
-
-                    # Zeilenende: Verarbeitung
-                    cursor_row  = self.parent.textconfig_promptwidth
-                    cursor_line = cursor_line + 1
-                    cursor_is_in_string  = False       # Cursor befindet sich nicht in einem Stringliteral
-                    totallinecount += 1
-
-                    # Mehrfach-Sprünge mit ON GOTO, ON GOSUB als Einzelbefehle auswerten
-                    linecommandcount += sum(m.group(1).count(',') + 1 for m in rx.finditer(currentlinetext))
-
-                    delay_ms += self.parent.textconfig_process_delay                       # Verarbeitungszeit
-                    delay_ms += linecommandcount * self.parent.textconfig_command_addition # zusätzliche Berechnungszeit bei mehreren Befehlen
-                    delay_ms += (totallinecount + basiclinesoffset) * self.parent.textconfig_linethrottle       # mehr Zeit bei vielen Zeilen
-
-                    # Zusatz-delay für zeitaufwendige DIM-Operationen im BASIC-Text bestimmen
-                    dim_refs, dim_units = dimanalyzer.analyze_line(currentlinetext)
-                    delay_ms += dim_refs  * self.parent.textconfig_dim_ref_delay
-                    delay_ms += dim_units * self.parent.textconfig_dim_unit_delay
-                    
-                    # Zusatz-delay für zeitaufwendige Variablen-Referenzen im BASIC-Text bestimmen
-                    var_refs, vars      = varanalyzer.analyze_line(currentlinetext)
-                    delay_ms += var_refs  * self.parent.textconfig_var_ref_delay
-                    
-                    print(f"({totallinecount}) {currentlinetext[:5]} - Befehle: {linecommandcount + 1} - Vars: {var_refs} - DIM: {dim_refs} | {dim_units}- Delay: {delay_ms:.0f}")
-
-                    linecommandcount = 0
-                    currentlinetext = ""
-
-                    if fastmode and cursor_line >= self.parent.textconfig_lines - 1:  # x0C braucht 1 Zeile  - CLS braucht 2(!) Zeilen (inkl. Enter)
-                        time.sleep(delay_ms / 1000.0)   # Prozessdauer etc abwarten
-                        ser.write(b"\x0C")
-                        time.sleep(self.parent.textconfig_char_delay / 1000)
-                        #ser.write(b"C")
-                        #time.sleep(self.parent.textconfig_char_delay / 1000)
-                        #ser.write(b"L")
-                        #time.sleep(self.parent.textconfig_char_delay / 1000)
-                        #ser.write(b"S")
-                        #time.sleep(self.parent.textconfig_char_delay / 1000)
-                        ser.write(b"\x0D")
-                        ser.flush()
-                        time.sleep(self.parent.textconfig_init_clsdelay / 1000)
-                        #print("CLS")
-                        cursor_line = 2
-                        cursor_row = self.parent.textconfig_promptwidth
-                        delay_ms = 0
+                    self.sent = seg.progress
+                lastlinenumber = seg.lastline
+                done += 1
 
-                else:
-                    if is_charbyte_printable(charbyte):
-                        cursor_row = cursor_row + 1
-                        # Hochkomma-> Stringliterale
-                        if charbyte == 0x22:
-                            cursor_is_in_string = not cursor_is_in_string
-                            #print ("\"")
-                        # Doppelpunkt
-                        if charbyte == 0x3A and not cursor_is_in_string and linecommandcount < 8:  #mehr als 8 Befehle in einer Zeile sind unwahrscheinlich
-                            linecommandcount += 1
-                    else:
-                        #print(f"ungültiges Zeichen {charbyte:02X} in Zeile: {totallinecount}")
-                        pass
-                        
-                    if cursor_row >= self.parent.textconfig_linewidth - self.parent.textconfig_promptwidth:
-                        cursor_row = 0
-                        cursor_line += 1
-                        #print(f"line: {cursor_line} - {cursor_row}")
-                        if not fastmode:	# es besteht die Möglichkeit, das gescrollt werden muss
-                            delay_ms += self.parent.textconfig_linescroll_delay
-
-                if delay_ms > 0:
-                    time.sleep(delay_ms / 1000.0)
-            
-            
-            if sll and lastlinenumber is not None:
+                pacer.wait(seg.delay_ms, pacer.wire_ms(len(seg.data), baudrate))   # Wartezeit (bei Abbruch sofort weiter)
+            
+            if sll and self.pr.lastlinebasic is not None and done == len(plan.segments):
+                # Änderungsübertragung: letzte Zeile des ganzen Programms (nicht der zuletzt eingegebenen)
+                self.parent.set_last_basicodelinenumber(self.pr.lastlinebasic)
+            elif sll and lastlinenumber is not None:
                 self.parent.set_last_basicodelinenumber(lastlinenumber)
             else:
                 self.parent.set_last_basicodelinenumber(None)
-            
-
-            # Nach der Schleife: ggf. abschließendes CR senden (wenn nicht abgebrochen)
-            if (
-                endreturn
-                and self.pr.transferdata[-1] != 0x0A 
-                and self.pr.transferdata[-1] != 0x0D 
-            ):
-                print("setze endreturn")
-                delay_ms = self.parent.textconfig_process_delay                          # Verarbeitungszeit
-                delay_ms += linecommandcount * self.parent.textconfig_command_addition   # zusätzliche Berechnungszeit bei mehreren Befehlen
-                delay_ms += totallinecount * self.parent.textconfig_linethrottle         # mehr Zeit bei vielen Zeilen
-                time.sleep(delay_ms / 1000.0)
-                ser.write(b"\x0D")
-                #time.sleep(self.parent.textconfig_char_delay / 1000.0)
-                #ser.write(b"\x0A")
-                ser.flush()
-                self.parent.textconfig_linescroll_delay
-                delay_ms = self.parent.textconfig_process_delay                          # Verarbeitungszeit
-                delay_ms += linecommandcount * self.parent.textconfig_command_addition   # zusätzliche Berechnungszeit bei mehreren Befehlen
-                delay_ms += totallinecount * self.parent.textconfig_linethrottle         # mehr Zeit bei vielen Zeilen
-                time.sleep(delay_ms / 1000.0)
-
                 
-            print(f"Bytes gesendet: {i} von {total} - Zeilen: {totallinecount}")
+            print(f"Bytes gesendet: {self.sent} von {plan.total} - Zeilen: {plan.lines}")
+            self.pace_stats = pacer.stats
+            print(f"job_sendtext() Takt: {pacer.stats}")
             
             self.cancelable = False   # als nicht cancelbar kennzeichnen
 
-            if self._cancel.is_set() and i < total:
+            if done < len(plan.segments):
                 with self._lock:
                     self.state = self._JS_CANCELED
                 #raise RuntimeError("Job abgebrochen")
@@ -544,7 +581,8 @@ class KC_Job:
          
     # sendet pr.transferdata an den KC
     # (Polling-Modus)
-    def job_sendbin(self) -> bool:
+    # escpause=False: ohne Pause nach dem ESC (Session-Stub statt CAOS-Duplex-Routine)
+    def job_sendbin(self, escpause: bool = True) -> bool:
         print("job_sendbin() wird gestartet")
         
         self.parent.set_last_basicodelinenumber(None)  # nach einem BIN-Senden ist kein Bascoder mehr geladen
@@ -580,67 +618,166 @@ class KC_Job:
             print("--- job_sendbin: Sende Header ---")
             print(" ".join(f"{b:02X}" for b in header))
 
-            ser.write(header[0:1])
-            ser.flush()
-            time.sleep(0.1)
-
-            ser.write(header[1:])
+            if escpause:
+                ser.write(header[0:1])
+                ser.flush()
+                time.sleep(0.1)   # Pause nach ESC für die CAOS-Duplexroutine (fest, nicht abbrechbar)
+                ser.write(header[1:])
+            else:
+                ser.write(header)
             ser.flush()
              
             # Schnittstellen-Modus wurde umgeschaltet
             self.parent.set_trans_state("BIN")
             
+            self.parent.set_resume_info(None)   # neue Übertragung - evtl. alter Stand ist hinfällig
+
+            return self._send_bindata(ser, 0)
+            
+        except serial.SerialException as e:
+            print(f"job_sendbin: {e}")
+            return False
+
+    # sendet pr.transferdata ab offset (ohne Header) an den KC:
+    # der Sendepuffer des Treibers wird anhand von out_waiting bis zu einer Obergrenze (_TX_WINDOW_MS)
+    # nachgefüllt, sobald er unter die Hälfte fällt - die Leitung läuft so ohne Pausen zwischen den Blöcken.
+    # sent zählt die tatsächlich übertragenen Bytes (geschrieben - noch im Puffer).
+    # bei Abbruch wird der Puffer noch geleert und der Stand für eine Fortsetzung (_JT_RESUMEBIN) gemerkt
+    def _send_bindata(self, ser: serial.Serial, offset: int) -> bool:
+        with self._lock:
+            self.sent = offset
+            
+        data  = self.pr.transferdata
+        total = len(data)
+        baudrate = int(getattr(ser, "baudrate", 1200)) or 1200
+        stopbits = int(getattr(ser, "stopbits", 2))
+        bytes_per_ms = baudrate / (9 + stopbits) / 1000.0
+        high  = max(self._TX_MIN_BLOCK, int(self._TX_WINDOW_MS * bytes_per_ms))   # Obergrenze im Puffer
+        low   = high // 2                                                         # nachfüllen darunter
+
+        stats = KC_SendStats(baudrate=baudrate, stopbits=stopbits)
+        try:
+            queued = int(ser.out_waiting)
+        except (AttributeError, NotImplementedError, OSError, serial.SerialException, TypeError, ValueError):
+            stats.pipelined = False
+            queued = 0
+
+        written = offset
+        write_failed = False
+        exact = True          # True: Anzahl der beim KC angekommenen Bytes ist bekannt
+        print(f"--- job_sendbin: Sende Daten (Puffer {low}-{high} Bytes) ---" if stats.pipelined else "--- job_sendbin: Sende Daten ---")
+
+        self.cancelable = True   # als cancelbar kennzeichnen
+
+        t0 = empty_at = time.perf_counter()
+        while written < total and not self._cancel.is_set():  # _cancel aus threading
+            try:
+                if stats.pipelined:
+                    queued = int(ser.out_waiting)
+                    now = time.perf_counter()
+                    if queued == 0 and written > offset and now > empty_at:
+                        stats.stall_s += now - empty_at   # Puffer lief leer - Leitung stand
+                    if queued > low:
+                        # warten, bis der Puffer etwa auf low geleert ist
+                        self._pacer.sleep((queued - low) / bytes_per_ms)
+                        continue
+                    n = min(high - queued, total - written)
+                    ser.write(data[written:written + n])
+                    written += n
+                    queued  += n
+                    empty_at = time.perf_counter() + queued / bytes_per_ms / 1000.0   # voraussichtlich leer
+                else:
+                    n = min(self._TX_MIN_BLOCK, total - written)
+                    ser.write(data[written:written + n])
+                    ser.flush()
+                    written += n
+                    queued = 0
+            except serial.SerialException as e:
+                print(f"job_sendbin: {e}")
+                write_failed = True
+                exact = not stats.pipelined   # Inhalt des Puffers unbekannt
+                break
+
+            with self._lock:
+                self.sent = written - queued if stats.pipelined else written
+            #print(f"Bytes gesendet: {written} von {total}", flush=True)
+
+        # Rest im Puffer noch übertragen (auch bei Abbruch - danach ist der Stand beim KC exakt bekannt)
+        if not write_failed:
+            try:
+                ser.flush()
+            except serial.SerialException as e:
+                print(f"job_sendbin: {e}")
+                write_failed = True
+                exact = False
+        if exact:
             with self._lock:
-                self.sent = 0
+                self.sent = written
+
+        stats.nbytes    = self.sent - offset
+        stats.elapsed_s = time.perf_counter() - t0
+        self.send_stats = stats
+        
+        #print(self.hexdump(self.pr.transferdata, 8))
+        print(f"Laenge: {len(self.pr.transferdata):04X} - {len(self.pr.transferdata)}")
+        print(f"Bytes gesendet (gesamt): {written}")
+        print(f"job_sendbin: {stats}")
+        
+        self.cancelable = False   # als nicht cancelbar kennzeichnen
+
+        if write_failed or (self._cancel.is_set() and written < total):
+            # der KC wartet noch auf total - offset Bytes -> Stand merken
+            # (nach einem Schreibfehler mit Daten im Puffer ist der Stand unbekannt - keine Fortsetzung)
+            self.parent.set_resume_info(KC_ResumeInfo(
+                start    = self.pr.start,
+                total    = total,
+                offset   = written,
+                crc      = KC_ResumeInfo.payload_crc(self.pr.transferdata),
+                baudrate = baudrate,
+                job      = self,
+                stopbits = stopbits,
+            ) if exact else None)
+            self.parent.set_trans_state("BROKE")
+            with self._lock:
+                self.state = self._JS_FAILED if write_failed else self._JS_CANCELED
+
+        else:
+            self.parent.set_resume_info(None)
+            # Speicherabbild mit Bascoder und BASICODE-Programm: letzte Zeile wie bei _JT_SENDBASICTEXT merken
+            if self.savelastline and self.pr.lastlinebasic is not None:
+                self.parent.set_last_basicodelinenumber(self.pr.lastlinebasic)
+            with self._lock:
+                self.state = self._JS_DONE
                 
-            # Daten blockweise senden
-            block_size = 64
-            total = len(self.pr.transferdata)
-            offset = 0
-            write_failed = False
-            print("--- job_sendbin: Sende Daten ---")
+        return True
 
-            self.cancelable = True   # als cancelbar kennzeichnen
+    # setzt eine abgebrochene ESC-T-Übertragung fort:
+    # Schnittstelle mit der ursprünglichen Datenrate neu öffnen und nur die fehlenden Bytes senden
+    # (Polling-Modus)
+    def job_resumebin(self) -> bool:
+        print("job_resumebin() wird gestartet")
 
-            while offset < total and not self._cancel.is_set():  # _cancel aus threading
-                chunk = self.pr.transferdata[offset:offset + block_size]
-                try:
-                    ser.write(chunk)
-                    ser.flush()
-                except serial.SerialException as e:
-                    print(f"job_sendbin: {e}")
-                    write_failed = True
-                    break
+        info = self.parent.get_resume_info()
+        if info is None: print("job_resumebin: kein Übertragungsstand"); return False
+        if (info.crc != KC_ResumeInfo.payload_crc(self.pr.transferdata)
+                or info.total != len(self.pr.transferdata) or info.start != self.pr.start):
+            print("job_resumebin: Nutzdaten passen nicht zum Übertragungsstand")
+            return False
 
-                offset += len(chunk)
-                with self._lock:
-                    self.sent = offset
-                #print(f"Bytes gesendet: {offset} von {total}", flush=True)
-            
-            #print(self.hexdump(self.pr.transferdata, 8))
-            print(f"Laenge: {len(self.pr.transferdata):04X} - {len(self.pr.transferdata)}")
-            print(f"Bytes gesendet (gesamt): {offset}")
-            
-            self.cancelable = False   # als nicht cancelbar kennzeichnen
+        print(f"job_resumebin: 0x{info.start:04X} - {info.offset} von {info.total} Bytes bereits übertragen, {info.baudrate} Baud 8N{info.stopbits}")
 
-            if write_failed:
-                self.parent.set_trans_state("BROKE")
-                with self._lock:
-                    self.state = self._JS_FAILED
-            
-            elif self._cancel.is_set() and offset < total:
-                self.parent.set_trans_state("BROKE")
-                with self._lock:
-                    self.state = self._JS_CANCELED
+        try:
+            self.parent._close_current_port()
+            self.parent.com_port = self.parent.open_port(info.baudrate, stopbits=info.stopbits)
+            ser = self._get_ser()
+
+            # der KC befindet sich noch im ESC-T-Empfang
+            self.parent.set_trans_state("BIN")
+
+            return self._send_bindata(ser, info.offset)
 
-            else:
-                with self._lock:
-                    self.state = self._JS_DONE
-                    
-            return True
-            
         except serial.SerialException as e:
-            print(f"job_sendbin: {e}")
+            print(f"job_resumebin: {e}")
             return False
 
 
@@ -677,7 +814,7 @@ class KC_Job:
 
             ser.write(header[0:1])
             ser.flush()
-            time.sleep(0.1)
+            time.sleep(0.1)   # Pause nach ESC (fest)
 
             ser.write(header[1:])
             ser.flush()
@@ -693,6 +830,112 @@ class KC_Job:
             return False
             
             
+    # startet das Prüfprogramm der Kalibrierung (ESC-U auf pr.callu) und liest dessen Antwort:
+    # 'O' - Testmuster fehlerfrei, 'E' - fehlerhaft; ohne Antwort (z.B. Kabel ohne Rückleitung) wird nachgefragt
+    # bei einem Fehler werden die weiteren Stufen übersprungen (BROKE)
+    # (Polling-Modus)
+    def job_runcheck(self) -> bool:
+        print("job_runcheck() wird gestartet")
+
+        if not self.pr.callu: print("job_runcheck: pr.callu"); return False
+        if self.parent.get_trans_state() == "BROKE": print("job_runcheck: transfer_state BROKE"); return False
+
+        header = bytearray((0x1B, 0x55, self.pr.callu & 0xFF, (self.pr.callu >> 8) & 0xFF))
+        try:
+            ser = self._get_ser()
+            ser.reset_input_buffer()
+
+            ser.write(header[0:1])
+            ser.flush()
+            time.sleep(0.1)   # Pause nach ESC (fest)
+            ser.write(header[1:])
+            ser.flush()
+
+            answer = b""
+            deadline = time.monotonic() + 3.0
+            while not answer and time.monotonic() < deadline:
+                if ser.in_waiting:
+                    answer = ser.read(1)
+                elif not self._delay(10):   # nicht im read() blockieren - Abbruch sofort möglich
+                    break
+
+        except serial.SerialException as e:
+            print(f"job_runcheck: {e}")
+            return False
+
+        if self._cancel.is_set():
+            return self._canceled()
+
+        step = self.calibration[0] if self.calibration else None
+        if answer in (b"O", b"E"):
+            ok = answer == b"O"
+        else:
+            print("job_runcheck: keine Antwort vom KC")
+            ok = self.parent.ask_yes_no("Kalibrierung", f"{step}\n\nZeigt der KC \"V24-Test OK\" an?")
+
+        self.parent.set_trans_state("BIN")
+        self.parent.on_calibration_step(self, ok)
+        with self._lock:
+            self.state = self._JS_DONE if ok else self._JS_FAILED
+        if not ok:
+            self.parent.set_trans_state("BROKE")   # weitere Stufen überspringen
+        return ok
+
+    # füllt am KC den Bereich pr.start..pr.end-1 mit pr.transferdata[0] (0 bei leeren transferdata)
+    # (Session-Stub)
+    def job_turbofill(self) -> bool:
+        print("job_turbofill() wird gestartet")
+
+        if self.pr.start is None or self.pr.end is None or self.pr.end <= self.pr.start: print("job_turbofill: pr.start - pr.end"); return False
+        if self.parent.get_trans_state() == "BROKE": print("job_turbofill: transfer_state BROKE"); return False
+
+        # 1B 46  aa aa  nn nn  ww
+        length = self.pr.end - self.pr.start
+        value  = self.pr.transferdata[0] if self.pr.transferdata else 0
+        header = bytearray((0x1B, 0x46,
+                            self.pr.start & 0xFF, (self.pr.start >> 8) & 0xFF,
+                            length & 0xFF, (length >> 8) & 0xFF,
+                            value))
+        try:
+            ser = self._get_ser()
+            print(" ".join(f"{b:02X}" for b in header))
+            ser.write(header)
+            ser.flush()
+
+            # der Stub empfängt erst nach dem Füllen wieder
+            if not self._delay(KC_V24_Transfer_FileFormatTools().fill_ms(length, ser.baudrate, int(getattr(ser, "stopbits", 2)))):
+                return self._canceled()
+
+            with self._lock:
+                self.sent  = self.total
+                self.state = self._JS_DONE
+            return True
+
+        except serial.SerialException as e:
+            print(f"job_turbofill: {e}")
+            return False
+
+    # beendet den Session-Stub, der KC arbeitet danach wieder mit der CAOS-Duplex-Routine (1200 Baud)
+    # (Session-Stub)
+    def job_turboend(self) -> bool:
+        print("job_turboend() wird gestartet")
+
+        if self.parent.get_trans_state() == "BROKE": print("job_turboend: transfer_state BROKE"); return False
+
+        try:
+            ser = self._get_ser()
+            ser.write(b"\x1B\x51")   # ESC 'Q'
+            ser.flush()
+
+            self.parent.set_trans_state("BIN")
+            with self._lock:
+                self.state = self._JS_DONE
+            return True
+
+        except serial.SerialException as e:
+            print(f"job_turboend: {e}")
+            return False
+
     # startet ein CAOS-Programm über die Eingabe des Programmnamens im CAOS-Menu
     # (Tastaturausgaben)
     def job_runbinmenu(self) -> bool:
@@ -718,6 +961,61 @@ class KC_Job:
             print(f"job_runbasic: {e}")
             return False
     
+    # pr liegt bereits unverändert im KC - es wird nichts gesendet
+    # (pause, askstart und savelastline wirken wie nach einer Übertragung)
+    def job_resident(self) -> bool:
+        area = f"{self.pr.start:04X}-{self.pr.end:04X}" if self.pr.start is not None and self.pr.end is not None else self.pr.type
+        print(f"job_resident() {area} bereits im KC")
+        if self.savelastline and self.pr.lastlinebasic is not None:
+            self.parent.set_last_basicodelinenumber(self.pr.lastlinebasic)
+        with self._lock:
+            self.sent  = self.total
+            self.state = self._JS_DONE
+        return True
+
+    # ruft am BASIC-Prompt den Zeilen-Einspeiser auf (KC_V24_Transfer_LineInjector) und wartet, bis er alle
+    # Zeilen an BASIC übergeben hat ('O' über die V24); ohne Antwort (z.B. Kabel ohne Rückleitung) endet das
+    # Warten nach der doppelten vorhergesagten Dauer
+    # (Tastaturausgaben)
+    def job_runinjector(self) -> bool:
+        print("job_runinjector() wird gestartet")
+
+        if self.image is None: print("job_runinjector: image"); return False
+
+        wait_ms = 2 * self.parent.cost_model.job_ms(self)[0] + 2000
+        try:
+            ser = self._get_ser()
+            ser.reset_input_buffer()
+            ser.write(KC_V24_Transfer_LineInjector.command().encode("ascii"))
+            ser.write(b"\x0D") # ENTER
+            ser.flush()
+
+            self.cancelable = True
+            answer = b""
+            deadline = time.monotonic() + wait_ms / 1000.0
+            while not answer and time.monotonic() < deadline:
+                if ser.in_waiting:
+                    answer = ser.read(1)
+                elif not self._delay(10):   # nicht im read() blockieren - Abbruch sofort möglich
+                    break
+            self.cancelable = False
+
+        except serial.SerialException as e:
+            print(f"job_runinjector: {e}")
+            return False
+
+        if self._cancel.is_set():
+            self.parent.set_last_basicodelinenumber(None)
+            return self._canceled()
+
+        if answer != KC_V24_Transfer_LineInjector._ANSWER:
+            print(f"job_runinjector: keine Antwort vom KC nach {wait_ms / 1000:.1f}s")
+        if self.savelastline:
+            self.parent.set_last_basicodelinenumber(self.pr.lastlinebasic)
+        with self._lock:
+            self.state = self._JS_DONE
+        return True
+
     def hexdump(self, data: Union[bytes, bytearray], width: int = 16, with_offset: bool = True) -> str:
         if not isinstance(data, (bytes, bytearray)):
             raise TypeError("data muss bytes oder bytearray sein")
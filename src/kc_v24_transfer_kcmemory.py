@@ -0,0 +1,261 @@
+from __future__ import annotations
+
+import json
+import sys
+import zlib
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple
+
+from kc_v24_transfer_kcjob import KC_Job
+
+# Abbild des KC-Arbeitsspeichers auf dem PC:
+# Jedes ESC-T/ESC-F einer Übertragung wird mit Inhalt und Gültigkeit je Byte mitgeschrieben. Bereiche, die
+# der KC danach verändern kann, werden ungültig - nach einem RESET die CAOS-Arbeitszellen und der IRM
+# (der übrige RAM bleibt beim KC85/4 erhalten), beim Start eines Programms der ganze Speicher, bei BASIC-
+# Eingaben der Systemblock und alles hinter dem Programmtext (Variablen, Strings, Stack).
+# Eingetippte BASIC-Programme liegen nur tokenisiert im KC - von ihnen wird das Listing gemerkt (basic_listing),
+# solange kein ESC-T in den BASIC-Speicher geschrieben und kein Maschinenprogramm gestartet wurde.
+# Die Job-Planung fragt damit ab, ob Stub, Bascoder oder Teile eines Programms noch unverändert im KC
+# liegen und nicht erneut übertragen werden müssen. Das Abbild wird im Konfigurationsverzeichnis gespeichert.
+
+
+class KC_V24_Transfer_MemoryShadow:
+    """Inhalt und Gültigkeit jedes Bytes im 64k-Adressraum des KC (soweit vom PC aus bekannt)."""
+
+    _SIZE  = 0x10000
+    _MAGIC = b"KCMEMORY1\n"
+
+    _RESET_CLOBBER  = ((0x0000, 0x0200), (0x8000, 0xC000))   # CAOS-Arbeitszellen, IRM
+    _BASIC_SYSBLOCK = (0x0300, 0x0401)                       # BASIC-Systemblock (Zeiger), siehe _KCB_SYS_MEM0300
+    _BASIC_TEXT     = 0x0401                                 # Beginn des BASIC-Programmtextes
+    _BASIC_TOP      = 0x8000                                 # Ende des BASIC-Arbeitsspeichers (RAM0 + RAM4)
+    _BASIC_AREA     = (_BASIC_SYSBLOCK[0], _BASIC_TOP)
+
+    def __init__(self) -> None:
+        self.data  = bytearray(self._SIZE)
+        self.valid = bytearray(self._SIZE)     # 1: Inhalt bekannt
+        self.loaders: List[Tuple[int, bytes]] = []   # Stubs (Adresse, Code) - ihr Aufruf (ESC-U) verändert den Speicher nicht
+        self.port: Optional[str] = None        # COM-Port, an dem der KC hängt
+        self.last_basicodelinenumber: Optional[str] = None
+        self.confirmed = True                  # False: aus einer früheren Sitzung geladen, noch nicht bestätigt
+        self.basic_listing: Optional[bytes] = None   # zuletzt eingetipptes BASIC-Listing, das so im KC steht
+        self.basic_prompt = False              # True: BASIC wartet am Prompt (Programm nicht gestartet, kein RESET)
+
+    # ------------------------ Inhalt ------------------------
+
+    def store(self, start: int, data) -> None:
+        """Bytes, die der KC ab start empfangen hat."""
+        data = bytes(data)
+        end = min(self._SIZE, start + len(data))
+        self.data[start:end]  = data[:end - start]
+        self.valid[start:end] = b"\x01" * (end - start)
+
+    def invalidate(self, start: int, end: int) -> None:
+        start, end = max(0, start), min(self._SIZE, end)
+        if end > start:
+            self.valid[start:end] = bytes(end - start)
+
+    def invalidate_all(self) -> None:
+        self.valid = bytearray(self._SIZE)
+        self.basic_listing = None
+        self.basic_prompt  = False
+
+    def is_empty(self) -> bool:
+        return not any(self.valid) and self.basic_listing is None
+
+    def _touch(self, start: Optional[int], end: Optional[int]) -> None:
+        """Binärdaten nach [start, end) geschrieben: ein eingetipptes BASIC-Programm darin ist nicht mehr bekannt."""
+        if start is None or end is None:
+            return
+        if start < self._BASIC_AREA[1] and end > self._BASIC_AREA[0]:
+            self.basic_listing = None
+            self.basic_prompt  = False
+
+    def resident(self, start: int, data, ignore: Iterable[Tuple[int, int]] = ()) -> bool:
+        """True, wenn data ab start vollständig bekannt und unverändert im KC liegt (Bereiche aus ignore ausgenommen)."""
+        data = bytes(data)
+        end = start + len(data)
+        if not data or end > self._SIZE:
+            return False
+        pos = start
+        for skip_start, skip_end in sorted(ignore) + [(end, end)]:
+            skip_start, skip_end = min(end, max(pos, skip_start)), min(end, skip_end)
+            if skip_start > pos:
+                if 0 in self.valid[pos:skip_start] or self.data[pos:skip_start] != data[pos - start:skip_start - start]:
+                    return False
+            pos = max(pos, skip_end)
+        return True
+
+    def changed_ranges(self, start: int, data, min_gap: int = 0) -> List[Tuple[int, int]]:
+        """
+        Adressbereiche [von, bis), in denen data vom bekannten KC-Inhalt abweicht (oder dieser unbekannt ist).
+        Bereiche mit einem Abstand unter min_gap Bytes werden zusammengefasst (ein ESC-T-Header kostet mehr als die Lücke).
+        """
+        data = bytes(data)
+        ranges: List[Tuple[int, int]] = []
+        block = 256
+        for ofs in range(0, len(data), block):
+            a = start + ofs
+            chunk = data[ofs:ofs + block]
+            b = a + len(chunk)
+            if 0 not in self.valid[a:b] and self.data[a:b] == chunk:
+                continue
+            for i, byte in enumerate(chunk, start=a):
+                if self.valid[i] and self.data[i] == byte:
+                    continue
+                if ranges and i - ranges[-1][1] <= min_gap:
+                    ranges[-1] = (ranges[-1][0], i + 1)
+                else:
+                    ranges.append((i, i + 1))
+        return ranges
+
+    def valid_ranges(self) -> List[Tuple[int, int]]:
+        """Bekannte Bereiche [von, bis) für die Anzeige."""
+        ranges: List[Tuple[int, int]] = []
+        pos = 0
+        while pos < self._SIZE:
+            start = self.valid.find(1, pos)
+            if start < 0:
+                break
+            end = self.valid.find(0, start)
+            end = self._SIZE if end < 0 else end
+            ranges.append((start, end))
+            pos = end
+        return ranges
+
+    # ------------------------ Ereignisse ------------------------
+
+    def on_reset(self) -> None:
+        """RESET am KC: CAOS initialisiert seine Arbeitszellen und den Bildschirm, der übrige RAM bleibt erhalten."""
+        for start, end in self._RESET_CLOBBER:
+            self.invalidate(start, end)
+        self.basic_prompt = False   # CAOS-Menü; das BASIC-Programm ist per REBASIC wieder erreichbar
+
+    def on_basic(self) -> None:
+        """BASIC-Eingaben/-Programmlauf: Systemblock und alles hinter dem (bekannten) Programmtext wird verändert."""
+        self.invalidate(*self._BASIC_SYSBLOCK)
+        text_end = self.valid.find(0, self._BASIC_TEXT)
+        self.invalidate(self._BASIC_TEXT if text_end < 0 else text_end, self._BASIC_TOP)
+
+    def is_loader(self, addr: Optional[int]) -> bool:
+        """True, wenn an addr ein Stub im KC liegt (ein Programm an derselben Adresse zählt nicht)."""
+        return addr is not None and any(start <= addr < start + len(code) and self.resident(start, code)
+                                        for start, code in self.loaders)
+
+    def apply_job(self, job: KC_Job, resume_offset: Optional[int] = None) -> None:
+        """
+        Wirkung eines ausgeführten Jobs auf den KC-Speicher nachführen.
+        resume_offset: bei einer abgebrochenen ESC-T-Übertragung die exakt angekommenen Bytes (sonst unbekannt).
+        """
+        t, pr = job.type, job.pr
+        done = job.state == KC_Job._JS_DONE or job.state == KC_Job._JS_NOAFTERASK
+
+        if t in (KC_Job._JT_SENDBIN, KC_Job._JT_TURBOSENDBIN, KC_Job._JT_RESUMEBIN, KC_Job._JT_TURBOFILL):
+            self._touch(pr.start, pr.end)
+            if job.image is not None:
+                self._touch(job.image.start, job.image.end)
+
+        if t in (KC_Job._JT_SENDBIN, KC_Job._JT_TURBOSENDBIN, KC_Job._JT_RESUMEBIN):
+            image = job.image
+            if done:
+                self.store(pr.start, pr.transferdata)
+                if image is not None:   # z.B. RLE: der Stub entpackt nach image.start
+                    self.store(image.start, image.transferdata)
+            else:
+                self.invalidate(pr.start, pr.end)
+                if image is not None:
+                    self.invalidate(image.start, image.end)
+                elif resume_offset:
+                    self.store(pr.start, pr.transferdata[:resume_offset])
+        elif t == KC_Job._JT_TURBOFILL:
+            if done:
+                self.store(pr.start, bytes([pr.transferdata[0] if pr.transferdata else 0]) * (pr.end - pr.start))
+            else:
+                self.invalidate(pr.start, pr.end)
+        elif t == KC_Job._JT_RUNBIN:
+            if not self.is_loader(pr.callu):   # Programmstart (Stubs verändern den Speicher nicht)
+                self.invalidate_all()
+        elif t == KC_Job._JT_RUNBASICWARM:   # Warmstart-Stub vor dem Systemblock: BASIC-Start mit RUN
+            self.invalidate(pr.start, self._BASIC_SYSBLOCK[0])   # Stub merkt sich die UP-Tabelle
+            self.on_basic()
+            self.basic_prompt = False
+        elif t in (KC_Job._JT_RUNBINMENU, KC_Job._JT_RUNCHECK):
+            self.invalidate_all()
+        elif t == KC_Job._JT_STARTBASIC:   # Kaltstart: BASIC-Speicher wird gelöscht
+            self.invalidate(*self._BASIC_AREA)
+            self.basic_listing = b"" if done else None
+            self.basic_prompt  = done
+        elif t in (KC_Job._JT_SENDBASICTEXT, KC_Job._JT_RUNINJECTOR):
+            self.on_basic()
+            # Änderungsübertragung: image ist das vollständige Listing, pr nur die Eingaben (Zeilen-Einspeiser: pr ohne Daten)
+            self.basic_listing = bytes((job.image or pr).transferdata) if done else None
+            self.basic_prompt  = done
+        elif t == KC_Job._JT_STARTREBASIC:   # Warmstart: das Programm bleibt erhalten
+            self.on_basic()
+            self.basic_prompt = done
+        elif t == KC_Job._JT_RUNBASIC:
+            self.on_basic()
+            self.basic_prompt = False
+        elif t in (KC_Job._JT_SENDTEXT, KC_Job._JT_RESETBASCODER):   # unbekannte Eingaben bzw. Programm gelöscht
+            self.on_basic()
+            self.basic_listing = None
+            self.basic_prompt  = False
+
+    # ------------------------ Speichern ------------------------
+
+    def save(self, path: Path) -> bool:
+        meta = {"port": self.port, "last_basicodelinenumber": self.last_basicodelinenumber,
+                "basic_listing": self.basic_listing.decode("latin1") if self.basic_listing is not None else None}
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with path.open("wb") as f:
+                f.write(self._MAGIC)
+                f.write(json.dumps(meta).encode("utf-8") + b"\n")
+                f.write(zlib.compress(bytes(self.data) + bytes(self.valid)))
+            return True
+        except Exception as e:
+            print(f"KC-Speicherabbild konnte nicht gespeichert werden: {e}")
+            return False
+
+    def load(self, path: Path) -> bool:
+        """Lädt ein gespeichertes Abbild; es gilt bis zur Bestätigung durch den Benutzer als unsicher (confirmed)."""
+        try:
+            with path.open("rb") as f:
+                if f.readline() != self._MAGIC:
+                    raise ValueError("unbekanntes Format")
+                meta = json.loads(f.readline().decode("utf-8"))
+                raw  = zlib.decompress(f.read())
+            if len(raw) != 2 * self._SIZE:
+                raise ValueError("falsche Länge")
+        except Exception as e:
+            print(f"KC-Speicherabbild konnte nicht geladen werden: {e}")
+            return False
+        self.data  = bytearray(raw[:self._SIZE])
+        self.valid = bytearray(raw[self._SIZE:])
+        self.port  = meta.get("port")
+        self.last_basicodelinenumber = meta.get("last_basicodelinenumber")
+        listing = meta.get("basic_listing")
+        self.basic_listing = listing.encode("latin1") if listing is not None else None
+        self.basic_prompt  = False
+        self.confirmed = self.is_empty()
+        return True
+
+
+# Einfacher CLI-Einstiegspunkt
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print(
+            "python kc_v24_transfer_kcmemory.py <abbild>"
+            ,""
+            ,"Zeigt die bekannten Bereiche eines gespeicherten KC-Speicherabbildes."
+            , sep="\n"
+            , file=sys.stderr
+        )
+        sys.exit(1)
+
+    shadow = KC_V24_Transfer_MemoryShadow()
+    if not shadow.load(Path(sys.argv[1])):
+        sys.exit(1)
+    print(f"COM-Port: {shadow.port}, letzte BASICODE-Zeile: {shadow.last_basicodelinenumber}")
+    for start, end in shadow.valid_ranges():
+        print(f"  {start:04X}-{end:04X}  {end - start} Bytes")
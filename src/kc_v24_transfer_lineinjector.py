@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import re
+import sys
+from typing import Optional
+
+from kc_v24_transfer_kcfileformattools import ParseResult
+
+# Zeilen-Einspeiser (bin/Basic_LineInjector.bin, Quelltext asm/Basic_LineInjector.asm):
+# Statt ein Listing als Tastatureingaben mit den Wartezeiten aus dem Übertragungsplan zu senden, wird es
+# zusammen mit dem Einspeiser per ESC-T (ggf. mit Schnelllader) unter das obere Ende des BASIC-Speichers
+# geladen. Nach dem BASIC-Start ruft CALL*7A00 den Einspeiser auf; er gibt jede Zeile an die BASIC-Eingabe
+# (CAOS INLIN) weiter, sobald BASIC die vorige verarbeitet hat, und meldet das Ende mit 'O' über die V24.
+# Das funktioniert mit jedem Listing, das auch eingetippt werden kann (kein Tokenisieren auf dem PC).
+
+
+class KC_V24_Transfer_LineInjector:
+    """Speicherabbild aus Einspeiser und Zeilenpuffer für ein BASIC-Listing."""
+
+    _START      = 0x7A00    # ORG des Einspeisers
+    _OFS_BUFPTR = 2         # Operand: Beginn des Zeilenpuffers
+    _TABLE_SIZE = 256       # Kopie der CAOS-UP-Tabelle hinter dem Einspeiser
+    _TOP        = 0x8000    # Ende des BASIC-Speichers (Stack und Zeichenketten oberhalb des Einspeisers)
+    _PROG_MARGIN = 0x0200   # Abstand zwischen wachsendem BASIC-Programm und Zeilenpuffer
+    _LINE_OVERHEAD = 4      # je Programmzeile im BASIC-Speicher: Zeiger auf die nächste Zeile + Zeilennummer
+
+    _ANSWER = b"O"          # Meldung des Einspeisers nach der letzten Zeile
+
+    _RX_NEWLINE = re.compile(rb"\r\n|\n|\r")
+
+    @classmethod
+    def command(cls) -> str:
+        """BASIC-Aufruf des Einspeisers (am Prompt einzutippen)."""
+        return f"CALL*{cls._START:X}"
+
+    @classmethod
+    def lines_buffer(cls, data) -> bytes:
+        """Zeilenpuffer: nicht leere Zeilen mit 0Dh abgeschlossen, Ende 00h."""
+        lines = cls._RX_NEWLINE.split(bytes(data))
+        return b"".join(line + b"\r" for line in lines if line.strip()) + b"\x00"
+
+    @classmethod
+    def build_image(cls, pr_stub: Optional[ParseResult], pr_text: ParseResult, prog_start: int) -> Optional[ParseResult]:
+        """
+        Speicherabbild <Zeilenpuffer><Einspeiser> für das Listing pr_text; None, wenn kein Einspeiser geladen ist
+        oder das Listing nicht zwischen das ab prog_start wachsende BASIC-Programm und den Einspeiser passt.
+        """
+        if pr_stub is None or pr_stub.start != cls._START:
+            return None
+        code = bytearray(pr_stub.transferdata)
+        if cls._START + len(code) + cls._TABLE_SIZE > cls._TOP:
+            return None
+
+        buffer = cls.lines_buffer(pr_text.transferdata)
+        bufstart = cls._START - len(buffer)
+        progend = prog_start + len(pr_text.transferdata) + buffer.count(b"\r") * cls._LINE_OVERHEAD + cls._PROG_MARGIN
+        if buffer == b"\x00" or bufstart < progend:
+            print(f"-- Zeilen-Einspeiser: Listing zu groß ({len(buffer)} Bytes ab {bufstart:04X}, Programm bis ca. {progend:04X})")
+            return None
+
+        code[cls._OFS_BUFPTR]     = bufstart & 0xFF
+        code[cls._OFS_BUFPTR + 1] = (bufstart >> 8) & 0xFF
+
+        pr = ParseResult()
+        pr.start        = bufstart
+        pr.end          = cls._START + len(code)
+        pr.format       = pr_stub.format
+        pr.type         = ParseResult._TYPE_MC
+        pr.transferdata = buffer + bytes(code)
+        pr.validstate   = 0
+        pr.errorstate   = False
+        return pr
+
+
+# Einfacher CLI-Einstiegspunkt
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print(
+            "python kc_v24_transfer_lineinjector.py <listing.txt>"
+            ,""
+            ,"Zeigt die Lage von Zeilenpuffer und Einspeiser für ein BASIC-Listing (Programm ab 0401h)."
+            , sep="\n"
+            , file=sys.stderr
+        )
+        sys.exit(1)
+
+    from pathlib import Path
+
+    stub = ParseResult()
+    stub.start, stub.format, stub.errorstate = KC_V24_Transfer_LineInjector._START, ParseResult._FORMAT_RAW, False
+    stub.transferdata = (Path(__file__).parent / "bin" / "Basic_LineInjector.bin").read_bytes()
+    text = ParseResult()
+    text.transferdata = Path(sys.argv[1]).read_bytes()
+    image = KC_V24_Transfer_LineInjector.build_image(stub, text, 0x0401)
+    if image is None:
+        sys.exit(1)
+    print(f"Speicherabbild {image.start:04X}-{image.end:04X} ({len(image.transferdata)} Bytes), Aufruf: {KC_V24_Transfer_LineInjector.command()}")
@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+import sys
+from typing import TYPE_CHECKING, Iterable, List, Optional, Sequence, Tuple
+
+if TYPE_CHECKING:
+    from kc_v24_transfer_kcjob import KC_Job
+    from kc_v24_transfer_kcfileformattools import ParseResult
+
+# Speicheraufteilung des KC85/4 für die Planung einer Übertragung:
+# Wo dürfen Lader (Schnelllader-Stubs) liegen, welche Bereiche eines Speicherabbildes treffen CAOS-Arbeitszellen,
+# BASIC-Systemblock, Bildspeicher oder ROM, und passt das Abbild in den RAM des KC (ramclass)?
+# Vor der Übertragung prüft check_image das zu sendende Abbild (Fehler: Abbruch, Warnungen: Rückfrage),
+# check_jobs die fertige Job-Folge (kein Abbild darf einen Lader überschreiben, während er empfängt).
+# Freie Plätze für Lader liefert free_slot; unter mehreren freien Plätzen wählt die Session den mit der
+# kürzesten vorhergesagten Übertragungszeit (ein noch geladener Stub muss nicht erneut gesendet werden).
+
+
+class KC_V24_Transfer_MemoryMap:
+    """Bereiche im 64k-Adressraum des KC85/4 und Prüfung von Speicherabbildern und Lader-Plätzen."""
+
+    _KIND_RAM   = "RAM"     # frei nutzbar (auch für Lader)
+    _KIND_CAOS  = "CAOS"    # Arbeitszellen des Betriebssystems - ein ESC-T dorthin stört den Empfang
+    _KIND_BASIC = "BASIC"   # BASIC-Systemblock (Zeiger, Warmstart-Vektor)
+    _KIND_IRM   = "IRM"     # Bild- und ASCII-Speicher
+    _KIND_ROM   = "ROM"     # BASIC- und CAOS-ROM - nicht beschreibbar
+
+    # (Beginn, Ende, Name, Art), lückenlos von 0000h bis FFFFh
+    _REGIONS: Tuple[Tuple[int, int, str, str], ...] = (
+        (0x0000, 0x0200, "CAOS-Arbeitszellen",       _KIND_CAOS),
+        (0x0200, 0x0300, "RAM0 (Stub-Bereich)",      _KIND_RAM),
+        (0x0300, 0x0401, "BASIC-Systemblock",        _KIND_BASIC),
+        (0x0401, 0x4000, "RAM0",                     _KIND_RAM),
+        (0x4000, 0x8000, "RAM4",                     _KIND_RAM),
+        (0x8000, 0xB700, "IRM Bild-/ASCII-Speicher", _KIND_IRM),
+        (0xB700, 0xB800, "IRM CAOS-Arbeitszellen",   _KIND_CAOS),
+        (0xB800, 0xC000, "IRM (frei)",               _KIND_RAM),
+        (0xC000, 0x10000, "ROM (BASIC, CAOS)",       _KIND_ROM),
+    )
+
+    _LOADER_KINDS = (_KIND_RAM, _KIND_BASIC)   # Lader liegen außerhalb von CAOS-Zellen, Bildspeicher und ROM
+    _RAM_KB       = 32                         # KC85/4: RAM0 + RAM4 (RAM8 nur als Modul bzw. umgeschaltet)
+
+    def __init__(self, ram_kb: int = _RAM_KB) -> None:
+        self.ram_kb = ram_kb
+
+    # ------------------------ Bereiche ------------------------
+
+    def regions(self, start: int, end: int) -> List[Tuple[int, int, str, str]]:
+        """Bereiche, die [start, end) überlappt."""
+        return [r for r in self._REGIONS if start < r[1] and end > r[0]]
+
+    def loader_regions(self) -> List[Tuple[int, int]]:
+        """Zusammenhängende Bereiche, in denen Lader liegen dürfen: 0200h-7FFFh, B800h-BFFFh."""
+        merged: List[Tuple[int, int]] = []
+        for lo, hi, _, kind in self._REGIONS:
+            if kind not in self._LOADER_KINDS or lo < 0x0200:
+                continue
+            if merged and merged[-1][1] == lo:
+                merged[-1] = (merged[-1][0], hi)
+            else:
+                merged.append((lo, hi))
+        return merged
+
+    def fits(self, start: int, size: int, busy: Iterable[Tuple[int, int]] = ()) -> bool:
+        """True, wenn ein Lader [start, start+size) in einem Lader-Bereich liegt und keinen Bereich aus busy überlappt."""
+        end = start + size
+        return (any(lo <= start and end <= hi for lo, hi in self.loader_regions())
+                and all(end <= s or start >= e for s, e in busy))
+
+    def free_slot(self, size: int, busy: Iterable[Tuple[int, int]], prefer: Iterable[int] = (), align: int = 0x10) -> Optional[int]:
+        """
+        Ladeadresse für einen Lader mit size Bytes, die keinen der Bereiche busy (start, end) überlappt: zuerst eine
+        der bevorzugten Adressen, sonst die niedrigste freie (auf align gerundete) Adresse; None: kein Platz.
+        """
+        busy = sorted(busy)
+        for addr in prefer:
+            if self.fits(addr, size, busy):
+                return addr
+        for lo, hi in self.loader_regions():
+            candidates = [lo] + [(e + align - 1) // align * align for _, e in busy if lo <= e < hi]
+            for addr in sorted(candidates):
+                if self.fits(addr, size, busy):
+                    return addr
+        return None
+
+    # ------------------------ Prüfung ------------------------
+
+    def check_image(self, pr: ParseResult) -> Tuple[List[str], List[str]]:
+        """
+        Prüft ein Speicherabbild vor der Übertragung; Rückgabe (Fehler, Warnungen).
+        Fehler: Abbild reicht ins ROM bzw. über FFFFh. Warnungen: CAOS-Arbeitszellen, Bildspeicher,
+        ramclass größer als der RAM des KC. Überschreibt ein Maschinenprogramm den BASIC-Systemblock,
+        wird das nur ausgegeben (danach ist kein BASIC-Warmstart möglich).
+        """
+        errors: List[str] = []
+        warnings: List[str] = []
+        if pr.start is None or pr.end is None or pr.errorstate:
+            return errors, warnings
+
+        where = f"{pr.start:04X}-{pr.end - 1:04X}"
+        if pr.end > 0x10000:
+            errors.append(f"Speicherabbild {where} reicht über FFFFh hinaus")
+        for lo, hi, name, kind in self.regions(pr.start, pr.end):
+            part = f"{max(lo, pr.start):04X}-{min(hi, pr.end) - 1:04X}"
+            if kind == self._KIND_ROM:
+                errors.append(f"Speicherabbild {where} überschreibt {name} ({part}) - dort ist kein RAM")
+            elif kind == self._KIND_CAOS:
+                warnings.append(f"Speicherabbild {where} überschreibt {name} ({part}) - der KC kann beim Laden abstürzen")
+            elif kind == self._KIND_IRM:
+                warnings.append(f"Speicherabbild {where} überschreibt den {name} ({part}) - wird nach einem RESET gelöscht")
+            elif kind == self._KIND_BASIC and pr.type == pr._TYPE_MC:
+                print(f"-- Speicherabbild {where} überschreibt den {name} ({part})")
+
+        need = self.ramclass_kb(pr.ramclass)
+        if need is not None and need > self.ram_kb:
+            warnings.append(f"Speicherabbild {where} braucht {pr.ramclass} RAM, der KC hat {self.ram_kb}k")
+        return errors, warnings
+
+    @staticmethod
+    def ramclass_kb(ramclass: Optional[str]) -> Optional[int]:
+        """RAM-Größenklasse ("16k", "32k", "48k") in kByte; None, wenn unbekannt."""
+        if not ramclass or not ramclass[:-1].isdigit():
+            return None
+        return int(ramclass[:-1])
+
+    def check_jobs(self, jobs: Sequence[KC_Job], loaders: Iterable[Tuple[int, bytes]]) -> List[str]:
+        """
+        Fehler in einer Job-Folge: Ein ESC-T/ESC-F an einen Lader darf den Lader selbst nicht überschreiben
+        (er ist vom ESC-U auf den Lader bis zum Zurückschalten auf 1200 Baud aktiv). loaders: (Adresse, Code)
+        wie KC_V24_Transfer_MemoryShadow.loaders.
+        """
+        from kc_v24_transfer_kcjob import KC_Job   # erst hier: der Stub-Erzeuger nutzt die Karte ohne pyserial
+
+        data_jobs = (KC_Job._JT_SENDBIN, KC_Job._JT_TURBOSENDBIN, KC_Job._JT_TURBOFILL)
+        starts = {start for start, _ in loaders}
+        errors: List[str] = []
+        active: Optional[Tuple[int, int]] = None
+        for job in jobs:
+            pr = job.pr
+            if job.type == KC_Job._JT_RUNBIN and pr is not None and pr.callu in starts and pr.end is not None:
+                active = (pr.start, pr.end)   # ESC-U auf den Lader (pr: der Stub ohne Daten)
+                continue
+            if job.type in data_jobs and active is not None and pr is not None and pr.start is not None and pr.end is not None:
+                if pr.start < active[1] and pr.end > active[0]:
+                    errors.append(f"Speicherabbild {pr.start:04X}-{pr.end - 1:04X} überschreibt den Lader {active[0]:04X}-{active[1] - 1:04X}")
+            if job.set_ser_br == 1200:
+                active = None
+        return errors
+
+
+# Einfacher CLI-Einstiegspunkt
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print(
+            "python kc_v24_transfer_memorymap.py <datei> [ram_kb]"
+            ,""
+            ,"Zeigt die vom Speicherabbild belegten Bereiche des KC85/4 und prüft es vor der Übertragung."
+            , sep="\n"
+            , file=sys.stderr
+        )
+        sys.exit(1)
+
+    from pathlib import Path
+    from kc_v24_transfer_kcfileformattools import KC_V24_Transfer_FileFormatTools
+
+    memmap = KC_V24_Transfer_MemoryMap(int(sys.argv[2]) if len(sys.argv) > 2 else KC_V24_Transfer_MemoryMap._RAM_KB)
+    pr = KC_V24_Transfer_FileFormatTools().parseBinData(Path(sys.argv[1]).read_bytes())
+    if pr.start is None or pr.end is None:
+        print(f"kein Speicherabbild mit Adressen ({pr.type})", file=sys.stderr)
+        sys.exit(1)
+    print(f"Speicherabbild {pr.start:04X}-{pr.end - 1:04X} ({pr.ramclass}):")
+    for lo, hi, name, kind in memmap.regions(pr.start, pr.end):
+        print(f"  {max(lo, pr.start):04X}-{min(hi, pr.end) - 1:04X}  {kind:<5} {name}")
+    errors, warnings = memmap.check_image(pr)
+    for line in errors:
+        print(f"Fehler: {line}")
+    for line in warnings:
+        print(f"Warnung: {line}")
+    sys.exit(1 if errors else 0)
@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+# Taktgeber für Tastaturübertragungen und feste Pausen:
+# Wartezeiten werden gegen absolute Zielzeitpunkte (time.perf_counter) geplant statt als
+# einzelne time.sleep()-Aufrufe. Die Übertragungszeit der gesendeten Bytes und zu lange
+# Wartezeiten des Betriebssystems (Timer-Auflösung 1-16 ms) werden so mit der nächsten
+# Pause verrechnet, die Gesamtdauer folgt dem Plan (KC_V24_Transfer_TextPlan.duration_ms).
+# Gewartet wird zweistufig: grob mit Event.wait (abbrechbar), die letzten Millisekunden
+# aktiv - die Länge der aktiven Phase passt sich der gemessenen Ungenauigkeit des Timers an.
+
+
+@dataclass
+class PacerStats:
+    """Genauigkeit eines Taktgebers über eine Übertragung (alle Zeiten in ms)."""
+    waits:     int   = 0       # Anzahl Wartezeiten
+    late_sum:  float = 0.0     # Summe der Verspätungen beim Aufwachen
+    late_max:  float = 0.0     # größte Verspätung
+    early:     int   = 0       # Wartezeiten, deren Ziel beim Aufruf schon überschritten war
+    spin_ms:   float = 0.0     # Summe der aktiv gewarteten Zeit (CPU)
+    drift_ms:  float = 0.0     # Ist- minus Plandauer am Ende (positiv: langsamer als geplant)
+
+    @property
+    def late_mean(self) -> float:
+        return self.late_sum / self.waits if self.waits else 0.0
+
+    def __str__(self) -> str:
+        return (f"{self.waits} Pausen, Verspätung Ø {self.late_mean:.2f}ms max {self.late_max:.2f}ms, "
+                f"{self.early} ohne Wartezeit, aktiv gewartet {self.spin_ms:.0f}ms, Abweichung vom Plan {self.drift_ms:+.0f}ms")
+
+
+class KC_V24_Transfer_Pacer:
+    """
+    Plant Pausen gegen absolute Zeitpunkte:
+    - wait(delay_ms, wire_ms): nächster Zeitpunkt = voriger Zeitpunkt + Übertragungszeit + Pause
+      (fortlaufender Plan, z.B. für die Segmente eines KC_V24_Transfer_TextPlan)
+    - sleep(ms): genaue Einzelpause ab jetzt (feste Pausen der übrigen Jobs)
+    Beide liefern False, sobald cancel gesetzt ist (Abbruch wirkt sofort).
+    """
+
+    _BITS_PER_BYTE = 11        # 1 Start-, 8 Daten-, 2 Stoppbits (siehe open_port)
+
+    _SPIN_MIN_S = 0.0005       # aktive Phase mindestens 0,5 ms ...
+    _SPIN_MAX_S = 0.020        # ... und höchstens 20 ms (grobe Windows-Timer)
+    _MIN_RATIO  = 0.8          # eine Pause wird zum Aufholen höchstens auf 80% verkürzt (der KC braucht seine Verarbeitungszeit)
+
+    def __init__(self, cancel: Optional[threading.Event] = None, min_ratio: float = _MIN_RATIO) -> None:
+        self.cancel    = cancel if cancel is not None else threading.Event()
+        self.min_ratio = min_ratio
+        self.stats     = PacerStats()
+        self._start:   Optional[float] = None   # Beginn des Plans
+        self._target:  Optional[float] = None   # aktueller Zielzeitpunkt
+        self._planned  = 0.0                    # Plandauer seit _start (s)
+        self._overshoot = 0.001                 # gleitender Mittelwert der Verspätung nach Event.wait (s)
+
+    @classmethod
+    def wire_ms(cls, nbytes: int, baudrate: int) -> float:
+        """Übertragungszeit von nbytes auf der Leitung."""
+        return nbytes * cls._BITS_PER_BYTE * 1000.0 / baudrate if baudrate else 0.0
+
+    def start(self) -> None:
+        """Beginnt einen neuen Plan (Zeitpunkt 0 = jetzt)."""
+        self._start = self._target = time.perf_counter()
+        self._planned = 0.0
+        self.stats = PacerStats()
+
+    def wait(self, delay_ms: float, wire_ms: float = 0.0) -> bool:
+        """Wartet bis zum nächsten Planzeitpunkt (vorheriger + wire_ms + delay_ms); mindestens min_ratio * delay_ms ab jetzt."""
+        if self._target is None:
+            self.start()
+        step = (wire_ms + delay_ms) / 1000.0
+        self._planned += step
+        now = time.perf_counter()
+        self._target = max(self._target + step, now + delay_ms * self.min_ratio / 1000.0)
+        ok = self._wait_until(self._target, now)
+        self.stats.drift_ms = (time.perf_counter() - self._start - self._planned) * 1000.0
+        return ok
+
+    def sleep(self, ms: float) -> bool:
+        """Genaue Einzelpause von ms Millisekunden ab jetzt."""
+        now = time.perf_counter()
+        return self._wait_until(now + ms / 1000.0, now)
+
+    def _wait_until(self, target: float, now: float) -> bool:
+        stats = self.stats
+        stats.waits += 1
+        if now >= target:
+            stats.early += 1
+            return not self.cancel.is_set()
+
+        # grobe Phase: abbrechbar warten, bis kurz vor dem Ziel
+        spin = min(self._SPIN_MAX_S, max(self._SPIN_MIN_S, 1.5 * self._overshoot))
+        coarse = target - spin - now
+        if coarse > 0:
+            if self.cancel.wait(coarse):
+                return False
+            late = time.perf_counter() - (target - spin)
+            self._overshoot += 0.2 * (max(0.0, late) - self._overshoot)
+
+        # feine Phase: aktiv bis zum Ziel (Abbruch weiterhin geprüft)
+        t_spin = time.perf_counter()
+        while True:
+            now = time.perf_counter()
+            if now >= target:
+                break
+            if self.cancel.is_set():
+                return False
+            if target - now > 0.002:
+                time.sleep(0)   # Rechenzeit abgeben
+        stats.spin_ms += (now - t_spin) * 1000.0
+
+        late_ms = (now - target) * 1000.0
+        stats.late_sum += late_ms
+        stats.late_max = max(stats.late_max, late_ms)
+        return not self.cancel.is_set()
+
+
+# Einfacher CLI-Einstiegspunkt
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print(
+            "python kc_v24_transfer_pacer.py <pause_ms> [anzahl]"
+            ,""
+            ,"Vergleicht time.sleep() mit dem Taktgeber für anzahl Pausen (Standard 200)."
+            , sep="\n"
+            , file=sys.stderr
+        )
+        sys.exit(1)
+
+    pause = float(sys.argv[1])
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    planned = pause * count
+
+    t0 = time.perf_counter()
+    for _ in range(count):
+        time.sleep(pause / 1000.0)
+    print(f"time.sleep: {(time.perf_counter() - t0) * 1000 - planned:+.1f}ms Abweichung bei {planned:.0f}ms Plandauer")
+
+    pacer = KC_V24_Transfer_Pacer()
+    pacer.start()
+    for _ in range(count):
+        pacer.wait(pause)
+    print(f"Taktgeber:  {pacer.stats}")
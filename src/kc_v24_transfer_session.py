@@ -0,0 +1,1054 @@
+from __future__ import annotations
+
+# Kern der Übertragung ohne GUI:
+# COM-Port, Übertragungszustand, Stubs/Bascoder, Konfiguration, die Job-Folgen je Datentyp
+# und die Abarbeitung der KC_Jobs (kc_v24_transfer_jobengine). KC_V24_TransferApp (Tk) und das
+# Kommandozeilenwerkzeug (kc_v24_transfer_cli) bauen darauf auf - Rückfragen an den
+# Benutzer (ask_yes_no, confirm_reset) und Fehlermeldungen (show_error) stellen sie selbst bereit.
+# Das Modul importiert kein tkinter.
+
+import configparser
+import os
+import sys
+import threading
+from pathlib import Path
+from typing import Callable, List, Optional
+
+import serial
+
+from kc_v24_transfer_kcfileformattools import ParseResult, KC_V24_Transfer_FileFormatTools
+from kc_v24_transfer_kcjob import KC_Job, KC_ResumeInfo
+from kc_v24_transfer_baudladder import KC_V24_Transfer_BaudLadder, BaudStep
+from kc_v24_transfer_jobengine import KC_V24_Transfer_JobEngine, JobEvent, ProcessingResult
+from kc_v24_transfer_costmodel import KC_V24_Transfer_CostModel
+from kc_v24_transfer_jobplan import KC_V24_Transfer_JobPlan
+from kc_v24_transfer_kcmemory import KC_V24_Transfer_MemoryShadow
+from kc_v24_transfer_basicdiff import KC_V24_Transfer_BasicDiff
+from kc_v24_transfer_lineinjector import KC_V24_Transfer_LineInjector
+from kc_v24_transfer_basicwarmstart import KC_V24_Transfer_BasicWarmStart
+from kc_v24_transfer_stubgen import KC_V24_Transfer_StubGenerator
+from kc_v24_transfer_memorymap import KC_V24_Transfer_MemoryMap
+
+
+class KC_V24_Transfer_Session:
+
+    APP_NAME = "KC-V24-Transfer"
+    VERSION  = "1.5"
+
+    BASE_DIR      = Path(__file__).resolve().parent
+
+    if os.name == "nt":
+        _cfg_root = os.environ.get("LOCALAPPDATA") or os.environ.get("APPDATA")
+        CONFIG_DIR = Path(_cfg_root) / APP_NAME if _cfg_root else (BASE_DIR / APP_NAME)
+    else:
+        _xdg = os.environ.get("XDG_CONFIG_HOME")
+        CONFIG_DIR = (Path(_xdg) if _xdg else (Path.home() / ".config")) / APP_NAME
+
+    CONFIG_PATH   = CONFIG_DIR / (APP_NAME + ".ini")
+    MEMORY_PATH   = CONFIG_DIR / "kc_memory.bin"     # Speicherabbild des KC (KC_V24_Transfer_MemoryShadow)
+    BIN_PATH      = BASE_DIR / "bin"
+
+    def __init__(self) -> None:
+        self.com_port           = None            # hält das COM-Portobjekt
+        self.com_port_name      = ""              # Name des aktuellen COM-Ports (vom COM-Portobjekt)
+
+        self.trans_state        = None            # hält den aktuellen Status des Transfersystems
+                                                  # None:    uninitialisiert
+                                                  # "BROKE": nach Abgebrochener Binärübertragung - der KC wartet dann auf seiner Seite auf Abschluss, bis er wieder in den Tastaturmodus wechseln kann 
+                                                  # "BIN":   im ESC-U/ESC-T-Polling-Modus
+                                                  # "KEY":   Interupt-Modus (Tastatureingaben)
+
+        self.pr                  = None           # hält das ParseResult der zuletzt geladenen Datei
+        self.file_name           = None           # nur Dateiname ohne Pfad
+         
+        self.pr_bascoder         = None           # hält das ParseResult der geladenen Bascoderdatei
+        self.file_name_bascoder  = None           # Dateiname der geladenen Bascoder-Datei
+        
+        # die stubs schalten die Schnittstellengeschwindigkeit zum Laden des Hauptprogramms auf die Turbo-Datenrate
+        # je nach Ladeadresse des Hauptprogramms wird ein stub vorgeladen, der ausserhalb des Speicherbereichs liegt
+        
+        self.use_turboload       = True           # wenn True, wird vor Binärübertragungen ein Stub mit Turbo-Pollingroutine geladen
+        self.pr_0200stub         = None           # hält ein parseResult mit den Binärdaten des Schnittstellen-Umschalters auf die Turbo-Datenrate, der unten geladen wird
+        self.file_name_0200stub  = None           # Dateiname des Umschalter-bins
+        self.pr_BF00stub         = None           # hält ein parseResult mit den Binärdaten des Schnittstellen-Umschalters auf die Turbo-Datenrate, der oben geladen wird
+        self.file_name_BF00stub  = None           # Dateiname des Umschalter-bins
+        self.use_rle_turboload   = True           # wenn True, werden Speicherabbilder RLE-gepackt übertragen, sofern das (inkl. Stub) schneller ist
+        self.pr_0200rlestub      = None           # Stub mit Pollingroutine und RLE-Entpacker, der unten geladen wird
+        self.pr_BF00rlestub      = None           # Stub mit Pollingroutine und RLE-Entpacker, der oben geladen wird
+        self.pr_0200sessionstub  = None           # residenter Session-Stub (mehrere ESC-T/ESC-F, ESC-U, ESC-Q), der unten geladen wird
+        self.pr_BF00sessionstub  = None           # residenter Session-Stub, der oben geladen wird
+        self.pr_injector         = None           # Zeilen-Einspeiser für BASIC-Listings (KC_V24_Transfer_LineInjector)
+        self.pr_warmstart        = None           # Warmstart-Stub für BASIC-Speicherabbilder (KC_V24_Transfer_BasicWarmStart)
+        self.checkdata           = None           # Prüfprogramm der Kalibrierung (bin/V24_Check.bin)
+        self.turbo_steps: dict[str, BaudStep] = {}  # kalibrierte Turbo-Einstellung je COM-Port ([turbo] in der Konfiguration)
+        
+        self.use_basicode_binload = True          # wenn True, werden Bascoder und BASICODE-Programm (tokenisiert) als ein Speicherabbild geladen
+        self.last_basicodelinenumber = None       # die letzte Zeilennummer des BASICODE-Programmes
+        self.resume_info: KC_ResumeInfo | None = None  # Stand einer abgebrochenen Binärübertragung (für "Fortsetzen")
+        self.memory = KC_V24_Transfer_MemoryShadow()   # was liegt (sicher) im Speicher des KC - wird von den Jobs nachgeführt
+        self.memory_map = KC_V24_Transfer_MemoryMap()  # Speicheraufteilung des KC85/4 (Lader-Plätze, Prüfung vor dem Senden), RAM: [kc] ram_kb
+
+        # -------------------------------------------------------------------------
+        # Zeugs für Nebenläufigkeit
+        # -------------------------------------------------------------------------
+        self.jobs: List[KC_Job] = []             # Liste der aktuellen Jobs verschiedenen Status
+        self.engine = KC_V24_Transfer_JobEngine(self)   # arbeitet die Jobs ab, Fortschritt per engine.subscribe()
+        self.plan_report: List[str] = []         # Jobs vor/nach der Optimierung (build_send_jobs)
+        self.engine.subscribe(self._save_memory_on_end)
+        self._lock = threading.Lock()            # der Lock für das Theading
+
+        # -------------------------------------------------------------------------
+        # Timeout-Überwachung (COM-Port / Jobs)
+        # -------------------------------------------------------------------------
+        # self.timeout_comport / self.timeout_job werden extern gesetzt
+        # (Sekunden; None = je Job aus dem Zeitmodell (cost_model.timeouts), 0 = deaktiviert)
+        self.timeout_comport: int | None = None  # sendende Jobs (job.total > 0): max. Stillstand ohne Fortschritt
+        self.timeout_job: int | None     = None  # sonstige Jobs (job.total == 0) ohne askstart: max. Laufzeit
+        self.cost_model = KC_V24_Transfer_CostModel(self)   # vorhergesagte Dauer der Jobs (Restlaufzeit, Timeouts, Schnelllader)
+
+        self.gui_max_fps: int = 10               # GUI: maximale Aktualisierungen der Fortschrittsanzeige pro Sekunde ([gui] max_fps)
+
+        # -------------------------------------------------------------------------
+        # Übertragungs-Konfiguration für Übertragungen im Keyboard-Übertragungsmodus
+        # -------------------------------------------------------------------------
+        self.textconfig_showkonfigdialog  = True    # der Textkonfigdialog soll bei der nächsten übertragung wieder angezeigt werden
+        self.textconfig_linewidth         = 40      # nach wievielen Zeichen wird die Zeile umgebrochen und gescrollt (40 - BASIC-Promptlänge)
+        self.textconfig_promptwidth       = 1       # wieviele Zeichen nimmt der BASIC-Prompt in Anspruch
+        self.textconfig_init_delay        = 300     # ms Wartezeit nach dem init der Schnittstelle
+        self.textconfig_init_clsdelay     = 600     # ms Wartezeit bis der Eingabeprompt nach einem CLS bereit ist
+        self.textconfig_init_basic1delay  = 700     # ms Wartezeit nach einem Start von BASIC in CAOS
+        self.textconfig_init_basic2delay  = 3800    # ms Wartezeit nach einem Start von BASIC (EIngabe von "MEMORY END")
+        self.textconfig_init_rebasicdelay = 300     # ms Wartezeit nach einem Start von BASIC in CAOS
+        self.textconfig_char_delay        = 0       # ms warten nach jeder Zeicheneingabe
+        self.textconfig_linescroll_delay  = 300     # nach Zeilenumbruch (ms Zeit, die der Rechner zum Scrollen einer Zeile braucht)
+        self.textconfig_process_delay     = 200     # nach Zeilenübergabe (ms Zeit, die der Rechner zur Verarbeitung der Eingabe braucht)
+        self.textconfig_command_addition  = 80      # zusätzliche Zeit für jeden zusätzlichen Befehl in der Zeile (es wird stumpf nach Doppelpunkten gesucht)
+        self.textconfig_linethrottle      = 0.4     # 0.4 = 400ms/1000 Zeilen - wird mit jeder zusätzlichen Zeile Programmcode dem Zeilendelay hinzugefügt - die BASIC Befehlsübernahme wird mit zunehmender Zeilenzahl langsamer
+        self.textconfig_lines             = 32      # maximal darstellbare Zeilen auf dem Bildschirm
+        self.textconfig_basicode_delay    = 50      # wenn Basicode schon im Speicher ist, wird der BASIC-Editor langsamer
+        self.textconfig_dim_ref_delay     = 40      # (20 gemessen)  DIM-Sonderbehandlung - dim_ref:  Zeit für Zugriff auf eine Feldvariable
+        self.textconfig_dim_unit_delay    = 0.2     # (0.3 gemessen) DIM-Sonderbehandlung - dim_unit: Zeit für Deklaration EINER einzelnen Feldvariable
+        self.textconfig_var_ref_delay     = 50      # Variablenaufruf-Sonderbehandlung - Zeit für Referenzierung einer Variable
+
+    ##################################################################################################
+    # Rückfragen und Meldungen - werden von GUI/CLI überschrieben
+    ##################################################################################################
+
+    def ask_yes_no(self, title: str, text: str, default: bool = True) -> bool:
+        """
+        Ja/Nein-Frage an den Benutzer (auch aus dem Worker-Thread, z.B. "Programm jetzt starten?").
+        default: Antwort ohne Rückfragemöglichkeit - bei Fragen nach dem Zustand des KC die vorsichtige (False).
+        """
+        print(f"{title}: {text} -> {'Ja' if default else 'Nein'}")
+        return default
+
+    def confirm_reset(self) -> bool:
+        """Aufforderung, vor der Übertragung RESET am KC zu drücken. False bricht die Übertragung ab."""
+        print("Vor der Übertragung RESET am KC drücken!")
+        return True
+
+    def show_error(self, text: str) -> None:
+        print(f"Fehler: {text}", file=sys.stderr)
+
+    ##################################################################################################
+    # Threading-Zeugs
+    ##################################################################################################
+    
+    # threadsicheres Setzen der Variable (aus den Jobs)
+    def set_trans_state(self, value: str) -> None:
+        with self._lock:
+            self.trans_state = value  
+             
+    # threadsicheres Lesen der Variable (aus den Jobs)
+    def get_trans_state(self) -> str:
+        with self._lock:
+            return self.trans_state
+            
+    # threadsicheres Setzen der Variable (aus den Jobs)
+    def set_last_basicodelinenumber(self, value: str | None) -> None:
+        with self._lock:
+            self.last_basicodelinenumber = value
+            print(f"set_last_basicodelinenumber: {value}")
+            
+    # threadsicheres Holen der Variable (in die Jobs)
+    def get_last_basicodelinenumber(self) -> str | None:
+        with self._lock:
+            return self.last_basicodelinenumber
+
+    # threadsicheres Setzen der Variable (aus den Jobs)
+    def set_resume_info(self, value: KC_ResumeInfo | None) -> None:
+        with self._lock:
+            self.resume_info = value
+
+    # threadsicheres Holen der Variable (in die Jobs)
+    def get_resume_info(self) -> KC_ResumeInfo | None:
+        with self._lock:
+            return self.resume_info
+    
+
+    # ------------------------ Speicher des KC ------------------------
+
+    def _reset_kc(self) -> bool:
+        """RESET am KC erfragen: danach ist der Übertragungszustand unbekannt, CAOS hat seine Arbeitsbereiche neu angelegt."""
+        if not self.confirm_reset():
+            return False
+        self.trans_state = None
+        self.memory.on_reset()
+        return True
+
+    def memory_usable(self) -> bool:
+        """
+        Darf die Planung sich auf self.memory verlassen? Nur für denselben COM-Port; ein Abbild aus einer
+        früheren Sitzung wird einmal bestätigt (der KC könnte inzwischen ausgeschaltet worden sein) -
+        ohne Rückfragemöglichkeit (--no-ask) gilt es als nicht bestätigt und wird verworfen.
+        """
+        memory = self.memory
+        if memory.port and self.com_port_name and memory.port.strip().lower() != self.com_port_name.strip().lower():
+            return False
+        if not memory.confirmed:
+            memory.confirmed = True
+            if not self.ask_yes_no("KC-Speicher", "Ist der KC seit der letzten Übertragung durchgehend eingeschaltet?\n\n"
+                                   "\"Ja\": bereits geladene Teile (Stub, Bascoder, Programm) werden nicht erneut übertragen.\n\n"
+                                   "\"Nein\": alles wird neu übertragen", default=False):
+                memory.invalidate_all()
+        return not memory.is_empty()
+
+    def basic_prompt_active(self) -> bool:
+        """Wartet BASIC mit dem zuletzt eingetippten Programm am Prompt? Ohne sicheres Wissen wird nachgefragt."""
+        if self.memory.basic_prompt and self.get_trans_state() == "KEY":
+            return True
+        return self.ask_yes_no("BASIC-Programm", "Zeigt der KC den BASIC-Prompt (>) mit dem zuletzt übertragenen Programm?\n\n"
+                               "\"Ja\": nur geänderte Zeilen werden eingegeben.\n\n"
+                               "\"Nein\": BASIC wird neu aufgesetzt (RESET und REBASIC bzw. Bascoder zurücksetzen)", default=False)
+
+    def basic_update_job(self, pr: ParseResult, full: List[KC_Job], *, askstart: bool = False, savelastline: bool = False) -> Optional[KC_Job]:
+        """
+        Job, der nur die Änderungen gegenüber dem zuletzt eingetippten Listing (self.memory.basic_listing) eingibt
+        (KC_V24_Transfer_BasicDiff). None, wenn das Listing nicht bekannt bzw. nicht zeilenweise vergleichbar ist
+        oder die vollständige Eingabe (Jobs full) nach dem Zeitmodell nicht langsamer ist.
+        """
+        if self.memory.basic_listing is None:
+            return None
+        diff = KC_V24_Transfer_BasicDiff.compare(self.memory.basic_listing, pr.transferdata)
+        if diff is None:
+            return None
+
+        pr_diff = pr.without_data()
+        if diff.lastline is not None:
+            pr_diff.lastlinebasic = str(diff.lastline)
+        if diff.is_empty():
+            job = KC_Job(parent=self, type=KC_Job._JT_RESIDENT, pr=pr_diff, askstart=askstart, savelastline=savelastline)
+        else:
+            pr_diff.transferdata = diff.transferdata()
+            job = KC_Job(parent=self, type=KC_Job._JT_SENDBASICTEXT, pr=pr_diff, pause=None, askstart=askstart,
+                         savelastline=savelastline, basiclinesoffset=diff.kept, image=pr)
+
+        # ungünstigster Fall: RESET und REBASIC vor der Eingabe
+        pr_nodata = pr.without_data()
+        update_ms = self.cost_model.total_ms([KC_Job(parent=self, type=KC_Job._JT_STARTKEYBMODE, pr=pr_nodata),
+                                              KC_Job(parent=self, type=KC_Job._JT_STARTREBASIC,  pr=pr_nodata, pause=500), job])
+        full_ms = self.cost_model.total_ms(full)
+        print(f"-- BASIC-Listing: {diff}; Zeitmodell: vollständig ca. {full_ms / 1000:.1f} s, nur Änderungen ca. {update_ms / 1000:.1f} s")
+        if update_ms >= full_ms or not self.memory_usable():
+            return None
+        return job
+
+    def injector_variant(self, pr: ParseResult, full: List[KC_Job], *, askstart: bool = False) -> List[KC_Job]:
+        """
+        Vollständige Eingabe eines BASIC-Listings (Jobs full: Tastaturmodus, BASIC-Kaltstart, SENDBASICTEXT) oder -
+        wenn nach dem Zeitmodell schneller - mit dem Zeilen-Einspeiser (KC_V24_Transfer_LineInjector): Listing und
+        Einspeiser vorab per ESC-T (ggf. mit Schnelllader) laden, dann BASIC starten und CALL*7A00 eingeben.
+        Setzt den Übertragungsmodus nach einem RESET voraus (ESC-T vor dem Tastaturmodus).
+        """
+        image = KC_V24_Transfer_LineInjector.build_image(self.pr_injector, pr, KC_V24_Transfer_MemoryShadow._BASIC_TEXT)
+        if image is None:
+            return full
+
+        saved, self.jobs = self.jobs, []
+        try:
+            self._add_full_load_jobs(image)
+            loads = self.jobs
+        finally:
+            self.jobs = saved
+
+        pr_nodata = pr.without_data()
+        lines = KC_V24_Transfer_BasicDiff.parse_lines(pr.transferdata)
+        if lines:
+            pr_nodata.lastlinebasic = str(max(lines))
+        injected = loads + [KC_Job(parent=self, type=KC_Job._JT_STARTKEYBMODE, pr=pr_nodata),
+                            KC_Job(parent=self, type=KC_Job._JT_STARTBASIC,    pr=pr_nodata),
+                            KC_Job(parent=self, type=KC_Job._JT_RUNINJECTOR,   pr=pr_nodata, askstart=askstart, image=pr)]
+
+        full_ms, injected_ms = self.cost_model.total_ms(full), self.cost_model.total_ms(injected)
+        print(f"-- Zeitmodell: Tastatureingabe ca. {full_ms / 1000:.1f} s, Zeilen-Einspeiser ca. {injected_ms / 1000:.1f} s")
+        return injected if injected_ms < full_ms else full
+
+    def add_basicmc_jobs(self, pr: ParseResult) -> None:
+        """
+        Hängt die Jobs zum Laden und Starten eines BASIC-Speicherabbilds an self.jobs an: mit dem Warmstart-Stub
+        (KC_V24_Transfer_BasicWarmStart) in einem ESC-T geladen und per ESC-U gestartet - ohne Stub bzw. wenn das
+        nach dem Zeitmodell nicht schneller ist, über den Tastaturmodus (REBASIC und RUN eingetippt).
+        """
+        pr_nodata = pr.without_data()
+        first = len(self.jobs)
+        self.add_bin_load_jobs(pr, pause=100, askstart=True)   # ggf. mit Schnelllader
+        self.jobs.append(KC_Job(parent=self, type=KC_Job._JT_STARTKEYBMODE, pr=pr_nodata))
+        self.jobs.append(KC_Job(parent=self, type=KC_Job._JT_STARTREBASIC,  pr=pr_nodata, pause=500))
+        self.jobs.append(KC_Job(parent=self, type=KC_Job._JT_RUNBASIC,      pr=pr_nodata))
+
+        image = KC_V24_Transfer_BasicWarmStart.build_image(self.pr_warmstart, pr)
+        if image is None:
+            return
+        keyb = self.jobs[first:]
+        del self.jobs[first:]
+        self.add_bin_load_jobs(image, askstart=True)
+        self.jobs.append(KC_Job(parent=self, type=KC_Job._JT_RUNBASICWARM, pr=image.without_data()))
+
+        keyb_ms, warm_ms = self.cost_model.total_ms(keyb), self.cost_model.total_ms(self.jobs[first:])
+        print(f"-- Zeitmodell: Start über Tastaturmodus ca. {keyb_ms / 1000:.1f} s, Warmstart per ESC-U ca. {warm_ms / 1000:.1f} s")
+        if warm_ms >= keyb_ms:
+            del self.jobs[first:]
+            self.jobs += keyb
+
+    def load_memory(self) -> bool:
+        """Gespeichertes Speicherabbild des KC laden (letzte BASICODE-Zeile inklusive)."""
+        if not self.MEMORY_PATH.exists() or not self.memory.load(self.MEMORY_PATH):
+            return False
+        if self.last_basicodelinenumber is None:
+            self.last_basicodelinenumber = self.memory.last_basicodelinenumber
+        return True
+
+    def save_memory(self) -> bool:
+        return self.memory.save(self.MEMORY_PATH)
+
+    def _save_memory_on_end(self, event: JobEvent) -> None:
+        if event.kind == self.engine._EV_END:
+            self.save_memory()
+
+    # ------------------------ Datei laden ------------------------
+
+    def read_file(self, path) -> ParseResult:
+        """
+        Liest und klassifiziert eine Programmdatei (KCC, KCB, SSS, BASIC-/BASICODE-Listing, Text, Binärdatei).
+        callu wird auf die Einsprungadresse aus dem Prolog bzw. dem Dateiheader gesetzt.
+        """
+        with open(path, "rb") as f:
+            filedata = f.read()
+        if not filedata:
+            raise ValueError("Datei ist leer.")
+
+        ft = KC_V24_Transfer_FileFormatTools()
+        pr = ft.parseBinData(filedata)  # pr ist eine Class ParseResult
+
+        print(pr)
+        if not pr.errorstate:
+            if pr.callp: pr.callu = pr.callp
+            else: pr.callu = pr.callh
+        return pr
+
+    # ------------------------ Senden ------------------------
+
+    def build_send_jobs(self) -> bool:
+        """
+        Baut in self.jobs die Job-Folge zur Übertragung von self.pr (je nach Datentyp mit Stub,
+        Bascoder, Tastaturmodus, Start) und optimiert sie (KC_V24_Transfer_JobPlan, Bericht in self.plan_report).
+        False, wenn nichts zu übertragen ist oder der Benutzer abbricht.
+        """
+        if self.pr is None or not self.check_memory_layout(self.pr):
+            return False
+        if not self._build_send_jobs():
+            return False
+        plan = KC_V24_Transfer_JobPlan(self, self.jobs)
+        self.jobs = plan.optimize(self.get_trans_state())
+        self.plan_report = plan.report
+
+        errors = self.memory_map.check_jobs(self.jobs, self.memory.loaders)
+        if errors:
+            self.show_error("Übertragung nicht möglich:\n" + "\n".join(errors))
+            self.jobs = []
+            return False
+        return bool(self.jobs)
+
+    def check_memory_layout(self, pr: ParseResult) -> bool:
+        """
+        Prüft das Speicherabbild vor der Übertragung gegen die Speicheraufteilung des KC (self.memory_map):
+        Fehler (z.B. Abbild im ROM) brechen ab, Warnungen (CAOS-Zellen, Bildspeicher, ramclass) werden erfragt.
+        """
+        errors, warnings = self.memory_map.check_image(pr)
+        if errors:
+            self.show_error("Übertragung nicht möglich:\n" + "\n".join(errors))
+            return False
+        if warnings:
+            return self.ask_yes_no("Speicherbelegung", "\n".join(warnings) + "\n\nTrotzdem übertragen?")
+        return True
+
+    def _build_send_jobs(self) -> bool:
+        """Job-Folge je Datentyp (ohne Optimierung)."""
+        if self.pr is None:
+            return False
+
+        # "leeres" ParseResult für Jobs ohne Datenübertagung erzeugen (spart Speicher)
+        pr_nodata = self.pr.without_data()
+
+        self.jobs = []
+
+        if self.pr.type == self.pr._TYPE_TEXT:
+            # Tastaturmodus einschalten
+            # transferdata als Tastatureingaben übertragen
+
+            # RESET am KC erfragen
+            if not self._reset_kc(): return False
+
+            self.jobs.append(KC_Job(parent=self, type=KC_Job._JT_STARTKEYBMODE, pr=pr_nodata))
+            self.jobs.append(KC_Job(parent=self, type=KC_Job._JT_SENDTEXT,      pr=self.pr))
+
+        elif self.pr.type == self.pr._TYPE_BASICTEXT:
+            # Tastaturmodus einschalten
+            # BASIC starten
+            # transferdata als Tastatureingaben übertragen
+            # wenn Autostart: BASIC-Programm starten
+
+            full = [KC_Job(parent=self, type=KC_Job._JT_STARTKEYBMODE, pr=pr_nodata),
+                    KC_Job(parent=self, type=KC_Job._JT_STARTBASIC,    pr=pr_nodata),
+                    KC_Job(parent=self, type=KC_Job._JT_SENDBASICTEXT, pr=self.pr, pause=None, askstart=True)]
+
+            # steht das zuletzt eingetippte Listing noch im KC: nur geänderte Zeilen eingeben (ohne BASIC-Kaltstart)
+            update = self.basic_update_job(self.pr, full, askstart=True)
+            if update is not None and self.basic_prompt_active():
+                self.jobs.append(KC_Job(parent=self, type=KC_Job._JT_STARTKEYBMODE, pr=pr_nodata))
+                self.jobs.append(update)
+            else:
+                if not self._reset_kc(): return False
+                if update is not None:   # BASIC-Warmstart: das Programm bleibt erhalten
+                    self.jobs.append(KC_Job(parent=self, type=KC_Job._JT_STARTKEYBMODE, pr=pr_nodata))
+                    self.jobs.append(KC_Job(parent=self, type=KC_Job._JT_STARTREBASIC,  pr=pr_nodata, pause=500))
+                    self.jobs.append(update)
+                else:
+                    self.jobs += self.injector_variant(self.pr, full, askstart=True)
+            self.jobs.append(KC_Job(parent=self, type=KC_Job._JT_RUNBASIC,      pr=pr_nodata))
+
+        elif self.pr.type == self.pr._TYPE_BASICODE:
+            # Bascoder und tokenisiertes BASICODE-Programm als ein gemeinsames Speicherabbild
+            pr_basicode = None
+            if self.use_basicode_binload:
+                pr_basicode = KC_V24_Transfer_FileFormatTools().build_basicode_image(self.pr_bascoder, self.pr.transferdata)
+                if pr_basicode.errorstate:
+                    print(f"-- BASICODE-Speicherabbild nicht möglich ({pr_basicode.validstate}) -> Zeilenübertragung")
+                    pr_basicode = None
+
+            if pr_basicode is not None:
+                # RESET am KC erfragen
+                if not self._reset_kc(): return False
+
+                # Bascoder + Programm laden (ggf. mit Schnelllader), Bascoder initialisieren (RUN -> CALL*410), Programm starten
+                self.add_bin_load_jobs(pr_basicode, savelastline=True)
+                self.jobs.append(KC_Job(parent=self, type=KC_Job._JT_STARTKEYBMODE, pr=pr_nodata))
+                self.jobs.append(KC_Job(parent=self, type=KC_Job._JT_STARTREBASIC,  pr=pr_nodata, pause=500))
+                self.jobs.append(KC_Job(parent=self, type=KC_Job._JT_RUNBASIC,      pr=pr_nodata, pause=3000, askstart=True))
+                self.jobs.append(KC_Job(parent=self, type=KC_Job._JT_RUNBASIC,      pr=pr_nodata))
+                return True
+
+            # BASCODER schon geladen? (wir haben die letzte Zeilennummer des zuletzt geladenen BASICODE-Programmes, evtl. läuft der BASCODER noch)
+            bascoderload = True
+            if self.last_basicodelinenumber and self.memory.resident(self.pr_bascoder.start, self.pr_bascoder.transferdata,
+                                                                     ignore=(self.memory._BASIC_SYSBLOCK,)) and self.memory_usable():
+                print("-- Bascoder ist noch geladen (KC-Speicherabbild)")
+                bascoderload = False
+            elif self.last_basicodelinenumber and self.memory.is_empty():   # Speicherinhalt unbekannt
+                print("Frage-Bascoder")
+                bascoderload = not self.ask_yes_no("BASICODE-Programm", "Ist der Bascoder bereits geladen?\"Ja\": Das Programm wird direkt geladen.\n\n\"Nein\": Der Bascoder wird mitübertragen")
+
+            if bascoderload:
+                print("Frage-Bascoder mitladen: Ja")
+
+                # RESET am KC erfragen
+                if not self._reset_kc(): return False
+
+                if self.use_turboload:   # stub mit Turbo-Routine vorladen und starten
+                    # passenden Stub (Preloader) auswählen
+                    pr_stub = self._polling_stub(self.pr_bascoder.start, self.pr_bascoder.end)
+                    if pr_stub is not None:
+                        self.add_turbo_stub_jobs(pr_stub)
+
+                # Bascoder vorladen
+                self.jobs.append(KC_Job(parent=self, type=KC_Job._JT_SENDBIN,       pr=self.pr_bascoder, set_ser_br=1200))
+                self.jobs.append(KC_Job(parent=self, type=KC_Job._JT_STARTKEYBMODE, pr=pr_nodata))
+                self.jobs.append(KC_Job(parent=self, type=KC_Job._JT_STARTREBASIC,  pr=pr_nodata, pause=500))
+                self.jobs.append(KC_Job(parent=self, type=KC_Job._JT_RUNBASIC,      pr=pr_nodata, pause=3000))
+                # Binärstart des Bascoder funktioniert nicht
+                #self.jobs.append(KC_Job(parent=self, type=KC_Job._JT_RUNBIN,        pr=pr_bascoder_nodata, pause=5000))
+
+            else:
+                print("Frage-Bascoder mitladen: Nein")
+                # zuletzt eingetipptes Programm noch bekannt und Bascoder am Prompt: nur geänderte Zeilen eingeben
+                update = self.basic_update_job(self.pr, [KC_Job(parent=self, type=KC_Job._JT_STARTKEYBMODE, pr=pr_nodata),
+                                                         KC_Job(parent=self, type=KC_Job._JT_RESETBASCODER, pr=pr_nodata),
+                                                         KC_Job(parent=self, type=KC_Job._JT_SENDBASICTEXT, pr=self.pr, pause=None, savelastline=True)],
+                                               askstart=True, savelastline=True)
+                if update is not None and self.basic_prompt_active():
+                    self.jobs.append(KC_Job(parent=self, type=KC_Job._JT_STARTKEYBMODE, pr=pr_nodata))
+                    self.jobs.append(update)
+                    self.jobs.append(KC_Job(parent=self, type=KC_Job._JT_RUNBASIC,      pr=pr_nodata))
+                    return True
+                # Bascoder - geladenes Programm zurücksetzen
+                self.jobs.append(KC_Job(parent=self, type=KC_Job._JT_STARTKEYBMODE,  pr=pr_nodata))
+                self.jobs.append(KC_Job(parent=self, type=KC_Job._JT_RESETBASCODER, pr=pr_nodata))
+
+            # Basicode-Programm laden    
+            self.jobs.append(KC_Job(parent=self, type=KC_Job._JT_SENDBASICTEXT,  pr=self.pr, pause=None, askstart=True, savelastline=True))
+            self.jobs.append(KC_Job(parent=self, type=KC_Job._JT_RUNBASIC,       pr=pr_nodata))
+
+        elif self.pr.type == self.pr._TYPE_BASICMC:
+            # BIN laden
+            # Tastaturmodus einschalten
+            # REBASIC starten
+            # wenn Autostart: BASIC-Programm starten
+            # RESET am KC erfragen
+            if not self._reset_kc(): return False
+            
+            self.add_basicmc_jobs(self.pr)
+            
+        elif self.pr.type == self.pr._TYPE_MC:
+            # BIN laden
+            # BIN starten
+            # Tastaturmodus einschalten
+            
+            # RESET am KC erfragen
+            if not self._reset_kc(): return False
+
+            if self.pr.callu:   # nur wenn Startadresse gegeben ist, nach Start fragen
+                self.add_bin_load_jobs(self.pr, pause=100, askstart=True)   # ggf. mit Schnelllader
+                self.jobs.append(KC_Job(parent=self, type=KC_Job._JT_STARTKEYBMODE, pr=pr_nodata))
+                self.jobs.append(KC_Job(parent=self, type=KC_Job._JT_RUNBINMENU,    pr=pr_nodata))
+            else:
+                self.add_bin_load_jobs(self.pr)
+
+        return bool(self.jobs)
+
+    def start_jobs(self) -> None:
+        """Startet die Abarbeitung von self.jobs in der JobEngine (eigener Thread mit asyncio-Ereignisschleife)."""
+        # WICHTIGER FUNKTIONSAUFRUF: die Engine übernimmt self.jobs und leert die Liste am Ende
+        self.engine.start(self.jobs)
+
+    def progress_totals(self) -> tuple[int, int, int, int]:
+        """Fortschritt über alle Jobs: (gesendete Bytes, Bytes gesamt, Nummer des aktuellen Jobs, Anzahl Jobs)."""
+        return self.engine.progress()
+
+    # Zustand der Abarbeitung (nur lesend, aus der Engine)
+    @property
+    def _worker(self) -> Optional[threading.Thread]:
+        return self.engine._thread
+
+    @property
+    def _current_job(self) -> Optional[KC_Job]:
+        return self.engine.current_job
+
+    @property
+    def _processing_result(self) -> Optional[ProcessingResult]:
+        return self.engine.result
+
+    def stop_all(self) -> None:
+        # globale Stop-Funktion: laufender Job endet sofort (auch in Wartezeiten), weitere Jobs starten nicht
+        self.engine.cancel()
+
+    def abort_port(self) -> None:
+        """
+        Bricht die Übertragung ab und schließt den COM-Port, ohne auf blockierende
+        Schreib-/Lesevorgänge zu warten (Timeouts). Der KC gilt danach als "BROKE".
+        """
+        self.stop_all()
+        self.set_trans_state("BROKE")
+        ser, self.com_port = self.com_port, None   # Referenz früh lösen
+        if ser is None:
+            return
+        try:
+            for name in ("cancel_write", "cancel_read"):
+                if hasattr(ser, name):
+                    try:
+                        getattr(ser, name)()
+                    except Exception:
+                        pass
+        finally:
+            try:
+                ser.close()
+            except Exception:
+                pass
+
+
+    #######################################################################################################
+    # Stubs, Bascoder, Schnelllader
+    #######################################################################################################
+
+    def load_stubs(self) -> None:
+        """
+        Lädt die Baud-Umschaltstubs und bereitet ParseResults vor,
+        die oben oder unten im Speicherraum als Preloader geladen werden können
+        """
+        try:
+        
+            # Stub für den unteren Speicherbereich
+            
+            stub_path = self.BASE_DIR / "bin" / "Polling_ESC-T_0200.bin"  # Dateiname ggf. anpassen
+            data = stub_path.read_bytes()
+            if not data:
+                raise ValueError("200-Stub ist leer.")
+
+            pr = ParseResult()
+            pr.format = ParseResult._FORMAT_RAW
+            pr.type = ParseResult._TYPE_MC
+            pr.errorstate = False
+            pr.validstate = 0
+
+            pr.transferdata = data
+            pr.start = 0x200
+            pr.end = pr.start + len(pr.transferdata)
+
+            pr.callp = pr.start
+            pr.callh = pr.start
+            pr.callu = pr.start
+
+            self.pr_0200stub = pr
+
+            # Stub für den oberen Speicherbereich
+
+            stub_path = self.BASE_DIR / "bin" / "Polling_ESC-T_BF00.bin"  # Dateiname ggf. anpassen
+            data = stub_path.read_bytes()
+            if not data:
+                raise ValueError("BF00-Stub ist leer.")
+
+            pr = ParseResult()
+            pr.format = ParseResult._FORMAT_RAW
+            pr.type = ParseResult._TYPE_MC
+            pr.errorstate = False
+            pr.validstate = 0
+
+            pr.transferdata = data
+            pr.start = 0xBF00
+            pr.end = pr.start + len(pr.transferdata)
+
+            pr.callp = pr.start
+            pr.callh = pr.start
+            pr.callu = pr.start
+
+            self.pr_BF00stub = pr
+
+        except Exception as e:
+            self.pr_BF00stub = None
+            self.pr_0200stub = None
+            self.show_error(f"Ein Stub konnte nicht geladen werden:\n{e}")
+
+        # Stub-Varianten (fehlen sie, wird nur mit dem einfachen Polling-Stub übertragen)
+        self.pr_0200rlestub     = self._load_stub("Polling_ESC-T_RLE_0200.bin", 0x0200)
+        self.pr_BF00rlestub     = self._load_stub("Polling_ESC-T_RLE_BF00.bin", 0xBF00)
+        self.pr_0200sessionstub = self._load_stub("Polling_Session_0200.bin", 0x0200)
+        self.pr_BF00sessionstub = self._load_stub("Polling_Session_BF00.bin", 0xBF00)
+
+        self.pr_injector        = self._load_stub("Basic_LineInjector.bin", KC_V24_Transfer_LineInjector._START)
+        self.pr_warmstart       = self._load_stub("Basic_WarmStart.bin", KC_V24_Transfer_BasicWarmStart._START)
+
+        pr_check = self._load_stub("V24_Check.bin", 0x0300)
+        self.checkdata = pr_check.transferdata if pr_check is not None else None
+
+        # Aufrufe der Stubs (ESC-U) verändern den KC-Speicher nicht
+        self.memory.loaders = [(p.start, bytes(p.transferdata)) for p in (self.pr_0200stub, self.pr_BF00stub, self.pr_0200rlestub, self.pr_BF00rlestub,
+                                                          self.pr_0200sessionstub, self.pr_BF00sessionstub) if p is not None]
+
+    def _load_stub(self, name: str, start: int) -> ParseResult | None:
+        """Lädt einen Stub aus bin/ als ParseResult (None, wenn er nicht geladen werden kann)."""
+        try:
+            data = (self.BASE_DIR / "bin" / name).read_bytes()
+            if not data:
+                raise ValueError(f"{name} ist leer.")
+        except Exception as e:
+            print(f"load_stubs: {name} nicht verfügbar: {e}")
+            return None
+
+        pr = ParseResult()
+        pr.format = ParseResult._FORMAT_RAW
+        pr.type = ParseResult._TYPE_MC
+        pr.errorstate = False
+        pr.validstate = 0
+
+        pr.transferdata = data
+        pr.start = start
+        pr.end = pr.start + len(pr.transferdata)
+
+        pr.callp = pr.start
+        pr.callh = pr.start
+        pr.callu = pr.start
+        return pr
+
+    def _select_stub(self, pr_low: ParseResult | None, pr_high: ParseResult | None, start: int, end: int) -> ParseResult | None:
+        """Wählt den Stub (unten/oben), der den Bereich start..end-1 nicht überlappt (self.memory_map.fits)."""
+        if pr_low is None or pr_high is None:
+            return None
+        for pr_stub in (pr_low, pr_high):
+            if self.memory_map.fits(pr_stub.start, len(pr_stub.transferdata), [(start, end)]):
+                return pr_stub
+        return None
+
+    def _polling_stub(self, start: int, end: int) -> ParseResult | None:
+        """
+        Polling-Stub, der den Bereich start..end-1 nicht überlappt. Kandidaten: die mitgelieferten (0200h, BF00h),
+        in dieser Sitzung erzeugte Stubs und einer für die niedrigste freie Adresse (KC_V24_Transfer_StubGenerator).
+        Gewählt wird der mit der kürzesten vorhergesagten Dauer für Vorladen und Start (cost_model) - ein noch
+        im KC liegender Stub muss nicht erneut übertragen werden. None, wenn im RAM kein Platz bleibt.
+        """
+        gen  = KC_V24_Transfer_StubGenerator()
+        busy = [(start, end)]
+        candidates = [p for p in (self.pr_0200stub, self.pr_BF00stub)
+                      if p is not None and self.memory_map.fits(p.start, len(p.transferdata), busy)]
+        for addr, code in self.memory.loaders:
+            if (len(code) == gen.size and self.memory_map.fits(addr, gen.size, busy)
+                    and all(c.start != addr for c in candidates) and code == gen.build(addr, code[gen.ctc_offset()] or 1)):
+                candidates.append(gen.build_pr(addr, self.get_turbo_step().ctc))
+        addr = gen.place(busy) if not candidates else None
+        if addr is not None:
+            candidates.append(gen.build_pr(addr, self.get_turbo_step().ctc))
+        if not candidates:
+            return None
+
+        # bei gleicher Dauer der erste (mitgelieferte) Stub
+        pr_stub = candidates[0] if len(candidates) == 1 else min(candidates, key=self._stub_jobs_ms)
+        if pr_stub in (self.pr_0200stub, self.pr_BF00stub):
+            return pr_stub
+        print(f"-- Polling-Stub für {pr_stub.start:04X} erzeugt")
+        loader = (pr_stub.start, bytes(pr_stub.transferdata))
+        if loader not in self.memory.loaders:   # sein Aufruf verändert den Speicher nicht
+            self.memory.loaders.append(loader)
+        return pr_stub
+
+    def _stub_jobs_ms(self, pr_stub: ParseResult) -> float:
+        """Vorhergesagte Dauer der Jobs aus add_turbo_stub_jobs für diesen Stub (ohne sie anzuhängen)."""
+        jobs, self.jobs = self.jobs, []
+        try:
+            self.add_turbo_stub_jobs(pr_stub)
+            return self.cost_model.total_ms(self.jobs)
+        finally:
+            self.jobs = jobs
+
+    def add_bin_load_jobs(self, pr: ParseResult, *, pause: int = 0, askstart: bool = False, savelastline: bool = False) -> None:
+        """
+        Hängt die Jobs zum Laden eines Speicherabbildes an self.jobs an (_add_full_load_jobs).
+        Liegt das Abbild nach dem Speicherabbild des KC (self.memory) schon ganz oder teilweise unverändert im KC,
+        werden nur die geänderten Bereiche mit 1200 Baud übertragen, wenn das nach dem Zeitmodell schneller ist.
+        """
+        first = len(self.jobs)
+        self._add_full_load_jobs(pr, pause=pause, askstart=askstart, savelastline=savelastline)
+
+        delta = self._delta_load_jobs(pr, pause=pause, askstart=askstart, savelastline=savelastline)
+        if delta is None:
+            return
+        full_ms  = self.cost_model.total_ms(self.jobs[first:])
+        delta_ms = self.cost_model.total_ms(delta)
+        print(f"-- Zeitmodell: vollständig ca. {full_ms / 1000:.1f} s, nur Änderungen ({len(delta)} Jobs) ca. {delta_ms / 1000:.1f} s")
+        if delta_ms < full_ms and self.memory_usable():
+            del self.jobs[first:]
+            self.jobs += delta
+
+    def _delta_load_jobs(self, pr: ParseResult, *, pause: int = 0, askstart: bool = False, savelastline: bool = False) -> Optional[List[KC_Job]]:
+        """Jobs, die nur die vom KC-Speicher abweichenden Bereiche von pr übertragen (None: Speicherinhalt unbekannt)."""
+        if self.memory.is_empty() or pr.start is None:
+            return None
+        # Lücken, deren Übertragung weniger kostet als ein weiterer ESC-T (Header + ESC-Pause), werden mitgesendet
+        ranges = self.memory.changed_ranges(pr.start, pr.transferdata, self.cost_model.esct_min_gap())
+        if not ranges:
+            return [KC_Job(parent=self, type=KC_Job._JT_RESIDENT, pr=pr.without_data(), pause=pause, askstart=askstart, savelastline=savelastline)]
+
+        jobs = []
+        for i, (start, end) in enumerate(ranges):
+            last = i == len(ranges) - 1
+            jobs.append(KC_Job(parent=self, type=KC_Job._JT_SENDBIN, pr=pr.slice(start - pr.start, end - pr.start),
+                               pause=pause if last else 0, askstart=askstart and last, savelastline=savelastline and last))
+        return jobs
+
+    def _add_full_load_jobs(self, pr: ParseResult, *, pause: int = 0, askstart: bool = False, savelastline: bool = False) -> None:
+        """
+        Hängt die Jobs zum vollständigen Laden eines Speicherabbildes an self.jobs an.
+        Mit Schnelllader wird die Variante gewählt, deren Job-Folge nach dem Zeitmodell (cost_model: Stub mit 1200 Baud,
+        Nutzdaten mit der kalibrierten Turbo-Datenrate des Ports, Entpacken/Füllen auf dem KC) am schnellsten ist:
+          - Polling-Stub: ein ESC-T mit dem ungepackten Speicherabbild
+          - RLE-Stub:     ein ESC-T mit dem gepackten Speicherabbild, der KC entpackt danach
+          - Session-Stub: mehrere ESC-T/ESC-F in einer Turbo-Sitzung (lange gleichförmige Bereiche werden gefüllt)
+        Ist die direkte Übertragung mit 1200 Baud nicht langsamer, entfällt der Schnelllader.
+        Der letzte Job schaltet auf 1200 Baud zurück und wartet pause ms bzw. fragt nach dem Start (askstart).
+        """
+        direct = KC_Job(parent=self, type=KC_Job._JT_SENDBIN, pr=pr, set_ser_br=1200, pause=pause, askstart=askstart, savelastline=savelastline)
+        if not self.use_turboload:
+            self.jobs.append(direct)
+            return
+
+        tools = KC_V24_Transfer_FileFormatTools()
+
+        # ungepackt: passenden Stub (Preloader) auswählen
+        pr_stub = self._polling_stub(pr.start, pr.end)
+        if pr_stub is None:
+            print(f"-- kein Platz für den Schnelllader neben {pr.start:04X}-{pr.end:04X} -> direkt mit 1200 Baud")
+            self.jobs.append(direct)
+            return
+        best = self._turbo_load_jobs(pr_stub, lambda _: [
+            KC_Job(parent=self, type=KC_Job._JT_SENDBIN, pr=pr, set_ser_br=1200, pause=pause, askstart=askstart, savelastline=savelastline)])
+        best_ms = self.cost_model.total_ms(best)
+        print(f"-- Turbo ungepackt: {len(pr.transferdata)} Bytes, ca. {best_ms / 1000:.1f} s")
+
+        # RLE-gepackt (der gepackte Strom kann hinter dem Speicherabbild enden)
+        if self.use_rle_turboload:
+            pr_packed = tools.build_rle_transfer(pr)
+            if not pr_packed.errorstate:
+                pr_rlestub = self._select_stub(self.pr_0200rlestub, self.pr_BF00rlestub,
+                                               min(pr.start, pr_packed.start), max(pr.end, pr_packed.end))
+                if pr_rlestub is not None:
+                    unpack_ms = tools.unpack_ms(len(pr.transferdata))
+                    packed = self._turbo_load_jobs(pr_rlestub, lambda _: [
+                        KC_Job(parent=self, type=KC_Job._JT_SENDBIN, pr=pr_packed, set_ser_br=1200, pause=pause + unpack_ms, askstart=askstart, savelastline=savelastline,
+                               image=pr)])
+                    packed_ms = self.cost_model.total_ms(packed)
+                    print(f"-- Turbo RLE: {len(pr_packed.transferdata)} Bytes ab {pr_packed.start:04X}, ca. {packed_ms / 1000:.1f} s")
+                    if packed_ms < best_ms:
+                        best, best_ms = packed, packed_ms
+
+        # Session mit ESC-T/ESC-F-Abschnitten
+        pr_sessionstub = self._select_stub(self.pr_0200sessionstub, self.pr_BF00sessionstub, pr.start, pr.end)
+        if pr_sessionstub is not None:
+            segments = tools.split_fill_segments(pr)
+            if any(kind == "F" for kind, _ in segments):
+                def session_jobs(pr_stub_nodata: ParseResult) -> List[KC_Job]:
+                    jobs = []
+                    last_t = max((i for i, (kind, _) in enumerate(segments) if kind == "T"), default=-1)
+                    for i, (kind, seg) in enumerate(segments):
+                        if kind == "F":
+                            jobs.append(KC_Job(parent=self, type=KC_Job._JT_TURBOFILL,    pr=seg))
+                        else:
+                            jobs.append(KC_Job(parent=self, type=KC_Job._JT_TURBOSENDBIN, pr=seg, savelastline=savelastline and i == last_t))
+                    jobs.append(KC_Job(parent=self, type=KC_Job._JT_TURBOEND,             pr=pr_stub_nodata, set_ser_br=1200, pause=pause, askstart=askstart))
+                    return jobs
+
+                session = self._turbo_load_jobs(pr_sessionstub, session_jobs)
+                session_ms = self.cost_model.total_ms(session)
+                print(f"-- Turbo Session: {len(segments)} Abschnitte, ca. {session_ms / 1000:.1f} s")
+                if session_ms < best_ms:
+                    best, best_ms = session, session_ms
+
+        # kleine Abbilder: direkt mit 1200 Baud, wenn das nicht langsamer ist als der Schnelllader samt Stub
+        direct_ms = self.cost_model.total_ms([direct])
+        print(f"-- Zeitmodell: Schnelllader ca. {best_ms / 1000:.1f} s, direkt ca. {direct_ms / 1000:.1f} s")
+        self.jobs += [direct] if direct_ms <= best_ms else best
+
+    def _turbo_load_jobs(self, pr_stub: ParseResult, data_jobs: Callable[[ParseResult], List[KC_Job]]) -> List[KC_Job]:
+        """Job-Folge einer Schnelllader-Variante: Stub vorladen/starten, dann data_jobs(Stub ohne Daten); self.jobs bleibt unverändert."""
+        saved, self.jobs = self.jobs, []
+        try:
+            pr_stub_nodata = self.add_turbo_stub_jobs(pr_stub)
+            return self.jobs + data_jobs(pr_stub_nodata)
+        finally:
+            self.jobs = saved
+
+    def get_turbo_step(self) -> BaudStep:
+        """Turbo-Einstellung für den aktuellen COM-Port (kalibriert oder Standard 57600 Baud 8N2)."""
+        return self.turbo_steps.get(self.com_port_name.strip().lower(), KC_V24_Transfer_BaudLadder.DEFAULT_STEP)
+
+    def add_turbo_stub_jobs(self, pr_stub: ParseResult) -> ParseResult:
+        """
+        Hängt die Jobs zum Vorladen und Starten eines Stubs an self.jobs an
+        (Zeitkonstante und Schnittstelleneinstellung nach get_turbo_step()).
+        Gibt das ParseResult des Stubs ohne Daten zurück (für weitere Jobs an den Stub).
+        """
+        step = self.get_turbo_step()
+        pr_stub = KC_V24_Transfer_BaudLadder().patch_stub(pr_stub, step.ctc)
+        print(f"-- Stub vorladen {pr_stub.start:04X} ({step})")
+
+        pr_stub_nodata = pr_stub.without_data()
+
+        if self.memory.resident(pr_stub.start, pr_stub.transferdata) and self.memory_usable():
+            print("-- Stub ist bereits geladen (KC-Speicherabbild)")
+        else:
+            self.jobs.append(KC_Job(parent=self, type=KC_Job._JT_SENDBIN,   pr=pr_stub))
+        self.jobs.append(KC_Job(parent=self, type=KC_Job._JT_RUNBIN,        pr=pr_stub_nodata, set_ser_br=step.baudrate, set_ser_sb=step.stopbits, pause=100))
+        return pr_stub_nodata
+
+    def load_bascoder(self) -> bool:
+        """
+        Die (mitgegebene) Bascoderdatei laden und bereithalten
+        """
+        print("load_bascoder")
+        try:
+            path = self.BIN_PATH / "BAC854-5.KCB"
+            pr = self.read_file(path)
+            if pr.errorstate:
+                return False
+
+            self.pr_bascoder = pr
+            
+            self.file_name_bascoder = path.name
+            
+            print(f"load_bascoder -> Bascoder-Datei \"{self.file_name_bascoder}\" geladen")
+            return True
+            
+        except Exception as e:
+            self.show_error(f"Fehler beim Laden der Datei:\n{e}")
+            print(f"load_bascoder{e}")
+            return False
+
+    #######################################################################################################
+    # Schnittstelle
+    #######################################################################################################
+
+    def open_port(self, br=1200, stopbits=None) -> Optional[serial.Serial]:
+        port_name = self.com_port_name
+        try:
+            ser = serial.Serial(
+                port_name,
+                baudrate=br,
+                bytesize=serial.EIGHTBITS,
+                parity=serial.PARITY_NONE,
+                stopbits=serial.STOPBITS_ONE if stopbits == 1 else serial.STOPBITS_TWO,
+                timeout=1,
+                xonxoff=False,
+            )
+            return ser
+        except serial.SerialException as e:
+            self.show_error(f"Schnittstelle {port_name} konnte nicht geöffnet werden:\n{e}")
+            return None
+            
+    def _close_current_port(self) -> None:
+        try:
+            if self.com_port and getattr(self.com_port, "is_open", False):
+                self.com_port.close()
+        except Exception:
+            pass
+        self.com_port = None
+   
+    #######################################################################################################
+    # gespeicherte Konfiguration 
+    #######################################################################################################
+    def load_config(self) -> bool:
+        self.load_memory()
+        cfg = configparser.ConfigParser()
+        if not self.CONFIG_PATH.exists():
+            if self.save_config():
+                print("load_config() Konfigurationsdatei angelegt")
+                return True
+            else:
+                return False
+
+        try:
+            cfg.read(self.CONFIG_PATH, encoding="utf-8")
+
+            # [serial]
+            if cfg.has_section("serial"):
+            #if cfg.has_option("serial", "com_port_name"):
+                self.com_port_name = cfg.get("serial", "com_port_name", fallback="").strip()
+                self.use_turboload = cfg.getboolean("serial", "use_turboload", fallback=self.use_turboload)
+                self.use_basicode_binload = cfg.getboolean("serial", "use_basicode_binload", fallback=self.use_basicode_binload)
+                self.use_rle_turboload = cfg.getboolean("serial", "use_rle_turboload", fallback=self.use_rle_turboload)
+
+            # [kc] - Ausbau des KC (KC_V24_Transfer_MemoryMap)
+            if cfg.has_section("kc"):
+                self.memory_map.ram_kb = cfg.getint("kc", "ram_kb", fallback=self.memory_map.ram_kb)
+
+            # [gui]
+            if cfg.has_section("gui"):
+                self.gui_max_fps = max(1, cfg.getint("gui", "max_fps", fallback=self.gui_max_fps))
+
+            # [turbo] - kalibrierte Einstellung je COM-Port
+            if cfg.has_section("turbo"):
+                for port, value in cfg.items("turbo"):
+                    step = BaudStep.from_config(value)
+                    if step is not None:
+                        self.turbo_steps[port] = step
+                
+            """    
+            # [timeouts]
+            if cfg.has_section("timeouts"):
+                self.timeout_comport              = cfg.getint("timeouts", "comport", fallback=self.timeout_comport)
+                self.timeout_job                  = cfg.getint("timeouts", "job",     fallback=self.timeout_job)
+                
+            # [textconfig]
+            if cfg.has_section("textconfig"):
+                self.timeout_comport              = cfg.getint("textconfig", "comport", fallback=self.timeout_comport)
+                self.timeout_job                  = cfg.getint("textconfig", "job",     fallback=self.timeout_job)
+                
+                self.textconfig_showkonfigdialog  = cfg.getboolean("textconfig", "showkonfigdialog", fallback=self.textconfig_showkonfigdialog)
+                self.textconfig_linewidth         = cfg.getint("textconfig", "linewidth",         fallback=self.textconfig_linewidth)
+                self.textconfig_promptwidth       = cfg.getint("textconfig", "promptwidth",       fallback=self.textconfig_promptwidth)
+                self.textconfig_init_delay        = cfg.getint("textconfig", "init_delay",        fallback=self.textconfig_init_delay)
+                self.textconfig_init_clsdelay     = cfg.getint("textconfig", "init_clsdelay",     fallback=self.textconfig_init_clsdelay)
+                self.textconfig_init_basic1delay  = cfg.getint("textconfig", "init_basic1delay",  fallback=self.textconfig_init_basic1delay)
+                self.textconfig_init_basic2delay  = cfg.getint("textconfig", "init_basic2delay",  fallback=self.textconfig_init_basic2delay)
+                self.textconfig_init_rebasicdelay = cfg.getint("textconfig", "init_rebasicdelay", fallback=self.textconfig_init_rebasicdelay)
+                self.textconfig_char_delay        = cfg.getint("textconfig", "char_delay",        fallback=self.textconfig_char_delay)
+                self.textconfig_linescroll_delay  = cfg.getint("textconfig", "linescroll_delay",  fallback=self.textconfig_linescroll_delay)
+                self.textconfig_process_delay     = cfg.getint("textconfig", "process_delay",     fallback=self.textconfig_process_delay)
+                self.textconfig_command_addition  = cfg.getint("textconfig", "command_addition",  fallback=self.textconfig_command_addition)
+                self.textconfig_linethrottle      = cfg.getint("textconfig", "linethrottle",      fallback=self.textconfig_linethrottle)
+                self.textconfig_lines             = cfg.getint("textconfig", "lines",             fallback=self.textconfig_lines)
+                self.textconfig_basicode_delay    = cfg.getint("textconfig", "basicode_delay",    fallback=self.textconfig_basicode_delay)
+                self.textconfig_dim_ref_delay     = cfg.getint("textconfig", "dim_ref_delay",     fallback=self.textconfig_dim_ref_delay)
+                self.textconfig_dim_unit_delay    = cfg.getint("textconfig", "dim_unit_delay",    fallback=self.textconfig_dim_unit_delay)
+                self.textconfig_var_ref_delay     = cfg.getint("textconfig", "var_ref_delay",     fallback=self.textconfig_var_ref_delay)
+            """
+            return True
+        except Exception as e:
+            print(f"load_config() Konfiguration konnte nicht geladen werden: {e}")
+            return False
+
+    def save_config(self) -> bool:
+        try:
+            self.CONFIG_PATH.parent.mkdir(parents=True, exist_ok=True)
+        except Exception as e:
+            print(f"save_config() Konfigurationsverzeichnis konnte nicht angelegt werden: {e}")
+            return False
+            
+        cfg = configparser.ConfigParser()
+
+        cfg["serial"] = {
+            "com_port_name":     self.com_port_name.strip(),
+            "use_turboload":     self.use_turboload,
+            "use_basicode_binload": self.use_basicode_binload,
+            "use_rle_turboload": self.use_rle_turboload
+        }
+        cfg["kc"] = {
+            "ram_kb":            str(int(self.memory_map.ram_kb)),
+        }
+        cfg["gui"] = {
+            "max_fps":           str(int(self.gui_max_fps)),
+        }
+        cfg["turbo"] = {port: step.to_config() for port, step in self.turbo_steps.items()}
+        
+        """
+        cfg["timeouts"] = {
+            "comport":           str(int(self.timeout_comport)),
+            "job":               str(int(self.timeout_job)),
+        }       
+        
+        cfg["textconfig"] = {
+            "showkonfigdialog":  str(bool(self.textconfig_showkonfigdialog)),
+            "linewidth":         str(int(self.textconfig_linewidth)),
+            "promptwidth":       str(int(self.textconfig_promptwidth)),
+            "init_delay":        str(int(self.textconfig_init_delay)),
+            "init_clsdelay":     str(int(self.textconfig_init_clsdelay)),
+            "init_basic1delay":  str(int(self.textconfig_init_basic1delay)),
+            "init_basic2delay":  str(int(self.textconfig_init_basic2delay)),
+            "init_rebasicdelay": str(int(self.textconfig_init_rebasicdelay)),
+            "char_delay":        str(int(self.textconfig_char_delay)),
+            "linescroll_delay":  str(int(self.textconfig_linescroll_delay)),
+            "process_delay":     str(int(self.textconfig_process_delay)),
+            "command_addition":  str(int(self.textconfig_command_addition)),
+            "linethrottle":      str(int(self.textconfig_linethrottle)),
+            "lines":             str(int(self.textconfig_lines)),
+            "basicode_delay":    str(int(self.textconfig_basicode_delay)),
+            "dim_ref_delay":     str(int(self.textconfig_dim_ref_delay)),
+            "dim_unit_delay":    str(int(self.textconfig_dim_unit_delay)),
+            "var_ref_delay":     str(int(self.textconfig_var_ref_delay)),
+        }
+        """
+        try:
+            with self.CONFIG_PATH.open("w", encoding="utf-8") as f:
+                cfg.write(f)
+        except Exception as e:
+            print(f"save_config() Konfiguration konnte nicht gespeichert werden: {e}")
+            return False
+
+        return True
+    
+
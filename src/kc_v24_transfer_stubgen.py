@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from kc_v24_transfer_kcfileformattools import ParseResult
+from kc_v24_transfer_memorymap import KC_V24_Transfer_MemoryMap
+
+# Erzeuger für den Polling-Stub (Schnelllader, asm/Polling_ESC-T_0200.asm) an beliebiger Adresse:
+# Der Code ist als Folge von Befehlen mit Sprungmarken hinterlegt; absolute Operanden (CALL, LD HL,Tabelle)
+# werden beim Erzeugen für die Ladeadresse eingesetzt, relative Sprünge (JR) bleiben unverändert.
+# Die Zeitkonstante der Turbo-Datenrate (RUN_CTC+1) wird mit eingetragen.
+# Mit den mitgelieferten Stubs (0200h und BF00h, Zeitkonstante 1) stimmt das Ergebnis Byte für Byte überein
+# (verify bzw. Aufruf dieses Moduls ohne Argumente).
+
+
+class KC_V24_Transfer_StubGenerator:
+    """Polling-Stub (ESC-T mit Turbo-Datenrate) für eine beliebige Ladeadresse."""
+
+    # (Sprungmarke, Befehlsbytes, Sprungmarke des absoluten 16-Bit-Operanden)
+    _POLLING: Tuple[Tuple[Optional[str], str, Optional[str]], ...] = (
+        ("START",     "F5 C5 D5 E5 DD E5 FD E5",  None),          # PUSH AF/BC/DE/HL/IX/IY
+        (None,        "08 F5 D9 C5 D5 E5 D9 08",  None),          # EX AF,AF' / PUSH AF / EXX / PUSH BC/DE/HL / EXX / EX AF,AF'
+        (None,        "F3",                       None),          # DI
+        (None,        "CD",                       "SETRUN"),      # CALL SETRUN
+        (None,        "CD",                       "RECV_ESCT"),   # CALL RECV_ESCT
+        (None,        "CD",                       "SETCAOS"),     # CALL SETCAOS
+        (None,        "D9 E1 D1 C1 D9 08 F1 08",  None),          # EXX / POP HL/DE/BC / EXX / EX AF,AF' / POP AF / EX AF,AF'
+        (None,        "FD E1 DD E1 E1 D1 C1 F1",  None),          # POP IY/IX/HL/DE/BC/AF
+        (None,        "C9",                       None),          # RET
+        ("RECV_ESCT", "CD",                       "GETBYTE"),     # WAIT_ESC: CALL GETBYTE
+        (None,        "FE 1B 20 F9",              None),          # CP 1Bh / JR NZ,WAIT_ESC
+        (None,        "CD",                       "GETBYTE"),
+        (None,        "FE 54 20 F2",              None),          # CP 'T' / JR NZ,WAIT_ESC
+        (None,        "CD",                       "GETBYTE"),
+        (None,        "6F",                       None),          # LD L,A (adrL)
+        (None,        "CD",                       "GETBYTE"),
+        (None,        "67",                       None),          # LD H,A (adrH)
+        (None,        "CD",                       "GETBYTE"),
+        (None,        "4F",                       None),          # LD C,A (lenL)
+        (None,        "CD",                       "GETBYTE"),
+        (None,        "47",                       None),          # LD B,A (lenH)
+        ("LOOP",      "78 B1 C8",                 None),          # LD A,B / OR C / RET Z
+        (None,        "CD",                       "GETBYTE"),
+        (None,        "77 23 0B 18 F5",           None),          # LD (HL),A / INC HL / DEC BC / JR LOOP
+        ("GETBYTE",   "DB 0B CB 47 28 FA DB 09 C9", None),        # IN A,(0Bh) / BIT 0,A / JR Z,GETBYTE / IN A,(09h) / RET
+        ("SETRUN",    "21",                       "RUN_CTC"),     # LD HL,RUN_CTC
+        (None,        "CD",                       "APPLY_CTC"),
+        (None,        "21",                       "RUN_SIO"),     # LD HL,RUN_SIO
+        (None,        "CD",                       "APPLY_SIO"),
+        (None,        "C9",                       None),
+        ("SETCAOS",   "21",                       "CAOS_CTC"),    # LD HL,CAOS_CTC
+        (None,        "CD",                       "APPLY_CTC"),
+        (None,        "21",                       "CAOS_SIO"),    # LD HL,CAOS_SIO
+        (None,        "CD",                       "APPLY_SIO"),
+        (None,        "C9",                       None),
+        ("APPLY_CTC", "0E 0D 06 02 ED B3 C9",     None),          # LD C,0Dh / LD B,2 / OTIR / RET
+        ("APPLY_SIO", "0E 0B 06 0B ED B3 C9",     None),          # LD C,0Bh / LD B,0Bh / OTIR / RET
+        ("RUN_CTC",   "47 01",                    None),          # Zeitkonstante (RUN_CTC+1)
+        ("RUN_SIO",   "18 02 E2 14 44 03 E1 05 EA 11 18", None),
+        ("CAOS_CTC",  "47 2E",                    None),          # 1200 Baud
+        ("CAOS_SIO",  "18 02 E2 14 44 03 E1 05 EA 11 18", None),
+    )
+
+    _CTC_LABEL = "RUN_CTC"
+
+    _ALIGN   = 0x10   # Ladeadressen auf Vielfache von 16
+
+    _SHIPPED = (("Polling_ESC-T_0200.bin", 0x0200), ("Polling_ESC-T_BF00.bin", 0xBF00))
+
+    def __init__(self) -> None:
+        self._labels: Dict[str, int] = {}
+        ofs = 0
+        for label, code, ref in self._POLLING:
+            if label is not None:
+                self._labels[label] = ofs
+            ofs += len(bytes.fromhex(code)) + (2 if ref is not None else 0)
+        self.size = ofs
+
+    def ctc_offset(self) -> int:
+        """Offset der Zeitkonstante im Stub."""
+        return self._labels[self._CTC_LABEL] + 1
+
+    def build(self, start: int, ctc: int = 1) -> bytes:
+        """Stub für die Ladeadresse start mit der Zeitkonstante ctc."""
+        if not 0 <= start <= 0x10000 - self.size:
+            raise ValueError(f"Stub passt nicht an {start:04X}")
+        if not 0 < ctc <= 0xFF:
+            raise ValueError(f"Zeitkonstante {ctc} ungültig")
+        data = bytearray()
+        for _, code, ref in self._POLLING:
+            data += bytes.fromhex(code)
+            if ref is not None:
+                data += (start + self._labels[ref]).to_bytes(2, "little")
+        data[self.ctc_offset()] = ctc
+        return bytes(data)
+
+    def build_pr(self, start: int, ctc: int = 1) -> ParseResult:
+        """Stub als ParseResult wie in load_stubs (callu = Ladeadresse)."""
+        pr = ParseResult()
+        pr.format       = ParseResult._FORMAT_RAW
+        pr.type         = ParseResult._TYPE_MC
+        pr.errorstate   = False
+        pr.validstate   = 0
+        pr.transferdata = self.build(start, ctc)
+        pr.start        = start
+        pr.end          = start + self.size
+        pr.callh = pr.callp = pr.callu = start
+        return pr
+
+    def place(self, busy: Iterable[Tuple[int, int]], prefer: Iterable[int] = ()) -> Optional[int]:
+        """
+        Ladeadresse für den Stub, die keinen der Bereiche busy (start, end) überlappt: zuerst eine der
+        bevorzugten Adressen (z.B. die der mitgelieferten Stubs), sonst die niedrigste freie Adresse; None: kein Platz.
+        Erlaubte Bereiche: KC_V24_Transfer_MemoryMap.loader_regions (RAM ab 0200h bis zum IRM, im IRM ab B800h).
+        """
+        return KC_V24_Transfer_MemoryMap().free_slot(self.size, busy, prefer, self._ALIGN)
+
+    def verify(self, bindir: Path) -> List[str]:
+        """Vergleicht die erzeugten Stubs mit den mitgelieferten (Zeitkonstante 1); Rückgabe: Abweichungen."""
+        errors = []
+        for name, start in self._SHIPPED:
+            shipped = (bindir / name).read_bytes()
+            built   = self.build(start, 1)
+            if built != shipped:
+                diff = [f"+{i:02X}h" for i, (a, b) in enumerate(zip(built, shipped)) if a != b]
+                errors.append(f"{name}: {len(built)} statt {len(shipped)} Bytes, Abweichungen bei {', '.join(diff) or '-'}")
+        return errors
+
+
+# Einfacher CLI-Einstiegspunkt
+if __name__ == "__main__":
+    gen = KC_V24_Transfer_StubGenerator()
+    if len(sys.argv) == 1:
+        errors = gen.verify(Path(__file__).resolve().parent / "bin")
+        for line in errors:
+            print(line, file=sys.stderr)
+        if not errors:
+            print(f"Polling-Stub ({gen.size} Bytes, RUN_CTC+1 bei +{gen.ctc_offset():02X}h) stimmt mit den mitgelieferten Stubs überein")
+        sys.exit(1 if errors else 0)
+
+    if len(sys.argv) < 3:
+        print(
+            "python kc_v24_transfer_stubgen.py                      (Prüfung gegen bin/Polling_ESC-T_*.bin)"
+            ,"python kc_v24_transfer_stubgen.py <adresse> <datei.bin> [zeitkonstante]"
+            ,""
+            ,"Erzeugt den Polling-Stub für eine Ladeadresse (hex), z.B. 7F00 stub.bin 1"
+            , sep="\n"
+            , file=sys.stderr
+        )
+        sys.exit(1)
+
+    start = int(sys.argv[1], 16)
+    ctc   = int(sys.argv[3]) if len(sys.argv) > 3 else 1
+    Path(sys.argv[2]).write_bytes(gen.build(start, ctc))
+    print(f"{sys.argv[2]}: {start:04X}-{start + gen.size:04X}, Zeitkonstante {ctc}")
@@ -0,0 +1,304 @@
+from __future__ import annotations
+
+import re
+import sys
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+from kc_v24_transfer_basiclexer import BasicToken, KC_V24_Transfer_BASIClexer
+from kc_v24_transfer_basiclinedimanalyzer import BasicLineDimAnalyzer
+from kc_v24_transfer_basiclinevaranalyzer import BasicLineVarAnalyzer
+
+
+# Übertragungsplan für Tastatureingaben (job_sendtext):
+# Vor dem Senden wird pr.transferdata zusammen mit den textconfig-Parametern in eine
+# unveränderliche Folge von Segmenten (Bytes, Wartezeit danach) übersetzt.
+# Der Sender schreibt dann je Segment einmal auf die Schnittstelle und wartet die
+# geplante Zeit - die Zeilenanalyse (ON GOTO, DIM, Variablen) läuft nicht mehr
+# während die Schnittstelle stillsteht.
+
+@dataclass(frozen=True)
+class TextPlanConfig:
+    """Die für den Plan relevanten textconfig-Parameter (Zeiten in ms)."""
+    linewidth:        int   = 40
+    promptwidth:      int   = 1
+    lines:            int   = 32
+    init_clsdelay:    float = 600
+    char_delay:       float = 0
+    linescroll_delay: float = 300
+    process_delay:    float = 200
+    command_addition: float = 80
+    linethrottle:     float = 0.4
+    dim_ref_delay:    float = 40
+    dim_unit_delay:   float = 0.2
+    var_ref_delay:    float = 50
+
+    @classmethod
+    def from_app(cls, app) -> "TextPlanConfig":
+        """Übernimmt die aktuellen textconfig_*-Werte der Anwendung."""
+        return cls(
+            linewidth        = app.textconfig_linewidth,
+            promptwidth      = app.textconfig_promptwidth,
+            lines            = app.textconfig_lines,
+            init_clsdelay    = app.textconfig_init_clsdelay,
+            char_delay       = app.textconfig_char_delay,
+            linescroll_delay = app.textconfig_linescroll_delay,
+            process_delay    = app.textconfig_process_delay,
+            command_addition = app.textconfig_command_addition,
+            linethrottle     = app.textconfig_linethrottle,
+            dim_ref_delay    = app.textconfig_dim_ref_delay,
+            dim_unit_delay   = app.textconfig_dim_unit_delay,
+            var_ref_delay    = app.textconfig_var_ref_delay,
+        )
+
+
+@dataclass(frozen=True)
+class TextPlanSegment:
+    data:     bytes          # in einem Stück zu sendende Bytes (kann leer sein -> nur warten)
+    delay_ms: float          # Wartezeit nach dem Senden
+    progress: int            # Position in transferdata nach diesem Segment (für die Fortschrittsanzeige)
+    lastline: Optional[str]  # zuletzt vollständig übertragene BASICODE-Zeilennummer (oder None)
+
+
+class KC_V24_Transfer_TextPlan:
+    """Unveränderlicher Übertragungsplan für Tastatureingaben."""
+
+    _RX_LINENUMBER = re.compile(r'^\s*(\d{1,5})')
+
+    _BITS_PER_BYTE = 11      # 1 Start-, 8 Daten-, 2 Stoppbits (siehe open_port)
+
+    def __init__(self, segments: Tuple[TextPlanSegment, ...], total: int, lines: int) -> None:
+        self._segments = tuple(segments)
+        self._total    = total    # Länge der zugrundeliegenden transferdata
+        self._lines    = lines    # Anzahl der übertragenen Zeilen
+
+    @property
+    def segments(self) -> Tuple[TextPlanSegment, ...]:
+        return self._segments
+
+    @property
+    def total(self) -> int:
+        return self._total
+
+    @property
+    def lines(self) -> int:
+        return self._lines
+
+    @property
+    def bytes_on_wire(self) -> int:
+        """Anzahl tatsächlich gesendeter Bytes (ohne LF, mit eingefügten CLS-/CR-Bytes)."""
+        return sum(len(s.data) for s in self._segments)
+
+    @property
+    def delay_ms(self) -> float:
+        """Summe aller geplanten Wartezeiten."""
+        return sum(s.delay_ms for s in self._segments)
+
+    def duration_ms(self, baudrate: int = 1200) -> float:
+        """Vorhergesagte Gesamtdauer: Wartezeiten plus Übertragungszeit der Bytes."""
+        return self.delay_ms + self.bytes_on_wire * self._BITS_PER_BYTE * 1000.0 / baudrate
+
+    @staticmethod
+    def _count_on_goto_targets(tokens: Tuple[BasicToken, ...]) -> int:
+        """Anzahl der Sprungziele aller ON ... GOTO/GOSUB-Anweisungen einer Zeile."""
+        count = 0
+        n = len(tokens)
+        for i, tok in enumerate(tokens):
+            if tok.kind != KC_V24_Transfer_BASIClexer._TK_KEYWORD or tok.text != "ON":
+                continue
+            # GOTO/GOSUB in derselben Anweisung suchen, dann Zeilennummern (durch ',' getrennt) zählen
+            j = i + 1
+            while j < n and tokens[j].text not in ("GOTO", "GOSUB", ":"):
+                j += 1
+            if j >= n or tokens[j].text == ":":
+                continue
+            j += 1
+            while j < n and tokens[j].kind == KC_V24_Transfer_BASIClexer._TK_NUMBER:
+                count += 1
+                if j + 1 < n and tokens[j + 1].text == ",":
+                    j += 2
+                else:
+                    break
+        return count
+
+    @classmethod
+    def compile(cls, transferdata, cfg: TextPlanConfig, *, fastmode: bool = False,
+                endreturn: bool | None = None, basiclinesoffset: int = 0,
+                basicode: bool = False, verbose: bool = False) -> "KC_V24_Transfer_TextPlan":
+        """
+        Übersetzt transferdata (HC-Zeichensatz) in einen Übertragungsplan.
+        Die Zeitberechnung entspricht der bisherigen zeichenweisen Übertragung in job_sendtext:
+        - nach jedem Zeichen char_delay
+        - nach jedem CR Verarbeitungszeit der Zeile (Befehle, Zeilenzahl, DIM, Variablen)
+        - ohne fastmode Scrollzeit bei Zeilenumbruch
+        - im fastmode CLS am Anfang und wenn der Bildschirm vollgeschrieben ist
+        Aufeinanderfolgende Bytes ohne Wartezeit dazwischen werden zu einem Segment zusammengefasst.
+        """
+        lexer = KC_V24_Transfer_BASIClexer.shared()    # gemeinsamer Cache für alle Zeilenanalysen
+        dimanalyzer = BasicLineDimAnalyzer(option_base=0, lexer=lexer)
+        varanalyzer = BasicLineVarAnalyzer(lexer=lexer)
+
+        segments: List[TextPlanSegment] = []
+        pending = bytearray()    # Bytes des aktuellen (noch offenen) Segments
+        lastline: Optional[str] = None
+
+        def emit(data: bytes, delay_ms: float, progress: int) -> None:
+            # Bytes an das offene Segment anhängen; bei Wartezeit > 0 Segment abschließen
+            pending.extend(data)
+            if delay_ms > 0:
+                segments.append(TextPlanSegment(bytes(pending), float(delay_ms), progress, lastline))
+                pending.clear()
+
+        cursor_line      = 0                  # aktuelle Zeile des Cursors auf dem KC
+        cursor_row       = cfg.promptwidth    # Cursor steht am Prompt
+        cursor_is_in_string = False           # True, wenn der Cursor in einem Stringliteral steht
+        linecommandcount = 0                  # Anzahl der ZUSÄTZLICHEN Befehle in einer Zeile (:)
+        totallinecount   = 0                  # Anzahl der verarbeiteten Zeilen
+        currentlinetext  = ""                 # Text der aktuellen Zeile
+
+        if fastmode:  # im Fastmode wird der Bildschirm initial und nach dem Vollschreiben gelöscht (Verhinderung von Zeilenscrolling)
+            emit(b"\x0C", cfg.char_delay, 0)
+            emit(b"\x0D", cfg.init_clsdelay, 0)
+            cursor_line = 2
+
+        total = len(transferdata)
+        i = 0
+        while i < total:
+            charbyte = transferdata[i]
+            i += 1
+
+            if charbyte == 0x0A:  # nur CR 0x0D soll im text gesendet werden
+                continue
+
+            delay_ms = cfg.char_delay
+
+            if charbyte == 0x0D:  # quasi Enter
+                if basicode:
+                    m = cls._RX_LINENUMBER.match(currentlinetext)
+                    if m:
+                        lastline = m.group(1)   # str
+
+                # Zeilenende: Verarbeitung
+                cursor_row  = cfg.promptwidth
+                cursor_line = cursor_line + 1
+                cursor_is_in_string = False
+                totallinecount += 1
+
+                # Mehrfach-Sprünge mit ON GOTO, ON GOSUB als Einzelbefehle auswerten
+                linecommandcount += cls._count_on_goto_targets(lexer.lex(currentlinetext))
+
+                delay_ms += cfg.process_delay                                           # Verarbeitungszeit
+                delay_ms += linecommandcount * cfg.command_addition                     # zusätzliche Berechnungszeit bei mehreren Befehlen
+                delay_ms += (totallinecount + basiclinesoffset) * cfg.linethrottle      # mehr Zeit bei vielen Zeilen
+
+                # Zusatz-delay für zeitaufwendige DIM-Operationen im BASIC-Text bestimmen
+                dim_refs, dim_units = dimanalyzer.analyze_line(currentlinetext)
+                delay_ms += dim_refs  * cfg.dim_ref_delay
+                delay_ms += dim_units * cfg.dim_unit_delay
+
+                # Zusatz-delay für zeitaufwendige Variablen-Referenzen im BASIC-Text bestimmen
+                var_refs, _ = varanalyzer.analyze_line(currentlinetext)
+                delay_ms += var_refs * cfg.var_ref_delay
+
+                if verbose:
+                    print(f"({totallinecount}) {currentlinetext[:5]} - Befehle: {linecommandcount + 1} - Vars: {var_refs} - DIM: {dim_refs} | {dim_units}- Delay: {delay_ms:.0f}")
+
+                linecommandcount = 0
+                currentlinetext  = ""
+
+                emit(b"\x0D", delay_ms, i)
+
+                if fastmode and cursor_line >= cfg.lines - 1:  # x0C braucht 1 Zeile  - CLS braucht 2(!) Zeilen (inkl. Enter)
+                    emit(b"\x0C", cfg.char_delay, i)
+                    emit(b"\x0D", cfg.init_clsdelay, i)
+                    cursor_line = 2
+                    cursor_row  = cfg.promptwidth
+                continue
+
+            currentlinetext += chr(charbyte)
+
+            if 0x20 <= charbyte < 0x80:   # darstellbares Zeichen
+                cursor_row = cursor_row + 1
+                # Hochkomma-> Stringliterale
+                if charbyte == 0x22:
+                    cursor_is_in_string = not cursor_is_in_string
+                # Doppelpunkt
+                if charbyte == 0x3A and not cursor_is_in_string and linecommandcount < 8:  # mehr als 8 Befehle in einer Zeile sind unwahrscheinlich
+                    linecommandcount += 1
+
+            if cursor_row >= cfg.linewidth - cfg.promptwidth:
+                cursor_row = 0
+                cursor_line += 1
+                if not fastmode:  # es besteht die Möglichkeit, das gescrollt werden muss
+                    delay_ms += cfg.linescroll_delay
+
+            emit(bytes((charbyte,)), delay_ms, i)
+
+        # ggf. abschließendes CR (Wartezeit davor und danach)
+        if endreturn and total and transferdata[-1] not in (0x0A, 0x0D):
+            delay_ms  = cfg.process_delay                          # Verarbeitungszeit
+            delay_ms += linecommandcount * cfg.command_addition    # zusätzliche Berechnungszeit bei mehreren Befehlen
+            delay_ms += totallinecount * cfg.linethrottle          # mehr Zeit bei vielen Zeilen
+            if delay_ms > 0:
+                if pending or not segments:
+                    emit(b"", delay_ms, total)
+                else:
+                    last = segments[-1]
+                    segments[-1] = TextPlanSegment(last.data, last.delay_ms + delay_ms, last.progress, last.lastline)
+            emit(b"\x0D", delay_ms, total)
+
+        # Rest ohne Wartezeit
+        if pending:
+            segments.append(TextPlanSegment(bytes(pending), 0.0, total, lastline))
+
+        return cls(tuple(segments), total, totallinecount)
+
+    def dump(self, limit: Optional[int] = None) -> str:
+        """Plan als Text (zur Kontrolle und für Tests)."""
+        out = [f"Textplan: {len(self._segments)} Segmente, {self.bytes_on_wire} Bytes, {self._lines} Zeilen, "
+               f"Wartezeit {self.delay_ms / 1000:.1f}s, Dauer (1200 Baud) {self.duration_ms() / 1000:.1f}s"]
+        for nr, seg in enumerate(self._segments):
+            if limit is not None and nr >= limit:
+                out.append(f"... ({len(self._segments) - limit} weitere)")
+                break
+            text = "".join(chr(b) if 0x20 <= b < 0x7F else f"<{b:02X}>" for b in seg.data)
+            out.append(f"{nr:5d} {seg.progress:6d} {len(seg.data):4d} {seg.delay_ms:8.1f}ms  {text}")
+        return "\n".join(out)
+
+    def __str__(self) -> str:
+        return self.dump(limit=20)
+
+
+# Einfacher CLI-Einstiegspunkt
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print(
+            "python kc_v24_transfer_textplan.py <datei.txt> [-fastmode] [-all]"
+            ," -fastmode: Plan wie bei der Übertragung von BASIC-Zeilen (CLS statt Scrollen)"
+            ,"      -all: alle Segmente ausgeben"
+            ,""
+            ,"Gibt den Übertragungsplan für die Übergabe als Tastatureingaben aus (Standard-Textkonfiguration)."
+            , sep="\n"
+            , file=sys.stderr
+        )
+        sys.exit(1)
+
+    from kc_v24_transfer_bytekernels import KC_V24_Transfer_ByteKernels
+    from kc_v24_transfer_kcfileformattools import KC_V24_Transfer_FileFormatTools, ParseResult
+
+    filename = sys.argv[1]
+    try:
+        with open(filename, "rb") as f:
+            data = f.read()
+    except OSError as e:
+        print(f"Fehler beim Lesen von '{filename}': {e}", file=sys.stderr)
+        sys.exit(1)
+
+    # latin1 -> KC (ä/ö/ü/ß usw.)
+    text = bytearray(KC_V24_Transfer_ByteKernels.latin_to_kc(data))
+    basicode = KC_V24_Transfer_FileFormatTools().classify_basic_text(text) == ParseResult._TYPE_BASICODE
+
+    fastmode = "-fastmode" in sys.argv[2:]
+    plan = KC_V24_Transfer_TextPlan.compile(text, TextPlanConfig(), fastmode=fastmode,
+                                            endreturn=fastmode, basicode=basicode)
+    print(plan.dump(limit=None if "-all" in sys.argv[2:] else 40))
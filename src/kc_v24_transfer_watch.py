@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import os
+import time
+from typing import TYPE_CHECKING, List, Optional, Tuple
+
+from kc_v24_transfer_kcfileformattools import ParseResult
+from kc_v24_transfer_kcjob import KC_Job
+from kc_v24_transfer_kcmemory import KC_V24_Transfer_MemoryShadow
+
+if TYPE_CHECKING:
+    from kc_v24_transfer_session import KC_V24_Transfer_Session
+
+# Entwicklungsschleife für Cross-Entwicklung (z.B. pasmo, siehe src/asm/README.md):
+# Eine Programmdatei (KCC, BIN, KCB ...) wird überwacht; nach jedem Neuerzeugen wird das neue Speicherabbild
+# mit dem zuletzt übertragenen verglichen und nur die geänderten Bereiche per ESC-T gesendet (Lücken, die
+# weniger kosten als ein weiterer ESC-T-Header, werden mitgesendet), danach optional per ESC-U gestartet.
+# Anders als das Speicherabbild der Session (KC_V24_Transfer_MemoryShadow) gilt das zuletzt übertragene Programm
+# auch nach seinem Start als unverändert - der Code eines Programms ändert sich beim Lauf in der Regel nicht.
+
+
+class KC_V24_Transfer_Watch:
+    """Überwacht eine Programmdatei und baut nach Änderungen die Jobs für die geänderten Bereiche."""
+
+    def __init__(self, session: KC_V24_Transfer_Session, path: str, run: bool = True) -> None:
+        self.session  = session
+        self.path     = path
+        self.run      = run
+        self.baseline = KC_V24_Transfer_MemoryShadow()   # zuletzt an den KC übertragenes Abbild
+        self._stamp   = self._stat()
+
+    # ------------------------ Datei ------------------------
+
+    def _stat(self) -> Optional[Tuple[int, int]]:
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def wait_change(self, interval: float = 0.5) -> None:
+        """Blockiert, bis die Datei geändert wurde und ein Abfrageintervall lang unverändert bleibt (Assembler fertig)."""
+        last = self._stamp
+        while True:
+            time.sleep(interval)
+            stamp = self._stat()
+            if stamp is not None and stamp != self._stamp and stamp == last:
+                self._stamp = stamp
+                return
+            last = stamp
+
+    # ------------------------ Abgleich ------------------------
+
+    @staticmethod
+    def supported(pr: ParseResult) -> bool:
+        return (not pr.errorstate and pr.start is not None and pr.end is not None
+                and pr.type in (ParseResult._TYPE_MC, ParseResult._TYPE_BASICMC))
+
+    def sent(self, pr: ParseResult) -> None:
+        """pr ist vollständig beim KC angekommen."""
+        self.baseline.store(pr.start, pr.transferdata)
+
+    def on_reset(self) -> None:
+        self.baseline.on_reset()
+
+    def changed_ranges(self, pr: ParseResult) -> List[Tuple[int, int]]:
+        return self.baseline.changed_ranges(pr.start, pr.transferdata, self.session.cost_model.esct_min_gap())
+
+    def build_jobs(self, pr: ParseResult) -> List[KC_Job]:
+        """
+        Jobs für ein neu erzeugtes Abbild: geänderte Bereiche als einzelne ESC-T mit 1200 Baud - oder die vollständige
+        Übertragung (ggf. mit Schnelllader, add_bin_load_jobs), wenn sie nach dem Zeitmodell schneller ist -, danach der Start.
+        """
+        s = self.session
+        delta = [KC_Job(parent=s, type=KC_Job._JT_SENDBIN, pr=pr.slice(start - pr.start, end - pr.start))
+                 for start, end in self.changed_ranges(pr)]
+
+        saved, s.jobs = s.jobs, []
+        try:
+            s._add_full_load_jobs(pr)
+            full = s.jobs
+        finally:
+            s.jobs = saved
+
+        full_ms, delta_ms = s.cost_model.total_ms(full), s.cost_model.total_ms(delta)
+        print(f"-- Zeitmodell: vollständig ca. {full_ms / 1000:.1f} s, nur Änderungen ca. {delta_ms / 1000:.1f} s")
+        jobs = delta if delta_ms <= full_ms else full
+        if jobs and self.run:
+            jobs += self.start_jobs(pr)
+        return jobs
+
+    def start_jobs(self, pr: ParseResult) -> List[KC_Job]:
+        """Start nach der Übertragung: ESC-U auf die Einsprungadresse bzw. REBASIC/RUN für BASIC-Speicherabbilder."""
+        s = self.session
+        pr_nodata = pr.without_data()
+        if pr.type == ParseResult._TYPE_BASICMC:
+            return [KC_Job(parent=s, type=KC_Job._JT_STARTKEYBMODE, pr=pr_nodata),
+                    KC_Job(parent=s, type=KC_Job._JT_STARTREBASIC,  pr=pr_nodata, pause=500),
+                    KC_Job(parent=s, type=KC_Job._JT_RUNBASIC,      pr=pr_nodata)]
+        if pr.callu:
+            return [KC_Job(parent=s, type=KC_Job._JT_RUNBIN, pr=pr_nodata)]
+        return []